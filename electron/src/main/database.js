@@ -80,7 +80,7 @@ async function getDatabaseInfo(resolvedPath) {
     console.log(`[${timestamp}] [ELECTRON] Database connection opened successfully for: ${resolvedPath}`);
     
     // Count tables
-    const tablesResult = db.prepare("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'").all();
+    const tablesResult = db.prepare("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' AND name != '_db_simulator_row_counts'").all();
     tableCount = tablesResult.length;
     
     // Count records in a few key tables if they exist
@@ -149,7 +149,7 @@ async function getDatabaseTables(databasePath, appPaths) {
     console.log(`[${timestamp}] [ELECTRON] Database connection opened successfully for getDatabaseTables: ${resolvedPath}`);
     
     try {
-      const rows = db.prepare("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'").all();
+      const rows = db.prepare("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' AND name != '_db_simulator_row_counts'").all();
       const tables = rows.map(row => row.name);
       console.log(`[${timestamp}] [ELECTRON] Found ${tables.length} tables: ${tables.join(', ')}`);
       return { success: true, tables };
@@ -342,7 +342,7 @@ async function exportTablesToCSV(resolvedPath, exportDir) {
   try {
     db = new Database(resolvedPath, { readonly: true });
     // Get all tables in the database
-    const tables = db.prepare("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'").all();
+    const tables = db.prepare("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' AND name != '_db_simulator_row_counts'").all();
     
     if (tables.length === 0) {
       throw new Error('No tables found in database');
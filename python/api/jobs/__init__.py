@@ -0,0 +1,9 @@
+"""
+Asynchronous simulation jobs for the DB Simulator API.
+Runs simulations in a bounded process pool with a persistent job store.
+"""
+
+from .store import JobStore
+from .manager import SimulationJobManager, JobQueueFullError, get_job_manager, shutdown_job_manager
+
+__all__ = ['JobStore', 'SimulationJobManager', 'JobQueueFullError', 'get_job_manager', 'shutdown_job_manager']
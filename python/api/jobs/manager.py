@@ -0,0 +1,170 @@
+"""
+Simulation job manager: bounded process pool with queue backpressure.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from .store import JobStore, CANCELLED, FAILED
+from .worker import execute_job, initialize_worker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 2
+DEFAULT_MAX_QUEUED = 8
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class SimulationJobManager:
+    """
+    Runs simulation jobs in a bounded pool of worker processes.
+
+    At most ``max_concurrent`` jobs run at once; up to ``max_queued`` more may
+    wait. Further submissions are rejected so callers can retry later. Both
+    limits are enforced through the job store, so they hold across every API
+    worker process sharing it.
+    """
+
+    def __init__(self, store=None, max_concurrent=None, max_queued=None):
+        """
+        Initialize the job manager.
+
+        Args:
+            store (JobStore, optional): Job store. Defaults to the shared store.
+            max_concurrent (int, optional): Worker processes (DB_SIMULATOR_MAX_CONCURRENT_SIMULATIONS)
+            max_queued (int, optional): Waiting jobs allowed (DB_SIMULATOR_MAX_QUEUED_SIMULATIONS)
+        """
+        self.store = store or JobStore()
+        self.max_concurrent = max(1, int(max_concurrent or os.environ.get(
+            'DB_SIMULATOR_MAX_CONCURRENT_SIMULATIONS', DEFAULT_MAX_CONCURRENT)))
+        self.max_queued = max(0, int(max_queued if max_queued is not None else os.environ.get(
+            'DB_SIMULATOR_MAX_QUEUED_SIMULATIONS', DEFAULT_MAX_QUEUED)))
+        self._executor = None
+        self._futures = {}
+        self._lock = threading.Lock()
+        self.store.reconcile_orphans()
+
+    def _get_executor(self):
+        if self._executor is None:
+            # Spawn keeps workers independent of Flask's threads on every platform
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_concurrent,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=initialize_worker
+            )
+        return self._executor
+
+    def submit(self, kind, params):
+        """
+        Submit a job.
+
+        Args:
+            kind (str): Job kind ('simulate' or 'generate-and-simulate')
+            params (dict): Job parameters
+
+        Returns:
+            str: Job ID
+
+        Raises:
+            JobQueueFullError: If the running and queued jobs are at capacity
+        """
+        with self._lock:
+            job_id = self.store.create(kind, params, max_active=self.max_concurrent + self.max_queued)
+            if job_id is None:
+                raise JobQueueFullError(
+                    f"Simulation queue is full ({self.max_concurrent} running, {self.max_queued} queued)"
+                )
+            try:
+                future = self._get_executor().submit(execute_job, job_id, self.store.db_path, kind, params,
+                                                     self.max_concurrent)
+            except Exception as e:
+                self.store.finish(job_id, FAILED, error=f"Failed to start job: {e}")
+                raise
+            self._futures[job_id] = future
+            future.add_done_callback(lambda f, jid=job_id: self._on_done(jid, f))
+        logger.info(f"Queued simulation job {job_id} ({kind})")
+        return job_id
+
+    def _on_done(self, job_id, future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+        if future.cancelled():
+            self.store.finish(job_id, CANCELLED)
+            return
+        error = future.exception()
+        if error is not None:
+            # Worker crashed before it could record the failure itself
+            logger.error(f"Simulation job {job_id} worker error: {error}")
+            self.store.finish(job_id, FAILED, error=str(error))
+
+    def wait(self, job_id, timeout=None):
+        """
+        Block until a job submitted by this process has finished.
+
+        Args:
+            job_id (str): Job ID
+            timeout (float, optional): Seconds to wait at most
+
+        Returns:
+            dict: Final job data from the store
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                pass  # Failures are recorded in the store below
+            if future.done():
+                # Record a crashed worker now instead of racing the done callback
+                self._on_done(job_id, future)
+        return self.store.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Cancel a job: drop it if still queued, otherwise interrupt it cooperatively.
+
+        Returns:
+            bool: True if the job was active
+        """
+        if not self.store.request_cancel(job_id):
+            return False
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            logger.info(f"Cancelled queued simulation job {job_id}")
+        else:
+            logger.info(f"Requested cancellation of simulation job {job_id}")
+        return True
+
+    def shutdown(self, wait=False):
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+
+def shutdown_job_manager(wait=False):
+    """Shut down the process-wide job manager's worker pool, if one was started."""
+    if _job_manager is not None:
+        _job_manager.shutdown(wait=wait)
+
+
+def get_job_manager():
+    """Get or create the process-wide job manager."""
+    global _job_manager
+    if _job_manager is None:
+        with _job_manager_lock:
+            if _job_manager is None:
+                _job_manager = SimulationJobManager()
+    return _job_manager
@@ -0,0 +1,343 @@
+"""
+Persistent simulation job store backed by SQLite.
+
+Job state, progress snapshots and final results are kept in a small SQLite
+database so that every API worker process and every simulation worker
+process sees the same jobs, and results survive a server restart.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import uuid
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle states
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+FINAL_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+
+def default_jobs_db_path():
+    """
+    Resolve the job store location.
+
+    Uses DB_SIMULATOR_JOBS_DB when set, otherwise places ``jobs.db`` next to
+    the configuration database.
+    """
+    if 'DB_SIMULATOR_JOBS_DB' in os.environ:
+        return os.environ['DB_SIMULATOR_JOBS_DB']
+    if 'DB_SIMULATOR_CONFIG_DB' in os.environ:
+        return os.path.join(os.path.dirname(os.environ['DB_SIMULATOR_CONFIG_DB']), 'jobs.db')
+    config_storage_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'config_storage')
+    return os.path.join(config_storage_dir, 'jobs.db')
+
+
+def _pid_alive(pid):
+    """Check whether a process with the given pid is still running."""
+    if not pid:
+        return False
+    if os.name == 'nt':
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        kernel32.CloseHandle(handle)
+        return exit_code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """
+    SQLite-backed store of simulation jobs.
+    Safe to use from several processes at once (WAL mode, short transactions).
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Initialize the job store.
+
+        Args:
+            db_path (str, optional): Path to the job database. Defaults to default_jobs_db_path().
+        """
+        self.db_path = db_path or default_jobs_db_path()
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        """Initialize the job table if it doesn't exist."""
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS simulation_jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                params TEXT,
+                progress TEXT,
+                result TEXT,
+                error TEXT,
+                owner_pid INTEGER,
+                worker_pid INTEGER,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                updated_at TEXT NOT NULL
+            )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_simulation_jobs_status ON simulation_jobs (status)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _row_to_job(self, row, include_params=False):
+        job = {
+            'id': row['id'],
+            'kind': row['kind'],
+            'status': row['status'],
+            'progress': json.loads(row['progress']) if row['progress'] else None,
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error'],
+            'cancel_requested': bool(row['cancel_requested']),
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+            'updated_at': row['updated_at'],
+        }
+        if include_params:
+            job['params'] = json.loads(row['params']) if row['params'] else {}
+        return job
+
+    def create(self, kind, params, max_active=None):
+        """
+        Create a queued job.
+
+        Args:
+            kind (str): Job kind ('simulate' or 'generate-and-simulate')
+            params (dict): JSON-serializable job parameters
+            max_active (int, optional): Refuse the job when this many jobs are
+                already queued or running across all processes
+
+        Returns:
+            str: The ID of the created job, or None if max_active was reached
+        """
+        job_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        try:
+            # Take the write lock before counting so concurrent API workers cannot overshoot
+            conn.execute('BEGIN IMMEDIATE')
+            if max_active is not None and self._count(conn, ACTIVE_STATUSES) >= max_active:
+                conn.rollback()
+                return None
+            conn.execute(
+                '''
+                INSERT INTO simulation_jobs (id, kind, status, params, owner_pid, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''',
+                (job_id, kind, QUEUED, json.dumps(params), os.getpid(), now, now)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        return job_id
+
+    def get(self, job_id, include_params=False):
+        """
+        Get a job by ID.
+
+        Returns:
+            dict: Job data or None if not found
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT * FROM simulation_jobs WHERE id = ?', (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return self._row_to_job(row, include_params) if row else None
+
+    def list(self, limit=50, status=None):
+        """
+        List the most recent jobs.
+
+        Args:
+            limit (int): Maximum number of jobs
+            status (str, optional): Only jobs in this status
+
+        Returns:
+            list: Job dictionaries, newest first
+        """
+        conn = self._connect()
+        try:
+            if status:
+                rows = conn.execute(
+                    'SELECT * FROM simulation_jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?',
+                    (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    'SELECT * FROM simulation_jobs ORDER BY created_at DESC LIMIT ?', (limit,)
+                ).fetchall()
+        finally:
+            conn.close()
+        return [self._row_to_job(row) for row in rows]
+
+    @staticmethod
+    def _count(conn, statuses):
+        return conn.execute(
+            f"SELECT COUNT(*) FROM simulation_jobs WHERE status IN ({', '.join('?' for _ in statuses)})", statuses
+        ).fetchone()[0]
+
+    def count_active(self):
+        """Number of queued or running jobs across all processes."""
+        conn = self._connect()
+        try:
+            return self._count(conn, ACTIVE_STATUSES)
+        finally:
+            conn.close()
+
+    def get_status(self, job_id):
+        """
+        Get the status of a job.
+
+        Returns:
+            str: Job status or None if not found
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT status FROM simulation_jobs WHERE id = ?', (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return row['status'] if row else None
+
+    def _update(self, job_id, where_status=None, **fields):
+        fields['updated_at'] = datetime.now().isoformat()
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        sql = f'UPDATE simulation_jobs SET {assignments} WHERE id = ?'
+        values = list(fields.values()) + [job_id]
+        if where_status:
+            sql += f" AND status IN ({', '.join('?' for _ in where_status)})"
+            values.extend(where_status)
+        conn = self._connect()
+        try:
+            cursor = conn.execute(sql, values)
+            conn.commit()
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    def mark_running(self, job_id, worker_pid, max_running=None):
+        """
+        Mark a queued job as running in the given worker process.
+
+        Args:
+            job_id (str): Job ID
+            worker_pid (int): PID of the process running the job
+            max_running (int, optional): Only start the job while fewer jobs than
+                this are running across all processes
+
+        Returns:
+            bool: True if the job was started
+        """
+        if max_running is None:
+            return self._update(job_id, where_status=(QUEUED,), status=RUNNING,
+                                worker_pid=worker_pid, started_at=datetime.now().isoformat())
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            if self._count(conn, (RUNNING,)) >= max_running:
+                conn.rollback()
+                return False
+            cursor = conn.execute(
+                'UPDATE simulation_jobs SET status = ?, worker_pid = ?, started_at = ?, updated_at = ? '
+                'WHERE id = ? AND status = ?',
+                (RUNNING, worker_pid, now, now, job_id, QUEUED)
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    def update_progress(self, job_id, progress):
+        """Store the latest progress snapshot of a running job."""
+        return self._update(job_id, progress=json.dumps(progress, default=str))
+
+    def finish(self, job_id, status, result=None, error=None):
+        """Record the final status and result of a job."""
+        return self._update(
+            job_id,
+            where_status=ACTIVE_STATUSES,
+            status=status,
+            result=json.dumps(result, default=str) if result is not None else None,
+            error=error,
+            finished_at=datetime.now().isoformat()
+        )
+
+    def request_cancel(self, job_id):
+        """
+        Flag an active job for cancellation.
+
+        Returns:
+            bool: True if the job was active and is now flagged
+        """
+        return self._update(job_id, where_status=ACTIVE_STATUSES, cancel_requested=1)
+
+    def is_cancel_requested(self, job_id):
+        """Check whether cancellation was requested for a job."""
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT cancel_requested FROM simulation_jobs WHERE id = ?', (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return bool(row and row['cancel_requested'])
+
+    def reconcile_orphans(self):
+        """
+        Fail active jobs whose owning API process no longer exists.
+
+        Returns:
+            int: Number of jobs marked as failed
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT id, owner_pid FROM simulation_jobs WHERE status IN (?, ?)', ACTIVE_STATUSES
+            ).fetchall()
+        finally:
+            conn.close()
+
+        orphaned = 0
+        for row in rows:
+            if row['owner_pid'] != os.getpid() and not _pid_alive(row['owner_pid']):
+                if self.finish(row['id'], FAILED, error='Interrupted by server shutdown'):
+                    orphaned += 1
+        if orphaned:
+            logger.warning(f"Marked {orphaned} interrupted simulation jobs as failed")
+        return orphaned
@@ -0,0 +1,167 @@
+"""
+Simulation job execution inside pool worker processes.
+
+Everything here runs in a separate process: the job's configuration content
+arrives in the job parameters, progress and results are written back to the
+shared JobStore, and cancellation is observed by polling the store.
+"""
+
+import logging
+import os
+import time
+
+from .store import JobStore, QUEUED, COMPLETED, FAILED, CANCELLED
+
+logger = logging.getLogger(__name__)
+
+# Seconds between attempts to claim a running slot
+SLOT_POLL_INTERVAL = 0.5
+
+
+def initialize_worker():
+    """Process initializer for simulation worker processes."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+
+def frontend_relative_path(db_path, project_id=None):
+    """Build the output-relative database path the frontend expects."""
+    db_filename = os.path.basename(db_path)
+    if project_id:
+        return f"output/{project_id}/{db_filename}"
+    return f"output/{db_filename}"
+
+
+def _progress_options(params):
+    """Progress cadence options requested for a job."""
+    return {
+        'progress_sim_interval': params.get('progress_sim_interval'),
+        'progress_wall_interval': params.get('progress_interval'),
+    }
+
+
+def run_simulation_task(params, should_stop=None, on_progress=None):
+    """
+    Run a simulation on an existing database.
+
+    Args:
+        params (dict): sim_config, db_config (YAML content), database_path and optional profile flag
+        should_stop: Cooperative cancellation callback
+        on_progress: Progress snapshot callback
+
+    Returns:
+        dict: Job result with simulation results
+    """
+    from src.simulation.core.runner import run_simulation
+
+    results = run_simulation(
+        params['sim_config'],
+        params['db_config'],
+        params['database_path'],
+        should_stop=should_stop,
+        on_progress=on_progress,
+        profile=bool(params.get('profile')),
+        **_progress_options(params)
+    )
+    return {'results': results}
+
+
+def generate_and_simulate_task(params, should_stop=None, on_progress=None):
+    """
+    Generate a database, run a simulation on it and resolve formula attributes.
+
+    Args:
+        params (dict): db_config, sim_config (YAML content), output_dir, project_id, name and optional profile flag
+        should_stop: Cooperative cancellation callback
+        on_progress: Progress snapshot callback
+
+    Returns:
+        dict: Job result with database path and simulation results
+    """
+    from src.generator import generate_database_with_formula_support
+    from src.simulation.core.runner import run_simulation
+
+    project_id = params.get('project_id')
+    db_path, generator = generate_database_with_formula_support(
+        params['db_config'],
+        params.get('output_dir'),
+        params.get('name'),
+        project_id,
+        params['sim_config']
+    )
+    result = {
+        'database_path': frontend_relative_path(db_path, project_id),
+        'database_file': db_path,
+    }
+
+    if should_stop and should_stop():
+        result['results'] = {'termination_reason': 'cancelled'}
+        return result
+
+    result['results'] = run_simulation(
+        params['sim_config'],
+        params['db_config'],
+        db_path,
+        should_stop=should_stop,
+        on_progress=on_progress,
+        profile=bool(params.get('profile')),
+        **_progress_options(params)
+    )
+
+    if generator.has_pending_formulas():
+        logger.info("Resolving formula-based attributes after simulation completion")
+        if not generator.resolve_formulas(db_path):
+            logger.warning("Formula resolution failed, but continuing with simulation results")
+    return result
+
+
+TASKS = {
+    'simulate': run_simulation_task,
+    'generate-and-simulate': generate_and_simulate_task,
+}
+
+
+def execute_job(job_id, store_path, kind, params, max_running=None):
+    """
+    Entry point executed in a pool worker for one job.
+
+    Args:
+        job_id (str): Job ID
+        store_path (str): Path of the shared job store
+        kind (str): Job kind, a key of TASKS
+        params (dict): Job parameters
+        max_running (int, optional): Limit on jobs running at once across all
+            API worker processes sharing the store; the job waits for a slot
+    """
+    store = JobStore(store_path)
+    while True:
+        if store.is_cancel_requested(job_id):
+            store.finish(job_id, CANCELLED)
+            return
+        if store.mark_running(job_id, os.getpid(), max_running=max_running):
+            break
+        if store.get_status(job_id) != QUEUED:
+            # Job was cancelled or finished while queued
+            return
+        time.sleep(SLOT_POLL_INTERVAL)
+
+    logger.info(f"Starting simulation job {job_id} ({kind})")
+
+    def should_stop():
+        return store.is_cancel_requested(job_id)
+
+    def on_progress(snapshot):
+        store.update_progress(job_id, snapshot)
+
+    try:
+        task = TASKS[kind]
+        result = task(params, should_stop=should_stop, on_progress=on_progress)
+        reason = (result.get('results') or {}).get('termination_reason')
+        status = CANCELLED if reason == 'cancelled' else COMPLETED
+        store.finish(job_id, status, result=result)
+        logger.info(f"Simulation job {job_id} {status}")
+    except Exception as e:
+        logger.error(f"Simulation job {job_id} failed: {e}")
+        store.finish(job_id, FAILED, error=str(e))
@@ -3,11 +3,12 @@ Results retrieval and export routes for DB Simulator API.
 Handles simulation results analysis and data export operations.
 """
 
-import csv
 import logging
 import os
 import sqlite3
 import sys
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import List, Dict, Tuple
 
@@ -15,10 +16,14 @@ from typing import List, Dict, Tuple
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from flask import Blueprint, request
+from src.utils.row_counts import ROW_COUNTS_TABLE, read_row_counts
 from ..utils.response_helpers import (
     success_response, error_response, validation_error_response,
     handle_exception, require_json_fields, log_api_request
 )
+from ..utils.result_aggregation import aggregate, database_fingerprint
+from ..utils.table_export import EXPORT_FORMATS, export_tables
+from ..utils.table_paging import TablePager, parse_filter
 
 # Create Blueprint
 results_bp = Blueprint('results', __name__)
@@ -28,6 +33,11 @@ logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir))
 
+# Database summaries keyed by (path, mtime, size), least recently used evicted first
+SUMMARY_CACHE_SIZE = 32
+_summary_cache = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
 
 @results_bp.route('/results/summary', methods=['GET'])
 def get_simulation_results():
@@ -43,7 +53,7 @@ def get_simulation_results():
         if not os.path.exists(resolved_path):
             return error_response(f"Database not found at {resolved_path}", status_code=404)
 
-        summary = _build_database_summary(resolved_path)
+        summary = _get_database_summary(resolved_path)
         return success_response({"data": summary})
 
     except Exception as e:
@@ -75,7 +85,18 @@ def get_database_tables():
 
 @results_bp.route('/results/table-data', methods=['GET'])
 def get_table_data():
-    """Get data from a specific table"""
+    """
+    Get a page of rows from a specific table.
+
+    Query parameters:
+        limit: Rows per page (1-5000, default 1000)
+        columns: Comma-separated column projection
+        cursor: next_cursor from the previous page
+        sort / order: Indexed column to sort by, 'asc' or 'desc'
+        filter: Repeatable ``column:op[:value]`` filters (eq, ne, lt, le, gt, ge, like, null, notnull)
+
+    Rows are returned as arrays aligned with ``columns``.
+    """
     try:
         # Support both camelCase and snake_case to align with existing UI calls
         database_path = request.args.get('databasePath') or request.args.get('database_path')
@@ -92,23 +113,83 @@ def get_table_data():
             return error_response(f"Database not found at {resolved_path}", status_code=404)
 
         limit_value = _coerce_limit(limit)
+        columns_param = request.args.get('columns')
+        columns = [c.strip() for c in columns_param.split(',') if c.strip()] if columns_param else None
+        descending = (request.args.get('order') or 'asc').lower() == 'desc'
 
         with _open_connection(resolved_path) as conn:
             tables = _list_tables(conn)
             if table_name not in tables:
                 return validation_error_response(f"Unknown table: {table_name}")
 
-            rows, columns = _fetch_table_rows(conn, table_name, limit_value)
-
-        return success_response({"data": rows, "columns": columns})
+            try:
+                filters = [parse_filter(f) for f in request.args.getlist('filter')]
+                page = TablePager(conn, table_name).fetch_page(
+                    limit_value,
+                    columns=columns,
+                    cursor=request.args.get('cursor'),
+                    sort=request.args.get('sort'),
+                    descending=descending,
+                    filters=filters
+                )
+            except ValueError as e:
+                return validation_error_response(str(e))
+
+        return success_response(page)
 
     except Exception as e:
         return handle_exception(e, "retrieving table data", logger)
 
 
+@results_bp.route('/results/aggregate', methods=['GET'])
+def get_aggregate():
+    """
+    Aggregate a result metric into simulation-time buckets.
+
+    Query parameters:
+        database_path: Result database
+        metric: event_count, event_completions, event_duration_avg, allocation_count,
+            busy_minutes, queue_entries, queue_wait_avg or queue_length_max
+        bucket_minutes: Bucket width in simulation minutes (default 60)
+        group_by: Optional dimension, e.g. flow, resource_type, queue
+        start / end: Optional simulation-minute window
+
+    Rows are returned as ``[bucket_start, group, value]`` arrays. Queue metrics
+    of runs logged with ``queue_logging: summary`` are read from their buckets.
+    """
+    try:
+        database_path = request.args.get('databasePath') or request.args.get('database_path')
+        metric = request.args.get('metric')
+        if not database_path or not metric:
+            return validation_error_response("Missing required parameters")
+
+        log_api_request(logger, "Aggregate results", extra_info=f"metric: {metric}, path: {database_path}")
+
+        resolved_path = _resolve_database_path(database_path)
+        if not os.path.exists(resolved_path):
+            return error_response(f"Database not found at {resolved_path}", status_code=404)
+
+        try:
+            result = aggregate(
+                resolved_path,
+                metric,
+                bucket_minutes=_optional_float(request.args.get('bucket_minutes')),
+                group_by=request.args.get('group_by') or None,
+                start=_optional_float(request.args.get('start')),
+                end=_optional_float(request.args.get('end'))
+            )
+        except ValueError as e:
+            return validation_error_response(str(e))
+
+        return success_response(result)
+
+    except Exception as e:
+        return handle_exception(e, "aggregating results", logger)
+
+
 @results_bp.route('/results/export-csv', methods=['POST'])
 def export_database_to_csv():
-    """Export database tables to CSV files"""
+    """Export database tables to CSV (default) or Parquet files"""
     try:
         log_api_request(logger, "Export database to CSV")
 
@@ -120,6 +201,11 @@ def export_database_to_csv():
         database_path = data['database_path']
         export_path = data['export_path']
         tables_filter = data.get('tables')  # optional list
+        export_format = (data.get('format') or 'csv').lower()
+        if export_format not in EXPORT_FORMATS:
+            return validation_error_response(
+                f"Unsupported export format: {export_format}. Expected one of: {', '.join(EXPORT_FORMATS)}"
+            )
 
         resolved_db_path = _resolve_database_path(database_path)
         if not os.path.exists(resolved_db_path):
@@ -137,7 +223,10 @@ def export_database_to_csv():
             if unknown:
                 return validation_error_response(f"Unknown tables requested: {', '.join(unknown)}")
 
-            exported_files = _export_tables_to_csv(conn, resolved_export_path, target_tables)
+        try:
+            exported_files = export_tables(resolved_db_path, resolved_export_path, target_tables, export_format)
+        except ValueError as e:
+            return validation_error_response(str(e))
 
         return success_response(
             {"exportPath": resolved_export_path, "files": exported_files},
@@ -177,7 +266,8 @@ def _open_connection(db_path: str) -> sqlite3.Connection:
 def _list_tables(conn: sqlite3.Connection) -> List[str]:
     """List user tables, skipping SQLite internals."""
     cursor = conn.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' AND name != ? ORDER BY name",
+        (ROW_COUNTS_TABLE,)
     )
     return [row[0] for row in cursor.fetchall()]
 
@@ -204,23 +294,43 @@ def _get_row_count(conn: sqlite3.Connection, table_name: str) -> int:
     return int(result["cnt"]) if result else 0
 
 
-def _fetch_table_rows(conn: sqlite3.Connection, table_name: str, limit: int) -> Tuple[List[Dict], List[str]]:
-    """Fetch up to `limit` rows from a table."""
-    cursor = conn.execute(f'SELECT * FROM "{table_name}" LIMIT ?', (limit,))
-    rows = cursor.fetchall()
-    columns = [desc[0] for desc in cursor.description] if cursor.description else []
-    data = [dict(row) for row in rows]
-    return data, columns
+def _summary_cache_key(db_path: str) -> Tuple:
+    """Identify a database version by path, mtime and size (including its WAL file)."""
+    return database_fingerprint(db_path)
+
+
+def _get_database_summary(db_path: str) -> Dict:
+    """Return the database summary, built once per database version."""
+    key = _summary_cache_key(db_path)
+    with _summary_cache_lock:
+        summary = _summary_cache.get(key)
+        if summary is not None:
+            _summary_cache.move_to_end(key)
+            return summary
+
+    summary = _build_database_summary(db_path)
+    with _summary_cache_lock:
+        # Drop summaries of older versions of the same file
+        for stale_key in [k for k in _summary_cache if k[0] == db_path]:
+            del _summary_cache[stale_key]
+        _summary_cache[key] = summary
+        while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+    return summary
 
 
 def _build_database_summary(db_path: str) -> Dict:
     """Build a summary of the database: tables, row counts, columns, size, timestamps."""
     with _open_connection(db_path) as conn:
         tables = _list_tables(conn)
+        # Counts recorded by the generator/simulator; COUNT(*) only for unrecorded tables
+        recorded_counts = read_row_counts(conn)
         table_summaries = []
         total_rows = 0
         for table in tables:
-            row_count = _get_row_count(conn, table)
+            row_count = recorded_counts.get(table)
+            if row_count is None:
+                row_count = _get_row_count(conn, table)
             total_rows += row_count
             table_summaries.append({
                 "name": table,
@@ -239,6 +349,16 @@ def _build_database_summary(db_path: str) -> Dict:
     }
 
 
+def _optional_float(value):
+    """Parse an optional numeric query parameter."""
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Invalid number: {value}")
+
+
 def _coerce_limit(limit_value) -> int:
     """Convert limit to a bounded int."""
     try:
@@ -247,17 +367,3 @@ def _coerce_limit(limit_value) -> int:
         value = 1000
     return max(1, min(value, 5000))
 
-
-def _export_tables_to_csv(conn: sqlite3.Connection, export_dir: str, tables: List[str]) -> List[str]:
-    """Export the provided tables to CSV files; returns list of file paths."""
-    exported = []
-    for table in tables:
-        rows, columns = _fetch_table_rows(conn, table, limit=10_000_000)
-        file_path = os.path.join(export_dir, f"{table}.csv")
-        with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=columns)
-            writer.writeheader()
-            writer.writerows(rows)
-        exported.append(file_path)
-        logger.info(f"Exported table '{table}' to {file_path} ({len(rows)} rows)")
-    return exported
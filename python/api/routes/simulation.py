@@ -7,17 +7,18 @@ import logging
 import sys
 import os
 import gc
+import json
 import time
 
 # Add parent directory to sys.path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from flask import Blueprint, request
+from flask import Blueprint, Response, request, stream_with_context
 from config_storage.config_db import ConfigManager
-from src.generator import generate_database
-from src.simulation.core.runner import run_simulation
 from src.utils.file_operations import safe_delete_sqlite_file
 from src.utils.path_resolver import resolve_output_dir
+from ..jobs import JobQueueFullError, get_job_manager
+from ..jobs.store import FAILED, FINAL_STATUSES
 from ..utils.response_helpers import (
     success_response, error_response, not_found_response, validation_error_response,
     handle_exception, require_json_fields, log_api_request
@@ -32,6 +33,9 @@ config_manager = ConfigManager()
 # Create logger
 logger = logging.getLogger(__name__)
 
+# Seconds between job store polls of the progress stream
+STREAM_POLL_INTERVAL = 0.5
+
 @simulation_bp.route('/run-simulation', methods=['POST'])
 def run_sim():
     """Run a simulation on an existing database"""
@@ -56,9 +60,28 @@ def run_sim():
             if db_config:
                 db_config_content = db_config['content']
         
+        job_params = {
+            'sim_config': config['content'],
+            'db_config': db_config_content,
+            'database_path': data['database_path'],
+            'profile': bool(data.get('profile')),
+            **_progress_options(data)
+        }
+        if data.get('async'):
+            return _submit_job('simulate', job_params)
+        if _offload_simulations():
+            job, failure = _run_job('simulate', job_params)
+            if failure:
+                return failure
+            return success_response({
+                "results": (job['result'] or {}).get('results')
+            }, message="Simulation completed successfully")
+        
         # Run simulation with database config if available
+        from src.simulation.core.runner import run_simulation
         if db_config_content:
-            results = run_simulation(config['content'], db_config_content, data['database_path'])
+            results = run_simulation(config['content'], db_config_content, data['database_path'],
+                                     profile=job_params['profile'])
         else:
             # Fallback to old method for backward compatibility
             results = run_simulation(config['content'], data['database_path'])
@@ -95,9 +118,31 @@ def generate_and_simulate():
         # Delete existing database file if it exists
         _cleanup_existing_database(output_dir, project_id, db_name, db_config)
         
+        job_params = {
+            'db_config': db_config['content'],
+            'sim_config': sim_config['content'],
+            'output_dir': output_dir,
+            'project_id': project_id,
+            'name': db_name,
+            'profile': bool(data.get('profile')),
+            **_progress_options(data)
+        }
+        if data.get('async'):
+            return _submit_job('generate-and-simulate', job_params)
+        if _offload_simulations():
+            job, failure = _run_job('generate-and-simulate', job_params)
+            if failure:
+                return failure
+            result = job['result'] or {}
+            return success_response({
+                "database_path": _prepare_response_path(result.get('database_file'), output_dir, project_id),
+                "results": result.get('results')
+            }, message="Generate-and-simulate completed successfully")
+        
         # Generate database with simulation config for attribute detection
         logger.info(f"Generating database with project_id: {project_id}")
         from src.generator import generate_database_with_formula_support
+        from src.simulation.core.runner import run_simulation
         db_path, generator = generate_database_with_formula_support(
             db_config['content'], 
             output_dir,
@@ -115,7 +160,8 @@ def generate_and_simulate():
         results = run_simulation(
             sim_config['content'],
             db_config['content'],
-            db_path
+            db_path,
+            profile=job_params['profile']
         )
         
         # Resolve formula attributes after simulation (transparent to user)
@@ -138,6 +184,82 @@ def generate_and_simulate():
     except Exception as e:
         return handle_exception(e, "generate-and-simulate", logger)
 
+@simulation_bp.route('/simulation/jobs', methods=['GET'])
+def list_jobs():
+    """List recent simulation jobs"""
+    try:
+        limit = request.args.get('limit', 50, type=int)
+        status = request.args.get('status')
+        jobs = get_job_manager().store.list(limit=limit, status=status)
+        return success_response({"jobs": jobs})
+    except Exception as e:
+        return handle_exception(e, "listing simulation jobs", logger)
+
+@simulation_bp.route('/simulation/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status, progress and result of a simulation job"""
+    try:
+        job = get_job_manager().store.get(job_id)
+        if not job:
+            return not_found_response("Simulation job")
+        return success_response({"job": job})
+    except Exception as e:
+        return handle_exception(e, "getting simulation job", logger)
+
+@simulation_bp.route('/simulation/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued or running simulation job"""
+    try:
+        log_api_request(logger, f"Cancel simulation job {job_id}")
+        manager = get_job_manager()
+        job = manager.store.get(job_id)
+        if not job:
+            return not_found_response("Simulation job")
+        if not manager.cancel(job_id):
+            return error_response(f"Job is already {job['status']}", status_code=409)
+        return success_response({"job_id": job_id}, message="Cancellation requested")
+    except Exception as e:
+        return handle_exception(e, "cancelling simulation job", logger)
+
+@simulation_bp.route('/simulation/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    """
+    Stream live job progress as Server-Sent Events until the job finishes.
+
+    Emits ``status`` events on state changes, ``progress`` events carrying the
+    simulator's latest progress snapshot (simulated time, entities, events,
+    queue lengths, utilization, events per second) and a final ``done`` event
+    with the job result. ``?interval=`` sets the poll interval in seconds.
+    """
+    store = get_job_manager().store
+    if not store.get(job_id):
+        return not_found_response("Simulation job")
+    interval = max(0.1, request.args.get('interval', STREAM_POLL_INTERVAL, type=float))
+
+    def generate():
+        last_status = None
+        last_progress = None
+        while True:
+            job = store.get(job_id)
+            if job is None:
+                return
+            if job['status'] != last_status:
+                last_status = job['status']
+                yield _sse_event('status', {'id': job_id, 'status': last_status})
+            if job['progress'] and job['progress'] != last_progress:
+                last_progress = job['progress']
+                yield _sse_event('progress', job['progress'])
+            if job['status'] in FINAL_STATUSES:
+                yield _sse_event('done', job)
+                return
+            time.sleep(interval)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @simulation_bp.route('/force-cleanup', methods=['POST'])
 def force_cleanup():
     """
@@ -159,6 +281,49 @@ def force_cleanup():
     except Exception as e:
         return handle_exception(e, "forced cleanup", logger)
 
+def _progress_options(data):
+    """Extract the progress cadence options from a request body."""
+    return {key: data[key] for key in ('progress_interval', 'progress_sim_interval') if data.get(key) is not None}
+
+def _sse_event(event, data):
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def _submit_job(kind, params):
+    """Submit a simulation job and return 202 with its ID, or 429 when the queue is full."""
+    try:
+        job_id = get_job_manager().submit(kind, params)
+    except JobQueueFullError as e:
+        return error_response(str(e), status_code=429)
+    response = success_response({
+        "job_id": job_id,
+        "status_url": f"/api/simulation/jobs/{job_id}",
+        "stream_url": f"/api/simulation/{job_id}/stream"
+    }, message="Simulation job queued")
+    response.status_code = 202
+    return response
+
+def _offload_simulations():
+    """Whether synchronous simulation requests run in the job worker pool (production serving mode)."""
+    return os.environ.get('DB_SIMULATOR_OFFLOAD_SIMULATIONS', '').lower() in ('1', 'true', 'yes')
+
+def _run_job(kind, params):
+    """
+    Run a simulation job in the worker pool and wait for it to finish.
+
+    Returns:
+        Tuple of (final job data, None) or (None, error response)
+    """
+    manager = get_job_manager()
+    try:
+        job_id = manager.submit(kind, params)
+    except JobQueueFullError as e:
+        return None, error_response(str(e), status_code=429)
+    job = manager.wait(job_id)
+    if job is None or job['status'] == FAILED:
+        return None, error_response((job or {}).get('error') or "Simulation job failed", status_code=500)
+    return job, None
+
 def _determine_output_directory():
     """Determine the appropriate output directory using shared resolver."""
     return resolve_output_dir()
@@ -0,0 +1,135 @@
+"""
+Production serving mode for the DB Simulator API.
+
+Runs the Flask app under a multi-worker WSGI server instead of Flask's
+development server. Gunicorn (POSIX) runs several worker processes; waitress
+(any platform, notably Windows) runs a pool of worker threads. The WSGI
+servers are optional dependencies and are imported only when selected.
+
+In this mode synchronous simulation requests are also executed in the job
+worker pool, so a long simulation never holds the GIL of a process that is
+serving configuration and validation requests. Every API worker shares the
+same job store, which enforces the global simulation limits.
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+WSGI_SERVERS = ('auto', 'gunicorn', 'waitress')
+DEFAULT_WORKERS = 4
+DEFAULT_THREADS = 4
+
+
+def _available(module_name):
+    try:
+        __import__(module_name)
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_wsgi_server(server='auto'):
+    """
+    Pick the WSGI server to use.
+
+    Args:
+        server: 'auto', 'gunicorn' or 'waitress'
+
+    Returns:
+        Name of an installed WSGI server
+
+    Raises:
+        ValueError: If the requested server is unknown or not installed
+    """
+    if server not in WSGI_SERVERS:
+        raise ValueError(f"Unknown WSGI server '{server}', expected one of: {', '.join(WSGI_SERVERS)}")
+    if server == 'auto':
+        # Gunicorn relies on fork and is not available on Windows
+        candidates = ('gunicorn', 'waitress') if os.name != 'nt' else ('waitress',)
+        for candidate in candidates:
+            if _available(candidate):
+                return candidate
+        raise ValueError("Production serving requires 'gunicorn' (Linux/macOS) or 'waitress' to be installed")
+    if not _available(server):
+        raise ValueError(f"Production serving with '{server}' requires the '{server}' package")
+    return server
+
+
+def configure_shared_job_limits(max_simulations=None, max_queued=None):
+    """
+    Pin the job store and simulation limits in the environment inherited by every worker.
+
+    Args:
+        max_simulations: Simulations running at once across all workers
+        max_queued: Simulations allowed to wait for a slot across all workers
+    """
+    from .jobs.store import default_jobs_db_path
+
+    os.environ['DB_SIMULATOR_JOBS_DB'] = os.path.abspath(default_jobs_db_path())
+    os.environ['DB_SIMULATOR_OFFLOAD_SIMULATIONS'] = '1'
+    if max_simulations is not None:
+        os.environ['DB_SIMULATOR_MAX_CONCURRENT_SIMULATIONS'] = str(max_simulations)
+    if max_queued is not None:
+        os.environ['DB_SIMULATOR_MAX_QUEUED_SIMULATIONS'] = str(max_queued)
+
+
+def run_production_server(host='127.0.0.1', port=5000, workers=None, threads=None, server='auto',
+                          max_simulations=None, max_queued=None):
+    """
+    Serve the API with a production WSGI server.
+
+    Args:
+        host: Host to bind
+        port: Port to bind
+        workers: Worker processes (gunicorn) or thread pool multiplier (waitress)
+        threads: Threads per worker
+        server: 'auto', 'gunicorn' or 'waitress'
+        max_simulations: Simulations running at once across all workers
+        max_queued: Simulations allowed to wait for a slot across all workers
+    """
+    server = resolve_wsgi_server(server)
+    workers = max(1, workers or DEFAULT_WORKERS)
+    threads = max(1, threads or DEFAULT_THREADS)
+    configure_shared_job_limits(max_simulations, max_queued)
+    logger.info(
+        f"Starting DB Simulator API with {server} on {host}:{port} "
+        f"({workers} workers x {threads} threads, job store {os.environ['DB_SIMULATOR_JOBS_DB']})"
+    )
+    if server == 'gunicorn':
+        _run_gunicorn(host, port, workers, threads)
+    else:
+        _run_waitress(host, port, workers, threads)
+
+
+def _run_gunicorn(host, port, workers, threads):
+    from gunicorn.app.base import BaseApplication
+
+    def worker_exit(server, worker):
+        from .jobs import shutdown_job_manager
+        shutdown_job_manager()
+
+    class _Application(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f"{host}:{port}")
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            # gthread keeps long-lived progress streams from blocking a whole worker
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('worker_exit', worker_exit)
+
+        def load(self):
+            # Each worker builds its own app (and job manager) after forking
+            from .server import create_app
+            return create_app()
+
+    _Application().run()
+
+
+def _run_waitress(host, port, workers, threads):
+    from waitress import serve
+    from .server import create_app
+
+    # Waitress serves from one process; simulations still run in the job worker pool
+    serve(create_app(), host=host, port=port, threads=workers * threads)
@@ -0,0 +1,261 @@
+"""
+Server-side time-bucket aggregation of simulation result tables.
+
+Metrics are predefined, parameterised ``GROUP BY`` queries over
+``sim_event_processing``, ``sim_resource_allocations`` and
+``sim_queue_activity``; clients choose the metric, bucket width, grouping
+dimension and time window. Runs with ``queue_logging: summary`` have no
+``sim_queue_activity``; their queue metrics are rolled up from the
+``sim_queue_summary`` buckets instead, so bucket widths must be multiples of
+the recorded one. Results are cached per database fingerprint, so
+repeated chart renders of an unchanged database do not touch SQLite.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from src.utils.result_indexes import RESOURCE_TYPES_VIEW
+from .table_export import open_readonly_connection
+
+AGGREGATE_CACHE_SIZE = 128
+DEFAULT_BUCKET_MINUTES = 60.0
+MAX_BUCKETS = 10000
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class Metric(NamedTuple):
+    """An aggregate over one result table."""
+    table: str
+    time_column: str
+    value: Optional[str]
+    unit: str
+    where: Optional[str] = None
+    # (start, end) columns of intervals whose length is split across buckets
+    interval: Optional[Tuple[str, str]] = None
+
+
+METRICS = {
+    'event_count': Metric('sim_event_processing', 'start_time', 'COUNT(*)', 'events'),
+    'event_completions': Metric('sim_event_processing', 'end_time', 'COUNT(*)', 'events'),
+    'event_duration_avg': Metric('sim_event_processing', 'start_time', 'AVG(duration)', 'minutes'),
+    'allocation_count': Metric('sim_resource_allocations', 'allocation_time', 'COUNT(*)', 'allocations'),
+    'busy_minutes': Metric('sim_resource_allocations', 'allocation_time', None, 'minutes',
+                           interval=('allocation_time', 'release_time')),
+    'queue_entries': Metric('sim_queue_activity', 'simulation_time', 'COUNT(*)', 'entities', where="action = 'entry'"),
+    'queue_wait_avg': Metric('sim_queue_activity', 'simulation_time', 'AVG(wait_time)', 'minutes',
+                             where='wait_time IS NOT NULL'),
+    # The length before the first transition of a bucket is the one carried into it
+    'queue_length_max': Metric('sim_queue_activity', 'simulation_time',
+                               'MAX(MAX(queue_length_before, queue_length_after))', 'entities'),
+}
+
+# Queue metrics over the buckets of summary-mode runs
+QUEUE_SUMMARY_TABLE = 'sim_queue_summary'
+SUMMARY_METRICS = {
+    'queue_entries': Metric(QUEUE_SUMMARY_TABLE, 'bucket_start', 'SUM(entries)', 'entities', where='entries > 0'),
+    'queue_wait_avg': Metric(QUEUE_SUMMARY_TABLE, 'bucket_start', 'SUM(total_wait_time) * 1.0 / SUM(exits)',
+                             'minutes', where='exits > 0'),
+    'queue_length_max': Metric(QUEUE_SUMMARY_TABLE, 'bucket_start', 'MAX(max_queue_length)', 'entities',
+                                where='entries + exits > 0'),
+}
+
+# Grouping dimensions per table: request name -> column
+DIMENSIONS = {
+    'sim_event_processing': {'flow': 'event_flow', 'event': 'event_id', 'entity_table': 'entity_table'},
+    'sim_resource_allocations': {'flow': 'event_flow', 'resource_table': 'resource_table',
+                                 'resource': 'resource_id', 'resource_type': 'resource_type'},
+    'sim_queue_activity': {'queue': 'queue_name', 'entity_table': 'entity_table', 'action': 'action'},
+    QUEUE_SUMMARY_TABLE: {'queue': 'queue_name'},
+}
+
+
+def database_fingerprint(db_path: str) -> Tuple:
+    """Identify a database version by path, mtime and size (including its WAL file)."""
+    stats = os.stat(db_path)
+    key = (db_path, stats.st_mtime_ns, stats.st_size)
+    wal_path = f"{db_path}-wal"
+    if os.path.exists(wal_path):
+        wal_stats = os.stat(wal_path)
+        key += (wal_stats.st_mtime_ns, wal_stats.st_size)
+    return key
+
+
+def _table_names(conn: sqlite3.Connection) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+
+
+def _summary_metric(conn: sqlite3.Connection, metric_name: str, metric: Metric, bucket: float,
+                    group_by: Optional[str]) -> Optional[Tuple[Metric, Optional[str]]]:
+    """
+    Queue summary variant of a metric for databases logged in summary mode.
+
+    Returns:
+        Tuple of (metric, group column), or None if the database has the
+        metric's own table or no queue summary
+
+    Raises:
+        ValueError: If the bucket width or grouping cannot be served from the summary
+    """
+    summary_metric = SUMMARY_METRICS.get(metric_name)
+    if summary_metric is None:
+        return None
+    names = _table_names(conn)
+    if metric.table in names or QUEUE_SUMMARY_TABLE not in names:
+        return None
+    dimensions = DIMENSIONS[QUEUE_SUMMARY_TABLE]
+    if group_by is not None and group_by not in dimensions:
+        raise ValueError(f"Queues were logged in summary mode; '{metric_name}' can only be grouped by "
+                         f"{', '.join(dimensions)}")
+    recorded = conn.execute(f'SELECT MAX(bucket_end - bucket_start) FROM "{QUEUE_SUMMARY_TABLE}"').fetchone()[0]
+    if recorded:
+        ratio = bucket / recorded
+        if ratio < 1 - 1e-9 or abs(ratio - round(ratio)) > 1e-9:
+            raise ValueError(f"Queues were logged in {recorded:g} minute buckets; "
+                             f"bucket_minutes must be a multiple of {recorded:g}")
+    return summary_metric, dimensions[group_by] if group_by else None
+
+
+def _source(conn: sqlite3.Connection, metric: Metric, group_column: Optional[str]) -> str:
+    """Table or view to read, validating that it exists in this database."""
+    names = _table_names(conn)
+    if metric.table not in names:
+        raise ValueError(f"Table '{metric.table}' is not in this database")
+    if group_column == 'resource_type':
+        if RESOURCE_TYPES_VIEW not in names:
+            raise ValueError("Resource types were not recorded for this database")
+        return RESOURCE_TYPES_VIEW
+    return metric.table
+
+
+def _check_bucket_count(conn: sqlite3.Connection, metric: Metric, bucket: float,
+                        start: Optional[float], end: Optional[float]):
+    """Refuse bucket widths that would produce more than MAX_BUCKETS buckets."""
+    start_col, end_col = metric.interval or (metric.time_column, metric.time_column)
+    low, high = conn.execute(f'SELECT MIN("{start_col}"), MAX("{end_col}") FROM "{metric.table}"').fetchone()
+    if low is None:
+        return
+    low = max(low, start) if start is not None else low
+    high = min(high, end) if end is not None else high
+    if (high - low) / bucket > MAX_BUCKETS:
+        raise ValueError(f"Too many buckets; use a bucket_minutes of at least {(high - low) / MAX_BUCKETS:g}")
+
+
+def _run_query(conn: sqlite3.Connection, metric: Metric, bucket: float, group_column: Optional[str],
+               start: Optional[float], end: Optional[float]):
+    source = _source(conn, metric, group_column)
+    _check_bucket_count(conn, metric, bucket, start, end)
+    group_expr = f'"{group_column}"' if group_column else 'NULL'
+    where, params = [], {'bucket': bucket}
+    if metric.where:
+        where.append(metric.where)
+
+    if metric.interval:
+        start_col, end_col = metric.interval
+        if start is not None:
+            where.append(f'"{end_col}" > :start')
+            params['start'] = start
+        if end is not None:
+            where.append(f'"{start_col}" < :end')
+            params['end'] = end
+        lower = f'MAX("{start_col}", :start)' if start is not None else f'"{start_col}"'
+        upper = f'MIN("{end_col}", :end)' if end is not None else f'"{end_col}"'
+        where_sql = f" WHERE {' AND '.join(where)}" if where else ''
+        # Expand each interval into the buckets it spans and add the overlap with each
+        sql = f"""
+            WITH RECURSIVE spans(grp, s, e, b) AS (
+                SELECT {group_expr}, {lower}, {upper}, CAST({lower} / :bucket AS INTEGER)
+                FROM "{source}"{where_sql}
+                UNION ALL
+                SELECT grp, s, e, b + 1 FROM spans WHERE (b + 1) * :bucket < e
+            )
+            SELECT b, grp, SUM(MIN(e, (b + 1) * :bucket) - MAX(s, b * :bucket))
+            FROM spans WHERE e > s GROUP BY b, grp ORDER BY b, grp
+        """
+    else:
+        time_col = metric.time_column
+        if start is not None:
+            where.append(f'"{time_col}" >= :start')
+            params['start'] = start
+        if end is not None:
+            where.append(f'"{time_col}" < :end')
+            params['end'] = end
+        where_sql = f" WHERE {' AND '.join(where)}" if where else ''
+        sql = f"""
+            SELECT CAST("{time_col}" / :bucket AS INTEGER) AS b, {group_expr} AS grp, {metric.value}
+            FROM "{source}"{where_sql}
+            GROUP BY b, grp ORDER BY b, grp
+        """
+    return conn.execute(sql, params).fetchall()
+
+
+def aggregate(db_path: str, metric_name: str, bucket_minutes: Optional[float] = None,
+              group_by: Optional[str] = None, start: Optional[float] = None,
+              end: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Aggregate a result metric into time buckets.
+
+    Args:
+        db_path: Path to the result database
+        metric_name: Key of METRICS
+        bucket_minutes: Bucket width in simulation minutes (default 60)
+        group_by: Dimension of the metric's table (see DIMENSIONS), or None
+        start: Only include times at or after this simulation minute
+        end: Only include times before this simulation minute
+
+    Returns:
+        Dictionary with metric, unit, bucket_minutes, group_by, columns and rows
+        (``[bucket_start, group, value]`` arrays ordered by bucket)
+
+    Raises:
+        ValueError: On unknown metrics or dimensions, invalid buckets or missing tables
+    """
+    metric = METRICS.get(metric_name)
+    if metric is None:
+        raise ValueError(f"Unknown metric '{metric_name}', expected one of: {', '.join(METRICS)}")
+    bucket = float(bucket_minutes) if bucket_minutes is not None else DEFAULT_BUCKET_MINUTES
+    if bucket <= 0:
+        raise ValueError("bucket_minutes must be positive")
+    dimensions = DIMENSIONS[metric.table]
+    if group_by is not None and group_by not in dimensions:
+        raise ValueError(f"Cannot group '{metric_name}' by '{group_by}', expected one of: {', '.join(dimensions)}")
+    if start is not None and end is not None and end <= start:
+        raise ValueError("end must be greater than start")
+    group_column = dimensions[group_by] if group_by else None
+
+    key = (database_fingerprint(db_path), metric_name, bucket, group_by, start, end)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    conn = open_readonly_connection(db_path)
+    try:
+        summary = _summary_metric(conn, metric_name, metric, bucket, group_by)
+        if summary is not None:
+            metric, group_column = summary
+        rows = _run_query(conn, metric, bucket, group_column, start, end)
+    finally:
+        conn.close()
+
+    result = {
+        'metric': metric_name,
+        'unit': metric.unit,
+        'bucket_minutes': bucket,
+        'group_by': group_by,
+        'columns': ['bucket_start', 'group', 'value'],
+        'rows': [[b * bucket, group, value] for b, group, value in rows],
+    }
+    with _cache_lock:
+        # Drop results computed against older versions of the same file
+        for stale_key in [k for k in _cache if k[0][0] == db_path and k[0] != key[0]]:
+            del _cache[stale_key]
+        _cache[key] = result
+        while len(_cache) > AGGREGATE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
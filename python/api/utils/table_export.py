@@ -0,0 +1,138 @@
+"""
+Streaming export of result database tables to CSV or Parquet.
+
+Each table is read in bounded chunks with ``fetchmany`` and written straight
+to its output file, so memory use does not grow with table size. Tables are
+exported concurrently, each worker thread using its own read-only SQLite
+connection.
+"""
+
+import csv
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('csv', 'parquet')
+EXPORT_CHUNK_SIZE = 10000
+DEFAULT_EXPORT_WORKERS = 4
+
+
+def open_readonly_connection(db_path: str) -> sqlite3.Connection:
+    """Open a read-only SQLite connection (safe to use alongside other readers)."""
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+
+def export_tables(db_path: str, export_dir: str, tables: List[str], fmt: str = 'csv',
+                  chunk_size: int = EXPORT_CHUNK_SIZE, max_workers: int = None) -> List[str]:
+    """
+    Export tables to files in parallel.
+
+    Args:
+        db_path: Path to the SQLite database
+        export_dir: Directory receiving one file per table
+        tables: Table names to export
+        fmt: 'csv' or 'parquet'
+        chunk_size: Rows read and written per chunk
+        max_workers: Concurrent table exports (defaults to DEFAULT_EXPORT_WORKERS)
+
+    Returns:
+        List of written file paths, in the order of ``tables``
+
+    Raises:
+        ValueError: If the format is unsupported or its dependency is missing
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}', expected one of: {', '.join(EXPORT_FORMATS)}")
+    if fmt == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError("Parquet export requires the 'pyarrow' package")
+
+    export_table = _export_table_csv if fmt == 'csv' else _export_table_parquet
+    workers = max(1, min(max_workers or DEFAULT_EXPORT_WORKERS, len(tables) or 1))
+
+    def run(table):
+        conn = open_readonly_connection(db_path)
+        try:
+            file_path = os.path.join(export_dir, f"{table}.{fmt}")
+            row_count = export_table(conn, table, file_path, chunk_size)
+            logger.info(f"Exported table '{table}' to {file_path} ({row_count} rows)")
+            return file_path
+        finally:
+            conn.close()
+
+    if workers == 1:
+        return [run(table) for table in tables]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='table-export') as executor:
+        return list(executor.map(run, tables))
+
+
+def _export_table_csv(conn: sqlite3.Connection, table: str, file_path: str, chunk_size: int) -> int:
+    """Stream one table into a CSV file; returns the number of rows written."""
+    cursor = conn.execute(f'SELECT * FROM "{table}"')
+    columns = [desc[0] for desc in cursor.description] if cursor.description else []
+    row_count = 0
+    with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(columns)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            writer.writerows(rows)
+            row_count += len(rows)
+    return row_count
+
+
+def _arrow_type(declared_type: str):
+    """Map a declared SQLite column type to an Arrow type by SQLite affinity rules."""
+    import pyarrow as pa
+
+    declared = (declared_type or '').upper()
+    if 'INT' in declared or 'BOOL' in declared:
+        return pa.int64()
+    if any(token in declared for token in ('CHAR', 'CLOB', 'TEXT', 'DATE', 'TIME')):
+        return pa.string()
+    if 'BLOB' in declared:
+        return pa.binary()
+    if any(token in declared for token in ('REAL', 'FLOA', 'DOUB', 'NUMERIC', 'DECIMAL')):
+        return pa.float64()
+    return pa.string()
+
+
+def _arrow_schema(conn: sqlite3.Connection, table: str):
+    """Build a fixed Arrow schema for a table so every chunk shares one schema."""
+    import pyarrow as pa
+
+    info = conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+    return pa.schema([(row[1], _arrow_type(row[2])) for row in info])
+
+
+def _export_table_parquet(conn: sqlite3.Connection, table: str, file_path: str, chunk_size: int) -> int:
+    """Stream one table into a Parquet file chunk by chunk; returns the number of rows written."""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(conn, table)
+    row_count = 0
+    with pq.ParquetWriter(file_path, schema) as writer:
+        for frame in pd.read_sql_query(f'SELECT * FROM "{table}"', conn, chunksize=chunk_size):
+            columns = []
+            for field in schema:
+                series = frame[field.name]
+                if pa.types.is_string(field.type):
+                    # SQLite is dynamically typed; render stray non-text values as text
+                    series = series.map(lambda value: value if isinstance(value, str) or pd.isna(value) else str(value))
+                columns.append(pa.array(series, type=field.type, from_pandas=True))
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            row_count += len(frame)
+    return row_count
+
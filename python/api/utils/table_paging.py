@@ -0,0 +1,219 @@
+"""
+Keyset-paginated, column-projected reads of result database tables.
+
+Pages are addressed by an opaque cursor holding the last row's sort value and
+key (rowid, or the primary key for WITHOUT ROWID tables). Each page is a
+range scan on an index, so fetching a page deep into a table costs the same
+as fetching the first one, unlike LIMIT/OFFSET.
+"""
+
+import base64
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+FILTER_OPERATORS = {
+    'eq': '=',
+    'ne': '!=',
+    'lt': '<',
+    'le': '<=',
+    'gt': '>',
+    'ge': '>=',
+    'like': 'LIKE',
+    'null': 'IS NULL',
+    'notnull': 'IS NOT NULL',
+}
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the position after a row as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def parse_filter(expression: str) -> Tuple[str, str, Optional[str]]:
+    """
+    Parse a ``column:op[:value]`` filter expression.
+
+    Returns:
+        Tuple of (column, operator key, value)
+
+    Raises:
+        ValueError: If the expression or operator is invalid
+    """
+    parts = expression.split(':', 2)
+    if len(parts) < 2:
+        raise ValueError(f"Invalid filter '{expression}', expected column:op[:value]")
+    column, op = parts[0], parts[1].lower()
+    if op not in FILTER_OPERATORS:
+        raise ValueError(f"Unknown filter operator '{op}', expected one of: {', '.join(FILTER_OPERATORS)}")
+    value = parts[2] if len(parts) == 3 else None
+    if value is None and op not in ('null', 'notnull'):
+        raise ValueError(f"Filter '{expression}' requires a value")
+    return column, op, value
+
+
+class TablePager:
+    """Builds and runs keyset-paginated queries against one table."""
+
+    def __init__(self, conn: sqlite3.Connection, table: str):
+        """
+        Args:
+            conn: Open SQLite connection
+            table: Existing table name
+        """
+        self.conn = conn
+        self.table = table
+        info = conn.execute(f'PRAGMA table_info({_quote(table)})').fetchall()
+        self.columns = [row[1] for row in info]
+        self.column_types = {row[1]: (row[2] or '').upper() for row in info}
+        self.pk_columns = [row[1] for row in sorted(info, key=lambda r: r[5]) if row[5]]
+        self.key_columns = self.pk_columns if self._without_rowid() else ['rowid']
+        self.indexed_columns = self._leading_index_columns()
+
+    def _without_rowid(self) -> bool:
+        try:
+            self.conn.execute(f'SELECT rowid FROM {_quote(self.table)} LIMIT 0')
+            return False
+        except sqlite3.OperationalError:
+            return True
+
+    def _leading_index_columns(self) -> set:
+        """Columns that lead some index (usable for an ordered range scan)."""
+        indexed = set(self.key_columns)
+        if len(self.pk_columns) == 1 and self.column_types.get(self.pk_columns[0]) == 'INTEGER':
+            indexed.add(self.pk_columns[0])  # INTEGER PRIMARY KEY aliases rowid
+        for index in self.conn.execute(f'PRAGMA index_list({_quote(self.table)})').fetchall():
+            first = self.conn.execute(f'PRAGMA index_info({_quote(index[1])})').fetchone()
+            if first and first[2]:
+                indexed.add(first[2])
+        return indexed
+
+    def _coerce(self, column: str, value: str) -> Any:
+        """Convert a query-string filter value to the column's affinity."""
+        declared = self.column_types.get(column, '')
+        try:
+            if 'INT' in declared:
+                return int(value)
+            if any(token in declared for token in ('REAL', 'FLOA', 'DOUB', 'NUMERIC', 'DECIMAL')):
+                return float(value)
+        except ValueError:
+            pass
+        return value
+
+    def fetch_page(self, limit: int, columns: Optional[List[str]] = None, cursor: Optional[str] = None,
+                   sort: Optional[str] = None, descending: bool = False,
+                   filters: Optional[List[Tuple[str, str, Optional[str]]]] = None) -> Dict[str, Any]:
+        """
+        Fetch one page of rows.
+
+        Args:
+            limit: Maximum rows in the page
+            columns: Projected columns (defaults to all)
+            cursor: Cursor from a previous page's next_cursor
+            sort: Indexed column to order by (defaults to the table key)
+            descending: Sort in descending order
+            filters: Parsed (column, op, value) filters, combined with AND
+
+        Returns:
+            Dictionary with columns, data (list of row arrays), next_cursor and has_more
+
+        Raises:
+            ValueError: On unknown columns, unindexed sort columns or invalid cursors
+        """
+        columns = columns or list(self.columns)
+        unknown = [c for c in columns if c not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        if sort is not None:
+            if sort not in self.columns:
+                raise ValueError(f"Unknown sort column: {sort}")
+            if sort not in self.indexed_columns:
+                raise ValueError(f"Sorting is only supported on indexed columns: {', '.join(sorted(self.indexed_columns))}")
+            if (sort in self.key_columns and len(self.key_columns) == 1) or \
+                    (self.key_columns == ['rowid'] and self.pk_columns == [sort] and self.column_types[sort] == 'INTEGER'):
+                # Sorting by the key itself is the default order
+                sort = None
+
+        where, params = [], []
+        for column, op, value in filters or []:
+            if column not in self.columns:
+                raise ValueError(f"Unknown filter column: {column}")
+            if op in ('null', 'notnull'):
+                where.append(f"{_quote(column)} {FILTER_OPERATORS[op]}")
+            else:
+                where.append(f"{_quote(column)} {FILTER_OPERATORS[op]} ?")
+                params.append(self._coerce(column, value))
+
+        key_expr = ', '.join(_quote(c) if c != 'rowid' else 'rowid' for c in self.key_columns)
+        key_tuple = f"({key_expr})"
+        direction = 'DESC' if descending else 'ASC'
+        compare = '<' if descending else '>'
+
+        if cursor:
+            position = decode_cursor(cursor)
+            expected = len(self.key_columns) + (1 if sort else 0)
+            if len(position) != expected:
+                raise ValueError("Cursor does not match the requested sort")
+            key_values = position[-len(self.key_columns):]
+            key_placeholders = f"({', '.join('?' for _ in key_values)})"
+            if sort is None:
+                where.append(f"{key_tuple} {compare} {key_placeholders}")
+                params.extend(key_values)
+            else:
+                sort_col, sort_value = _quote(sort), position[0]
+                # SQLite orders NULLs first ascending and last descending
+                if sort_value is None:
+                    clause = f"({sort_col} IS NULL AND {key_tuple} {compare} {key_placeholders})"
+                    if not descending:
+                        clause = f"({clause} OR {sort_col} IS NOT NULL)"
+                    where.append(clause)
+                    params.extend(key_values)
+                else:
+                    clause = (f"({sort_col} {compare} ? OR ({sort_col} = ? AND "
+                              f"{key_tuple} {compare} {key_placeholders})")
+                    clause += f" OR {sort_col} IS NULL)" if descending else ")"
+                    where.append(clause)
+                    params.extend([sort_value, sort_value, *key_values])
+
+        order_by = f"{_quote(sort)} {direction}, " if sort else ''
+        order_by += ', '.join(f"{c if c == 'rowid' else _quote(c)} {direction}" for c in self.key_columns)
+        # Hidden trailing columns carry the cursor position of each row
+        hidden = ([_quote(sort)] if sort else []) + [c if c == 'rowid' else _quote(c) for c in self.key_columns]
+        select_list = ', '.join([_quote(c) for c in columns] + hidden)
+        sql = f"SELECT {select_list} FROM {_quote(self.table)}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order_by} LIMIT ?"
+        params.append(limit + 1)
+
+        rows = self.conn.execute(sql, params).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        width = len(columns)
+        next_cursor = encode_cursor(tuple(rows[-1])[width:]) if has_more and rows else None
+        return {
+            'columns': columns,
+            'data': [list(row)[:width] for row in rows],
+            'next_cursor': next_cursor,
+            'has_more': has_more,
+        }
@@ -7,13 +7,25 @@ import os
 import sqlite3
 import json
 import logging
+import threading
 import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
 import yaml
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Configuration records kept in memory, validated against updated_at
+CONFIG_CACHE_SIZE = 256
+# Prepared statements kept per connection
+STATEMENT_CACHE_SIZE = 128
+# Idle connections kept open for reuse by later requests
+CONNECTION_POOL_SIZE = 4
+
+CONFIG_COLUMNS = "id, name, type, content, description, project_id, created_at, updated_at"
+
 class ConfigManager:
     """
     Configuration storage manager using SQLite.
@@ -47,12 +59,126 @@ class ConfigManager:
                 logger.info(f"Using default config database path: {db_path}")
         
         self.db_path = db_path
+        self._pool = []
+        self._pool_lock = threading.Lock()
+        self._pool_pid = os.getpid()
+        self._config_cache = OrderedDict()
+        self._config_cache_lock = threading.Lock()
         logger.info(f"Initializing config database at: {self.db_path}")
         self._init_db()
     
+    # Connection handling
+    def _open_connection(self):
+        """Open a connection that may be used by any thread (one at a time)."""
+        conn = sqlite3.connect(self.db_path, timeout=30, cached_statements=STATEMENT_CACHE_SIZE,
+                               check_same_thread=False)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+    
+    def _acquire(self):
+        """
+        Take a connection from the pool, opening one when none is idle.
+        
+        The Flask server runs each request on a new thread, so connections are
+        pooled rather than kept per thread; returned connections keep SQLite's
+        prepared statement cache warm for the next request.
+        """
+        with self._pool_lock:
+            if self._pool_pid != os.getpid():
+                # Connections inherited from the parent process must not be used
+                self._pool = []
+                self._pool_pid = os.getpid()
+            if self._pool:
+                return self._pool.pop()
+        return self._open_connection()
+    
+    def _release(self, conn):
+        """Return a connection to the pool, closing it when the pool is full."""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._pool_lock:
+            if self._pool_pid == os.getpid() and len(self._pool) < CONNECTION_POOL_SIZE:
+                self._pool.append(conn)
+                return
+        conn.close()
+    
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection for the duration of the block."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+    
+    @contextmanager
+    def _transaction(self):
+        """Yield a cursor inside a transaction that commits on success and rolls back on error."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+    
+    def _query(self, sql, params=()):
+        """Run a read query on a pooled connection and return all rows."""
+        conn = self._acquire()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            self._release(conn)
+    
+    def close(self):
+        """Close all pooled connections."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, []
+        for conn in pool:
+            conn.close()
+    
+    # Config record cache
+    @staticmethod
+    def _row_to_config(row):
+        return {
+            'id': row[0],
+            'name': row[1],
+            'type': row[2],
+            'content': row[3],
+            'description': row[4],
+            'project_id': row[5],
+            'created_at': row[6],
+            'updated_at': row[7]
+        }
+    
+    def _cache_config(self, config):
+        with self._config_cache_lock:
+            self._config_cache[config['id']] = config
+            self._config_cache.move_to_end(config['id'])
+            while len(self._config_cache) > CONFIG_CACHE_SIZE:
+                self._config_cache.popitem(last=False)
+    
+    def _invalidate_configs(self, config_ids=None):
+        """Drop cached configs (all of them when no IDs are given)."""
+        with self._config_cache_lock:
+            if config_ids is None:
+                self._config_cache.clear()
+            else:
+                for config_id in config_ids:
+                    self._config_cache.pop(config_id, None)
+    
     def _init_db(self):
         """Initialize the database schema if it doesn't exist."""
-        conn = sqlite3.connect(self.db_path)
+        with self._connection() as conn:
+            # WAL lets API readers proceed while a write is in progress
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._create_schema(conn)
+    
+    def _create_schema(self, conn):
+        """Create or migrate the schema on a connection."""
         cursor = conn.cursor()
         
         # Check if the old configurations table exists and drop it
@@ -93,9 +219,10 @@ class ConfigManager:
             FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
         )
         ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS ix_configs_project_type ON configs (project_id, type)')
         
         conn.commit()
-        conn.close()
+        cursor.close()
     
     # Project management methods
     def create_project(self, name, description=""):
@@ -112,24 +239,19 @@ class ConfigManager:
         project_id = str(uuid.uuid4())
         now = datetime.now().isoformat()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get the next display_order (max + 1)
-        cursor.execute('SELECT MAX(display_order) FROM projects')
-        max_order = cursor.fetchone()[0]
-        next_order = (max_order or -1) + 1
-        
-        cursor.execute(
-            '''
-            INSERT INTO projects (id, name, description, created_at, updated_at, display_order)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ''',
-            (project_id, name, description, now, now, next_order)
-        )
-        
-        conn.commit()
-        conn.close()
+        with self._transaction() as cursor:
+            # Get the next display_order (max + 1)
+            cursor.execute('SELECT MAX(display_order) FROM projects')
+            max_order = cursor.fetchone()[0]
+            next_order = (max_order or -1) + 1
+            
+            cursor.execute(
+                '''
+                INSERT INTO projects (id, name, description, created_at, updated_at, display_order)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''',
+                (project_id, name, description, now, now, next_order)
+            )
         
         logger.info(f"Created project: {name} (ID: {project_id})")
         return project_id
@@ -144,10 +266,7 @@ class ConfigManager:
         Returns:
             dict: Project data or None if not found
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
+        rows = self._query(
             '''
             SELECT id, name, description, created_at, updated_at
             FROM projects
@@ -156,10 +275,8 @@ class ConfigManager:
             (project_id,)
         )
         
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
+        if rows:
+            row = rows[0]
             return {
                 'id': row[0],
                 'name': row[1],
@@ -176,10 +293,7 @@ class ConfigManager:
         Returns:
             list: List of project dictionaries
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
+        rows = self._query(
             '''
             SELECT id, name, description, created_at, updated_at, display_order
             FROM projects
@@ -187,9 +301,6 @@ class ConfigManager:
             '''
         )
         
-        rows = cursor.fetchall()
-        conn.close()
-        
         projects = []
         for row in rows:
             projects.append({
@@ -225,20 +336,15 @@ class ConfigManager:
         updated_name = name if name is not None else project['name']
         updated_description = description if description is not None else project['description']
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            '''
-            UPDATE projects
-            SET name = ?, description = ?, updated_at = ?
-            WHERE id = ?
-            ''',
-            (updated_name, updated_description, now, project_id)
-        )
-        
-        conn.commit()
-        conn.close()
+        with self._transaction() as cursor:
+            cursor.execute(
+                '''
+                UPDATE projects
+                SET name = ?, description = ?, updated_at = ?
+                WHERE id = ?
+                ''',
+                (updated_name, updated_description, now, project_id)
+            )
         
         logger.info(f"Updated project: {updated_name} (ID: {project_id})")
         return True
@@ -257,39 +363,34 @@ class ConfigManager:
         if not project:
             return False
         
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # This allows column access by name
-        cursor = conn.cursor()
-        
-        # Log the configurations that will be deleted
-        cursor.execute("SELECT * FROM configs WHERE project_id = ?", (project_id,))
-        configs_to_delete = cursor.fetchall()
-        logger.info(f"Deleting {len(configs_to_delete)} configurations associated with project {project_id}")
-        for config in configs_to_delete:
-            logger.info(f"  - Deleting config: {config['name']} (ID: {config['id']}, Type: {config['type']})")
-        
-        # Delete associated configurations first
-        cursor.execute(
-            '''
-            DELETE FROM configs
-            WHERE project_id = ?
-            ''',
-            (project_id,)
-        )
-        deleted_configs = cursor.rowcount
-        logger.info(f"Deleted {deleted_configs} configurations for project {project_id}")
-        
-        # Delete project
-        cursor.execute(
-            '''
-            DELETE FROM projects
-            WHERE id = ?
-            ''',
-            (project_id,)
-        )
-        
-        conn.commit()
-        conn.close()
+        with self._transaction() as cursor:
+            # Log the configurations that will be deleted
+            cursor.execute("SELECT id, name, type FROM configs WHERE project_id = ?", (project_id,))
+            configs_to_delete = cursor.fetchall()
+            logger.info(f"Deleting {len(configs_to_delete)} configurations associated with project {project_id}")
+            for config_id, config_name, config_type in configs_to_delete:
+                logger.info(f"  - Deleting config: {config_name} (ID: {config_id}, Type: {config_type})")
+            
+            # Delete associated configurations first
+            cursor.execute(
+                '''
+                DELETE FROM configs
+                WHERE project_id = ?
+                ''',
+                (project_id,)
+            )
+            deleted_configs = cursor.rowcount
+            logger.info(f"Deleted {deleted_configs} configurations for project {project_id}")
+            
+            # Delete project
+            cursor.execute(
+                '''
+                DELETE FROM projects
+                WHERE id = ?
+                ''',
+                (project_id,)
+            )
+        self._invalidate_configs([row[0] for row in configs_to_delete])
         
         logger.info(f"Deleted project: {project['name']} (ID: {project_id})")
         return True
@@ -317,53 +418,33 @@ class ConfigManager:
             raise ValueError(f"Project not found: {project_id}")
         
         # Find all configs of this type for the project
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
+        existing_configs = self._query(
             '''
             SELECT id FROM configs
             WHERE project_id = ? AND type = ?
+            ORDER BY updated_at DESC
             ''',
             (project_id, config_type)
         )
         
-        existing_configs = cursor.fetchall()
-        
         if existing_configs:
+            # Use the most recently updated config
+            config_id = existing_configs[0][0]
+            
             # If there are multiple configs, keep only the most recently updated one
             if len(existing_configs) > 1:
                 logger.warning(f"Found {len(existing_configs)} {config_type} configs for project {project_id}. Cleaning up duplicates.")
                 
-                # Get the most recently updated config
-                cursor.execute(
-                    '''
-                    SELECT id FROM configs
-                    WHERE project_id = ? AND type = ?
-                    ORDER BY updated_at DESC
-                    LIMIT 1
-                    ''',
-                    (project_id, config_type)
-                )
-                
-                latest_config_id = cursor.fetchone()[0]
-                
                 # Delete all but the most recent config
-                cursor.execute(
-                    '''
-                    DELETE FROM configs
-                    WHERE project_id = ? AND type = ? AND id != ?
-                    ''',
-                    (project_id, config_type, latest_config_id)
-                )
-                
-                conn.commit()
-                
-                # Use the remaining config as our existing config
-                config_id = latest_config_id
-            else:
-                # Just one config exists, use it
-                config_id = existing_configs[0][0]
+                with self._transaction() as cursor:
+                    cursor.execute(
+                        '''
+                        DELETE FROM configs
+                        WHERE project_id = ? AND type = ? AND id != ?
+                        ''',
+                        (project_id, config_type, config_id)
+                    )
+                self._invalidate_configs([row[0] for row in existing_configs[1:]])
                 
             # Update the existing config
             self.update_config(
@@ -374,11 +455,9 @@ class ConfigManager:
                 description
             )
             
-            conn.close()
             return config_id
         else:
             # No config exists, create a new one
-            conn.close()
             return self.save_config(name, config_type, content, description, project_id)
     
     def get_project_config(self, project_id, config_type):
@@ -392,32 +471,17 @@ class ConfigManager:
         Returns:
             dict: Configuration data or None if not found
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
+        rows = self._query(
             '''
-            SELECT id, name, type, content, description, project_id, created_at, updated_at
+            SELECT id, updated_at
             FROM configs
             WHERE project_id = ? AND type = ?
             ''',
             (project_id, config_type)
         )
         
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            return {
-                'id': row[0],
-                'name': row[1],
-                'type': row[2],
-                'content': row[3],
-                'description': row[4],
-                'project_id': row[5],
-                'created_at': row[6],
-                'updated_at': row[7]
-            }
+        if rows:
+            return self._get_config_version(rows[0][0], rows[0][1])
         return None
     
     def get_project_configs(self, project_id):
@@ -430,12 +494,9 @@ class ConfigManager:
         Returns:
             list: List of configuration dictionaries
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            '''
-            SELECT id, name, type, content, description, project_id, created_at, updated_at
+        rows = self._query(
+            f'''
+            SELECT {CONFIG_COLUMNS}
             FROM configs
             WHERE project_id = ?
             ORDER BY updated_at DESC
@@ -443,23 +504,7 @@ class ConfigManager:
             (project_id,)
         )
         
-        rows = cursor.fetchall()
-        conn.close()
-        
-        configs = []
-        for row in rows:
-            configs.append({
-                'id': row[0],
-                'name': row[1],
-                'type': row[2],
-                'content': row[3],
-                'description': row[4],
-                'project_id': row[5],
-                'created_at': row[6],
-                'updated_at': row[7]
-            })
-        
-        return configs
+        return [self._row_to_config(row) for row in rows]
     
     # Standard configuration methods
     def save_config(self, name, config_type, content, description="", project_id=None):
@@ -479,19 +524,14 @@ class ConfigManager:
         config_id = str(uuid.uuid4())
         now = datetime.now().isoformat()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            '''
-            INSERT INTO configs (id, name, type, content, description, project_id, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''',
-            (config_id, name, config_type, content, description, project_id, now, now)
-        )
-        
-        conn.commit()
-        conn.close()
+        with self._transaction() as cursor:
+            cursor.execute(
+                f'''
+                INSERT INTO configs ({CONFIG_COLUMNS})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''',
+                (config_id, name, config_type, content, description, project_id, now, now)
+            )
         
         logger.info(f"Saved config: {name} (ID: {config_id}, Type: {config_type})")
         return config_id
@@ -506,33 +546,36 @@ class ConfigManager:
         Returns:
             dict: Configuration data or None if not found
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            '''
-            SELECT id, name, type, content, description, project_id, created_at, updated_at
-            FROM configs
-            WHERE id = ?
-            ''',
-            (config_id,)
-        )
-        
-        row = cursor.fetchone()
-        conn.close()
+        # Only the version stamp is read when the cached copy is current
+        rows = self._query('SELECT updated_at FROM configs WHERE id = ?', (config_id,))
+        if not rows:
+            self._invalidate_configs([config_id])
+            return None
+        return self._get_config_version(config_id, rows[0][0])
+    
+    def _get_config_version(self, config_id, updated_at):
+        """
+        Return a config, served from the cache when its updated_at matches.
         
-        if row:
-            return {
-                'id': row[0],
-                'name': row[1],
-                'type': row[2],
-                'content': row[3],
-                'description': row[4],
-                'project_id': row[5],
-                'created_at': row[6],
-                'updated_at': row[7]
-            }
-        return None
+        Args:
+            config_id (str): Configuration ID
+            updated_at (str): Current updated_at of the stored configuration
+            
+        Returns:
+            dict: Configuration data or None if it disappeared meanwhile
+        """
+        with self._config_cache_lock:
+            cached = self._config_cache.get(config_id)
+            if cached is not None and cached['updated_at'] == updated_at:
+                self._config_cache.move_to_end(config_id)
+                return dict(cached)
+        
+        rows = self._query(f'SELECT {CONFIG_COLUMNS} FROM configs WHERE id = ?', (config_id,))
+        if not rows:
+            return None
+        config = self._row_to_config(rows[0])
+        self._cache_config(config)
+        return dict(config)
     
     def get_all_configs(self, config_type=None):
         """
@@ -544,13 +587,10 @@ class ConfigManager:
         Returns:
             list: List of configuration dictionaries
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         if config_type:
-            cursor.execute(
-                '''
-                SELECT id, name, type, content, description, project_id, created_at, updated_at
+            rows = self._query(
+                f'''
+                SELECT {CONFIG_COLUMNS}
                 FROM configs
                 WHERE type = ?
                 ORDER BY updated_at DESC
@@ -558,31 +598,15 @@ class ConfigManager:
                 (config_type,)
             )
         else:
-            cursor.execute(
-                '''
-                SELECT id, name, type, content, description, project_id, created_at, updated_at
+            rows = self._query(
+                f'''
+                SELECT {CONFIG_COLUMNS}
                 FROM configs
                 ORDER BY updated_at DESC
                 '''
             )
         
-        rows = cursor.fetchall()
-        conn.close()
-        
-        configs = []
-        for row in rows:
-            configs.append({
-                'id': row[0],
-                'name': row[1],
-                'type': row[2],
-                'content': row[3],
-                'description': row[4],
-                'project_id': row[5],
-                'created_at': row[6],
-                'updated_at': row[7]
-            })
-        
-        return configs
+        return [self._row_to_config(row) for row in rows]
     
     def update_config(self, config_id, name=None, config_type=None, content=None, description=None):
         """
@@ -610,20 +634,16 @@ class ConfigManager:
         updated_content = content if content is not None else config['content']
         updated_description = description if description is not None else config['description']
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            '''
-            UPDATE configs
-            SET name = ?, type = ?, content = ?, description = ?, updated_at = ?
-            WHERE id = ?
-            ''',
-            (updated_name, updated_type, updated_content, updated_description, now, config_id)
-        )
-        
-        conn.commit()
-        conn.close()
+        with self._transaction() as cursor:
+            cursor.execute(
+                '''
+                UPDATE configs
+                SET name = ?, type = ?, content = ?, description = ?, updated_at = ?
+                WHERE id = ?
+                ''',
+                (updated_name, updated_type, updated_content, updated_description, now, config_id)
+            )
+        self._invalidate_configs([config_id])
         
         logger.info(f"Updated config: {updated_name} (ID: {config_id}, Type: {updated_type})")
         return True
@@ -642,19 +662,15 @@ class ConfigManager:
         if not config:
             return False
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            '''
-            DELETE FROM configs
-            WHERE id = ?
-            ''',
-            (config_id,)
-        )
-        
-        conn.commit()
-        conn.close()
+        with self._transaction() as cursor:
+            cursor.execute(
+                '''
+                DELETE FROM configs
+                WHERE id = ?
+                ''',
+                (config_id,)
+            )
+        self._invalidate_configs([config_id])
         
         logger.info(f"Deleted config: {config['name']} (ID: {config_id}, Type: {config['type']})")
         return True
@@ -738,20 +754,16 @@ class ConfigManager:
         Returns:
             int: Number of configurations deleted
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if include_project_configs:
-            # Delete all configurations
-            cursor.execute('DELETE FROM configs')
-            deleted_count = cursor.rowcount
-        else:
-            # Delete only standalone configurations (not associated with a project)
-            cursor.execute('DELETE FROM configs WHERE project_id IS NULL')
-            deleted_count = cursor.rowcount
-        
-        conn.commit()
-        conn.close()
+        with self._transaction() as cursor:
+            if include_project_configs:
+                # Delete all configurations
+                cursor.execute('DELETE FROM configs')
+                deleted_count = cursor.rowcount
+            else:
+                # Delete only standalone configurations (not associated with a project)
+                cursor.execute('DELETE FROM configs WHERE project_id IS NULL')
+                deleted_count = cursor.rowcount
+        self._invalidate_configs()
         
         logger.info(f"Cleared {deleted_count} configurations")
         return deleted_count
@@ -770,23 +782,18 @@ class ConfigManager:
             return False
             
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Update display_order for each project
-            for index, project_id in enumerate(project_ids):
-                cursor.execute(
+            now = datetime.now().isoformat()
+            with self._transaction() as cursor:
+                # Update display_order for each project
+                cursor.executemany(
                     '''
                     UPDATE projects 
                     SET display_order = ?, updated_at = ?
                     WHERE id = ?
                     ''',
-                    (index, datetime.now().isoformat(), project_id)
+                    [(index, now, project_id) for index, project_id in enumerate(project_ids)]
                 )
             
-            conn.commit()
-            conn.close()
-            
             logger.info(f"Updated display order for {len(project_ids)} projects")
             return True
             
@@ -7,18 +7,11 @@ import logging
 import sys
 import os
 
-# Import components from refactored structure
-from src.generator import generate_database, generate_database_with_formula_support
-from src.simulation.core.runner import run_simulation, run_simulation_from_config_dir
-from config_storage.config_db import ConfigManager
-
-# Import the Flask app factory from refactored API server
-# Import the Flask app factory from refactored API server
-from api.server import create_app
-
-# Apply py_mini_racer patch for Windows support
-import patch_mini_racer
-patch_mini_racer.apply_patch()
+# Import components from refactored structure. Heavy subsystems (Flask app,
+# SimPy/NumPy simulation engine, SQLAlchemy generator, V8) are imported by
+# the command that needs them, keeping startup fast.
+from src.generator import generate_database, generate_database_with_formula_support, get_cache_dir
+from src.generator.cache import GeneratedDatabaseCache, format_cache_entries
 
 # Configure logging (console)
 logging.basicConfig(
@@ -40,18 +33,25 @@ if _log_file:
         logging.getLogger(__name__).warning('Failed to enable file logging: %s', _e)
 logger = logging.getLogger(__name__)
 
-# Initialize the Flask app using the modular structure
-app = create_app()
-
-# Initialize configuration manager (for CLI usage)
-config_manager = ConfigManager()
-
 # All API routes are now handled by the modular routes structure in api/routes/
 # This file now only handles CLI functionality
 
-def run_api(host='127.0.0.1', port=5000):
-    """Run the Flask API server"""
-    app.run(host=host, port=port, debug=False)
+def run_api(host='127.0.0.1', port=5000, production=False, **server_options):
+    """
+    Run the API server.
+
+    Args:
+        host: Host to bind
+        port: Port to bind
+        production: Serve with a multi-worker WSGI server instead of Flask's development server
+        **server_options: Options for api.serving.run_production_server
+    """
+    if production:
+        from api.serving import run_production_server
+        run_production_server(host=host, port=port, **server_options)
+    else:
+        from api.server import create_app
+        create_app().run(host=host, port=port, debug=False)
 
 def main():
     """Main CLI entry point"""
@@ -62,6 +62,16 @@ def main():
     api_parser = subparsers.add_parser('api', help='Start the API server')
     api_parser.add_argument('--host', default='127.0.0.1', help='Host to bind the API server')
     api_parser.add_argument('--port', type=int, default=5000, help='Port to bind the API server')
+    api_parser.add_argument('--production', action='store_true',
+                            help='Serve with a multi-worker WSGI server (gunicorn or waitress) instead of the development server')
+    api_parser.add_argument('--wsgi-server', choices=['auto', 'gunicorn', 'waitress'], default='auto',
+                            help='WSGI server for --production (default: gunicorn if installed, else waitress)')
+    api_parser.add_argument('--workers', type=int, help='Worker processes for --production (default: 4)')
+    api_parser.add_argument('--threads', type=int, help='Threads per worker for --production (default: 4)')
+    api_parser.add_argument('--max-simulations', type=int,
+                            help='Simulations running at once across all workers (default: 2)')
+    api_parser.add_argument('--max-queued-simulations', type=int,
+                            help='Simulations waiting for a slot across all workers (default: 8)')
     
     # Added for PyInstaller compatibility - will be passed by Electron
     api_parser.add_argument('--output-dir', help='Output directory for files')
@@ -74,12 +84,20 @@ def main():
     gen_parser.add_argument('--output-dir', '-o', default='output', help='Output directory')
     gen_parser.add_argument('--name', '-n', help='Database name (without extension)')
     gen_parser.add_argument('--sim-config', help='Path to simulation configuration file for attribute column detection')
+    gen_parser.add_argument('--chunk-size', type=int, help='Rows generated and inserted per batch (default: 10000)')
+    gen_parser.add_argument('--memory-limit-mb', type=float, help='Memory ceiling for one batch of pending rows (default: 256)')
+    gen_parser.add_argument('--no-bulk-load', dest='bulk_load', action='store_false',
+                            help='Create indexes before loading and skip load-phase pragmas and the foreign key check')
+    gen_parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                            help='Always regenerate instead of reusing a cached database for seeded configs')
     
     # Run simulation command (preserved for CLI compatibility)
     sim_parser = subparsers.add_parser('simulate', help='Run a simulation')
     sim_parser.add_argument('config', help='Path to simulation configuration file')
     sim_parser.add_argument('db_config', help='Path to database configuration file')
     sim_parser.add_argument('database', help='Path to SQLite database file')
+    sim_parser.add_argument('--profile', action='store_true',
+                            help='Write a timing profile (JSON and collapsed stacks) next to the database')
     
     # Generate resources and run simulation command
     dynamic_parser = subparsers.add_parser('dynamic-simulate', 
@@ -96,6 +114,20 @@ def main():
     gen_sim_parser.add_argument('sim_config', help='Path to simulation configuration file')
     gen_sim_parser.add_argument('--output-dir', '-o', default='output', help='Output directory')
     gen_sim_parser.add_argument('--name', '-n', help='Database name (without extension)')
+    gen_sim_parser.add_argument('--chunk-size', type=int, help='Rows generated and inserted per batch (default: 10000)')
+    gen_sim_parser.add_argument('--memory-limit-mb', type=float, help='Memory ceiling for one batch of pending rows (default: 256)')
+    gen_sim_parser.add_argument('--no-bulk-load', dest='bulk_load', action='store_false',
+                                help='Create indexes before loading and skip load-phase pragmas and the foreign key check')
+    gen_sim_parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                                help='Always regenerate instead of reusing a cached database for seeded configs')
+    gen_sim_parser.add_argument('--profile', action='store_true',
+                                help='Write a timing profile (JSON and collapsed stacks) next to the database')
+    
+    # Generated database cache maintenance
+    cache_parser = subparsers.add_parser('cache', help='Inspect or prune the generated database cache')
+    cache_parser.add_argument('action', choices=['list', 'prune', 'clear'], help='Cache operation to perform')
+    cache_parser.add_argument('--output-dir', '-o', default='output', help='Output directory holding the cache')
+    cache_parser.add_argument('--max-size-mb', type=float, help='Size budget to prune down to (default: configured budget)')
     
     # Parse arguments
     args = parser.parse_args()
@@ -117,24 +149,37 @@ def main():
         logger.info(f"Running with config_db: {os.environ.get('DB_SIMULATOR_CONFIG_DB', 'not set')}")
         logger.info(f"Running in packaged mode: {os.environ.get('DB_SIMULATOR_PACKAGED', 'not set')}")
         
-        run_api(host=args.host, port=args.port)
+        if args.production:
+            try:
+                run_api(host=args.host, port=args.port, production=True, server=args.wsgi_server,
+                        workers=args.workers, threads=args.threads, max_simulations=args.max_simulations,
+                        max_queued=args.max_queued_simulations)
+            except ValueError as e:
+                logger.error(str(e))
+                sys.exit(1)
+        else:
+            run_api(host=args.host, port=args.port)
     elif args.command == 'generate':
         try:
-            db_path = generate_database(args.config, args.output_dir, args.name, sim_config_path_or_content=args.sim_config)
+            db_path = generate_database(args.config, args.output_dir, args.name, sim_config_path_or_content=args.sim_config,
+                                        chunk_size=args.chunk_size, memory_limit_mb=args.memory_limit_mb,
+                                        bulk_load=args.bulk_load, use_cache=args.use_cache)
             logger.info(f"Database generated at: {db_path}")
         except Exception as e:
             logger.error(f"Error generating database: {e}")
             sys.exit(1)
     elif args.command == 'simulate':
+        from src.simulation.core.runner import run_simulation
         try:
             # Pass sim config path, db config path, and db path
-            results = run_simulation(args.config, args.db_config, args.database)
+            results = run_simulation(args.config, args.db_config, args.database, profile=args.profile)
             logger.info(f"Simulation results: {results}")
         except Exception as e:
             logger.error(f"Error running simulation: {e}")
             sys.exit(1)
     elif args.command == 'dynamic-simulate':
         logger.warning("The 'dynamic-simulate' command is deprecated and may be removed in future versions. Please use 'generate-simulate' instead.")
+        from src.simulation.core.runner import run_simulation
         try:
             # Use generate_database instead of generate_database_for_simulation for better reliability
             db_path = generate_database(args.db_config, args.output_dir, args.name, sim_config_path=args.sim_config)
@@ -147,6 +192,7 @@ def main():
             logger.error(f"Error in dynamic simulation: {e}")
             sys.exit(1)
     elif args.command == 'generate-simulate':
+        from src.simulation.core.runner import run_simulation
         try:
             # This command fixes the relationship column issue by:
             # 1. Creating a full database with all tables (not just resources)
@@ -157,12 +203,16 @@ def main():
                 args.db_config, 
                 args.output_dir, 
                 args.name, 
-                sim_config_path_or_content=args.sim_config
+                sim_config_path_or_content=args.sim_config,
+                chunk_size=args.chunk_size,
+                memory_limit_mb=args.memory_limit_mb,
+                bulk_load=args.bulk_load,
+                use_cache=args.use_cache
             )
             logger.info(f"Complete database generated at: {db_path}")
             
             # Run simulation on the complete database
-            results = run_simulation(args.sim_config, args.db_config, db_path)
+            results = run_simulation(args.sim_config, args.db_config, db_path, profile=args.profile)
             logger.info(f"Simulation results: {results}")
             
             # Resolve formulas after simulation if any are pending
@@ -178,9 +228,24 @@ def main():
         except Exception as e:
             logger.error(f"Error in generate-simulate: {e}")
             sys.exit(1)
+    elif args.command == 'cache':
+        cache = GeneratedDatabaseCache(get_cache_dir(args.output_dir))
+        if args.action == 'list':
+            entries = cache.entries()
+            for line in format_cache_entries(entries):
+                print(line)
+            total_mb = sum(entry['size_bytes'] for entry in entries) / (1024 * 1024)
+            print(f"{len(entries)} cached databases, {total_mb:.2f} MB of {cache.max_bytes / (1024 * 1024):.0f} MB at {cache.cache_dir}")
+        else:
+            max_size_mb = 0 if args.action == 'clear' else args.max_size_mb
+            removed = cache.prune(max_size_mb)
+            logger.info(f"Removed {removed} cached databases from {cache.cache_dir}")
     else:
         parser.print_help()
         sys.exit(1)
 
 if __name__ == '__main__':
+    # Required for the spawned simulation job workers in frozen builds
+    import multiprocessing
+    multiprocessing.freeze_support()
     main() 
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Simulation bookkeeping memory benchmark.
+
+Measures with ``tracemalloc`` how many bytes the simulation keeps per
+in-flight entity (a waiting QueueEntry with its wakeup event), per loaded
+Resource (including its utilization counters) and per allocation history
+record. Exits non-zero when the bytes per in-flight entity exceed the target,
+so it can guard against per-entity state growing again.
+
+Usage:
+    python memory_benchmark.py [--entities 20000] [--resources 5000] [--columns 20] [--target 1024] [--json]
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+
+import simpy
+
+from src.config_parser.sim_parser import QueueDefinition
+from src.simulation.managers.queue_manager import QueueManager
+from src.simulation.managers.resource_manager import AllocationRecord, Resource, ResourceManager
+
+# Bytes per waiting entity
+DEFAULT_TARGET_BYTES = 1024
+
+
+def _measure(build, count):
+    """Bytes allocated (and still referenced) per item by ``build(count)``."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        keep = build(count)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del keep
+    return (after - before) / count
+
+
+def _entity_row(i, columns):
+    """An entity row like the ones processors pass to enqueue."""
+    row = {f"column_{c}": f"value {i}.{c}" for c in range(columns)}
+    row['id'] = i
+    row['priority'] = i % 5
+    return row
+
+
+def measure_queue_entries(count, columns):
+    """Bytes per entity waiting in a LowAttribute queue."""
+    env = simpy.Environment()
+    manager = QueueManager(env, [QueueDefinition(name='Bench', type='LowAttribute', attribute='priority')])
+    rows = [_entity_row(i, columns) for i in range(count)]
+
+    def build(n):
+        entries = []
+        for i in range(n):
+            entry = manager.enqueue('Bench', i, 'Entity', rows[i], lane=('Resource', 'type'))
+            entry.wakeup = env.event()
+            entries.append(entry)
+        return manager
+
+    return _measure(build, count)
+
+
+def measure_resources(count):
+    """Bytes per Resource including its slot in the utilization arrays."""
+    env = simpy.Environment()
+    manager = ResourceManager(env, None, None)
+
+    def build(n):
+        for i in range(n):
+            manager.resources.append(Resource(id=i, table='Resource', type=f"type_{i % 4}", ordinal=i))
+        manager._grow_utilization_arrays()
+        return manager
+
+    return _measure(build, count)
+
+
+def measure_allocation_records(count):
+    """Bytes per allocation history record (resources are shared, not copied)."""
+    resources = (Resource(id=1, table='Resource', type='type', ordinal=0),)
+
+    def build(n):
+        return [AllocationRecord(i, float(i), resources, 'allocate') for i in range(n)]
+
+    return _measure(build, count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure simulation bookkeeping memory per entity and resource')
+    parser.add_argument('--entities', type=int, default=20000, help='Waiting entities to create')
+    parser.add_argument('--resources', type=int, default=5000, help='Resources to create')
+    parser.add_argument('--columns', type=int, default=20, help='Columns of each entity row')
+    parser.add_argument('--target', type=float, default=DEFAULT_TARGET_BYTES,
+                        help=f'Bytes per in-flight entity target (default: {DEFAULT_TARGET_BYTES})')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    per_entity = measure_queue_entries(max(1, args.entities), args.columns)
+    report = {
+        'bytes_per_inflight_entity': round(per_entity, 1),
+        'bytes_per_resource': round(measure_resources(max(1, args.resources)), 1),
+        'bytes_per_allocation_record': round(measure_allocation_records(max(1, args.entities)), 1),
+        'entities': args.entities,
+        'resources': args.resources,
+        'target_bytes': args.target,
+        'passed': per_entity <= args.target,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Per in-flight entity:  {report['bytes_per_inflight_entity']:.1f} bytes "
+              f"(target {args.target:.0f}, {args.entities} entities, {args.columns}-column rows)")
+        print(f"Per resource:          {report['bytes_per_resource']:.1f} bytes")
+        print(f"Per allocation record: {report['bytes_per_allocation_record']:.1f} bytes")
+        print("PASS" if report['passed'] else "FAIL: per-entity memory is above the target")
+    sys.exit(0 if report['passed'] else 1)
+
+
+if __name__ == '__main__':
+    main()
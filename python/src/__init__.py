@@ -2,9 +2,24 @@
 Database Simulator - A tool for generating synthetic databases and running simulations
 """
 
-from .generator import generate_database
-from .simulation import EventSimulator
-from .simulation.core.runner import run_simulation, run_simulation_from_config_dir
+
+def __getattr__(name):
+    # Subsystems load on first use, so importing a light submodule (config
+    # parsing, path helpers) does not pull in SQLAlchemy, NumPy or SimPy
+    if name == 'generate_database':
+        from .generator import generate_database
+        return generate_database
+    if name == 'EventSimulator':
+        from .simulation import EventSimulator
+        return EventSimulator
+    if name == 'run_simulation':
+        from .simulation.core.runner import run_simulation
+        return run_simulation
+    if name == 'run_simulation_from_config_dir':
+        from .simulation.core.runner import run_simulation_from_config_dir
+        return run_simulation_from_config_dir
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'generate_database',
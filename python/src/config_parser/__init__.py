@@ -24,6 +24,8 @@ from .sim_parser import (
     SimulationConfig,
     EntityArrival,
     EventSimulation,
+    QueueLoggingConfig,
+    SimLoggingConfig,
     ResourceRequirement,
     TableSpecification,
     # New event flows components
@@ -111,6 +113,8 @@ def parse_sim_config_from_string(content: str, db_config: Optional[DatabaseConfi
                 pass  # Ignore cleanup errors
         raise
 
+from .cache import ParsedConfigCache, get_config_cache, load_db_config, load_configs
+
 __all__ = [
     'BaseConfigParser',
     'ConfigValidationError',
@@ -123,6 +127,8 @@ __all__ = [
     'SimulationConfig',
     'EntityArrival',
     'EventSimulation',
+    'QueueLoggingConfig',
+    'SimLoggingConfig',
     'ResourceRequirement',
     'TableSpecification',
     # New event flows components
@@ -138,4 +144,8 @@ __all__ = [
     'parse_sim_config',
     'parse_sim_config_from_string',
     'find_resource_type_column',
+    'ParsedConfigCache',
+    'get_config_cache',
+    'load_db_config',
+    'load_configs',
 ]
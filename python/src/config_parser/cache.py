@@ -0,0 +1,157 @@
+"""
+Process-level cache of parsed configurations.
+
+Parsing a configuration means YAML loading, validation and resource column
+lookups, which repeats identically for every run of the same content. Parsed
+``DatabaseConfig``/``SimulationConfig`` objects are therefore cached by the
+SHA-256 of their YAML text. Callers always receive deep copies (copy on read),
+so concurrent runs never share mutable state.
+"""
+
+import copy
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_ENTRIES = 64
+
+ConfigSource = Union[str, Path]
+
+
+def _read_source(source: ConfigSource) -> Tuple[str, Optional[str]]:
+    """
+    Resolve a configuration file path or YAML content string.
+
+    Returns:
+        Tuple of (YAML text, file path or None for inline content)
+    """
+    if isinstance(source, (str, Path)) and os.path.isfile(source):
+        with open(source, 'r') as f:
+            return f.read(), str(source)
+    if isinstance(source, str):
+        return source, None
+    raise ValueError("Invalid configuration path or content provided.")
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class ParsedConfigCache:
+    """Thread-safe LRU cache of parsed configurations keyed by content hash."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        """
+        Args:
+            max_entries: Maximum number of cached parse results
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _parse_db(self, content: str, path: Optional[str], digest: str):
+        from . import parse_db_config, parse_db_config_from_string
+
+        key = ('db', digest)
+        config = self._lookup(key)
+        if config is None:
+            config = parse_db_config(path) if path else parse_db_config_from_string(content)
+            self._store(key, config)
+        else:
+            logger.debug(f"Using cached database config {digest[:12]}")
+        return config
+
+    def get_db_config(self, db_source: ConfigSource):
+        """
+        Get a parsed database configuration.
+
+        Args:
+            db_source: Path to the database config file or YAML content string
+
+        Returns:
+            DatabaseConfig private to the caller
+        """
+        content, path = _read_source(db_source)
+        return copy.deepcopy(self._parse_db(content, path, _content_hash(content)))
+
+    def get_configs(self, sim_source: ConfigSource, db_source: Optional[ConfigSource] = None):
+        """
+        Get a parsed simulation configuration and the database configuration it was derived with.
+
+        Args:
+            sim_source: Path to the simulation config file or YAML content string
+            db_source: Optional path or YAML content of the database config
+
+        Returns:
+            Tuple of (DatabaseConfig or None, SimulationConfig), copied together so
+            references between them are preserved
+        """
+        from . import parse_sim_config, parse_sim_config_from_string
+
+        db_config, db_digest = None, None
+        if db_source is not None:
+            db_content, db_path = _read_source(db_source)
+            db_digest = _content_hash(db_content)
+            db_config = self._parse_db(db_content, db_path, db_digest)
+
+        sim_content, sim_path = _read_source(sim_source)
+        key = ('sim', _content_hash(sim_content), db_digest)
+        sim_config = self._lookup(key)
+        if sim_config is None:
+            if sim_path:
+                sim_config = parse_sim_config(sim_path, db_config)
+            else:
+                sim_config = parse_sim_config_from_string(sim_content, db_config)
+            self._store(key, (db_config, sim_config))
+        else:
+            logger.debug(f"Using cached simulation config {key[1][:12]}")
+            db_config, sim_config = sim_config
+        return copy.deepcopy((db_config, sim_config))
+
+    def clear(self):
+        """Drop all cached configurations."""
+        with self._lock:
+            self._entries.clear()
+
+
+_default_cache = ParsedConfigCache()
+
+
+def get_config_cache() -> ParsedConfigCache:
+    """Get the process-wide parsed configuration cache."""
+    return _default_cache
+
+
+def load_db_config(db_source: ConfigSource):
+    """Parse a database configuration through the process-wide cache."""
+    return _default_cache.get_db_config(db_source)
+
+
+def load_configs(sim_source: ConfigSource, db_source: Optional[ConfigSource] = None):
+    """Parse simulation and database configurations through the process-wide cache."""
+    return _default_cache.get_configs(sim_source, db_source)
@@ -1,7 +1,7 @@
 """
 Simulation configuration parser
 Dataclasses: `SimulationConfig`, `EventSimulation`, `TableSpecification`, 
-`ResourceRequirement`, `ResourceCapacityConfig`, `Condition/Outcome/DecideConfig`, 
+`QueueDefinition`, `QueueLoggingConfig`, `SimLoggingConfig`, `ResourceRequirement`, `ResourceCapacityConfig`, `Condition/Outcome/DecideConfig`, 
 `AssignmentOperation/AssignConfig`, `TriggerConfig`, `CreateConfig`, 
 `EventStepConfig`, `Step`, `EventFlow`
 """
@@ -77,6 +77,110 @@ class QueueDefinition:
             )
 
 
+@dataclass
+class QueueLoggingConfig:
+    """How queue activity is persisted to sim_queue_* tables"""
+    mode: str = 'full'                 # off | summary | full
+    flush_size: int = 500              # Buffered rows written per batch
+    bucket_minutes: float = 60.0       # Bucket width of summary rows
+
+    def __post_init__(self):
+        """Validate queue logging configuration"""
+        valid_modes = ['off', 'summary', 'full']
+        if self.mode not in valid_modes:
+            raise ValueError(
+                f"queue_logging mode must be one of {valid_modes}, got '{self.mode}'"
+            )
+        if int(self.flush_size) < 1:
+            raise ValueError("queue_logging flush_size must be at least 1")
+        if float(self.bucket_minutes) <= 0:
+            raise ValueError("queue_logging bucket_minutes must be positive")
+        self.flush_size = int(self.flush_size)
+        self.bucket_minutes = float(self.bucket_minutes)
+
+
+def parse_queue_logging(value: Any) -> QueueLoggingConfig:
+    """
+    Parse the ``queue_logging`` setting.
+
+    Args:
+        value: Mode string (``off | summary | full``), mapping with ``mode``,
+            ``flush_size`` and ``bucket_minutes``, or None for the default
+
+    Returns:
+        QueueLoggingConfig
+    """
+    if value is None:
+        return QueueLoggingConfig()
+    if isinstance(value, bool):
+        # YAML reads an unquoted `off` as false
+        return QueueLoggingConfig(mode='full' if value else 'off')
+    if isinstance(value, str):
+        return QueueLoggingConfig(mode=value)
+    if isinstance(value, dict):
+        defaults = QueueLoggingConfig()
+        mode = value.get('mode', defaults.mode)
+        if isinstance(mode, bool):
+            mode = 'full' if mode else 'off'
+        return QueueLoggingConfig(
+            mode=mode,
+            flush_size=value.get('flush_size', defaults.flush_size),
+            bucket_minutes=value.get('bucket_minutes', defaults.bucket_minutes)
+        )
+    raise ValueError(f"queue_logging must be a mode string or a mapping, got {type(value).__name__}")
+
+
+# Subsystems whose log level can be set on their own (see simulation.utils.sim_logging)
+LOG_SUBSYSTEMS = ['engine', 'processors', 'resources', 'queues', 'entities', 'tracking']
+
+
+@dataclass
+class SimLoggingConfig:
+    """Simulation log levels per subsystem and sampled entity tracing"""
+    levels: Dict[str, str] = field(default_factory=dict)  # subsystem -> DEBUG | INFO | WARNING | ERROR
+    trace_every: int = 0               # Trace 1 of every N entities end to end (0 = off)
+
+    def __post_init__(self):
+        """Validate simulation logging configuration"""
+        valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+        levels = {}
+        for subsystem, level in self.levels.items():
+            if subsystem not in LOG_SUBSYSTEMS:
+                raise ValueError(
+                    f"logging subsystem must be one of {LOG_SUBSYSTEMS}, got '{subsystem}'"
+                )
+            level = str(level).upper()
+            if level not in valid_levels:
+                raise ValueError(
+                    f"logging level for '{subsystem}' must be one of {valid_levels}, got '{level}'"
+                )
+            levels[subsystem] = level
+        self.levels = levels
+        if not isinstance(self.trace_every, int) or self.trace_every < 0:
+            raise ValueError("logging trace_every must be a non-negative integer")
+
+
+def parse_sim_logging(value: Any) -> SimLoggingConfig:
+    """
+    Parse the ``logging`` setting.
+
+    Args:
+        value: Mapping with ``levels`` (subsystem -> level) and ``trace_every``,
+            or None for the default
+
+    Returns:
+        SimLoggingConfig
+    """
+    if value is None:
+        return SimLoggingConfig()
+    if isinstance(value, dict):
+        return SimLoggingConfig(
+            levels=dict(value.get('levels') or {}),
+            trace_every=value.get('trace_every', 0) or 0
+        )
+    raise ValueError(f"logging must be a mapping, got {type(value).__name__}")
+
+
 # New event flow dataclasses
 @dataclass
 class Condition:
@@ -165,6 +269,8 @@ class TerminatingConditions:
 class EventSimulation:
     table_specification: Optional[TableSpecification] = None
     queues: List[QueueDefinition] = field(default_factory=list)  # Arena-style queue definitions
+    queue_logging: QueueLoggingConfig = field(default_factory=QueueLoggingConfig)
+    logging: SimLoggingConfig = field(default_factory=SimLoggingConfig)
     event_flows: Optional[EventFlowsConfig] = None
     resource_capacities: Optional[Dict[str, ResourceCapacityConfig]] = None
 
@@ -439,6 +545,8 @@ def parse_sim_config(file_path: Union[str, Path], db_config: Optional[DatabaseCo
         event_simulation = EventSimulation(
             table_specification=table_spec,
             queues=queues,  # Include parsed queue definitions
+            queue_logging=parse_queue_logging(event_dict.get('queue_logging')),
+            logging=parse_sim_logging(event_dict.get('logging')),
             event_flows=event_flows,
             resource_capacities=resource_capacities
         )
@@ -682,6 +790,8 @@ def parse_sim_config_from_string(config_content: str, db_config: Optional[Databa
         event_simulation = EventSimulation(
             table_specification=table_spec,
             queues=queues,  # Include parsed queue definitions
+            queue_logging=parse_queue_logging(event_dict.get('queue_logging')),
+            logging=parse_sim_logging(event_dict.get('logging')),
             event_flows=event_flows,
             resource_capacities=resource_capacities
         )
@@ -40,7 +40,7 @@ logger = logging.getLogger(__name__)
 
 
 def generate_from_distribution(dist_config: Union[str, Dict[str, Any]], 
-                              size: Optional[int] = None) -> Union[float, List[float]]:
+                              size: Optional[int] = None, rng=None) -> Union[float, List[float]]:
     """
     Generate random values from a statistical distribution.
     
@@ -51,6 +51,8 @@ def generate_from_distribution(dist_config: Union[str, Dict[str, Any]],
     Args:
         dist_config: Distribution configuration (formula string or dictionary)
         size: Number of values to generate (if None, returns a single value)
+        rng: numpy Generator to draw from, e.g. a stream of the simulation's
+            RandomStreamRegistry (default: the global np.random state)
         
     Returns:
         Random value(s) from the distribution
@@ -81,7 +83,7 @@ def generate_from_distribution(dist_config: Union[str, Dict[str, Any]],
     dist_type = dist_config.get('type', 'uniform')
     
     # Use registry to generate values
-    return DistributionRegistry.generate(dist_type, dist_config, size)
+    return DistributionRegistry.generate(dist_type, dist_config, size, rng)
 
 
 def round_if_needed(value: Union[float, np.ndarray]) -> Union[int, float, np.ndarray]:
@@ -21,7 +21,7 @@ class ContinuousDistributions:
     """Static class containing all continuous distribution generators."""
     
     @staticmethod
-    def uniform(min_val: float, max_val: float, size: Optional[int] = None) -> Union[float, np.ndarray]:
+    def uniform(min_val: float, max_val: float, size: Optional[int] = None, rng=None) -> Union[float, np.ndarray]:
         """
         UNIF(min, max) - Uniform distribution (INCLUSIVE of both bounds).
         
@@ -34,6 +34,7 @@ class ContinuousDistributions:
             min_val: Minimum value (inclusive)
             max_val: Maximum value (inclusive)
             size: Number of samples to generate
+            rng: Generator to draw from (default: the global np.random state)
             
         Returns:
             Random value(s) from uniform distribution [min, max] inclusive
@@ -42,11 +43,11 @@ class ContinuousDistributions:
         # The column type will determine the final data type during processing
         # Add small epsilon to include max value
         epsilon = np.nextafter(float(max_val), float(max_val) + 1) - float(max_val)
-        return np.random.uniform(float(min_val), float(max_val) + epsilon, size)
+        return (rng or np.random).uniform(float(min_val), float(max_val) + epsilon, size)
     
     @staticmethod
     def normal(mean: float, stddev: float, size: Optional[int] = None, 
-               min_val: float = float('-inf'), max_val: float = float('inf')) -> Union[float, np.ndarray]:
+               min_val: float = float('-inf'), max_val: float = float('inf'), rng=None) -> Union[float, np.ndarray]:
         """
         NORM(mean, stddev) - Normal distribution.
         
@@ -56,30 +57,32 @@ class ContinuousDistributions:
             size: Number of samples to generate
             min_val: Minimum value (for clamping)
             max_val: Maximum value (for clamping)
+            rng: Generator to draw from (default: the global np.random state)
             
         Returns:
             Random value(s) from normal distribution, optionally clamped
         """
-        values = np.random.normal(mean, stddev, size)
+        values = (rng or np.random).normal(mean, stddev, size)
         return np.clip(values, min_val, max_val)
     
     @staticmethod
-    def exponential(scale: float, size: Optional[int] = None) -> Union[float, np.ndarray]:
+    def exponential(scale: float, size: Optional[int] = None, rng=None) -> Union[float, np.ndarray]:
         """
         EXPO(mean) - Exponential distribution.
         
         Args:
             scale: Scale parameter (same as mean for exponential)
             size: Number of samples to generate
+            rng: Generator to draw from (default: the global np.random state)
             
         Returns:
             Random value(s) from exponential distribution
         """
-        return np.random.exponential(scale, size)
+        return (rng or np.random).exponential(scale, size)
     
     @staticmethod
     def beta(min_val: float, max_val: float, shape1: float, shape2: float, 
-             size: Optional[int] = None) -> Union[float, np.ndarray]:
+             size: Optional[int] = None, rng=None) -> Union[float, np.ndarray]:
         """
         BETA(min, max, shape1, shape2) - Beta distribution scaled to [min, max].
         
@@ -89,15 +92,16 @@ class ContinuousDistributions:
             shape1: First shape parameter (alpha)
             shape2: Second shape parameter (beta)
             size: Number of samples to generate
+            rng: Generator to draw from (default: the global np.random state)
             
         Returns:
             Random value(s) from scaled beta distribution
         """
-        beta_vals = np.random.beta(shape1, shape2, size)
+        beta_vals = (rng or np.random).beta(shape1, shape2, size)
         return min_val + beta_vals * (max_val - min_val)
     
     @staticmethod
-    def gamma(alpha: float, beta: float, size: Optional[int] = None) -> Union[float, np.ndarray]:
+    def gamma(alpha: float, beta: float, size: Optional[int] = None, rng=None) -> Union[float, np.ndarray]:
         """
         GAMA(alpha, beta) - Gamma distribution.
         
@@ -105,14 +109,15 @@ class ContinuousDistributions:
             alpha: Shape parameter
             beta: Scale parameter
             size: Number of samples to generate
+            rng: Generator to draw from (default: the global np.random state)
             
         Returns:
             Random value(s) from gamma distribution
         """
-        return np.random.gamma(alpha, beta, size)
+        return (rng or np.random).gamma(alpha, beta, size)
     
     @staticmethod  
-    def erlang(mean: float, k: int, size: Optional[int] = None) -> Union[float, np.ndarray]:
+    def erlang(mean: float, k: int, size: Optional[int] = None, rng=None) -> Union[float, np.ndarray]:
         """
         ERLA(mean, k) - Erlang distribution.
         
@@ -122,16 +127,17 @@ class ContinuousDistributions:
             mean: Mean of the distribution
             k: Number of stages (integer shape parameter)
             size: Number of samples to generate
+            rng: Generator to draw from (default: the global np.random state)
             
         Returns:
             Random value(s) from Erlang distribution
         """
         # For Erlang: shape = k, scale = mean/k
         scale = mean / k
-        return np.random.gamma(k, scale, size)
+        return (rng or np.random).gamma(k, scale, size)
     
     @staticmethod
-    def lognormal(mean: float, sigma: float, size: Optional[int] = None) -> Union[float, np.ndarray]:
+    def lognormal(mean: float, sigma: float, size: Optional[int] = None, rng=None) -> Union[float, np.ndarray]:
         """
         LOGN(mean, sigma) - Lognormal distribution.
         
@@ -139,15 +145,16 @@ class ContinuousDistributions:
             mean: Mean of underlying normal distribution
             sigma: Standard deviation of underlying normal distribution
             size: Number of samples to generate
+            rng: Generator to draw from (default: the global np.random state)
             
         Returns:
             Random value(s) from lognormal distribution
         """
-        return np.random.lognormal(mean, sigma, size)
+        return (rng or np.random).lognormal(mean, sigma, size)
     
     @staticmethod
     def triangular(min_val: float, mode: float, max_val: float, 
-                   size: Optional[int] = None) -> Union[float, np.ndarray]:
+                   size: Optional[int] = None, rng=None) -> Union[float, np.ndarray]:
         """
         TRIA(min, mode, max) - Triangular distribution.
         
@@ -156,14 +163,15 @@ class ContinuousDistributions:
             mode: Mode (most likely value)  
             max_val: Maximum value
             size: Number of samples to generate
+            rng: Generator to draw from (default: the global np.random state)
             
         Returns:
             Random value(s) from triangular distribution
         """
-        return np.random.triangular(min_val, mode, max_val, size)
+        return (rng or np.random).triangular(min_val, mode, max_val, size)
     
     @staticmethod
-    def weibull(alpha: float, beta: float, size: Optional[int] = None) -> Union[float, np.ndarray]:
+    def weibull(alpha: float, beta: float, size: Optional[int] = None, rng=None) -> Union[float, np.ndarray]:
         """
         WEIB(alpha, beta) - Weibull distribution.
         
@@ -171,8 +179,9 @@ class ContinuousDistributions:
             alpha: Shape parameter
             beta: Scale parameter
             size: Number of samples to generate
+            rng: Generator to draw from (default: the global np.random state)
             
         Returns:
             Random value(s) from Weibull distribution
         """
-        return beta * np.random.weibull(alpha, size)
\ No newline at end of file
+        return beta * (rng or np.random).weibull(alpha, size)
\ No newline at end of file
@@ -15,7 +15,7 @@ class DiscreteDistributions:
     
     @staticmethod
     def discrete(values: List[Any], weights: Optional[List[float]] = None, 
-                size: Optional[int] = None) -> Union[Any, List[Any]]:
+                size: Optional[int] = None, rng=None) -> Union[Any, List[Any]]:
         """
         DISC(p1, v1, p2, v2, ...) - Discrete distribution.
         
@@ -25,6 +25,7 @@ class DiscreteDistributions:
             values: List of possible values to choose from
             weights: List of probabilities for each value (must sum to 1.0)
             size: Number of samples to generate
+            rng: Generator to draw from (default: the global np.random state)
             
         Returns:
             Random value(s) chosen from the discrete distribution
@@ -41,7 +42,7 @@ class DiscreteDistributions:
             weights = np.array(weights)
             weights = weights / np.sum(weights)
         
-        result = np.random.choice(values, size=size, p=weights)
+        result = (rng or np.random).choice(values, size=size, p=weights)
         
         # Handle single value case - np.random.choice returns numpy scalar
         # but we want to return the original type
@@ -53,15 +54,16 @@ class DiscreteDistributions:
         return result.tolist()
     
     @staticmethod
-    def poisson(lam: float, size: Optional[int] = None) -> Union[int, np.ndarray]:
+    def poisson(lam: float, size: Optional[int] = None, rng=None) -> Union[int, np.ndarray]:
         """
         POIS(lambda) - Poisson distribution.
         
         Args:
             lam: Lambda parameter (mean and variance of the distribution)
             size: Number of samples to generate
+            rng: Generator to draw from (default: the global np.random state)
             
         Returns:
             Random value(s) from Poisson distribution
         """
-        return np.random.poisson(lam, size)
\ No newline at end of file
+        return (rng or np.random).poisson(lam, size)
\ No newline at end of file
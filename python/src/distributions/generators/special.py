@@ -14,17 +14,18 @@ class SpecialDistributions:
     """Static class containing special distribution generators and functions."""
     
     @staticmethod
-    def rand(size: Optional[int] = None) -> Union[float, np.ndarray]:
+    def rand(size: Optional[int] = None, rng=None) -> Union[float, np.ndarray]:
         """
         RAND() - Uniform random number between 0 and 1.
         
         Args:
             size: Number of samples to generate
+            rng: Generator to draw from (default: the global np.random state)
             
         Returns:
             Random value(s) uniformly distributed in [0, 1]
         """
-        return np.random.uniform(0, 1, size)
+        return (rng or np.random).uniform(0, 1, size)
     
     @staticmethod
     def fixed(value: Any, size: Optional[int] = None) -> Union[Any, np.ndarray]:
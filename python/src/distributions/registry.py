@@ -37,7 +37,8 @@ class DistributionRegistry:
     }
     
     @classmethod
-    def generate(cls, dist_type: str, config: Dict[str, Any], size: Optional[int] = None) -> Union[float, List[float]]:
+    def generate(cls, dist_type: str, config: Dict[str, Any], size: Optional[int] = None,
+                 rng=None) -> Union[float, List[float]]:
         """
         Generate random values from a specified distribution.
         
@@ -45,6 +46,7 @@ class DistributionRegistry:
             dist_type: Distribution type name (supports aliases)
             config: Configuration dictionary with distribution parameters
             size: Number of values to generate
+            rng: numpy Generator to draw from (default: the global np.random state)
             
         Returns:
             Generated random value(s)
@@ -58,63 +60,63 @@ class DistributionRegistry:
         # Route to appropriate generator
         if normalized_type == 'UNIF':
             return ContinuousDistributions.uniform(
-                config.get('min', 0), config.get('max', 1), size
+                config.get('min', 0), config.get('max', 1), size, rng=rng
             )
         
         elif normalized_type == 'NORM':
             return ContinuousDistributions.normal(
                 config.get('mean', 0), config.get('stddev', 1), size,
-                config.get('min', float('-inf')), config.get('max', float('inf'))
+                config.get('min', float('-inf')), config.get('max', float('inf')), rng=rng
             )
         
         elif normalized_type == 'EXPO':
             # Handle both 'scale' and 'mean' parameter names
             scale = config.get('scale') or config.get('mean', 1)
-            return ContinuousDistributions.exponential(scale, size)
+            return ContinuousDistributions.exponential(scale, size, rng=rng)
         
         elif normalized_type == 'POIS':
             # Handle both 'lambda' and 'lam' parameter names
             lam = config.get('lambda') or config.get('lam', 1)
-            return DiscreteDistributions.poisson(lam, size)
+            return DiscreteDistributions.poisson(lam, size, rng=rng)
         
         elif normalized_type == 'TRIA':
             return ContinuousDistributions.triangular(
-                config.get('min', 0), config.get('mode', 0.5), config.get('max', 1), size
+                config.get('min', 0), config.get('mode', 0.5), config.get('max', 1), size, rng=rng
             )
         
         elif normalized_type == 'BETA':
             return ContinuousDistributions.beta(
                 config.get('min', 0), config.get('max', 1),
-                config.get('shape1', 2), config.get('shape2', 2), size
+                config.get('shape1', 2), config.get('shape2', 2), size, rng=rng
             )
         
         elif normalized_type == 'GAMA':
             return ContinuousDistributions.gamma(
-                config.get('alpha', 2), config.get('beta', 1), size
+                config.get('alpha', 2), config.get('beta', 1), size, rng=rng
             )
         
         elif normalized_type == 'ERLA':
             return ContinuousDistributions.erlang(
-                config.get('mean', 1), config.get('k', 2), size
+                config.get('mean', 1), config.get('k', 2), size, rng=rng
             )
         
         elif normalized_type == 'LOGN':
             return ContinuousDistributions.lognormal(
-                config.get('mean', 0), config.get('sigma', 1), size
+                config.get('mean', 0), config.get('sigma', 1), size, rng=rng
             )
         
         elif normalized_type == 'WEIB':
             return ContinuousDistributions.weibull(
-                config.get('alpha', 1), config.get('beta', 1), size
+                config.get('alpha', 1), config.get('beta', 1), size, rng=rng
             )
         
         elif normalized_type == 'DISC':
             return DiscreteDistributions.discrete(
-                config.get('values', [0]), config.get('weights'), size
+                config.get('values', [0]), config.get('weights'), size, rng=rng
             )
         
         elif normalized_type == 'RAND':
-            return SpecialDistributions.rand(size)
+            return SpecialDistributions.rand(size, rng=rng)
         
         elif normalized_type == 'FIXED':
             return SpecialDistributions.fixed(config.get('value', 0), size)
@@ -8,14 +8,15 @@ import os
 import logging
 from pathlib import Path
 
-from .database_generator import DatabaseGenerator
-from ..config_parser import parse_db_config, parse_sim_config, parse_db_config_from_string, parse_sim_config_from_string
+from .cache import GeneratedDatabaseCache, CACHE_DIR_NAME
+from ..config_parser import load_db_config, load_configs
 from ..utils.path_resolver import resolve_output_dir
 
 # Create logger
 logger = logging.getLogger(__name__)
 
-def generate_database(config_path_or_content, output_dir='output', db_name=None, project_id=None, sim_config_path_or_content=None):
+def generate_database(config_path_or_content, output_dir='output', db_name=None, project_id=None, sim_config_path_or_content=None,
+                      chunk_size=None, memory_limit_mb=None, bulk_load=True, use_cache=True):
     """
     Generate a SQLite database from a configuration file path or content string.
     Returns only the database path.
@@ -25,12 +26,17 @@ def generate_database(config_path_or_content, output_dir='output', db_name=None,
         output_dir,
         db_name,
         project_id,
-        sim_config_path_or_content
+        sim_config_path_or_content,
+        chunk_size,
+        memory_limit_mb,
+        bulk_load,
+        use_cache
     )
     return db_path
 
 
-def generate_database_with_formula_support(config_path_or_content, output_dir='output', db_name=None, project_id=None, sim_config_path_or_content=None):
+def generate_database_with_formula_support(config_path_or_content, output_dir='output', db_name=None, project_id=None, sim_config_path_or_content=None,
+                                           chunk_size=None, memory_limit_mb=None, bulk_load=True, use_cache=True):
     """
     Generate a SQLite database and return both path and generator (for post-simulation formula resolution).
     """
@@ -39,32 +45,34 @@ def generate_database_with_formula_support(config_path_or_content, output_dir='o
         output_dir,
         db_name,
         project_id,
-        sim_config_path_or_content
+        sim_config_path_or_content,
+        chunk_size,
+        memory_limit_mb,
+        bulk_load,
+        use_cache
     )
 
 
-def _generate_database_internal(config_path_or_content, output_dir, db_name, project_id, sim_config_path_or_content):
+def _generate_database_internal(config_path_or_content, output_dir, db_name, project_id, sim_config_path_or_content,
+                                chunk_size=None, memory_limit_mb=None, bulk_load=True, use_cache=True):
     """Shared implementation for database generation."""
-    # Parse DB config
+    # Parse DB config (served from the parsed-config cache when unchanged)
     if os.path.exists(config_path_or_content) and os.path.isfile(config_path_or_content):
         logger.info(f"Generating database from config file: {config_path_or_content}")
-        config = parse_db_config(config_path_or_content)
     else:
         logger.info("Generating database from config content string")
-        config = parse_db_config_from_string(config_path_or_content)
+    config = load_db_config(config_path_or_content)
 
     # Parse simulation config if provided
     sim_config = None
     if sim_config_path_or_content:
-        if os.path.exists(sim_config_path_or_content) and os.path.isfile(sim_config_path_or_content):
-            logger.info(f"Parsing simulation config from file: {sim_config_path_or_content}")
-            sim_config = parse_sim_config(sim_config_path_or_content)
-        else:
-            logger.info("Parsing simulation config from content string")
-            sim_config = parse_sim_config_from_string(sim_config_path_or_content)
+        _, sim_config = load_configs(sim_config_path_or_content)
     else:
         logger.debug("No simulation config provided")
 
+    # Generated databases are cached once per output root, shared across projects
+    cache = GeneratedDatabaseCache(get_cache_dir(output_dir)) if use_cache else None
+
     # Resolve output directory (env/project-aware)
     output_dir = resolve_output_dir(output_dir, project_id)
 
@@ -82,7 +90,10 @@ def _generate_database_internal(config_path_or_content, output_dir, db_name, pro
         db_name = db_name[:-3]
         logger.info(f"Removed .db extension from database name: {db_name}")
 
-    generator = DatabaseGenerator(config, output_dir, None, sim_config)
+    from .database_generator import DatabaseGenerator
+    generator = DatabaseGenerator(config, output_dir, None, sim_config,
+                                  chunk_size=chunk_size, memory_limit_mb=memory_limit_mb,
+                                  bulk_load=bulk_load, cache=cache)
     db_path = generator.generate(db_name)
 
     # Ensure the returned path is absolute
@@ -120,8 +131,23 @@ def _generate_database_internal(config_path_or_content, output_dir, db_name, pro
 
     return db_path, generator
 
+
+def __getattr__(name):
+    # SQLAlchemy, NumPy and the Faker.js engine load with the generator on first use
+    if name == 'DatabaseGenerator':
+        from .database_generator import DatabaseGenerator
+        return DatabaseGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_cache_dir(output_dir=None):
+    """Return the generated-database cache directory for an output root."""
+    return os.path.join(resolve_output_dir(output_dir), CACHE_DIR_NAME)
+
 __all__ = [
     'generate_database',
     'generate_database_with_formula_support',
-    'DatabaseGenerator'
+    'get_cache_dir',
+    'DatabaseGenerator',
+    'GeneratedDatabaseCache'
 ]
@@ -0,0 +1,216 @@
+"""
+Content-addressed cache of generated base databases.
+
+Generating a database is deterministic for a given database config,
+simulation attribute analysis and random seed, so the populated file can be
+reused across runs. Cached files live in a hidden directory inside the output
+directory and are evicted least-recently-used once the cache exceeds its
+size budget.
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from ..config_parser import DatabaseConfig
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a change to generation alters the produced data or schema
+GENERATOR_VERSION = "2"
+
+CACHE_DIR_NAME = ".db_cache"
+DEFAULT_CACHE_MAX_MB = 2048
+
+
+def _copy_sqlite_file(source_path: str, target_path: str) -> None:
+    """Copy a SQLite database with the online backup API (consistent even under WAL)."""
+    src = sqlite3.connect(source_path)
+    try:
+        dst = sqlite3.connect(target_path)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
+class GeneratedDatabaseCache:
+    """Size-bounded LRU cache of generated SQLite databases keyed by content hash."""
+
+    def __init__(self, cache_dir: str, max_size_mb: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached database files
+            max_size_mb: Size budget in megabytes (defaults to DB_SIMULATOR_DB_CACHE_MB or 2048)
+        """
+        if max_size_mb is None:
+            max_size_mb = float(os.environ.get('DB_SIMULATOR_DB_CACHE_MB', DEFAULT_CACHE_MAX_MB))
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+
+    @staticmethod
+    def compute_key(config: DatabaseConfig, flow_attributes: Dict[str, Dict[str, Dict[str, Any]]],
+                    seed: Optional[int], chunk_size: Optional[int] = None,
+                    memory_limit_bytes: Optional[int] = None) -> str:
+        """
+        Compute the cache key for a generation request.
+
+        Chunking settings are part of the key: self-referencing FK parents
+        are refreshed per chunk, so the same seed can give different rows
+        with a different chunk size or memory limit.
+
+        Args:
+            config: Parsed database configuration
+            flow_attributes: Flow attribute analysis (flow -> table -> attribute -> column type)
+            seed: Random seed used for generation
+            chunk_size: Rows generated and inserted per batch
+            memory_limit_bytes: Memory ceiling for one batch of pending rows
+
+        Returns:
+            Hex digest identifying the generated database
+        """
+        attribute_columns = {
+            flow_id: {
+                table: {name: getattr(col_type, '__name__', str(col_type)) for name, col_type in attrs.items()}
+                for table, attrs in tables.items()
+            }
+            for flow_id, tables in (flow_attributes or {}).items()
+        }
+        payload = {
+            'generator_version': GENERATOR_VERSION,
+            'db_config': dataclasses.asdict(config),
+            'flow_attributes': attribute_columns,
+            'seed': seed,
+            'chunk_size': chunk_size,
+            'memory_limit_bytes': memory_limit_bytes,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.db")
+
+    def get(self, key: str, target_path: str) -> bool:
+        """
+        Materialize a cached database at the target path.
+
+        Args:
+            key: Cache key from compute_key
+            target_path: Destination database file path
+
+        Returns:
+            True on a cache hit, False otherwise
+        """
+        entry_path = self._entry_path(key)
+        if not os.path.exists(entry_path):
+            return False
+        try:
+            _copy_sqlite_file(entry_path, target_path)
+            # Refresh the timestamp used for LRU ordering
+            os.utime(entry_path, None)
+            logger.info(f"Database cache hit {key[:12]} -> {target_path}")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to restore cached database {key[:12]}: {e}")
+            return False
+
+    def put(self, key: str, source_path: str) -> bool:
+        """
+        Store a freshly generated database in the cache and enforce the size budget.
+
+        Args:
+            key: Cache key from compute_key
+            source_path: Path of the generated database
+
+        Returns:
+            True if the entry was stored, False otherwise
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entry_path = self._entry_path(key)
+            tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+            _copy_sqlite_file(source_path, tmp_path)
+            os.replace(tmp_path, entry_path)
+            logger.info(f"Stored generated database in cache as {key[:12]}")
+        except Exception as e:
+            logger.warning(f"Failed to cache generated database: {e}")
+            return False
+        self.prune()
+        return True
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        List cache entries, most recently used first.
+
+        Returns:
+            List of dictionaries with key, path, size_bytes and last_used
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+        result = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.db'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            result.append({
+                'key': name[:-3],
+                'path': path,
+                'size_bytes': stat.st_size,
+                'last_used': stat.st_mtime,
+            })
+        result.sort(key=lambda entry: entry['last_used'], reverse=True)
+        return result
+
+    def total_size(self) -> int:
+        """Total size of all cache entries in bytes."""
+        return sum(entry['size_bytes'] for entry in self.entries())
+
+    def prune(self, max_size_mb: Optional[float] = None) -> int:
+        """
+        Evict least recently used entries until the cache fits its budget.
+
+        Args:
+            max_size_mb: Override for the size budget (0 clears the cache)
+
+        Returns:
+            Number of entries removed
+        """
+        max_bytes = self.max_bytes if max_size_mb is None else int(max_size_mb * 1024 * 1024)
+        entries = self.entries()
+        total = sum(entry['size_bytes'] for entry in entries)
+        removed = 0
+        # Oldest entries are at the end
+        while entries and total > max_bytes:
+            entry = entries.pop()
+            try:
+                os.remove(entry['path'])
+                total -= entry['size_bytes']
+                removed += 1
+                logger.debug(f"Evicted cached database {entry['key'][:12]} ({entry['size_bytes']} bytes)")
+            except OSError as e:
+                logger.warning(f"Failed to evict cached database {entry['path']}: {e}")
+        if removed:
+            logger.info(f"Evicted {removed} cached databases, cache size now {total} bytes")
+        return removed
+
+
+def format_cache_entries(entries: List[Dict[str, Any]]) -> List[str]:
+    """Render cache entries as human-readable lines for the CLI."""
+    lines = []
+    for entry in entries:
+        last_used = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['last_used']))
+        lines.append(f"{entry['key'][:16]}  {entry['size_bytes'] / (1024 * 1024):10.2f} MB  {last_used}")
+    return lines
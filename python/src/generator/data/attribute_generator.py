@@ -10,7 +10,7 @@ import random
 from typing import Any, Dict
 
 from .faker_js import generate_fake_data
-from .template import generate_from_template
+from .template import compile_template
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +68,7 @@ def generate_attribute_value(attr_config: Dict[str, Any], row_index: int) -> Any
         # Use row_index + 1 for 1-based ID in template context
         context = {'id': row_index + 1} 
         try:
-            return generate_from_template(template, context)
+            return compile_template(template).render(context)
         except Exception as e:
             logger.warning(f"Error in template for {attr_name}: {e}. Context: {context}")
             return f"Template_Error_{attr_name}_{row_index}"
@@ -6,6 +6,6 @@ a JavaScript V8 engine, enabling access to 500+ data generation methods
 for commercial and business database simulation.
 """
 
-from .generator import generate_fake_data, test_faker_js_integration
+from .generator import generate_fake_data, seed_fake_data, test_faker_js_integration
 
-__all__ = ['generate_fake_data', 'test_faker_js_integration']
\ No newline at end of file
+__all__ = ['generate_fake_data', 'seed_fake_data', 'test_faker_js_integration']
\ No newline at end of file
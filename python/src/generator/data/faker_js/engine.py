@@ -10,7 +10,6 @@ import sys
 import logging
 import threading
 from typing import Any, Optional
-from py_mini_racer import MiniRacer
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +17,23 @@ logger = logging.getLogger(__name__)
 _v8_lock = threading.Lock()
 
 
+def _create_context():
+    """
+    Create a V8 context.
+
+    py_mini_racer (and the V8 runtime) is only loaded here, on first Faker.js
+    use, together with the platform patch for pre-1970 dates.
+    """
+    from py_mini_racer import MiniRacer
+
+    try:
+        import patch_mini_racer
+        patch_mini_racer.apply_patch()
+    except ImportError as e:
+        logger.debug(f"py_mini_racer patch not applied: {e}")
+    return MiniRacer()
+
+
 class FakerJSEngine:
     """
     V8 JavaScript engine wrapper for Faker.js execution.
@@ -29,7 +45,7 @@ class FakerJSEngine:
     def __init__(self):
         """Initialize the V8 engine and load Faker.js bundle."""
         try:
-            self.ctx = MiniRacer()
+            self.ctx = _create_context()
             
             # Load the Faker.js bundle
             # Handle both development and PyInstaller frozen environments
@@ -103,6 +119,16 @@ class FakerJSEngine:
             logger.error(f"Error generating fake data for {method}: {e}")
             return error_msg
     
+    def seed(self, seed: int) -> None:
+        """
+        Seed the Faker.js random generator for reproducible output.
+        
+        Args:
+            seed: Integer seed value
+        """
+        with _v8_lock:
+            self.ctx.eval(f"FakerBundle.faker.seed({int(seed)})")
+    
     def test_connection(self) -> dict:
         """
         Test the Faker.js engine connection and available methods.
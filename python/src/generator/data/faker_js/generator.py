@@ -46,6 +46,19 @@ def generate_fake_data(method: str, size: Optional[int] = None) -> Any:
         return error_msg
 
 
+def seed_fake_data(seed: int) -> None:
+    """
+    Seed the Faker.js engine so subsequent values are reproducible.
+    
+    Args:
+        seed: Integer seed value
+    """
+    try:
+        get_faker_engine().seed(seed)
+    except Exception as e:
+        logger.warning(f"Failed to seed Faker.js engine: {e}")
+
+
 def test_faker_js_integration() -> dict:
     """
     Test the Faker.js integration with common business/commercial methods.
@@ -6,5 +6,6 @@ management during phase 1 data population.
 """
 
 from .resolver import ForeignKeyResolver
+from .deck import OneToOneDeck, ParentIdBuffer
 
-__all__ = ['ForeignKeyResolver']
\ No newline at end of file
+__all__ = ['ForeignKeyResolver', 'OneToOneDeck', 'ParentIdBuffer']
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Array-backed parent ID containers for foreign key assignment.
+
+A deck holds a random permutation of the parent IDs in a NumPy array and
+hands them out one at a time, so every child row receives a unique parent.
+Integer IDs are stored as a compact ``int64`` array (8 bytes per ID) instead
+of a Python list of boxed ints, which keeps decks for tens of millions of
+parents within a few hundred megabytes. A parent ID buffer holds the keys
+of a table that references itself and grows as its rows are generated.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+
+
+class OneToOneDeck:
+    """Shuffled, consumable deck of unique parent IDs."""
+
+    def __init__(self, parent_ids: np.ndarray):
+        """
+        Initialize the deck with a random permutation of the parent IDs.
+
+        Args:
+            parent_ids: 1-D array of parent primary key values
+        """
+        # Permute in place to avoid holding two copies of a large array
+        self._ids = parent_ids
+        np.random.shuffle(self._ids)
+        self._next = len(self._ids)
+
+    @property
+    def remaining(self) -> int:
+        """Number of IDs that have not been drawn yet."""
+        return self._next
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def draw(self) -> Optional[Any]:
+        """
+        Draw the next unused parent ID.
+
+        Returns:
+            Parent ID as a native Python value, or None when the deck is exhausted
+        """
+        if self._next == 0:
+            return None
+        self._next -= 1
+        value = self._ids[self._next]
+        return value.item() if isinstance(value, np.generic) else value
+
+
+class ParentIdBuffer:
+    """Growable array of parent IDs for self-referencing many-to-one keys."""
+
+    def __init__(self, parent_ids: np.ndarray):
+        """
+        Initialize the buffer with the IDs already in the table.
+
+        Args:
+            parent_ids: 1-D array of existing parent key values
+        """
+        self._ids = parent_ids
+        self._size = len(parent_ids)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: Any):
+        """Add the key of a row written to the table (amortised O(1))."""
+        if self._size == len(self._ids):
+            grown = np.empty(max(16, 2 * self._size), dtype=self._ids.dtype)
+            grown[:self._size] = self._ids[:self._size]
+            self._ids = grown
+        self._ids[self._size] = value
+        self._size += 1
+
+    def view(self) -> np.ndarray:
+        """Array of the IDs added so far (no copy)."""
+        return self._ids[:self._size]
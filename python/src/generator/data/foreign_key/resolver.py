@@ -23,7 +23,7 @@ UNIF(1, 5) generates 3 → selects parent_ids[2] → returns 'ghi-789'
 
 import logging
 import random
-from typing import List, Any, Optional
+from typing import Any, Optional, Sequence
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +35,9 @@ class ForeignKeyResolver:
         """Initialize the foreign key resolver."""
         pass
     
-    def select_parent_id(self, parent_ids: List[Any], formula: Optional[str] = None) -> Any:
-        if not parent_ids:
+    def select_parent_id(self, parent_ids: Sequence[Any], formula: Optional[str] = None) -> Any:
+        # Accepts lists or NumPy arrays (truthiness is ambiguous for arrays)
+        if parent_ids is None or len(parent_ids) == 0:
             return None
             
         if not formula:
@@ -7,21 +7,53 @@ with synthetic data based on entity configurations.
 
 import logging
 import dataclasses
-from typing import List, Any
+import sys
+from typing import List, Any, Dict, Iterator, Optional
+
+import numpy as np
+from sqlalchemy import insert, select, func
 
 from ...config_parser import DatabaseConfig, Entity, Attribute
 from .attribute_generator import generate_attribute_value
 from .type_processor import process_value_for_type
+from .foreign_key import ForeignKeyResolver, OneToOneDeck, ParentIdBuffer
+from .template import compile_template
 
 logger = logging.getLogger(__name__)
 
 
+# Rows generated and written per insert batch
+DEFAULT_CHUNK_SIZE = 10000
+# Upper bound on memory held by one chunk of pending rows
+DEFAULT_MEMORY_LIMIT_MB = 256
+
+
 class DataPopulator:
     """Handles population of database tables with synthetic data."""
     
-    def __init__(self):
-        """Initialize the data populator."""
+    # Rows in the first chunk of each table, used to estimate per-row memory
+    PROBE_ROWS = 100
+    
+    def __init__(self, chunk_size: Optional[int] = None, memory_limit_mb: Optional[float] = None):
+        """
+        Initialize the data populator.
+        
+        Args:
+            chunk_size: Maximum number of rows generated and inserted per batch
+            memory_limit_mb: Memory ceiling for one batch of pending rows (0 disables the limit)
+        """
         self.pending_formulas = {}  # Store formula attributes for post-simulation resolution
+        self.chunk_size = max(1, int(chunk_size or DEFAULT_CHUNK_SIZE))
+        if memory_limit_mb is None:
+            memory_limit_mb = DEFAULT_MEMORY_LIMIT_MB
+        self.memory_limit_bytes = int(memory_limit_mb * 1024 * 1024)
+        self._fk_resolver = ForeignKeyResolver()
+        self._one_to_one_decks = {}
+        self._parent_id_cache = {}
+        self._self_ref_ids = {}
+        self._next_auto_id = None
+        self._valid_keys = set()
+        self._template_attrs = []
     
     def populate_tables(self, models: dict, config: DatabaseConfig, session, 
                        flow_assigned_attributes: dict,
@@ -54,14 +86,52 @@ class DataPopulator:
                 continue
             self._populate_entity(entity)
     
+    def collect_pending_formulas(self, config: DatabaseConfig, dynamic_entity_tables: List[str] = None):
+        """
+        Register formula attributes without populating any table.
+        
+        Used when the populated database is restored from the generation
+        cache, so post-simulation formula resolution still knows its work.
+        
+        Args:
+            config: Database configuration
+            dynamic_entity_tables: List of tables skipped during population
+        """
+        skipped = set(dynamic_entity_tables or [])
+        for entity in config.entities:
+            if entity.name not in skipped:
+                self._collect_formula_attributes(entity)
+    
+    def _collect_formula_attributes(self, entity: Entity):
+        """
+        Store an entity's formula attributes for post-simulation resolution.
+        
+        Args:
+            entity: Entity configuration
+        """
+        formula_attrs = []
+        for attr in entity.attributes:
+            if attr.generator and getattr(attr.generator, "type", None) == "formula":
+                formula_attrs.append(attr)
+        
+        # Store formula attributes if any exist
+        if formula_attrs:
+            self.pending_formulas[entity.name] = formula_attrs
+            logger.info(f"Found {len(formula_attrs)} formula attributes in table {entity.name} for post-simulation resolution")
+    
     def _populate_entity(self, entity: Entity):
         """
-        Populate table with data based on entity configuration
+        Populate table with data based on entity configuration.
+        
+        Rows are produced by a chunk generator and streamed into the table with
+        executemany inserts, committing after every chunk, so memory use is
+        bounded by the chunk size rather than by the table size.
         
         Args:
             entity: Entity configuration
         """
         model_class = self.models[entity.name]
+        table = model_class.__table__
         
         # Determine number of rows to generate
         num_rows = self._get_num_rows(entity)
@@ -69,129 +139,260 @@ class DataPopulator:
         logger.info(f"Generating {num_rows} rows for table {entity.name}")
         
         # Collect formula attributes for post-simulation resolution
-        formula_attrs = []
-        for attr in entity.attributes:
-            if attr.generator and getattr(attr.generator, "type", None) == "formula":
-                formula_attrs.append(attr)
+        self._collect_formula_attributes(entity)
         
-        # Store formula attributes if any exist
-        if formula_attrs:
-            self.pending_formulas[entity.name] = formula_attrs
-            logger.info(f"Found {len(formula_attrs)} formula attributes in table {entity.name} for post-simulation resolution")
+        if num_rows <= 0:
+            return
         
         # Pre-process one_to_one attributes to create shuffled ID decks
-        one_to_one_decks = {}
+        self._one_to_one_decks = {}
+        # Parent IDs for many_to_one attributes, fetched once per table
+        self._parent_id_cache = {}
+        # Self-referencing many_to_one attributes -> (referenced column, IDs written so far)
+        self._self_ref_ids = {}
+        self._next_auto_id = None
+        pk_attr = next((attr for attr in entity.attributes if attr.is_primary_key), None)
         for attr in entity.attributes:
-            if attr.generator and getattr(attr.generator, "type", None) == "foreign_key":
+            if attr.generator and getattr(attr.generator, "type", None) == "foreign_key" and attr.ref:
                 subtype = getattr(attr.generator, "subtype", "many_to_one")
-                if subtype == "one_to_one" and attr.ref:
-                    ref_table, ref_column = attr.ref.split('.')
-                    parent_model = self.models[ref_table]
-                    # Fetch all parent IDs
-                    parent_ids = self.session.query(getattr(parent_model, ref_column)).all()
-                    parent_ids = [pid[0] for pid in parent_ids]
-                    
-                    if not parent_ids:
+                ref_table, ref_column = attr.ref.split('.')
+                if subtype == "one_to_one":
+                    parent_ids = self._fetch_parent_ids(ref_table, ref_column)
+                    if len(parent_ids) == 0:
                         logger.warning(f"No parent rows found for 1:1 FK '{attr.name}' in '{entity.name}'")
-                        one_to_one_decks[attr.name] = []
-                    else:
-                        import random
-                        # Create a copy and shuffle it
-                        deck = list(parent_ids)
-                        random.shuffle(deck)
-                        one_to_one_decks[attr.name] = deck
-                        logger.info(f"Prepared 1:1 deck for {attr.name}: {len(deck)} unique IDs")
-
-        # Generate rows
-        for i in range(num_rows):
-            row_data = {}
+                    self._one_to_one_decks[attr.name] = OneToOneDeck(parent_ids)
+                    logger.info(f"Prepared 1:1 deck for {attr.name}: {len(parent_ids)} unique IDs")
+                elif ref_table == entity.name:
+                    # Rows may reference any earlier row, including rows of the same chunk
+                    self._self_ref_ids[attr.name] = (
+                        ref_column, ParentIdBuffer(self._fetch_parent_ids(ref_table, ref_column))
+                    )
+                    if pk_attr is not None and ref_column == pk_attr.name and not pk_attr.generator:
+                        # Assign auto-increment keys here so they are known before the insert
+                        self._next_auto_id = self._max_key(table.c[ref_column]) + 1
+                else:
+                    self._parent_id_cache[attr.name] = self._fetch_parent_ids(ref_table, ref_column)
+        
+        # Template columns are compiled once and rendered per block
+        assigned_for_entity = self.flow_assigned_attributes.get(entity.name, set())
+        self._template_attrs = [
+            (attr, compile_template(attr.generator.template or "{id}"))
+            for attr in entity.attributes
+            if attr.generator and getattr(attr.generator, "type", None) == "template"
+            and (attr.is_primary_key or attr.name not in assigned_for_entity)
+        ]
+        
+        self._valid_keys = {col.name for col in table.columns}
+        rows_written = 0
+        for rows in self._iter_row_chunks(entity, num_rows):
+            try:
+                self.session.execute(insert(table), rows)
+            except Exception as e:
+                logger.error(f"Error inserting rows {rows_written + 1}-{rows_written + len(rows)} into {entity.name}: {e}")
+                self.session.rollback()
+                raise
+            # Commit per chunk to release buffered rows and make IDs available for foreign keys
+            self.session.commit()
+            rows_written += len(rows)
+            logger.debug(f"Wrote {rows_written}/{num_rows} rows to {entity.name}")
+        
+        self._one_to_one_decks = {}
+        self._parent_id_cache = {}
+        self._self_ref_ids = {}
+        self._next_auto_id = None
+        self._template_attrs = []
+    
+    def _iter_row_chunks(self, entity: Entity, num_rows: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Generate rows for an entity in chunks bounded by chunk size and memory ceiling.
+        
+        The first chunk is a small probe used to estimate the in-memory size of
+        a row; subsequent chunks are sized so that one chunk stays within the
+        configured memory ceiling.
+        
+        Args:
+            entity: Entity configuration
+            num_rows: Total number of rows to generate
             
-            # Generate data for each attribute
-            for attr in entity.attributes:
-                # Handle primary key - use generator if present, otherwise skip for auto-increment
-                if attr.is_primary_key:
-                    if attr.generator:
-                        # PK has a custom generator (e.g., faker uuid)
-                        row_data[attr.name] = self._generate_attribute_value(attr, i)
-                        logger.debug(f"Generated PK value for {attr.name} using {attr.generator.type} generator")
-                    # else: skip - let database handle auto-increment
-                    continue
+        Yields:
+            Lists of row dictionaries
+        """
+        chunk_rows = min(self.chunk_size, self.PROBE_ROWS)
+        start = 0
+        while start < num_rows:
+            count = min(chunk_rows, num_rows - start)
+            # Render template columns for the whole block up front
+            block = self._render_template_block(start, count)
+            chunk = [self._build_row(entity, start + offset, block, offset) for offset in range(count)]
+            yield chunk
+            chunk_rows = self._rows_within_budget(chunk)
+            start += count
+    
+    def _render_template_block(self, start: int, count: int) -> Dict[str, List[Any]]:
+        """
+        Render all template-generated columns for a block of rows.
+        
+        Args:
+            start: 0-based index of the first row in the block
+            count: Number of rows in the block
+            
+        Returns:
+            Dictionary of attribute name to list of processed values
+        """
+        block = {}
+        for attr, compiled in self._template_attrs:
+            # Templates see 1-based row ids, matching generate_attribute_value
+            values = compiled.render_ids(start + 1, count)
+            block[attr.name] = [process_value_for_type(value, attr.type) for value in values]
+        return block
+    
+    def _rows_within_budget(self, sample: List[Dict[str, Any]]) -> int:
+        """
+        Compute how many rows fit in one chunk under the memory ceiling.
+        
+        Args:
+            sample: Recently generated rows used to estimate the per-row size
+            
+        Returns:
+            Number of rows for the next chunk (at least 1, at most chunk_size)
+        """
+        if not self.memory_limit_bytes or not sample:
+            return self.chunk_size
+        probe = sample[:self.PROBE_ROWS]
+        row_bytes = sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row.values())
+            for row in probe
+        ) / len(probe)
+        return max(1, min(self.chunk_size, int(self.memory_limit_bytes // max(row_bytes, 1))))
+    
+    def _build_row(self, entity: Entity, i: int, block: Dict[str, List[Any]] = None, offset: int = 0) -> Dict[str, Any]:
+        """
+        Build the column values for a single row.
+        
+        Args:
+            entity: Entity configuration
+            i: 0-based row index
+            block: Pre-rendered template column values for the current block
+            offset: Position of this row within the block
+            
+        Returns:
+            Dictionary of column name to value
+        """
+        row_data = {}
+        
+        # Generate data for each attribute
+        for attr in entity.attributes:
+            # Handle primary key - use generator if present, otherwise skip for auto-increment
+            if block and attr.name in block:
+                row_data[attr.name] = block[attr.name][offset]
+                continue
+            
+            if attr.is_primary_key:
+                if attr.generator:
+                    # PK has a custom generator (e.g., faker uuid)
+                    row_data[attr.name] = self._generate_attribute_value(attr, i)
+                elif self._next_auto_id is not None:
+                    # Self-referencing table: the key must be known to later rows
+                    row_data[attr.name] = self._next_auto_id
+                    self._next_auto_id += 1
+                # else: skip - let database handle auto-increment
+                continue
 
-                # Check for formula type generators - skip during initial population
-                if attr.generator and getattr(attr.generator, "type", None) == "formula":
-                    logger.debug(f"Skipping formula attribute '{attr.name}' in table '{entity.name}' for post-simulation resolution")
-                    continue
+            # Check for formula type generators - skip during initial population
+            if attr.generator and getattr(attr.generator, "type", None) == "formula":
+                continue
 
-                # Handle new "foreign_key" generator type
-                if attr.generator and getattr(attr.generator, "type", None) == "foreign_key":
-                    subtype = getattr(attr.generator, "subtype", "many_to_one")
-                    
-                    if subtype == "one_to_one":
-                        # Use the pre-shuffled deck
-                        deck = one_to_one_decks.get(attr.name, [])
-                        if deck:
-                            row_data[attr.name] = deck.pop()
-                        else:
-                            logger.warning(f"Ran out of unique IDs for 1:1 FK '{attr.name}' in '{entity.name}' (Row {i+1}). Setting to None.")
-                            row_data[attr.name] = None
+            # Handle new "foreign_key" generator type
+            if attr.generator and getattr(attr.generator, "type", None) == "foreign_key":
+                subtype = getattr(attr.generator, "subtype", "many_to_one")
+                
+                if subtype == "one_to_one":
+                    # Draw from the pre-shuffled deck
+                    deck = self._one_to_one_decks.get(attr.name)
+                    value = deck.draw() if deck is not None else None
+                    if value is None:
+                        logger.warning(f"Ran out of unique IDs for 1:1 FK '{attr.name}' in '{entity.name}' (Row {i+1}). Setting to None.")
+                    row_data[attr.name] = value
+                else:
+                    # Standard Many-to-One logic (formerly called One-to-Many)
+                    # We accept "one_to_many" as a legacy alias for "many_to_one"
+                    if not attr.ref:
+                        logger.error(f"Foreign key attribute '{attr.name}' in table '{entity.name}' missing 'ref'. Assigning None.")
+                        row_data[attr.name] = None
                     else:
-                        # Standard Many-to-One logic (formerly called One-to-Many)
-                        # We accept "one_to_many" as a legacy alias for "many_to_one"
-                        if subtype == "one_to_many":
-                             logger.debug(f"Attribute '{attr.name}' uses legacy subtype 'one_to_many'. Treating as 'many_to_one'.")
-
-                        # Get parent table and column
-                        if not attr.ref:
-                            logger.error(f"Foreign key attribute '{attr.name}' in table '{entity.name}' missing 'ref'. Assigning None.")
+                        self_ref = self._self_ref_ids.get(attr.name)
+                        parent_ids = self_ref[1].view() if self_ref else self._parent_id_cache.get(attr.name)
+                        if parent_ids is None or len(parent_ids) == 0:
+                            ref_table = attr.ref.split('.')[0]
+                            logger.warning(f"No rows in parent table {ref_table}, assigning None to FK '{attr.name}' in '{entity.name}'")
                             row_data[attr.name] = None
                         else:
-                            ref_table, ref_column = attr.ref.split('.')
-                            parent_model = self.models[ref_table]
-                            parent_ids = self.session.query(getattr(parent_model, ref_column)).all()
-                            parent_ids = [id[0] for id in parent_ids]
-                            
-                            if not parent_ids:
-                                logger.warning(f"No rows in parent table {ref_table}, assigning None to FK '{attr.name}' in '{entity.name}'")
-                                row_data[attr.name] = None
-                            else:
-                                # Use ForeignKeyResolver for proper formula-based selection
-                                from .foreign_key import ForeignKeyResolver
-                                fk_resolver = ForeignKeyResolver()
-                                formula = getattr(attr.generator, 'formula', None)
-                                row_data[attr.name] = fk_resolver.select_parent_id(parent_ids, formula)
-                # Generate data based on other generator configuration
-                elif attr.generator:
-                    # If this attribute is assigned by any Assign step in flows,
-                    # leave it NULL initially (no placeholder), so simulation can set it.
-                    assigned_for_entity = self.flow_assigned_attributes.get(entity.name, set())
-                    if attr.name in assigned_for_entity:
-                        row_data[attr.name] = None
-                    else:
-                        row_data[attr.name] = self._generate_attribute_value(attr, i)
-                # Handle foreign keys without generator
-                elif attr.is_foreign_key:
-                    logger.error(f"Missing generator for foreign key '{attr.name}' in table '{entity.name}'. Assigning None.")
+                            # Use ForeignKeyResolver for proper formula-based selection
+                            formula = getattr(attr.generator, 'formula', None)
+                            value = self._fk_resolver.select_parent_id(parent_ids, formula)
+                            row_data[attr.name] = value.item() if isinstance(value, np.generic) else value
+            # Generate data based on other generator configuration
+            elif attr.generator:
+                # If this attribute is assigned by any Assign step in flows,
+                # leave it NULL initially (no placeholder), so simulation can set it.
+                assigned_for_entity = self.flow_assigned_attributes.get(entity.name, set())
+                if attr.name in assigned_for_entity:
                     row_data[attr.name] = None
-                # Default value for other attributes without generator - Set to NULL for manual/SQL population
                 else:
-                    logger.debug(f"No generator for attribute '{attr.name}' in table '{entity.name}'. Setting to NULL for manual population.")
-                    row_data[attr.name] = None
-            
-            # Create and add row
-            # Ensure row_data doesn't contain keys not present in the model if assigning None to FKs caused issues
-            valid_keys = {col.name for col in model_class.__table__.columns}
-            filtered_row_data = {k: v for k, v in row_data.items() if k in valid_keys}
-            
-            try:
-                 row = model_class(**filtered_row_data)
-                 self.session.add(row)
-            except Exception as e:
-                 logger.error(f"Error creating row for {entity.name} with data {filtered_row_data}: {e}")
-
-            self.session.add(row)
+                    row_data[attr.name] = self._generate_attribute_value(attr, i)
+            # Handle foreign keys without generator
+            elif attr.is_foreign_key:
+                logger.error(f"Missing generator for foreign key '{attr.name}' in table '{entity.name}'. Assigning None.")
+                row_data[attr.name] = None
+            # Default value for other attributes without generator - Set to NULL for manual/SQL population
+            else:
+                row_data[attr.name] = None
+        
+        # Later rows of a self-referencing table can point at this one
+        for ref_column, buffer in self._self_ref_ids.values():
+            value = row_data.get(ref_column)
+            if value is not None:
+                buffer.append(value)
+        
+        # Drop keys not present in the model, so each chunk is held only once
+        for key in row_data.keys() - self._valid_keys:
+            del row_data[key]
+        return row_data
+    
+    def _fetch_parent_ids(self, ref_table: str, ref_column: str) -> np.ndarray:
+        """
+        Stream a parent table's key column into a NumPy array.
         
-        # Commit after each table to make IDs available for foreign keys
-        self.session.commit()
+        Integer keys are packed into an ``int64`` array; other key types
+        (e.g. UUID strings) fall back to an object array.
+        
+        Args:
+            ref_table: Parent table name
+            ref_column: Parent key column name
+            
+        Returns:
+            1-D array of parent key values in table order
+        """
+        parent_table = self.models[ref_table].__table__
+        column = parent_table.c[ref_column]
+        count = self.session.execute(select(func.count()).select_from(parent_table)).scalar() or 0
+        result = self.session.execute(
+            select(column).execution_options(yield_per=self.chunk_size)
+        ).scalars()
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = object
+        if python_type is int:
+            return np.fromiter(result, dtype=np.int64, count=count)
+        ids = np.empty(count, dtype=object)
+        for idx, value in enumerate(result):
+            ids[idx] = value
+        return ids
+    
+    def _max_key(self, column) -> int:
+        """Largest value of an integer key column, or 0 for an empty table."""
+        return self.session.execute(select(func.max(column))).scalar() or 0
     
     def _get_num_rows(self, entity: Entity) -> int:
         """
@@ -3,8 +3,17 @@ Template-based data generation module.
 
 This module provides template string processing with variable substitution,
 support for random selection from lists, and template validation utilities.
+Templates are compiled once into positional format plans that can render
+whole blocks of rows.
 """
 
 from .generator import generate_from_template, validate_template, extract_template_variables
+from .compiler import CompiledTemplate, compile_template
 
-__all__ = ['generate_from_template', 'validate_template', 'extract_template_variables']
\ No newline at end of file
+__all__ = [
+    'generate_from_template',
+    'validate_template',
+    'extract_template_variables',
+    'CompiledTemplate',
+    'compile_template'
+]
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+Template compilation for fast, repeated rendering.
+
+A template such as ``"TK-{id}-{random_a,b}"`` is parsed once into a
+``str.format`` plan with one positional slot per placeholder. Rendering then
+skips regex matching entirely, and whole blocks of rows can be rendered from
+column sequences without building a context dict per row.
+"""
+
+import logging
+import random
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_PATTERN = re.compile(r'\{([^}]+)\}')
+
+
+class CompiledTemplate:
+    """A template parsed into a positional format plan."""
+
+    __slots__ = ('template', 'variables', '_format', '_slots')
+
+    def __init__(self, template: str):
+        """
+        Parse the template.
+
+        Args:
+            template: Template string with {variable} and {random_a,b,...} placeholders
+        """
+        self.template = template
+        # Each slot is ('var', name) or ('random', options)
+        slots: List[Tuple[str, Any]] = []
+        parts = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(template):
+            parts.append(self._escape(template[position:match.start()]))
+            var_name = match.group(1)
+            if var_name.startswith('random_'):
+                options = tuple(opt.strip() for opt in var_name[7:].split(','))
+                slots.append(('random', options))
+            else:
+                slots.append(('var', var_name))
+            parts.append(f"{{{len(slots) - 1}}}")
+            position = match.end()
+        parts.append(self._escape(template[position:]))
+
+        self._format = ''.join(parts)
+        self._slots = tuple(slots)
+        # Context variables the template needs, in first-use order
+        self.variables = tuple(dict.fromkeys(value for kind, value in slots if kind == 'var'))
+
+    @staticmethod
+    def _escape(text: str) -> str:
+        return text.replace('{', '{{').replace('}', '}}')
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        """
+        Render a single value.
+
+        Args:
+            context: Mapping of variable names to values
+
+        Returns:
+            Rendered string
+        """
+        if not self._slots:
+            return self.template
+        args = []
+        for kind, value in self._slots:
+            if kind == 'var':
+                if value in context:
+                    args.append(context[value])
+                else:
+                    logger.warning(f"Template variable '{value}' not found in context")
+                    args.append(f"{{Unknown: {value}}}")
+            else:
+                args.append(random.choice(value))
+        return self._format.format(*args)
+
+    def render_block(self, columns: Mapping[str, Sequence[Any]], count: int) -> List[str]:
+        """
+        Render a block of values at once.
+
+        Args:
+            columns: Mapping of variable name to a sequence of ``count`` values
+            count: Number of values to render
+
+        Returns:
+            List of rendered strings
+        """
+        if not self._slots:
+            return [self.template] * count
+        args = []
+        for kind, value in self._slots:
+            if kind == 'var':
+                column = columns.get(value)
+                if column is None:
+                    logger.warning(f"Template variable '{value}' not found in context")
+                    column = [f"{{Unknown: {value}}}"] * count
+                args.append(column)
+            else:
+                args.append(random.choices(value, k=count))
+        fmt = self._format.format
+        return [fmt(*row) for row in zip(*args)]
+
+    def render_ids(self, start_id: int, count: int, extra: Optional[Dict[str, Sequence[Any]]] = None) -> List[str]:
+        """
+        Render a block of values for consecutive ``{id}`` values.
+
+        Args:
+            start_id: 1-based id of the first row in the block
+            count: Number of rows
+            extra: Additional variable columns
+
+        Returns:
+            List of rendered strings
+        """
+        columns = dict(extra or {})
+        columns['id'] = range(start_id, start_id + count)
+        return self.render_block(columns, count)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(template: str) -> CompiledTemplate:
+    """
+    Compile a template string, reusing previously compiled templates.
+
+    Args:
+        template: Template string
+
+    Returns:
+        CompiledTemplate instance
+    """
+    return CompiledTemplate(template)
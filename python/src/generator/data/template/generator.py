@@ -2,11 +2,11 @@
 Template-based data generation for database entities.
 """
 
-import re
 import logging
-import random
 from typing import Dict, Any, Optional
 
+from .compiler import PLACEHOLDER_PATTERN, compile_template
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,32 +22,10 @@ def generate_from_template(template: str, context: Dict[str, Any], size: Optiona
     Returns:
         Generated data from template
     """
+    compiled = compile_template(template)
     if size is not None:
-        return [generate_from_template(template, context) for _ in range(size)]
-        
-    # Pattern to match variables in the template
-    pattern = r'\{([^}]+)\}'
-    
-    def replace_var(match):
-        var_name = match.group(1)
-        
-        # Check if the variable exists in the context
-        if var_name in context:
-            return str(context[var_name])
-            
-        # Handle special cases
-        if var_name.startswith('random_'):
-            # Random selection from a list
-            options_str = var_name[7:]  # Remove 'random_' prefix
-            options = [opt.strip() for opt in options_str.split(',')]
-            return random.choice(options)
-            
-        logger.warning(f"Template variable '{var_name}' not found in context")
-        return f"{{Unknown: {var_name}}}"
-        
-    # Replace all variables in the template
-    result = re.sub(pattern, replace_var, template)
-    return result
+        return [compiled.render(context) for _ in range(size)]
+    return compiled.render(context)
 
 
 def validate_template(template: str) -> tuple[bool, str]:
@@ -65,8 +43,7 @@ def validate_template(template: str) -> tuple[bool, str]:
     
     try:
         # Check for balanced braces
-        pattern = r'\{([^}]+)\}'
-        matches = re.findall(pattern, template)
+        matches = PLACEHOLDER_PATTERN.findall(template)
         
         # Check for empty variables
         for match in matches:
@@ -98,8 +75,7 @@ def extract_template_variables(template: str) -> list[str]:
     Returns:
         List of variable names found in the template
     """
-    pattern = r'\{([^}]+)\}'
-    matches = re.findall(pattern, template)
+    matches = PLACEHOLDER_PATTERN.findall(template)
     
     variables = []
     for match in matches:
@@ -5,18 +5,23 @@ Builds tables/relationships from config and fills them with synthetic data.
 
 import os
 import logging
+import random
 from typing import Optional, List
 from pathlib import Path
 from datetime import datetime
 
-from sqlalchemy import create_engine, inspect, text
+import numpy as np
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker
 
 from ..config_parser import DatabaseConfig, SimulationConfig
 from ..utils.file_operations import safe_delete_sqlite_file, ensure_database_closed
+from ..utils.row_counts import RowCountTracker
 
-from .schema import TableBuilder, DependencySorter
+from .schema import TableBuilder, DependencySorter, IndexBuilder
 from .data import DataPopulator
+from .data.faker_js import seed_fake_data
+from .cache import GeneratedDatabaseCache
 from .simulation import SimulationAttributeAnalyzer
 
 logger = logging.getLogger(__name__)
@@ -25,19 +30,40 @@ logger = logging.getLogger(__name__)
 class DatabaseGenerator:
     def __init__(self, config: DatabaseConfig, output_dir: str = "output",
                  dynamic_entity_tables: Optional[List[str]] = None,
-                 sim_config: Optional[SimulationConfig] = None):
-        """Initialize generator with configs and destination."""
+                 sim_config: Optional[SimulationConfig] = None,
+                 chunk_size: Optional[int] = None,
+                 memory_limit_mb: Optional[float] = None,
+                 bulk_load: bool = True,
+                 cache: Optional[GeneratedDatabaseCache] = None):
+        """
+        Initialize generator with configs and destination.
+        
+        Args:
+            config: Database configuration
+            output_dir: Directory for the generated database file
+            dynamic_entity_tables: Tables to leave empty for the simulator
+            sim_config: Simulation configuration used for attribute column detection
+            chunk_size: Rows generated and inserted per batch during population
+            memory_limit_mb: Memory ceiling for one batch of pending rows
+            bulk_load: Load into bare tables and build indexes / check foreign keys
+                afterwards (True), or build indexes up front and insert with
+                SQLite's default settings, without foreign key checks (False)
+            cache: Generated-database cache consulted for seeded runs
+        """
         self.config = config
         self.sim_config = sim_config
         self.output_dir = output_dir
         self.engine = None
         self.session = None
         self.dynamic_entity_tables = dynamic_entity_tables or []
+        self.bulk_load = bulk_load
+        self.cache = cache
         
         # Initialize components
         self.simulation_analyzer = SimulationAttributeAnalyzer(sim_config, config)
         self.table_builder = TableBuilder()
-        self.data_populator = DataPopulator()
+        self.index_builder = IndexBuilder()
+        self.data_populator = DataPopulator(chunk_size=chunk_size, memory_limit_mb=memory_limit_mb)
         
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
@@ -77,43 +103,99 @@ class DatabaseGenerator:
         if not safe_delete_sqlite_file(db_path):
             logger.warning(f"Could not delete existing database file, continuing anyway: {db_path}")
         
-        # Create SQLAlchemy engine with specific flags for better reliability
-        connection_string = f"sqlite:///{db_path}"
-        self.engine = create_engine(connection_string, echo=False)
-        
         # Analyze simulation config for flow-specific attributes
         flow_attributes = self.simulation_analyzer.analyze_simulation_attributes()
         # Attributes set during flows stay NULL at generation time
         entity_assigned_attrs = self.simulation_analyzer.get_entity_attribute_names_map(flow_attributes)
         
+        # Only seeded runs are reproducible, so only they can be served from the cache
+        seed = self.sim_config.random_seed if self.sim_config else None
+        cache_key = None
+        if seed is not None:
+            self._seed_generators(seed)
+            if self.cache is not None:
+                cache_key = self.cache.compute_key(
+                    self.config, flow_attributes, seed,
+                    chunk_size=self.data_populator.chunk_size,
+                    memory_limit_bytes=self.data_populator.memory_limit_bytes
+                )
+                if self.cache.get(cache_key, db_path):
+                    self.data_populator.collect_pending_formulas(self.config, self.dynamic_entity_tables)
+                    self._verify_database(db_path)
+                    return db_path
+        
+        # Tally inserted rows so readers get table sizes without COUNT(*) scans
+        row_counts = RowCountTracker(db_path, fresh=not os.path.exists(db_path))
+        
+        # Create SQLAlchemy engine with specific flags for better reliability
+        connection_string = f"sqlite:///{db_path}"
+        self.engine = create_engine(connection_string, echo=False)
+        event.listen(self.engine, "connect", self._configure_load_connection)
+        
         # Create tables
         models = self.table_builder.create_tables(self.config, self.engine, flow_attributes)
+        indexes = self.index_builder.plan_indexes(self.config, models)
+        if not self.bulk_load:
+            # Maintain indexes during inserts
+            self.index_builder.create_indexes(self.engine, indexes)
         
         # Create session
         Session = sessionmaker(bind=self.engine)
         self.session = Session()
         
         # Populate tables with data
-        self.data_populator.populate_tables(
-            models,
-            self.config,
-            self.session,
-            entity_assigned_attrs,
-            self.dynamic_entity_tables,
-        )
+        with row_counts:
+            self.data_populator.populate_tables(
+                models,
+                self.config,
+                self.session,
+                entity_assigned_attrs,
+                self.dynamic_entity_tables,
+            )
         
         # Commit and close session
         self.session.commit()
         self.session.close()
         
+        if self.bulk_load:
+            # Build indexes and validate references once, after all rows are in
+            self.index_builder.create_indexes(self.engine, indexes)
+            self.index_builder.validate_foreign_keys(self.engine)
+        with self.engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        
         # Dispose engine for safe file operations
         ensure_database_closed(self.engine)
+        row_counts.flush()
         
         # Verify the database file exists and is not empty
         self._verify_database(db_path)
         
+        if cache_key is not None:
+            self.cache.put(cache_key, db_path)
+        
         return db_path
     
+    def _seed_generators(self, seed: int):
+        """Seed the Python, NumPy and Faker.js generators used during population."""
+        random.seed(seed)
+        np.random.seed(seed)
+        seed_fake_data(seed)
+        logger.debug(f"Seeded data generators with {seed}")
+    
+    def _configure_load_connection(self, dbapi_connection, connection_record):
+        """Apply SQLite pragmas for the load phase to each new connection."""
+        if not self.bulk_load:
+            # Previous behaviour: SQLite defaults, foreign keys not enforced
+            return
+        cursor = dbapi_connection.cursor()
+        # Fresh file is discarded on failure, so durability during load is not needed
+        cursor.execute("PRAGMA foreign_keys=OFF")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+    
     def _verify_database(self, db_path: str):
         """Basic existence/table check for the generated DB."""
         if not os.path.exists(db_path):
@@ -7,5 +7,6 @@ for database generation.
 
 from .table_builder import TableBuilder
 from .dependency_sorter import DependencySorter
+from .index_builder import IndexBuilder
 
-__all__ = ['TableBuilder', 'DependencySorter']
\ No newline at end of file
+__all__ = ['TableBuilder', 'DependencySorter', 'IndexBuilder']
\ No newline at end of file
@@ -40,7 +40,9 @@ class DependencySorter:
             for attr in entity.attributes:
                 if attr.is_foreign_key and attr.ref:
                     ref_table, _ = attr.ref.split('.')
-                    dependencies.add(ref_table)
+                    # Self-references point at earlier rows of the same table
+                    if ref_table != entity.name:
+                        dependencies.add(ref_table)
             
             graph[entity.name] = dependencies
         
@@ -2,6 +2,13 @@
 Simulation module for discrete event simulation
 """
 
-from .core.simulator import EventSimulator
+
+def __getattr__(name):
+    # SimPy and NumPy load with the simulator on first use
+    if name == 'EventSimulator':
+        from .core.simulator import EventSimulator
+        return EventSimulator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ['EventSimulator'] 
\ No newline at end of file
@@ -5,9 +5,12 @@ Execution module for simulation engine
 from .flow_manager import FlowManager
 from .step_executor import StepExecutor
 from .entity_router import EntityRouter
+from .flow_graph import CompiledFlow, FlowGraph
 
 __all__ = [
     'FlowManager',
     'StepExecutor',
-    'EntityRouter'
+    'EntityRouter',
+    'CompiledFlow',
+    'FlowGraph'
 ]
\ No newline at end of file
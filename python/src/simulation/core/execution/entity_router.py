@@ -6,8 +6,10 @@ import logging
 from typing import Optional, TYPE_CHECKING
 import simpy
 
+from .flow_graph import FlowGraph
+
 if TYPE_CHECKING:
-    from ....config_parser import EventFlow, Step
+    from ....config_parser import EventFlow
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +23,16 @@ class EntityRouter:
     during flow execution.
     """
     
-    def __init__(self, env: simpy.Environment):
+    def __init__(self, env: simpy.Environment, flow_graph: Optional[FlowGraph] = None):
         """
         Initialize the entity router.
         
         Args:
             env: SimPy environment
+            flow_graph: Compiled flows (compiled on demand if not provided)
         """
         self.env = env
+        self.flow_graph = flow_graph or FlowGraph()
     
     def route_entity_from_create(self, entity_id: int, initial_step_id: str, flow: 'EventFlow',
                                 entity_table: str, event_flow: str, step_executor):
@@ -45,8 +49,7 @@ class EntityRouter:
         """
         try:
             # Find the initial step in the flow
-            initial_step = self._find_step_by_id(initial_step_id, flow)
-            if not initial_step:
+            if initial_step_id not in self.flow_graph.get(flow).index:
                 logger.error(f"Initial step {initial_step_id} not found in flow {flow.flow_id}")
                 return
             
@@ -76,8 +79,7 @@ class EntityRouter:
         """
         try:
             # Find the next step in the flow
-            next_step = self._find_step_by_id(next_step_id, flow)
-            if not next_step:
+            if next_step_id not in self.flow_graph.get(flow).index:
                 logger.error(f"Next step {next_step_id} not found in flow {flow.flow_id}")
                 return
             
@@ -90,19 +92,3 @@ class EntityRouter:
             
         except Exception as e:
             logger.error(f"Error routing entity {entity_id} from step {current_step_id} to {next_step_id}: {e}", exc_info=True)
-    
-    def _find_step_by_id(self, step_id: str, flow: 'EventFlow') -> Optional['Step']:
-        """
-        Find a step by its ID within a flow
-        
-        Args:
-            step_id: Step ID to find
-            flow: Event flow to search in
-            
-        Returns:
-            Step object or None if not found
-        """
-        for step in flow.steps:
-            if step.step_id == step_id:
-                return step
-        return None
@@ -0,0 +1,175 @@
+"""
+Compiled, immutable view of the configured event flows.
+
+Flows are configured as lists of steps that reference each other by ID.
+Compiling them once at simulator init turns every per-entity lookup into an
+index access: step IDs map to integer indexes, successors are integer arrays,
+the processor for each step is resolved from its type, and whether a step
+hands its resource group on to the next step is decided up front.
+"""
+
+import logging
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ....config_parser import EventFlow, Step, SimulationConfig
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_TYPES = ('create', 'batch')
+
+
+def _successor_ids(step: 'Step') -> Tuple[str, ...]:
+    """Step IDs an entity can move to after this step."""
+    ids = list(step.next_steps or [])
+    if step.decide_config:
+        ids.extend(outcome.next_step_id for outcome in step.decide_config.outcomes if outcome.next_step_id)
+    # Keep order while dropping duplicates
+    return tuple(dict.fromkeys(ids))
+
+
+class CompiledFlow:
+    """Index-based representation of a single event flow."""
+
+    __slots__ = ('flow', 'flow_id', 'steps', 'index', 'successors', 'processors',
+                 'group_ids', 'keeps_group', 'entry_points')
+
+    def __init__(self, flow: 'EventFlow', step_processor_factory=None):
+        """
+        Args:
+            flow: Event flow configuration
+            step_processor_factory: Factory used to resolve the processor of each step (optional)
+        """
+        steps = tuple(flow.steps)
+        index = {}
+        for i, step in enumerate(steps):
+            if step.step_id in index:
+                logger.warning(f"Duplicate step ID '{step.step_id}' in flow {flow.flow_id}; using the first one")
+                continue
+            index[step.step_id] = i
+
+        successors = []
+        for step in steps:
+            targets = []
+            for step_id in _successor_ids(step):
+                if step_id in index:
+                    targets.append(index[step_id])
+                else:
+                    logger.warning(f"Step {step.step_id} in flow {flow.flow_id} routes to unknown step '{step_id}'")
+            successors.append(tuple(targets))
+
+        group_ids = tuple(step.group_id for step in steps)
+        # A step keeps its group's resources when its (first) next step is in the same group
+        keeps_group = tuple(
+            bool(group_ids[i]) and bool(step.next_steps) and step.next_steps[0] in index
+            and group_ids[index[step.next_steps[0]]] == group_ids[i]
+            for i, step in enumerate(steps)
+        )
+
+        set_attr = object.__setattr__
+        set_attr(self, 'flow', flow)
+        set_attr(self, 'flow_id', flow.flow_id)
+        set_attr(self, 'steps', steps)
+        set_attr(self, 'index', index)
+        set_attr(self, 'successors', tuple(successors))
+        set_attr(self, 'processors', tuple(
+            step_processor_factory.get_processor(step.step_type) if step_processor_factory else None
+            for step in steps
+        ))
+        set_attr(self, 'group_ids', group_ids)
+        set_attr(self, 'keeps_group', keeps_group)
+        set_attr(self, 'entry_points', tuple(
+            i for i, step in enumerate(steps) if step.step_type in ENTRY_POINT_TYPES
+        ))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def keeps_group_resources(self, step_id: str) -> bool:
+        """Whether a step passes its group's resources on to its next step."""
+        i = self.index.get(step_id)
+        return self.keeps_group[i] if i is not None else False
+
+    def resolve_next(self, index: int, step_id: str) -> Optional[int]:
+        """
+        Get the index of the step an entity moves to after the step at ``index``.
+
+        The step's successor array is searched first; routes to steps that are
+        not declared as successors fall back to the ID index.
+
+        Args:
+            index: Index of the current step
+            step_id: ID of the next step returned by the step's processor
+
+        Returns:
+            Index of the next step, or None if the flow has no such step
+        """
+        steps = self.steps
+        for j in self.successors[index]:
+            if steps[j].step_id == step_id:
+                return j
+        return self.index.get(step_id)
+
+    def entry_steps(self) -> Tuple['Step', ...]:
+        """Get the steps that start entity processing (create/batch)."""
+        return tuple(self.steps[i] for i in self.entry_points)
+
+
+class FlowGraph:
+    """Compiled flows of a simulation, keyed by flow ID."""
+
+    def __init__(self, flows=(), step_processor_factory=None):
+        """
+        Args:
+            flows: Event flows to compile
+            step_processor_factory: Factory used to resolve step processors (optional)
+        """
+        self.step_processor_factory = step_processor_factory
+        self._flows: Dict[str, CompiledFlow] = {}
+        for flow in flows:
+            self._flows[flow.flow_id] = CompiledFlow(flow, step_processor_factory)
+
+    @classmethod
+    def from_config(cls, config: 'SimulationConfig', step_processor_factory=None) -> 'FlowGraph':
+        """
+        Compile all event flows of a simulation configuration.
+
+        Args:
+            config: Simulation configuration
+            step_processor_factory: Factory used to resolve step processors (optional)
+
+        Returns:
+            FlowGraph of the configured flows
+        """
+        event_sim = config.event_simulation if config else None
+        flows = event_sim.event_flows.flows if event_sim and event_sim.event_flows else []
+        graph = cls(flows, step_processor_factory)
+        logger.debug(f"Compiled {len(graph)} flows with {sum(len(f.steps) for f in graph)} steps")
+        return graph
+
+    def get(self, flow: 'EventFlow') -> CompiledFlow:
+        """
+        Get the compiled form of a flow, compiling flows that were not known at init.
+
+        Args:
+            flow: Event flow configuration
+
+        Returns:
+            CompiledFlow for the flow
+        """
+        compiled = self._flows.get(flow.flow_id)
+        if compiled is None or compiled.flow is not flow:
+            compiled = CompiledFlow(flow, self.step_processor_factory)
+            self._flows[flow.flow_id] = compiled
+        return compiled
+
+    def rebuild(self):
+        """Recompile all flows, e.g. after the factory's processors changed."""
+        for flow_id, compiled in list(self._flows.items()):
+            self._flows[flow_id] = CompiledFlow(compiled.flow, self.step_processor_factory)
+
+    def __iter__(self):
+        return iter(self._flows.values())
+
+    def __len__(self):
+        return len(self._flows)
@@ -4,6 +4,8 @@ import logging
 from typing import List, Dict, Optional, TYPE_CHECKING
 import simpy
 
+from .flow_graph import FlowGraph
+
 if TYPE_CHECKING:
     from ....config_parser import EventFlow, Step, SimulationConfig
 
@@ -14,7 +16,8 @@ class FlowManager:
     """Finds flow entry points (Create) and starts their processes."""
     
     def __init__(self, env: simpy.Environment, config: 'SimulationConfig', 
-                 step_processor_factory, flow_event_trackers: Dict, entity_manager):
+                 step_processor_factory, flow_event_trackers: Dict, entity_manager,
+                 flow_graph: Optional[FlowGraph] = None, entity_lifecycle=None):
         """
         Args:
             env: SimPy environment.
@@ -22,12 +25,17 @@ class FlowManager:
             step_processor_factory: Factory for step processors.
             flow_event_trackers: Flow-specific trackers.
             entity_manager: Entity manager instance.
+            flow_graph: Compiled flows (compiled from config if not provided).
+            entity_lifecycle: Tracks entities while they are in a flow (optional).
         """
         self.env = env
         self.config = config
         self.step_processor_factory = step_processor_factory
         self.flow_event_trackers = flow_event_trackers
         self.entity_manager = entity_manager
+        self.flow_graph = flow_graph or FlowGraph.from_config(config, step_processor_factory)
+        self.entity_lifecycle = entity_lifecycle
+        self._step_executor = None
     
     def start_create_modules(self):
         """
@@ -56,7 +64,7 @@ class FlowManager:
                 logger.warning(f"Flow {flow.flow_id} has multiple entry points: {entry_points}. All will be started.")
             
             # Start each entry point module
-            for step in flow.steps:
+            for step in self.flow_graph.get(flow).entry_steps():
                 if step.step_type == 'create' and step.create_config:
                     logger.debug(f"Starting Create module: {step.step_id} (table: {step.create_config.entity_table})")
                     
@@ -81,12 +89,9 @@ class FlowManager:
             List of step IDs that are entry points.
         """
         entry_points = []
-        entry_point_types = ['create', 'batch']  # Extensible for future module types
-        
-        for step in flow.steps:
-            if step.step_type in entry_point_types:
-                entry_points.append(step.step_id)
-                logger.debug(f"Identified entry point: {step.step_id} (type: {step.step_type})")
+        for step in self.flow_graph.get(flow).entry_steps():
+            entry_points.append(step.step_id)
+            logger.debug(f"Identified entry point: {step.step_id} (type: {step.step_type})")
         
         return entry_points
     
@@ -145,39 +150,30 @@ class FlowManager:
         """
         try:
             # Find the initial step in the flow
-            initial_step = self._find_step_by_id(initial_step_id, flow)
-            if not initial_step:
+            if initial_step_id not in self.flow_graph.get(flow).index:
                 logger.error(f"Initial step {initial_step_id} not found in flow {flow.flow_id}")
                 return
             
             logger.debug(f"Routing entity {entity_id} from table {entity_table} to step {initial_step_id}")
             
-            # Import StepExecutor here to avoid circular import
-            from .step_executor import StepExecutor
-            step_executor = StepExecutor(
-                self.env, self.step_processor_factory, self.flow_event_trackers
-            )
+            if self.entity_lifecycle is not None:
+                self.entity_lifecycle.entity_entered(entity_id, entity_table)
             
             # Start processing the entity from the initial step
             self.env.process(
-                step_executor.process_step(entity_id, initial_step_id, flow, entity_table, event_flow)
+                self._get_step_executor().process_step(entity_id, initial_step_id, flow, entity_table, event_flow)
             )
             
         except Exception as e:
             logger.error(f"Error routing entity {entity_id} from Create module: {e}", exc_info=True)
     
-    def _find_step_by_id(self, step_id: str, flow: 'EventFlow') -> Optional['Step']:
-        """
-        Find a step by its ID within a flow
-        
-        Args:
-            step_id: Step ID to find
-            flow: Event flow to search in
-            
-        Returns:
-            Step object or None if not found
-        """
-        for step in flow.steps:
-            if step.step_id == step_id:
-                return step
-        return None
+    def _get_step_executor(self):
+        """Get the step executor shared by all entities routed from Create modules."""
+        if self._step_executor is None:
+            # Import StepExecutor here to avoid circular import
+            from .step_executor import StepExecutor
+            self._step_executor = StepExecutor(
+                self.env, self.step_processor_factory, self.flow_event_trackers, self.flow_graph,
+                self.entity_lifecycle
+            )
+        return self._step_executor
@@ -4,25 +4,34 @@ import logging
 from typing import Dict, Optional, TYPE_CHECKING
 import simpy
 
+from .flow_graph import CompiledFlow, FlowGraph
+from ...utils.sim_logging import get_sim_logger, trace
+
 if TYPE_CHECKING:
-    from ....config_parser import EventFlow, Step
+    from ....config_parser import EventFlow
 
 logger = logging.getLogger(__name__)
+sim_log = get_sim_logger(__name__)
 
 
 class StepExecutor:
     """Runs a step via processors and continues flow routing."""
     
-    def __init__(self, env: simpy.Environment, step_processor_factory, flow_event_trackers: Dict):
+    def __init__(self, env: simpy.Environment, step_processor_factory, flow_event_trackers: Dict,
+                 flow_graph: Optional[FlowGraph] = None, entity_lifecycle=None):
         """
         Args:
             env: SimPy environment.
             step_processor_factory: Factory for step processors.
             flow_event_trackers: Flow-specific event trackers.
+            flow_graph: Compiled flows (compiled on demand if not provided).
+            entity_lifecycle: Notified when an entity's flow ends (optional).
         """
         self.env = env
         self.step_processor_factory = step_processor_factory
         self.flow_event_trackers = flow_event_trackers
+        self.flow_graph = flow_graph or FlowGraph(step_processor_factory=step_processor_factory)
+        self.entity_lifecycle = entity_lifecycle
     
     def process_step(self, entity_id: int, step_id: str, flow: 'EventFlow', 
                     entity_table: str, event_flow: str):
@@ -36,12 +45,22 @@ class StepExecutor:
             entity_table: Name of the entity table.
             event_flow: Identifier/label of the event flow.
         """
-        step = self._find_step_by_id(step_id, flow)
-        if not step:
+        compiled = self.flow_graph.get(flow)
+        index = compiled.index.get(step_id)
+        if index is None:
             logger.error(f"Step {step_id} not found in flow {flow.flow_id}")
             return
-        
-        logger.debug(f"Processing step {step_id} of type {step.step_type} for entity {entity_id}")
+        yield from self._process_step_at(entity_id, index, compiled, entity_table, event_flow)
+
+    def _process_step_at(self, entity_id: int, index: int, compiled: CompiledFlow,
+                         entity_table: str, event_flow: str):
+        """Process the step at an index of a compiled flow, then route through its successor array."""
+        flow = compiled.flow
+        step = compiled.steps[index]
+        step_id = step.step_id
+        sim_log.debug("Processing step %s of type %s for entity %s", step_id, step.step_type, entity_id)
+        trace(entity_id, "t=%.3f entity %s (%s) step %s [%s] in flow %s", self.env.now, entity_id,
+              entity_table, step_id, step.step_type, flow.flow_id)
         
         try:
             # Get flow-specific EventTracker
@@ -49,7 +68,8 @@ class StepExecutor:
             
             # Use the step processor factory to process the step
             step_generator = self.step_processor_factory.process_step(
-                entity_id, step, flow, entity_table, event_flow, flow_event_tracker
+                entity_id, step, flow, entity_table, event_flow, flow_event_tracker,
+                processor=compiled.processors[index]
             )
             
             # Process the step and get the next step ID
@@ -57,25 +77,23 @@ class StepExecutor:
             
             # Continue to next step if applicable
             if next_step_id:
-                self.env.process(self.process_step(entity_id, next_step_id, flow, entity_table, event_flow))
+                next_index = compiled.resolve_next(index, next_step_id)
+                if next_index is None:
+                    logger.error(f"Step {next_step_id} not found in flow {flow.flow_id}")
+                    self._entity_exited(entity_id, entity_table)
+                    return
+                self.env.process(self._process_step_at(entity_id, next_index, compiled, entity_table, event_flow))
             else:
-                logger.debug(f"Entity {entity_id} flow ended at step {step_id}")
+                sim_log.debug("Entity %s flow ended at step %s", entity_id, step_id)
+                trace(entity_id, "t=%.3f entity %s (%s) left flow %s at step %s", self.env.now, entity_id,
+                      entity_table, flow.flow_id, step_id)
+                self._entity_exited(entity_id, entity_table)
                 
         except Exception as e:
             logger.error(f"Error processing step {step_id} for entity {entity_id}: {str(e)}", exc_info=True)
-    
-    def _find_step_by_id(self, step_id: str, flow: 'EventFlow') -> Optional['Step']:
-        """
-        Find a step by its ID within a flow
-        
-        Args:
-            step_id: Step ID to find.
-            flow: Event flow to search in.
-            
-        Returns:
-            Step object or None if not found.
-        """
-        for step in flow.steps:
-            if step.step_id == step_id:
-                return step
-        return None
+            self._entity_exited(entity_id, entity_table)
+
+    def _entity_exited(self, entity_id: int, entity_table: str):
+        """Fire the lifecycle hook of an entity whose flow ended (last step, Release step or error)."""
+        if self.entity_lifecycle is not None:
+            self.entity_lifecycle.entity_exited(entity_id, entity_table)
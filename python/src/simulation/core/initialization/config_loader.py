@@ -6,15 +6,18 @@ import numpy as np
 import simpy
 from sqlalchemy import create_engine
 from sqlalchemy.pool import NullPool
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from ....config_parser import SimulationConfig, DatabaseConfig
 from ...termination.formula import TerminationFormulaParser, TerminationFormulaEvaluator
 from ...managers.resource_manager import ResourceManager
 from ...managers.entity_manager import EntityManager
 from ...managers.entity_attribute_manager import EntityAttributeManager
+from ..lifecycle.entity_lifecycle import EntityLifecycle
 from ...managers.queue_manager import QueueManager
 from ...processors import StepProcessorFactory
+from ..execution.flow_graph import FlowGraph
+from ...utils.random_streams import RandomStreamRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +25,8 @@ logger = logging.getLogger(__name__)
 class SimulatorInitializer:
     """Builds all core simulation components."""
 
-    def __init__(self, config: SimulationConfig, db_config: DatabaseConfig, db_path: str):
+    def __init__(self, config: SimulationConfig, db_config: DatabaseConfig, db_path: str,
+                 replication: Optional[int] = None):
         """
         Store configs/paths and prepare holders for components.
         
@@ -30,10 +34,12 @@ class SimulatorInitializer:
             config: Parsed simulation config.
             db_config: Parsed database config.
             db_path: Path to the SQLite database.
+            replication: Replication number; selects independent random streams for the same seed.
         """
         self.config = config
         self.db_config = db_config
         self.db_path = db_path
+        self.replication = replication
         
         # Core components - will be initialized
         self.env = None
@@ -41,8 +47,11 @@ class SimulatorInitializer:
         self.resource_manager = None
         self.entity_manager = None
         self.entity_attribute_manager = None
+        self.entity_lifecycle = None
         self.queue_manager = None
         self.step_processor_factory = None
+        self.flow_graph = None
+        self.random_streams = None
         
         # Tracking components
         self.processed_events = 0
@@ -80,7 +89,15 @@ class SimulatorInitializer:
         return self.engine
     
     def initialize_random_seed(self):
-        """Set random seeds if config provides one."""
+        """Restart the per-component random streams and seed the global generators."""
+        if self.random_streams is None:
+            self.random_streams = RandomStreamRegistry(self.config.random_seed, self.replication)
+        else:
+            self.random_streams.reset(self.config.random_seed, self.replication)
+
+        # Arrivals, durations, decisions, resource counts and foreign keys draw from
+        # the registry. Entity attribute values (generate_attribute_value, Faker and
+        # distribution formulas without a stream) still use the global generators.
         if self.config.random_seed is not None:
             random.seed(self.config.random_seed)
             np.random.seed(self.config.random_seed)
@@ -107,12 +124,14 @@ class SimulatorInitializer:
     def initialize_queue_manager(self):
         """Build queue manager (queues optional)."""
         queue_definitions = []
+        queue_logging = None
 
         # Extract queue definitions from event_simulation config
         if (hasattr(self.config, 'event_simulation') and
             self.config.event_simulation and
             hasattr(self.config.event_simulation, 'queues')):
             queue_definitions = self.config.event_simulation.queues or []
+            queue_logging = getattr(self.config.event_simulation, 'queue_logging', None)
 
         # Create QueueManager with database logging enabled
         self.queue_manager = QueueManager(
@@ -120,7 +139,8 @@ class SimulatorInitializer:
             queue_definitions,
             self.db_config,
             db_path=self.db_path,
-            start_date=self.config.start_date
+            start_date=self.config.start_date,
+            logging_config=queue_logging
         )
 
         if queue_definitions:
@@ -140,17 +160,24 @@ class SimulatorInitializer:
 
         # Initialize resource manager
         self.resource_manager = ResourceManager(
-            self.env, self.engine, self.db_path, self.db_config
+            self.env, self.engine, self.db_path, self.db_config,
+            random_streams=self.random_streams
         )
 
         # Initialize entity manager (using first flow's tracker for backward compatibility)
         event_tracker = next(iter(flow_event_trackers.values())) if flow_event_trackers else None
         self.entity_manager = EntityManager(
-            self.env, self.engine, self.db_path, self.config, self.db_config, event_tracker
+            self.env, self.engine, self.db_path, self.config, self.db_config, event_tracker,
+            random_streams=self.random_streams
         )
 
         # Initialize entity attribute manager for Arena-style assign functionality
-        self.entity_attribute_manager = EntityAttributeManager(self.entity_manager)
+        self.entity_attribute_manager = EntityAttributeManager(self.entity_manager, self.queue_manager)
+
+        # Free per-entity state when entities leave their flow
+        self.entity_lifecycle = EntityLifecycle(
+            self.env, self.entity_attribute_manager, self.resource_manager, self.entity_manager
+        )
 
         logger.debug("Initialized all manager components")
     
@@ -170,6 +197,11 @@ class SimulatorInitializer:
             self.queue_manager,  # Pass queue_manager to factory
             self.db_config  # Pass db_config for trigger processor
         )
+
+        # Compile flows once so routing never scans step lists
+        self.flow_graph = FlowGraph.from_config(self.config, self.step_processor_factory)
+        self.step_processor_factory.set_flow_graph(self.flow_graph)
+        self.step_processor_factory.set_random_streams(self.random_streams)
         logger.debug("Initialized step processor factory")
     
     def get_initialization_state(self) -> Dict[str, Any]:
@@ -185,8 +217,11 @@ class SimulatorInitializer:
             'resource_manager': self.resource_manager,
             'entity_manager': self.entity_manager,
             'entity_attribute_manager': self.entity_attribute_manager,
+            'entity_lifecycle': self.entity_lifecycle,
             'queue_manager': self.queue_manager,
             'step_processor_factory': self.step_processor_factory,
+            'flow_graph': self.flow_graph,
+            'random_streams': self.random_streams,
             'processed_events': self.processed_events,
             'entities_processed': self.entities_processed,
             'termination_reason': self.termination_reason,
@@ -1,16 +1,17 @@
 """Create EventTrackers per flow for resource/event logging."""
 
 import logging
+import time
 from typing import Dict, Optional
 
 from ....config_parser import SimulationConfig, DatabaseConfig
-from ...managers.event_tracker import EventTracker
+from ...managers.event_tracker import EventTracker, EventTrackingService
 
 logger = logging.getLogger(__name__)
 
 
 class FlowEventTrackerSetup:
-    """Creates flow-scoped EventTrackers."""
+    """Creates flow-scoped EventTrackers on top of one shared EventTrackingService."""
 
     def __init__(self, db_path: str, config: SimulationConfig, db_config: DatabaseConfig):
         """
@@ -22,6 +23,7 @@ class FlowEventTrackerSetup:
         self.db_path = db_path
         self.config = config
         self.db_config = db_config
+        self.tracking_service: Optional[EventTrackingService] = None
     
     def initialize_flow_event_trackers(self) -> Dict[str, EventTracker]:
         """
@@ -43,6 +45,19 @@ class FlowEventTrackerSetup:
             logger.error("Could not determine resource table name. EventTrackers cannot be created.")
             return flow_trackers
         
+        started = time.perf_counter()
+        try:
+            service = EventTrackingService(
+                self.db_path,
+                self.config.start_date,
+                resource_table_name=resource_table_name,
+                db_config=self.db_config
+            )
+        except Exception as e:
+            logger.error(f"Failed to create event tracking service: {e}")
+            return flow_trackers
+        self.tracking_service = service
+        
         for flow in flows:
             flow_id = flow.flow_id
             
@@ -70,7 +85,8 @@ class FlowEventTrackerSetup:
                     resource_table_name=resource_table_name,
                     entity_table_name=entity_table_name,
                     bridge_table_config=bridge_table_config,  # May be None
-                    db_config=self.db_config
+                    db_config=self.db_config,
+                    service=service
                 )
                 flow_trackers[flow_id] = event_tracker
                 
@@ -79,9 +95,16 @@ class FlowEventTrackerSetup:
             except Exception as e:
                 logger.error(f"Failed to create EventTracker for flow {flow_id}: {e}")
         
-        logger.debug(f"Initialized {len(flow_trackers)} flow-specific EventTrackers")
+        phases = ', '.join(f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in service.phase_times.items())
+        logger.info(f"Initialized {len(flow_trackers)} flow-specific EventTrackers in "
+                    f"{(time.perf_counter() - started) * 1000:.1f} ms ({phases})")
         return flow_trackers
     
+    def flush(self):
+        """Write the tracking rows still buffered by the shared service."""
+        if self.tracking_service is not None:
+            self.tracking_service.flush()
+    
     def _get_resource_table_name(self) -> Optional[str]:
         """
         Get the resource table name from configuration.
@@ -185,7 +208,7 @@ class FlowEventTrackerSetup:
                 }
             
             # Note: Resource-Bridge and Entity-Bridge patterns are handled dynamically
-            # by event_tracker._get_dynamic_bridge() when target_bridge_table is specified
+            # by EventTrackingService._get_dynamic_bridge() when target_bridge_table is specified
             # in the simulation step config. Here we only need to find the primary bridge.
         
         return None
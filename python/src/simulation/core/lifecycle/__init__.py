@@ -2,15 +2,20 @@
 Lifecycle module for simulation engine.
 
 This module handles simulation lifecycle management including termination
-monitoring, cleanup operations, and metrics collection.
+monitoring, cleanup operations, metrics collection, progress publishing and
+the tracking of entities while they are inside a flow.
 """
 
 from .termination import TerminationMonitor
 from .cleanup import DatabaseCleanup
 from .metrics import MetricsCollector
+from .progress import ProgressChannel
+from .entity_lifecycle import EntityLifecycle
 
 __all__ = [
     'TerminationMonitor',
     'DatabaseCleanup',
-    'MetricsCollector'
+    'MetricsCollector',
+    'ProgressChannel',
+    'EntityLifecycle'
 ]
\ No newline at end of file
@@ -34,10 +34,10 @@ class DatabaseCleanup:
             timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
             logger.info(f"[{timestamp}] [PYTHON] Starting simulator cleanup to prevent EBUSY errors for: {self.db_path}")
 
-            # Dispose QueueManager engine first (if exists)
+            # Flush and dispose QueueManager engine first (if exists)
             if queue_manager and hasattr(queue_manager, 'engine') and queue_manager.engine:
                 logger.info(f"[{timestamp}] [PYTHON] Disposing QueueManager engine for: {self.db_path}")
-                queue_manager.engine.dispose()
+                queue_manager.dispose()
                 logger.info(f"[{timestamp}] [PYTHON] QueueManager engine disposed for: {self.db_path}")
 
             # Dispose EventTracker engine
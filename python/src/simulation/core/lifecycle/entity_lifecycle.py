@@ -0,0 +1,128 @@
+"""Track entities while they are inside a flow and free their state when they leave it."""
+
+import logging
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EntityLifecycle:
+    """
+    Counts live entities and releases their per-entity state on flow exit.
+
+    An entity is live from the moment a Create step routes it into its flow
+    until the flow ends (last step or Release step). On exit its unsaved
+    attributes are written to its table, and its in-memory attributes,
+    leftover group resources and current event type are dropped, so memory
+    follows the entities in flight rather than all entities ever created.
+    Additional exit hooks can be registered with ``add_exit_hook``.
+    """
+
+    def __init__(self, env, entity_attribute_manager=None, resource_manager=None, entity_manager=None):
+        """
+        Args:
+            env: SimPy environment.
+            entity_attribute_manager: Attribute store to flush and clear on exit (optional).
+            resource_manager: Resource manager whose group allocations are released on exit (optional).
+            entity_manager: Entity manager whose per-entity event types are dropped on exit (optional).
+        """
+        self.env = env
+        self.entity_attribute_manager = entity_attribute_manager
+        self.resource_manager = resource_manager
+        self.entity_manager = entity_manager
+        self._live: Dict[Tuple[str, Any], int] = {}  # (entity_table, entity_id) -> paths in flight
+        # Per-entity state is keyed by ID only, so it is freed once no table has that ID live
+        self._live_ids: Dict[Any, int] = {}
+        self._exit_hooks: List[Callable[[Any, str], None]] = []
+        self.entered = 0
+        self.exited = 0
+        self.peak_live = 0
+        self.peak_time = 0.0
+
+    @property
+    def live_count(self) -> int:
+        """Number of entities currently inside a flow."""
+        return len(self._live)
+
+    def add_exit_hook(self, hook: Callable[[Any, str], None]):
+        """
+        Register a callable run with (entity_id, entity_table) when an entity leaves its flow.
+
+        Args:
+            hook: Callback; exceptions it raises are logged and ignored
+        """
+        self._exit_hooks.append(hook)
+
+    def entity_entered(self, entity_id: Any, entity_table: str):
+        """
+        Record that an entity started processing in a flow.
+
+        Args:
+            entity_id: Entity ID
+            entity_table: Table of the entity
+        """
+        key = (entity_table, entity_id)
+        if key not in self._live:
+            self.entered += 1
+        self._live[key] = self._live.get(key, 0) + 1
+        self._live_ids[entity_id] = self._live_ids.get(entity_id, 0) + 1
+        if len(self._live) > self.peak_live:
+            self.peak_live = len(self._live)
+            self.peak_time = self.env.now
+
+    def entity_exited(self, entity_id: Any, entity_table: str):
+        """
+        Record that an entity's flow ended and free its state once it has no path left in a flow.
+
+        Args:
+            entity_id: Entity ID
+            entity_table: Table of the entity
+        """
+        key = (entity_table, entity_id)
+        remaining = self._live.get(key)
+        if remaining is None:
+            return
+        if remaining > 1:
+            self._live[key] = remaining - 1
+        else:
+            del self._live[key]
+            self.exited += 1
+            for hook in self._exit_hooks:
+                try:
+                    hook(entity_id, entity_table)
+                except Exception as e:
+                    logger.warning(f"Entity exit hook failed for entity {entity_id}: {e}")
+
+        remaining_ids = self._live_ids.get(entity_id, 0) - 1
+        if remaining_ids > 0:
+            self._live_ids[entity_id] = remaining_ids
+            return
+        self._live_ids.pop(entity_id, None)
+        self._release_state(entity_id, entity_table)
+
+    def _release_state(self, entity_id: Any, entity_table: str):
+        """Flush and drop the per-entity state held by the managers."""
+        try:
+            if self.entity_attribute_manager is not None:
+                self.entity_attribute_manager.release_entity(entity_id, entity_table)
+            if self.resource_manager is not None:
+                self.resource_manager.release_entity_groups(entity_id)
+            if self.entity_manager is not None:
+                self.entity_manager.entity_current_event_types.pop(entity_id, None)
+        except Exception as e:
+            logger.warning(f"Error releasing state of entity {entity_id}: {e}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get live entity statistics.
+
+        Returns:
+            Dictionary with live, peak (high-water mark), entered and completed entity counts
+        """
+        return {
+            'live_entities': self.live_count,
+            'peak_live_entities': self.peak_live,
+            'peak_time_minutes': self.peak_time,
+            'entered_entities': self.entered,
+            'completed_entities': self.exited
+        }
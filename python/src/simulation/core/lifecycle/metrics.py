@@ -54,6 +54,11 @@ class MetricsCollector:
             if hasattr(self.initializer, 'queue_manager') and self.initializer.queue_manager:
                 queue_stats = self.initializer.queue_manager.get_statistics()
 
+            # Get live entity statistics
+            lifecycle_stats = {}
+            if getattr(self.initializer, 'entity_lifecycle', None):
+                lifecycle_stats = self.initializer.entity_lifecycle.get_statistics()
+
             # Get entity count
             entity_count = 0
             if hasattr(self.initializer, 'entity_manager') and self.initializer.entity_manager:
@@ -70,6 +75,7 @@ class MetricsCollector:
                 'processed_events': self.initializer.processed_events,
                 'resource_utilization': resource_stats,
                 'entity_attributes': attribute_stats,
+                'entity_lifecycle': lifecycle_stats,
                 'queue_statistics': queue_stats,  # Add queue statistics
                 # Legacy field for backward compatibility
                 'duration_days': getattr(self.config, 'duration_days', None)
@@ -134,6 +140,39 @@ class MetricsCollector:
             logger.error(f"Error getting queue statistics: {e}")
             return {}
 
+    def get_progress_snapshot(self, detailed: bool = False) -> Dict[str, Any]:
+        """
+        Get a lightweight snapshot of run progress.
+
+        Args:
+            detailed: Also include current queue lengths and per-type resource utilization.
+
+        Returns:
+            Dictionary with simulated time, entity and event counts.
+        """
+        entity_count = 0
+        if hasattr(self.initializer, 'entity_manager') and self.initializer.entity_manager:
+            entity_count = self.initializer.entity_manager.entity_count
+        snapshot = {
+            'simulation_time_minutes': self.env.now,
+            'entity_count': entity_count,
+            'entities_processed': self.initializer.entities_processed,
+            'processed_events': self.initializer.processed_events,
+        }
+        entity_lifecycle = getattr(self.initializer, 'entity_lifecycle', None)
+        if entity_lifecycle is not None:
+            snapshot['live_entities'] = entity_lifecycle.live_count
+        if detailed:
+            queue_manager = getattr(self.initializer, 'queue_manager', None)
+            snapshot['queue_lengths'] = {
+                name: queue_manager.get_queue_length(name) for name in queue_manager.queues
+            } if queue_manager else {}
+            resource_manager = getattr(self.initializer, 'resource_manager', None)
+            snapshot['resource_utilization'] = (
+                resource_manager.get_utilization_snapshot() if resource_manager else {}
+            )
+        return snapshot
+
     def log_simulation_progress(self):
         """Log current simulation progress."""
         try:
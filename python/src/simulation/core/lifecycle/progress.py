@@ -0,0 +1,128 @@
+"""Publish periodic progress snapshots of a running simulation to subscribers."""
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+# Default wall-clock seconds between published snapshots
+DEFAULT_WALL_INTERVAL = 1.0
+
+
+class ProgressChannel:
+    """
+    Publish/subscribe channel for live simulation progress.
+
+    Snapshots are published at a simulated-time cadence, a wall-clock cadence,
+    or both, whichever comes first. With no subscribers ``maybe_publish`` returns
+    after a single attribute check and no snapshot is ever built.
+    """
+
+    def __init__(self, metrics_collector, sim_interval: Optional[float] = None,
+                 wall_interval: Optional[float] = DEFAULT_WALL_INTERVAL):
+        """
+        Args:
+            metrics_collector: MetricsCollector used to build snapshots.
+            sim_interval: Simulated minutes between snapshots (None disables).
+            wall_interval: Wall-clock seconds between snapshots (None disables).
+        """
+        self.metrics_collector = metrics_collector
+        self.sim_interval = sim_interval
+        self.wall_interval = wall_interval
+        self._subscribers: List[ProgressCallback] = []
+
+        self._started_at = None
+        self._last_wall = 0.0
+        self._last_sim = 0.0
+        self._last_events = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        """Whether anybody is listening."""
+        return bool(self._subscribers)
+
+    def subscribe(self, callback: ProgressCallback) -> Callable[[], None]:
+        """
+        Register a progress subscriber.
+
+        Args:
+            callback: Called with each snapshot dictionary.
+
+        Returns:
+            Function that removes the subscription.
+        """
+        self._subscribers.append(callback)
+
+        def unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+        return unsubscribe
+
+    def start(self):
+        """Mark the start of the run for events-per-second rates."""
+        self._started_at = self._last_wall = time.monotonic()
+        self._last_sim = 0.0
+        self._last_events = 0
+
+    def maybe_publish(self, sim_now: float) -> bool:
+        """
+        Publish a snapshot if a cadence interval has elapsed.
+
+        Args:
+            sim_now: Current simulated time in minutes.
+
+        Returns:
+            True if a snapshot was published.
+        """
+        if not self._subscribers:
+            return False
+
+        wall_now = time.monotonic()
+        if self._started_at is None:
+            self.start()
+        due = (
+            (self.sim_interval is not None and sim_now - self._last_sim >= self.sim_interval) or
+            (self.wall_interval is not None and wall_now - self._last_wall >= self.wall_interval)
+        )
+        if not due:
+            return False
+
+        self.publish(wall_now)
+        return True
+
+    def publish(self, wall_now: Optional[float] = None, final: bool = False):
+        """
+        Build a snapshot and deliver it to every subscriber.
+
+        Args:
+            wall_now: Current monotonic time (defaults to now).
+            final: Whether this is the last snapshot of the run.
+        """
+        if not self._subscribers:
+            return
+        if wall_now is None:
+            wall_now = time.monotonic()
+        if self._started_at is None:
+            self.start()
+
+        snapshot = self.metrics_collector.get_progress_snapshot(detailed=True)
+        processed = snapshot.get('processed_events', 0)
+        elapsed = wall_now - self._started_at
+        interval = wall_now - self._last_wall
+        snapshot['wall_time_seconds'] = round(elapsed, 3)
+        snapshot['events_per_second'] = round((processed - self._last_events) / interval, 2) if interval > 0 else 0.0
+        snapshot['average_events_per_second'] = round(processed / elapsed, 2) if elapsed > 0 else 0.0
+        snapshot['final'] = final
+
+        self._last_wall = wall_now
+        self._last_sim = snapshot.get('simulation_time_minutes', 0.0)
+        self._last_events = processed
+
+        for callback in list(self._subscribers):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.debug(f"Progress subscriber failed: {e}")
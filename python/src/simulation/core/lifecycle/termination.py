@@ -49,6 +49,10 @@ class TerminationMonitor:
                 # Check termination conditions
                 should_terminate, reason = self._check_termination_conditions()
                 
+                # Cooperative cancellation from outside the simulation
+                if not should_terminate and self.simulator_ref.poll_external_control():
+                    should_terminate, reason = True, "cancelled"
+                
                 if should_terminate:
                     self.termination_reason = reason
                     logger.info(f"Termination condition met: {reason}")
@@ -0,0 +1,313 @@
+"""
+Built-in profiler for simulation runs.
+
+``SimulationProfiler`` instruments one ``EventSimulator`` while it runs:
+
+- wall time spent executing each step, by processor type and step ID
+  (only the time a step's generator is running, not the simulated time it
+  waits on SimPy events);
+- database time per statement category (``insert entity``,
+  ``tracker write``, ``sql expression``, ``count``, ``other``), attributed to
+  the step that issued it;
+- SimPy events processed per second;
+- peak resident set size of the whole process, and how far the run raised
+  it (in a long-lived API server the process peak may predate the run).
+
+The instrumentation is only installed while profiling, so normal runs pay
+nothing. ``write_reports`` writes a JSON report and a collapsed-stack file
+(``frame;frame;frame <microseconds>`` per line, readable by flamegraph.pl,
+speedscope and similar tools) next to the output database.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+ENGINE_FRAME = 'engine'
+
+# Tables written by the event trackers and queue logging
+TRACKER_TABLE_PREFIX = 'sim_'
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _insert_table(statement: str) -> str:
+    """Table name of an INSERT statement."""
+    parts = statement.split(None, 4)
+    if len(parts) < 3:
+        return ''
+    # INSERT [OR ...] INTO <table>
+    try:
+        index = [p.upper() for p in parts].index('INTO')
+    except ValueError:
+        return ''
+    if index + 1 >= len(parts):
+        return ''
+    return parts[index + 1].split('(')[0].strip('"`[]')
+
+
+class SimulationProfiler:
+    """Collects timing for one simulator run; use as a context manager around ``run()``."""
+
+    def __init__(self, simulator):
+        """
+        Args:
+            simulator: EventSimulator to instrument (initialized, not yet run)
+        """
+        self.simulator = simulator
+        self.step_times: Dict[Tuple[str, str], float] = {}  # (step_type, step_id) -> seconds
+        self.step_calls: Dict[Tuple[str, str], int] = {}  # (step_type, step_id) -> resumptions
+        self.db_times: Dict[Tuple[Optional[Tuple[str, str]], str], float] = {}  # (step key, category) -> seconds
+        self.db_counts: Dict[str, int] = {}
+        self.simpy_events = 0
+        self.wall_time = 0.0
+        self._bridge_tables = {
+            entity.name for entity in getattr(simulator.db_config, 'entities', None) or []
+            if entity.type == 'bridge'
+        }
+        self._current_step: Optional[Tuple[str, str]] = None
+        self._thread_id = None
+        self._started = None
+        self._rss_at_start: Optional[float] = None
+        self._rss_at_stop: Optional[float] = None
+        self._restore = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def start(self):
+        """Install the instrumentation."""
+        self._thread_id = threading.get_ident()
+        factory = self.simulator.initializer.step_processor_factory
+        original_process_step = factory.process_step
+
+        def process_step(entity_id, step, *args, **kwargs):
+            generator = original_process_step(entity_id, step, *args, **kwargs)
+            return self._timed(generator, (step.step_type, step.step_id))
+
+        factory.process_step = process_step
+        self._restore.append(lambda: delattr(factory, 'process_step'))
+
+        env = self.simulator.initializer.env
+        original_step = env.step
+
+        def step():
+            self.simpy_events += 1
+            original_step()
+
+        env.step = step
+        self._restore.append(lambda: delattr(env, 'step'))
+
+        event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        self._restore.append(lambda: event.remove(Engine, 'before_cursor_execute', self._before_cursor_execute))
+        self._restore.append(lambda: event.remove(Engine, 'after_cursor_execute', self._after_cursor_execute))
+        self._rss_at_start = _peak_rss_mb()
+        self._started = time.perf_counter()
+
+    def stop(self):
+        """Remove the instrumentation."""
+        if self._started is not None:
+            self.wall_time = time.perf_counter() - self._started
+            self._started = None
+            self._rss_at_stop = _peak_rss_mb()
+        while self._restore:
+            try:
+                self._restore.pop()()
+            except Exception as e:
+                logger.debug(f"Error removing profiler instrumentation: {e}")
+
+    def _timed(self, generator, key: Tuple[str, str]):
+        """Run a step generator, adding the time of each resumption to its step."""
+        perf_counter = time.perf_counter
+        value, error = None, None
+        while True:
+            outer, self._current_step = self._current_step, key
+            started = perf_counter()
+            try:
+                if error is not None:
+                    yielded = generator.throw(error)
+                else:
+                    yielded = generator.send(value)
+            except StopIteration as stop:
+                self._add_step_time(key, perf_counter() - started)
+                self._current_step = outer
+                return stop.value
+            except BaseException:
+                self._add_step_time(key, perf_counter() - started)
+                self._current_step = outer
+                raise
+            self._add_step_time(key, perf_counter() - started)
+            self._current_step = outer
+            value, error = None, None
+            try:
+                value = yield yielded
+            except BaseException as e:
+                error = e
+
+    def _add_step_time(self, key: Tuple[str, str], seconds: float):
+        self.step_times[key] = self.step_times.get(key, 0.0) + seconds
+        self.step_calls[key] = self.step_calls.get(key, 0) + 1
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == self._thread_id:
+            conn.info.setdefault('_profiler_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() != self._thread_id:
+            return
+        starts = conn.info.get('_profiler_started')
+        if not starts:
+            return
+        seconds = time.perf_counter() - starts.pop()
+        category = self.categorize(statement)
+        key = (self._current_step, category)
+        self.db_times[key] = self.db_times.get(key, 0.0) + seconds
+        self.db_counts[category] = self.db_counts.get(category, 0) + 1
+
+    def categorize(self, statement: str) -> str:
+        """
+        Statement category of a SQL statement.
+
+        Args:
+            statement: SQL text
+
+        Returns:
+            One of 'insert entity', 'tracker write', 'count', 'sql expression', 'other'
+        """
+        head = statement.lstrip()[:16].upper()
+        if head.startswith('INSERT'):
+            table = _insert_table(statement)
+            if table.startswith(TRACKER_TABLE_PREFIX) or table in self._bridge_tables:
+                return 'tracker write'
+            return 'insert entity'
+        if head.startswith('SELECT') and 'COUNT(' in statement.upper():
+            return 'count'
+        if head.startswith(('SELECT', 'UPDATE', 'DELETE', 'WITH')):
+            return 'sql expression'
+        return 'other'
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Build the profile report.
+
+        Returns:
+            Dictionary with wall time, per-step and per-category timings,
+            SimPy events per second, the process peak RSS and the run's growth
+            of it (0 when the run stayed below an earlier peak)
+        """
+        db_by_category: Dict[str, float] = {}
+        db_by_step: Dict[Tuple[str, str], float] = {}
+        for (step_key, category), seconds in self.db_times.items():
+            db_by_category[category] = db_by_category.get(category, 0.0) + seconds
+            if step_key is not None:
+                db_by_step[step_key] = db_by_step.get(step_key, 0.0) + seconds
+
+        by_processor: Dict[str, float] = {}
+        steps = []
+        for (step_type, step_id), seconds in sorted(self.step_times.items(), key=lambda item: -item[1]):
+            by_processor[step_type] = by_processor.get(step_type, 0.0) + seconds
+            steps.append({
+                'processor': step_type,
+                'step_id': step_id,
+                'wall_seconds': round(seconds, 6),
+                'db_seconds': round(db_by_step.get((step_type, step_id), 0.0), 6),
+                'resumptions': self.step_calls.get((step_type, step_id), 0),
+            })
+
+        simulated_minutes = self.simulator.initializer.env.now
+        peak_rss = self._rss_at_stop if self._rss_at_stop is not None else _peak_rss_mb()
+        return {
+            'wall_seconds': round(self.wall_time, 6),
+            'simulated_minutes': simulated_minutes,
+            'simpy_events': self.simpy_events,
+            'simpy_events_per_second': round(self.simpy_events / self.wall_time, 1) if self.wall_time > 0 else None,
+            'process_peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+            'run_peak_rss_growth_mb': (round(max(0.0, peak_rss - self._rss_at_start), 1)
+                                       if peak_rss is not None and self._rss_at_start is not None else None),
+            'processors': {name: round(seconds, 6) for name, seconds in
+                           sorted(by_processor.items(), key=lambda item: -item[1])},
+            'steps': steps,
+            'db': {
+                category: {'seconds': round(seconds, 6), 'statements': self.db_counts.get(category, 0)}
+                for category, seconds in sorted(db_by_category.items(), key=lambda item: -item[1])
+            },
+        }
+
+    def collapsed_stacks(self):
+        """
+        Yield collapsed-stack lines (``run;frame;... <microseconds>``).
+
+        Step frames hold the step's own time; the database time it issued is
+        a child frame per statement category. Time outside all steps is
+        reported under ``run;engine``.
+        """
+        db_by_step: Dict[Optional[Tuple[str, str]], float] = {}
+        for (step_key, category), seconds in self.db_times.items():
+            db_by_step[step_key] = db_by_step.get(step_key, 0.0) + seconds
+            frames = ['run', ENGINE_FRAME] if step_key is None else ['run', step_key[0], step_key[1]]
+            yield self._stack_line(frames + [f"db:{category}"], seconds)
+
+        for step_key, seconds in self.step_times.items():
+            yield self._stack_line(['run', step_key[0], step_key[1]], seconds - db_by_step.get(step_key, 0.0))
+
+        engine_time = self.wall_time - sum(self.step_times.values()) - db_by_step.get(None, 0.0)
+        yield self._stack_line(['run', ENGINE_FRAME], engine_time)
+
+    @staticmethod
+    def _stack_line(frames, seconds: float) -> str:
+        name = ';'.join(str(frame).replace(';', '_').replace(' ', '_') for frame in frames)
+        return f"{name} {max(0, int(round(seconds * 1e6)))}"
+
+    def write_reports(self, db_path: str) -> Dict[str, Any]:
+        """
+        Write the JSON report and the collapsed-stack file next to the database.
+
+        Args:
+            db_path: Path of the simulated database
+
+        Returns:
+            Summary with the report paths, wall time, events per second and RSS figures
+        """
+        base = os.path.splitext(str(db_path))[0]
+        report_path = f"{base}.profile.json"
+        collapsed_path = f"{base}.profile.folded"
+        report = self.report()
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for line in self.collapsed_stacks():
+                if not line.endswith(' 0'):
+                    f.write(line + '\n')
+        logger.info(f"Profile written to {report_path} and {collapsed_path}")
+        return {
+            'report_path': report_path,
+            'collapsed_path': collapsed_path,
+            'wall_seconds': report['wall_seconds'],
+            'simpy_events_per_second': report['simpy_events_per_second'],
+            'process_peak_rss_mb': report['process_peak_rss_mb'],
+            'run_peak_rss_growth_mb': report['run_peak_rss_growth_mb'],
+        }
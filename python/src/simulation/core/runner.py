@@ -8,11 +8,11 @@ import os
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Any, Union
+from typing import Dict, Any, Callable, Optional, Union
 
-from ...config_parser import parse_sim_config, parse_sim_config_from_string
-from ...config_parser import parse_db_config, parse_db_config_from_string # Import db config parsers
+from ...config_parser import load_configs
 from .simulator import EventSimulator
+from .profiler import SimulationProfiler
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +34,13 @@ def ensure_simulation_tables(sim_config, db_path: Union[str, Path], db_config=No
 # Add a call to ensure_simulation_tables in run_simulation
 def run_simulation(sim_config_path_or_content: Union[str, Path],
                    db_config_path_or_content: Union[str, Path],
-                   db_path: Union[str, Path]) -> Dict[str, Any]:
+                   db_path: Union[str, Path],
+                   should_stop: Optional[Callable[[], bool]] = None,
+                   on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                   progress_sim_interval: Optional[float] = None,
+                   progress_wall_interval: Optional[float] = None,
+                   replication: Optional[int] = None,
+                   profile: bool = False) -> Dict[str, Any]:
     """
     Run a simulation based on configuration, ensuring required tables exist.
     
@@ -42,39 +48,36 @@ def run_simulation(sim_config_path_or_content: Union[str, Path],
         sim_config_path_or_content: Path to the simulation configuration file or YAML content string
         db_config_path_or_content: Path to the database configuration file or YAML content string.
         db_path: Path to the SQLite database
+        should_stop: Optional callback polled during the run to cancel it cooperatively
+        on_progress: Optional callback receiving periodic progress snapshots
+        progress_sim_interval: Simulated minutes between progress snapshots
+        progress_wall_interval: Wall-clock seconds between progress snapshots
+        replication: Optional replication number for independent runs of the same seed
+        profile: Profile the run and write ``<db>.profile.json`` and a collapsed-stack
+            ``<db>.profile.folded`` next to the database; the summary is added as ``results['profile']``
         
     Returns:
         Dictionary with simulation results
     """
-    # Parse database configuration first
-    db_config = None
-    if isinstance(db_config_path_or_content, (str, Path)) and os.path.exists(db_config_path_or_content) and os.path.isfile(db_config_path_or_content):
-        logger.info(f"Parsing database config file: {db_config_path_or_content}")
-        db_config = parse_db_config(db_config_path_or_content)
-    elif isinstance(db_config_path_or_content, str):
-        logger.info("Parsing database config from content string")
-        db_config = parse_db_config_from_string(db_config_path_or_content)
-    else:
-        raise ValueError("Invalid db_config_path_or_content provided.")
-        
-    # Parse simulation configuration with database config
-    sim_config = None
-    if isinstance(sim_config_path_or_content, (str, Path)) and os.path.exists(sim_config_path_or_content) and os.path.isfile(sim_config_path_or_content):
-        logger.info(f"Parsing simulation config file: {sim_config_path_or_content}")
-        sim_config = parse_sim_config(sim_config_path_or_content, db_config)
-    elif isinstance(sim_config_path_or_content, str):
-        logger.info("Parsing simulation config from content string")
-        sim_config = parse_sim_config_from_string(sim_config_path_or_content, db_config)
-    else:
-        raise ValueError("Invalid sim_config_path_or_content provided.")
+    # Parse both configurations (served from the parsed-config cache when unchanged)
+    db_config, sim_config = load_configs(sim_config_path_or_content, db_config_path_or_content)
     
     # Ensure necessary tables exist
     ensure_simulation_tables(sim_config, db_path, db_config)
     
     # Create and run simulator
     logger.info("Initializing EventSimulator...")
-    simulator = EventSimulator(config=sim_config, db_config=db_config, db_path=db_path)
-    results = simulator.run()
+    simulator = EventSimulator(config=sim_config, db_config=db_config, db_path=db_path,
+                               should_stop=should_stop, on_progress=on_progress,
+                               progress_sim_interval=progress_sim_interval,
+                               progress_wall_interval=progress_wall_interval,
+                               replication=replication)
+    if profile:
+        with SimulationProfiler(simulator) as profiler:
+            results = simulator.run()
+        results['profile'] = profiler.write_reports(db_path)
+    else:
+        results = simulator.run()
     
     logger.info(f"Simulation completed: {results}")
     return results
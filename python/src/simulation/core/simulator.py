@@ -1,12 +1,16 @@
 """SimPy-based simulator that runs configured flows and resources."""
 
 import logging
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Callable, Optional
 
 from ...config_parser import SimulationConfig, DatabaseConfig
+from ...utils.result_indexes import build_result_indexes
+from ...utils.row_counts import RowCountTracker
 from .initialization import SimulatorInitializer, FlowEventTrackerSetup, ResourceInitializer
 from .execution import FlowManager
-from .lifecycle import TerminationMonitor, DatabaseCleanup, MetricsCollector
+from .lifecycle import TerminationMonitor, DatabaseCleanup, MetricsCollector, ProgressChannel
+from ..utils.sim_logging import configure_sim_logging
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +23,15 @@ class EventSimulator:
     and wraps termination/metrics/cleanup.
     """
 
-    def __init__(self, config: SimulationConfig, db_config: DatabaseConfig, db_path: str):
+    # Wall-clock seconds between stop checks
+    CONTROL_INTERVAL = 0.5
+
+    def __init__(self, config: SimulationConfig, db_config: DatabaseConfig, db_path: str,
+                 should_stop: Optional[Callable[[], bool]] = None,
+                 on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 progress_sim_interval: Optional[float] = None,
+                 progress_wall_interval: Optional[float] = None,
+                 replication: Optional[int] = None):
         """
         Wire up configs and build all subcomponents.
         
@@ -27,13 +39,28 @@ class EventSimulator:
             config: Parsed simulation config.
             db_config: Parsed database config.
             db_path: Path to the SQLite database.
+            should_stop: Optional callback polled during the run; returning True
+                stops the simulation cooperatively with reason 'cancelled'.
+            on_progress: Optional callback subscribed to the progress channel.
+            progress_sim_interval: Simulated minutes between progress snapshots.
+            progress_wall_interval: Wall-clock seconds between progress snapshots
+                (defaults to the channel default when neither interval is given).
+            replication: Optional replication number; replications of one seed use
+                independent random streams and can run in parallel.
         """
         self.config = config
         self.db_config = db_config
         self.db_path = db_path
         
+        # External control (job cancellation and progress reporting)
+        self.stop_requested = False
+        self._should_stop = should_stop
+        self._next_control_poll = 0.0
+        self._progress_sim_interval = progress_sim_interval
+        self._progress_wall_interval = progress_wall_interval
+        
         # Initialize core components using modular architecture
-        self.initializer = SimulatorInitializer(config, db_config, db_path)
+        self.initializer = SimulatorInitializer(config, db_config, db_path, replication)
         self.tracker_setup = FlowEventTrackerSetup(db_path, config, db_config)
         self.cleanup_handler = DatabaseCleanup(db_path)
         
@@ -41,14 +68,21 @@ class EventSimulator:
         self.flow_manager = None
         self.termination_monitor = None
         self.metrics_collector = None
+        self.progress = None
         self.resource_initializer = None
         self.flow_event_trackers = None
         
         # Set up all components
         self._initialize_all_components()
+        if on_progress is not None:
+            self.progress.subscribe(on_progress)
     
     def _initialize_all_components(self):
         """Set up env, DB engine, managers, processors, trackers, and lifecycle hooks."""
+        # Apply per-subsystem log levels and entity tracing before any hot-path logging
+        event_sim = self.config.event_simulation
+        configure_sim_logging(getattr(event_sim, 'logging', None) if event_sim else None)
+        
         # Initialize core SimPy environment and database
         self.initializer.initialize_environment()
         self.initializer.initialize_database_engine()
@@ -72,7 +106,8 @@ class EventSimulator:
         # Initialize execution components
         self.flow_manager = FlowManager(
             self.initializer.env, self.config, self.initializer.step_processor_factory,
-            self.flow_event_trackers, self.initializer.entity_manager
+            self.flow_event_trackers, self.initializer.entity_manager,
+            self.initializer.flow_graph, self.initializer.entity_lifecycle
         )
         
         # Initialize lifecycle components
@@ -82,6 +117,14 @@ class EventSimulator:
         self.metrics_collector = MetricsCollector(
             self.config, self.initializer.env, self.initializer
         )
+        if self._progress_sim_interval is None and self._progress_wall_interval is None:
+            self.progress = ProgressChannel(self.metrics_collector)
+        else:
+            self.progress = ProgressChannel(
+                self.metrics_collector,
+                sim_interval=self._progress_sim_interval,
+                wall_interval=self._progress_wall_interval
+            )
         
         logger.debug("All simulation components initialized successfully")
     
@@ -92,6 +135,9 @@ class EventSimulator:
         Returns:
             Dict with termination reason and collected metrics.
         """
+        row_counts = RowCountTracker(self.db_path)
+        row_counts.start()
+        completed = False
         try:
             # Set random seed again to ensure consistency
             self.initializer.initialize_random_seed()
@@ -111,21 +157,71 @@ class EventSimulator:
             termination_event = self.termination_monitor.start_monitoring()
             
             # Run simulation until the termination monitor process exits
+            self.progress.start()
             self.initializer.env.run(until=termination_event)
+            self.progress.publish(final=True)
             
             # Clean up any remaining allocated resources
             self._cleanup_remaining_resources()
             
+            # Write buffered event/allocation/queue rows while row counts are still tracked
+            self.tracker_setup.flush()
+            if self.initializer.queue_manager is not None:
+                self.initializer.queue_manager.flush()
+            
             logger.debug(f"Simulation completed. Processed {self.initializer.processed_events} events for {self.initializer.entity_manager.entity_count} entities")
             
             # Collect and return final results
-            return self.metrics_collector.collect_final_results(
+            results = self.metrics_collector.collect_final_results(
                 self.termination_monitor.get_termination_reason()
             )
+            completed = True
+            return results
             
         finally:
+            row_counts.stop()
             # ALWAYS clean up database connections to prevent EBUSY errors on Windows
             self._cleanup_database_connections()
+            # Record table sizes for result readers; a failed run leaves them to COUNT(*)
+            if completed:
+                resource_manager = self.initializer.resource_manager
+                build_result_indexes(self.db_path, getattr(resource_manager, 'resource_type_columns', None))
+                row_counts.flush()
+            else:
+                row_counts.invalidate()
+    
+    def request_stop(self):
+        """Ask the running simulation to stop at the next termination check."""
+        self.stop_requested = True
+    
+    def poll_external_control(self) -> bool:
+        """
+        Publish due progress snapshots and check for a stop request.
+        
+        Stop checks are throttled by wall-clock time; with no subscribers and
+        no stop callback this is a couple of attribute checks.
+        
+        Returns:
+            True if the simulation should stop.
+        """
+        if self.stop_requested:
+            return True
+        self.progress.maybe_publish(self.initializer.env.now)
+        if self._should_stop is None:
+            return False
+        
+        now = time.monotonic()
+        if now < self._next_control_poll:
+            return False
+        self._next_control_poll = now + self.CONTROL_INTERVAL
+        
+        try:
+            if self._should_stop():
+                logger.info("Stop requested, ending simulation early")
+                self.stop_requested = True
+        except Exception as e:
+            logger.debug(f"Stop check failed: {e}")
+        return self.stop_requested
     
     def _cleanup_remaining_resources(self):
         """Release any resources still allocated."""
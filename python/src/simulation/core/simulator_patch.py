@@ -82,7 +82,15 @@ class SafeEventTracker:
             logger.debug("Skipping resource allocation recording during shutdown")
             return
         return self._tracker.record_resource_allocation(*args, **kwargs)
-    
+
+    @safe_database_operation
+    def record_resource_allocations(self, *args, **kwargs):
+        """Safe wrapper for record_resource_allocations"""
+        if self._shutdown:
+            logger.debug("Skipping resource allocation recording during shutdown")
+            return
+        return self._tracker.record_resource_allocations(*args, **kwargs)
+
     def __getattr__(self, name):
         """Delegate other methods to the wrapped tracker"""
         return getattr(self._tracker, name)
\ No newline at end of file
@@ -5,11 +5,12 @@ Simulation manager components
 from .entity_manager import EntityManager
 from .entity_attribute_manager import EntityAttributeManager
 from .resource_manager import ResourceManager
-from .event_tracker import EventTracker
+from .event_tracker import EventTracker, EventTrackingService
 
 __all__ = [
     'EntityManager',
     'EntityAttributeManager', 
     'ResourceManager',
-    'EventTracker'
+    'EventTracker',
+    'EventTrackingService'
 ]
\ No newline at end of file
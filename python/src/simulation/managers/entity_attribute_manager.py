@@ -6,7 +6,7 @@ supporting Arena-style Assign module functionality.
 """
 
 import logging
-from typing import Dict, Union, Optional, Any
+from typing import Dict, Iterable, Set, Union, Optional, Any
 from threading import Lock
 
 logger = logging.getLogger(__name__)
@@ -20,16 +20,20 @@ class EntityAttributeManager:
     assigned by Assign modules during simulation execution.
     """
     
-    def __init__(self, entity_manager=None):
+    def __init__(self, entity_manager=None, queue_manager=None):
         """Initialize the entity attribute manager.
         
         Args:
             entity_manager: Optional entity manager reference for db_config access
+            queue_manager: Optional queue manager, notified so waiting entities are re-prioritised
         """
         # Storage: {entity_id: {attribute_name: value}}
         self._entity_attributes: Dict[int, Dict[str, Union[str, int, float]]] = {}
+        # Attributes set but not yet written to the entity's table: {entity_id: {attribute_name}}
+        self._dirty: Dict[int, Set[str]] = {}
         self._lock = Lock()  # Thread safety for concurrent access
         self.entity_manager = entity_manager  # For db_config access
+        self.queue_manager = queue_manager
         
     def set_attribute(self, entity_id: int, attribute_name: str, value: Union[str, int, float]) -> bool:
         """
@@ -52,8 +56,12 @@ class EntityAttributeManager:
                 self._entity_attributes[entity_id] = {}
             
             self._entity_attributes[entity_id][attribute_name] = value
+            self._dirty.setdefault(entity_id, set()).add(attribute_name)
             logger.debug(f"Set attribute '{attribute_name}' = {value} for entity {entity_id}")
-            return True
+
+        if self.queue_manager is not None:
+            self.queue_manager.update_entity_attribute(entity_id, attribute_name, value)
+        return True
     
     def get_attribute(self, entity_id: int, attribute_name: str, entity_table: str = None) -> Optional[Union[str, int, float]]:
         """
@@ -140,11 +148,58 @@ class EntityAttributeManager:
             True if entity had attributes to clear, False if no attributes existed
         """
         with self._lock:
+            self._dirty.pop(entity_id, None)
             if entity_id in self._entity_attributes:
                 del self._entity_attributes[entity_id]
                 logger.debug(f"Cleared all attributes for entity {entity_id}")
                 return True
             return False
+
+    def mark_persisted(self, entity_id: int, attribute_names: Iterable[str]) -> None:
+        """
+        Mark attributes as written to the entity's table.
+        
+        Args:
+            entity_id: Entity ID
+            attribute_names: Names of the attributes that were written
+        """
+        with self._lock:
+            dirty = self._dirty.get(entity_id)
+            if dirty is None:
+                return
+            dirty.difference_update(attribute_names)
+            if not dirty:
+                del self._dirty[entity_id]
+
+    def release_entity(self, entity_id: int, entity_table: Optional[str] = None) -> int:
+        """
+        Write an entity's unsaved attributes to its table and drop its in-memory attributes.
+        
+        Only attributes that are columns of the entity table are written; the
+        others only ever lived in memory.
+        
+        Args:
+            entity_id: Entity ID
+            entity_table: Table of the entity (no write without it)
+            
+        Returns:
+            Number of attributes written
+        """
+        with self._lock:
+            attributes = self._entity_attributes.pop(entity_id, None) or {}
+            dirty = self._dirty.pop(entity_id, None) or set()
+        
+        pending = {name: attributes[name] for name in dirty if name in attributes}
+        if not pending or not entity_table or self.entity_manager is None:
+            return 0
+        
+        entity_config = self.entity_manager.get_entity_config(entity_table)
+        columns = {attr.name for attr in entity_config.attributes} if entity_config else set()
+        pending = {name: value for name, value in pending.items() if name in columns}
+        if pending and self.entity_manager.update_entity_attributes_batch(entity_id, entity_table, pending):
+            logger.debug(f"Wrote {len(pending)} unsaved attributes of entity {entity_id} to {entity_table}")
+            return len(pending)
+        return 0
     
     def get_entity_count(self) -> int:
         """
@@ -184,5 +239,6 @@ class EntityAttributeManager:
         with self._lock:
             cleared_count = len(self._entity_attributes)
             self._entity_attributes.clear()
+            self._dirty.clear()
             if cleared_count > 0:
                 logger.info(f"Cleared attributes for {cleared_count} entities")
\ No newline at end of file
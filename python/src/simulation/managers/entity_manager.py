@@ -5,7 +5,7 @@ This module handles entity creation and management for the simulation.
 """
 
 import logging
-import random
+import sqlite3
 from datetime import timedelta
 from typing import Dict, List, Tuple, Any, Optional
 import dataclasses
@@ -18,9 +18,13 @@ from ...distributions import generate_from_distribution
 from ...generator.data.attribute_generator import generate_attribute_value
 from ...generator.data.type_processor import process_value_for_type
 from ..utils.column_resolver import ColumnResolver
+from ..utils.random_streams import RandomStreamRegistry
 
 logger = logging.getLogger(__name__)
 
+# Bound parameters per multi-row INSERT (SQLite's historical default limit is 999)
+BULK_INSERT_MAX_VARIABLES = 999
+
 class EntityManager:
     """
     Manages entities for the event-based simulation.
@@ -28,7 +32,7 @@ class EntityManager:
     Handles entity creation, event creation, and relationship management.
     """
     
-    def __init__(self, env, engine, db_path, config, db_config, event_tracker):
+    def __init__(self, env, engine, db_path, config, db_config, event_tracker, random_streams=None):
         """
         Initialize the entity manager
         
@@ -39,6 +43,7 @@ class EntityManager:
             config: Simulation configuration
             db_config: Database configuration
             event_tracker: Event tracker instance
+            random_streams: RandomStreamRegistry for foreign key selection (optional)
         """
         self.env = env
         self.engine = engine
@@ -46,6 +51,9 @@ class EntityManager:
         self.config = config
         self.db_config = db_config
         self.event_tracker = event_tracker
+        self.random_streams = random_streams if random_streams is not None else RandomStreamRegistry(
+            getattr(config, 'random_seed', None)
+        )
         
         # Initialize column resolver for strict column type resolution
         if not db_config:
@@ -57,10 +65,38 @@ class EntityManager:
         
         # Counter for entities
         self.entity_count = 0
+        # Entities created during the run per table, and rows each table had before
+        self.created_by_table: Dict[str, int] = {}
+        self._initial_row_counts: Dict[str, int] = {}
+        # Tables whose inserts during the run all come from Create and Trigger steps
+        self._counted_tables = self._compute_counted_tables()
         
         # Precompute attributes that will be assigned by flows, per entity table
         self._assigned_attrs_by_entity = self._compute_assigned_attributes_by_entity()
 
+    def _compute_counted_tables(self) -> set:
+        """
+        Get the tables populated by Create and Trigger steps.
+
+        Both report their inserts through ``record_created`` /
+        ``record_inserted``, so these tables can be counted in memory. Other
+        writers (bridge and event rows, SQL steps) do not report theirs.
+        """
+        event_sim = getattr(self.config, 'event_simulation', None)
+        if not event_sim or not event_sim.event_flows:
+            return set()
+        flows = event_sim.event_flows.flows if hasattr(event_sim.event_flows, 'flows') else event_sim.event_flows
+        tables = set()
+        for flow in flows or []:
+            for step in flow.steps:
+                step_type = getattr(step, 'step_type', None)
+                if step_type == 'create' and step.create_config and step.create_config.entity_table:
+                    tables.add(step.create_config.entity_table)
+                elif step_type == 'trigger' and step.trigger_config and step.trigger_config.target_table:
+                    tables.add(step.trigger_config.target_table)
+        bridge_tables = {entity.name for entity in self.db_config.entities if entity.type in ('bridge', 'event')}
+        return tables - bridge_tables
+
     def _compute_assigned_attributes_by_entity(self) -> Dict[str, set]:
         """
         Analyze the simulation config to determine which entity attributes
@@ -181,6 +217,15 @@ class EntityManager:
             logger.error(f"Error batch updating attributes for entity {entity_id} in {entity_table}: {e}")
             return False
     
+    def _get_fk_random_stream(self, entity_table: str, column: str):
+        """Get the random stream of a foreign key column."""
+        return self.random_streams.stream('fk', f"{entity_table}.{column}")
+
+    @staticmethod
+    def _choose_parent_id(parent_ids: List[Any], rng):
+        """Pick a parent ID uniformly from a random stream."""
+        return parent_ids[int(rng.integers(len(parent_ids)))]
+
     def get_entity_config(self, entity_name: str) -> Optional[DbEntity]:
         """Find entity configuration by name."""
         if not self.db_config:
@@ -212,6 +257,150 @@ class EntityManager:
 
         return self.get_table_by_type('entity'), self.get_table_by_type('resource')
 
+    def _build_entity_row(self, session, entity_table: str, entity_config: DbEntity,
+                          initial_data: Optional[Dict[str, Any]] = None, row_offset: int = 0,
+                          parent_ids_cache: Optional[Dict[str, List[Any]]] = None) -> Tuple[Dict[str, Any], Any]:
+        """
+        Generate the column values of a new entity row.
+
+        Args:
+            session: SQLAlchemy session
+            entity_table: Name of the entity table
+            entity_config: Database configuration of the entity
+            initial_data: Optional attributes to set explicitly (overrides generators)
+            row_offset: Position of the row within a batch (for template PKs)
+            parent_ids_cache: Parent IDs per foreign key reference, shared within a batch
+
+        Returns:
+            Tuple of (row data, generated primary key or None for auto-increment)
+        """
+        pk_column = self.column_resolver.get_primary_key(entity_table)
+        
+        # Check if PK has a custom generator
+        pk_attr = next((attr for attr in entity_config.attributes if attr.is_primary_key), None)
+        generated_pk = None
+        
+        if pk_attr and pk_attr.generator:
+            # PK has a custom generator (e.g., faker uuid) - generate value
+            gen_dict = dataclasses.asdict(pk_attr.generator) if pk_attr.generator else None
+            attr_config_dict = {
+                'name': pk_attr.name,
+                'generator': gen_dict
+            }
+            
+            # For template generators, we need the next sequence number to support {id}
+            row_index = 0
+            if getattr(pk_attr.generator, 'type', None) == 'template':
+                try:
+                    # Use count as a proxy for the next row index (0-based)
+                    # The template generator will add 1 to this for the {id} variable
+                    count_result = session.execute(text(f'SELECT COUNT(*) FROM "{entity_table}"')).scalar()
+                    row_index = (int(count_result) if count_result is not None else 0) + row_offset
+                except Exception as e:
+                    logger.warning(f"Could not determine row count for {entity_table}: {e}")
+            
+            generated_pk = generate_attribute_value(attr_config_dict, row_index)
+            generated_pk = process_value_for_type(generated_pk, pk_attr.type)
+            logger.debug(f"Generated custom PK value for {pk_attr.name}: {generated_pk}")
+        
+        row_data = {}
+        
+        # Include generated PK if using custom generator
+        if generated_pk is not None:
+            row_data[pk_column] = generated_pk
+        
+        # Apply initial data if provided
+        if initial_data:
+            for key, value in initial_data.items():
+                row_data[key] = value
+        
+        # Generate values for other attributes
+        for attr in entity_config.attributes:
+            if attr.is_primary_key:
+                continue  # Already handled above
+            
+            # Skip if already populated by initial_data
+            if attr.name in row_data:
+                continue
+            
+            # Handle foreign key generator specifically
+            if attr.generator and attr.generator.type == "foreign_key":
+                if not attr.ref:
+                    logger.error(f"Foreign key attribute '{attr.name}' in table '{entity_table}' missing 'ref'. Assigning None.")
+                    row_data[attr.name] = None
+                else:
+                    ref_table, ref_column = attr.ref.split('.')
+                    # Query the parent table for valid IDs (once per batch)
+                    parent_ids = parent_ids_cache.get(attr.ref) if parent_ids_cache is not None else None
+                    if parent_ids is None:
+                        sql_query = text(f'SELECT "{ref_column}" FROM "{ref_table}"')
+                        result = session.execute(sql_query).fetchall()
+                        parent_ids = [id[0] for id in result]
+                        if parent_ids_cache is not None:
+                            parent_ids_cache[attr.ref] = parent_ids
+                    
+                    if not parent_ids:
+                        logger.warning(f"No rows in parent table {ref_table}, assigning None to FK '{attr.name}' in '{entity_table}'")
+                        row_data[attr.name] = None
+                    else:
+                        # Use user-defined distribution if present, else random
+                        rng = self._get_fk_random_stream(entity_table, attr.name)
+                        if attr.generator.formula:
+                            # Use distribution formula for FK selection
+                            from ...distributions import generate_from_distribution
+                            try:
+                                # For FK, we need to map the generated value to parent_ids
+                                generated_value = generate_from_distribution(attr.generator.formula, rng=rng)
+                                if isinstance(generated_value, (int, float)):
+                                    # If numeric, use as index (clamp to valid range)
+                                    index = int(generated_value) % len(parent_ids)
+                                    row_data[attr.name] = parent_ids[index]
+                                else:
+                                    # If string/categorical, try to find in parent_ids, else use random
+                                    row_data[attr.name] = self._choose_parent_id(parent_ids, rng)
+                            except Exception as e:
+                                logger.warning(f"Error using formula for FK '{attr.name}': {e}. Using random assignment.")
+                                row_data[attr.name] = self._choose_parent_id(parent_ids, rng)
+                        else:
+                            # Uniform random assignment if no distribution is provided
+                            row_data[attr.name] = self._choose_parent_id(parent_ids, rng)
+            elif attr.generator:
+                # If this attribute is assigned later in flows for this entity,
+                # leave it NULL at creation time (no placeholder default).
+                assigned_for_entity = self._assigned_attrs_by_entity.get(entity_table, set())
+                if attr.name in assigned_for_entity:
+                    continue
+                # Convert generator dataclass to dict for the utility function
+                gen_dict = dataclasses.asdict(attr.generator) if attr.generator else None
+                attr_config_dict = {
+                    'name': attr.name,
+                    'generator': gen_dict
+                }
+                # Pass 0 as row_index placeholder - most generators (faker, distribution) 
+                # don't use it. Template generators needing sequential IDs should be avoided
+                # for simulation-created entities or use the actual PK post-INSERT.
+                generated_value = generate_attribute_value(attr_config_dict, 0)
+                # Apply type-aware processing
+                row_data[attr.name] = process_value_for_type(generated_value, attr.type)
+            else:
+                # Handle attributes without generators if necessary (e.g., default NULL or specific value)
+                # For now, let the DB handle defaults or NULL
+                pass
+        
+        # Check if the table has a datetime column and populate it automatically
+        try:
+            if entity_config:
+                for attr in entity_config.attributes:
+                    if attr.type in ['datetime', 'timestamp'] and attr.name not in row_data:
+                        # Calculate the current simulation datetime
+                        creation_datetime = self.config.start_date + timedelta(minutes=self.env.now)
+                        row_data[attr.name] = creation_datetime
+                        logger.debug(f"Added {attr.name}={creation_datetime} for entity in {entity_table}")
+        except Exception as e:
+            logger.warning(f"Error setting datetime columns for {entity_table}: {e}")
+
+        return row_data, generated_pk
+
     def create_entity(self, session, entity_table: str, initial_data: Optional[Dict[str, Any]] = None) -> int:
         """
         Create a new entity in the database, populating attributes based on generators.
@@ -230,137 +419,10 @@ class EntityManager:
                 logger.error(f"Database configuration not found for entity: {entity_table}")
                 return None
 
-            pk_column = self.column_resolver.get_primary_key(entity_table)
-            
-            # Check if PK has a custom generator
-            pk_attr = next((attr for attr in entity_config.attributes if attr.is_primary_key), None)
-            generated_pk = None
-            
-            if pk_attr and pk_attr.generator:
-                # PK has a custom generator (e.g., faker uuid) - generate value
-                gen_dict = dataclasses.asdict(pk_attr.generator) if pk_attr.generator else None
-                attr_config_dict = {
-                    'name': pk_attr.name,
-                    'generator': gen_dict
-                }
-                
-                # For template generators, we need the next sequence number to support {id}
-                row_index = 0
-                if getattr(pk_attr.generator, 'type', None) == 'template':
-                    try:
-                        # Use count as a proxy for the next row index (0-based)
-                        # The template generator will add 1 to this for the {id} variable
-                        count_result = session.execute(text(f'SELECT COUNT(*) FROM "{entity_table}"')).scalar()
-                        row_index = int(count_result) if count_result is not None else 0
-                    except Exception as e:
-                        logger.warning(f"Could not determine row count for {entity_table}: {e}")
-                
-                generated_pk = generate_attribute_value(attr_config_dict, row_index)
-                generated_pk = process_value_for_type(generated_pk, pk_attr.type)
-                logger.debug(f"Generated custom PK value for {pk_attr.name}: {generated_pk}")
-            
-            row_data = {}
-            
-            # Include generated PK if using custom generator
-            if generated_pk is not None:
-                row_data[pk_column] = generated_pk
-            
-            # Apply initial data if provided
-            if initial_data:
-                for key, value in initial_data.items():
-                    row_data[key] = value
-            
-            # Generate values for other attributes
-            for attr in entity_config.attributes:
-                if attr.is_primary_key:
-                    continue  # Already handled above
-                
-                # Skip if already populated by initial_data
-                if attr.name in row_data:
-                    continue
-                
-                # Handle foreign key generator specifically
-                if attr.generator and attr.generator.type == "foreign_key":
-                    if not attr.ref:
-                        logger.error(f"Foreign key attribute '{attr.name}' in table '{entity_table}' missing 'ref'. Assigning None.")
-                        row_data[attr.name] = None
-                    else:
-                        ref_table, ref_column = attr.ref.split('.')
-                        # Query the parent table for valid IDs
-                        sql_query = text(f'SELECT "{ref_column}" FROM "{ref_table}"')
-                        result = session.execute(sql_query).fetchall()
-                        parent_ids = [id[0] for id in result]
-                        
-                        if not parent_ids:
-                            logger.warning(f"No rows in parent table {ref_table}, assigning None to FK '{attr.name}' in '{entity_table}'")
-                            row_data[attr.name] = None
-                        else:
-                            # Use user-defined distribution if present, else random
-                            if attr.generator.formula:
-                                # Use distribution formula for FK selection
-                                from ...distributions import generate_from_distribution
-                                try:
-                                    # For FK, we need to map the generated value to parent_ids
-                                    generated_value = generate_from_distribution(attr.generator.formula)
-                                    if isinstance(generated_value, (int, float)):
-                                        # If numeric, use as index (clamp to valid range)
-                                        index = int(generated_value) % len(parent_ids)
-                                        row_data[attr.name] = parent_ids[index]
-                                    else:
-                                        # If string/categorical, try to find in parent_ids, else use random
-                                        row_data[attr.name] = random.choice(parent_ids)
-                                except Exception as e:
-                                    logger.warning(f"Error using formula for FK '{attr.name}': {e}. Using random assignment.")
-                                    row_data[attr.name] = random.choice(parent_ids)
-                            else:
-                                # Uniform random assignment if no distribution is provided
-                                row_data[attr.name] = random.choice(parent_ids)
-                elif attr.generator:
-                    # If this attribute is assigned later in flows for this entity,
-                    # leave it NULL at creation time (no placeholder default).
-                    assigned_for_entity = self._assigned_attrs_by_entity.get(entity_table, set())
-                    if attr.name in assigned_for_entity:
-                        continue
-                    # Convert generator dataclass to dict for the utility function
-                    gen_dict = dataclasses.asdict(attr.generator) if attr.generator else None
-                    attr_config_dict = {
-                        'name': attr.name,
-                        'generator': gen_dict
-                    }
-                    # Pass 0 as row_index placeholder - most generators (faker, distribution) 
-                    # don't use it. Template generators needing sequential IDs should be avoided
-                    # for simulation-created entities or use the actual PK post-INSERT.
-                    generated_value = generate_attribute_value(attr_config_dict, 0)
-                    # Apply type-aware processing
-                    row_data[attr.name] = process_value_for_type(generated_value, attr.type)
-                else:
-                    # Handle attributes without generators if necessary (e.g., default NULL or specific value)
-                    # For now, let the DB handle defaults or NULL
-                    pass
-            
-            # Check if the table has a datetime column and populate it automatically
-            try:
-                if entity_config:
-                    for attr in entity_config.attributes:
-                        if attr.type in ['datetime', 'timestamp'] and attr.name not in row_data:
-                            # Calculate the current simulation datetime
-                            creation_datetime = self.config.start_date + timedelta(minutes=self.env.now)
-                            row_data[attr.name] = creation_datetime
-                            logger.debug(f"Added {attr.name}={creation_datetime} for entity in {entity_table}")
-            except Exception as e:
-                logger.warning(f"Error setting datetime columns for {entity_table}: {e}")
-            
-            # Build INSERT statement dynamically (without PK - let database generate it)
-            if row_data:
-                columns = ", ".join([f'"{col}"' for col in row_data.keys()])
-                placeholders = ", ".join([f":{col}" for col in row_data.keys()])
-                sql_query = text(f'INSERT INTO "{entity_table}" ({columns}) VALUES ({placeholders})')
-            else:
-                # No data to insert - use default values
-                sql_query = text(f'INSERT INTO "{entity_table}" DEFAULT VALUES')
-            
+            row_data, generated_pk = self._build_entity_row(session, entity_table, entity_config, initial_data)
+
             logger.debug(f"Creating entity in {entity_table} with data: {row_data}")
-            result = session.execute(sql_query, row_data)
+            result = self._insert_row(session, entity_table, row_data)
             
             # Return the appropriate primary key value
             if generated_pk is not None:
@@ -383,3 +445,130 @@ class EntityManager:
             logger.error(f"Error creating entity in {entity_table}: {str(e)}", exc_info=True)
             return None
 
+    @staticmethod
+    def _insert_row(session, entity_table: str, row_data: Dict[str, Any]):
+        """Insert one entity row (without PK unless generated - let database generate it)."""
+        if row_data:
+            columns = ", ".join([f'"{col}"' for col in row_data.keys()])
+            placeholders = ", ".join([f":{col}" for col in row_data.keys()])
+            sql_query = text(f'INSERT INTO "{entity_table}" ({columns}) VALUES ({placeholders})')
+        else:
+            # No data to insert - use default values
+            sql_query = text(f'INSERT INTO "{entity_table}" DEFAULT VALUES')
+        return session.execute(sql_query, row_data)
+
+    def create_entities(self, session, entity_table: str, count: int,
+                        initial_data: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """
+        Create several entities that arrive at the same instant with one multi-row INSERT.
+
+        Args:
+            session: SQLAlchemy session
+            entity_table: Name of the entity table
+            count: Number of entities to create
+            initial_data: Optional attributes to set explicitly on every entity
+
+        Returns:
+            IDs of the created entities (empty on error)
+        """
+        if count <= 1 or sqlite3.sqlite_version_info < (3, 35, 0):
+            # Single rows, or no INSERT ... RETURNING support
+            ids = [self.create_entity(session, entity_table, initial_data) for _ in range(count)]
+            return [entity_id for entity_id in ids if entity_id is not None]
+        try:
+            entity_config = self.get_entity_config(entity_table)
+            if not entity_config:
+                logger.error(f"Database configuration not found for entity: {entity_table}")
+                return []
+            pk_column = self.column_resolver.get_primary_key(entity_table)
+
+            parent_ids_cache: Dict[str, List[Any]] = {}
+            rows, generated_pks = [], []
+            for offset in range(count):
+                row_data, generated_pk = self._build_entity_row(
+                    session, entity_table, entity_config, initial_data, offset, parent_ids_cache
+                )
+                rows.append(row_data)
+                generated_pks.append(generated_pk)
+
+            columns = list(rows[0])
+            if not columns or any(list(row) != columns for row in rows):
+                # Rows without a common column set cannot share one VALUES list
+                ids = []
+                for row_data, generated_pk in zip(rows, generated_pks):
+                    result = self._insert_row(session, entity_table, row_data)
+                    ids.append(generated_pk if generated_pk is not None else result.lastrowid)
+                return ids
+
+            column_sql = ", ".join(f'"{col}"' for col in columns)
+            rows_per_statement = max(1, BULK_INSERT_MAX_VARIABLES // len(columns))
+            returned = []
+            for start in range(0, len(rows), rows_per_statement):
+                chunk = rows[start:start + rows_per_statement]
+                params = {}
+                values = []
+                for r, row_data in enumerate(chunk):
+                    names = []
+                    for c, col in enumerate(columns):
+                        name = f"p{r}_{c}"
+                        params[name] = row_data[col]
+                        names.append(f":{name}")
+                    values.append(f"({', '.join(names)})")
+                sql_query = text(
+                    f'INSERT INTO "{entity_table}" ({column_sql}) VALUES {", ".join(values)} RETURNING "{pk_column}"'
+                )
+                returned.extend(row[0] for row in session.execute(sql_query, params).fetchall())
+
+            logger.debug(f"Created {len(rows)} entities in {entity_table} with one batched INSERT")
+            if all(pk is not None for pk in generated_pks):
+                return generated_pks
+            # RETURNING order is unspecified; auto-increment keys of one statement ascend
+            return sorted(returned)
+        except Exception as e:
+            logger.error(f"Error creating {count} entities in {entity_table}: {str(e)}", exc_info=True)
+            return []
+
+    def record_created(self, entity_table: str, count: int = 1):
+        """
+        Count entities created during the run.
+
+        Args:
+            entity_table: Table the entities were created in
+            count: Number of entities created
+        """
+        self.entity_count += count
+        self.record_inserted(entity_table, count)
+
+    def record_inserted(self, table: str, count: int = 1):
+        """
+        Count rows inserted into a table during the run without creating entities (e.g. by Trigger steps).
+
+        Args:
+            table: Table the rows were inserted into
+            count: Number of rows inserted
+        """
+        self.created_by_table[table] = self.created_by_table.get(table, 0) + count
+
+    def get_table_entity_count(self, entity_table: str) -> int:
+        """
+        Get the number of rows in an entity table.
+
+        For tables populated only by Create and Trigger steps, the table's
+        pre-existing rows are counted once and rows inserted by the simulation
+        are tracked in memory. Other tables are counted with COUNT(*).
+
+        Args:
+            entity_table: Name of the entity table
+
+        Returns:
+            Current number of entities in the table
+        """
+        if entity_table not in self._counted_tables:
+            with self.engine.connect() as conn:
+                return conn.execute(text(f'SELECT COUNT(*) FROM "{entity_table}"')).scalar() or 0
+        created = self.created_by_table.get(entity_table, 0)
+        if entity_table not in self._initial_row_counts:
+            with self.engine.connect() as conn:
+                total = conn.execute(text(f'SELECT COUNT(*) FROM "{entity_table}"')).scalar() or 0
+            self._initial_row_counts[entity_table] = max(0, total - created)
+        return self._initial_row_counts[entity_table] + created
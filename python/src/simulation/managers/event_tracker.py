@@ -1,420 +1,391 @@
 """
 Event tracker for recording simulation events in the database
+
+All flows of a simulation share one EventTrackingService: a single engine and
+connection, one MetaData holding the tracking tables and every reflected
+table, and a write buffer for the ``sim_event_processing`` and
+``sim_resource_allocations`` rows. Each flow gets a lightweight EventTracker
+context carrying its entity table and bridge configuration.
+
+Bridge table writes follow a BridgeWritePlan compiled once per entity table,
+resource table and target bridge: columns, the parent bridge of chained
+bridges and the primary key generator are resolved up front, so recording an
+event's allocations only builds rows and runs one batched insert per bridge.
 """
 
+import dataclasses
 import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
-from sqlalchemy import create_engine, Table, Column, Integer, String, DateTime, Float, MetaData, insert, text, ForeignKey
+from typing import Dict, Any, Optional, List, Tuple, Iterable
+from sqlalchemy import create_engine, inspect, Table, Column, Integer, String, DateTime, Float, MetaData, insert, text, ForeignKey
 from sqlalchemy.exc import NoSuchTableError
 from sqlalchemy.pool import NullPool
 from ..utils.column_resolver import ColumnResolver
 
 logger = logging.getLogger(__name__)
 
-class EventTracker:
+# Buffered tracking rows written per flush
+WRITE_BUFFER_SIZE = 500
+
+
+class BridgeKeyGenerator:
     """
-    Tracks and records simulation events in the database
-    
-    This class creates and manages tables for tracking:
-    - Event processing
-    - Resource allocations
-    - A dynamic event-resource bridging table (e.g., Deliverable_Consultant)
-    
-    Note: Entity arrivals are now tracked via created_at column in entity tables
+    Generates the custom primary keys of one bridge table.
+
+    Template generators number keys by the table's row count; the count is
+    read once and then advanced per generated key instead of queried per row.
     """
-    
+
+    __slots__ = ('table_name', 'pk_column', 'pk_type', 'attr_config', 'uses_row_count', '_next_index')
+
+    def __init__(self, table_name: str, pk_attr):
+        """
+        Args:
+            table_name: Name of the bridge table
+            pk_attr: Primary key attribute config with a generator
+        """
+        self.table_name = table_name
+        self.pk_column = pk_attr.name
+        self.pk_type = pk_attr.type
+        self.attr_config = {'name': pk_attr.name, 'generator': dataclasses.asdict(pk_attr.generator)}
+        self.uses_row_count = getattr(pk_attr.generator, 'type', None) == 'template'
+        self._next_index = None
+
+    def next_key(self, conn) -> Any:
+        """
+        Generate the next primary key value.
+
+        Args:
+            conn: Connection used to read the initial row count
+
+        Returns:
+            Generated PK value
+        """
+        from ...generator.data.attribute_generator import generate_attribute_value
+        from ...generator.data.type_processor import process_value_for_type
+
+        row_index = 0
+        if self.uses_row_count:
+            if self._next_index is None:
+                try:
+                    count_result = conn.execute(text(f'SELECT COUNT(*) FROM "{self.table_name}"')).scalar()
+                    self._next_index = int(count_result) if count_result is not None else 0
+                except Exception as e:
+                    logger.warning(f"Could not determine row count for {self.table_name}: {e}")
+                    self._next_index = 0
+            row_index = self._next_index
+            self._next_index += 1
+
+        generated_pk = process_value_for_type(generate_attribute_value(self.attr_config, row_index), self.pk_type)
+        logger.debug(f"Generated bridge PK for {self.table_name}: {generated_pk}")
+        return generated_pk
+
+    def reset(self):
+        """Re-read the row count on next use (after a failed write rolled back generated keys)."""
+        self._next_index = None
+
+
+@dataclass(slots=True, eq=False)
+class BridgeWritePlan:
+    """
+    Precompiled write of allocation rows into one bridge table.
+
+    Chained bridges (a bridge whose FK references another bridge) carry the
+    plan of their parent bridge and the FK column holding the parent's key.
+    """
+
+    table: Table
+    statement: Any
+    columns: frozenset
+    entity_columns: Tuple[str, ...] = ()
+    resource_columns: Tuple[str, ...] = ()
+    event_type_columns: Tuple[str, ...] = ()
+    event_id_column: Optional[str] = None
+    start_column: Optional[str] = None
+    end_column: Optional[str] = None
+    key_generator: Optional[BridgeKeyGenerator] = None
+    parent: Optional['BridgeWritePlan'] = None
+    parent_fk_column: Optional[str] = None
+    requires_entity: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.table.name
+
+    def build_row(self, entity_id, resource_id, start_datetime, end_datetime,
+                  event_type: Optional[str], event_id, extra_attributes: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the column values of one row (without parent FK and generated PK)."""
+        row = {}
+        if self.start_column:
+            row[self.start_column] = start_datetime
+        if self.end_column:
+            row[self.end_column] = end_datetime
+        for column in self.resource_columns:
+            row[column] = resource_id
+        if entity_id is not None:
+            for column in self.entity_columns:
+                row[column] = entity_id
+        if event_type:
+            for column in self.event_type_columns:
+                row[column] = event_type
+        if self.event_id_column:
+            row[self.event_id_column] = event_id
+        if extra_attributes:
+            for key, value in extra_attributes.items():
+                if key in self.columns:
+                    row[key] = value
+        return row
+
+
+class EventTrackingService:
+    """
+    Shared database side of event tracking for all flows of a simulation.
+
+    Owns the engine, the connection, the tracking tables and a cache of
+    reflected tables. Event processing and resource allocation rows are
+    buffered and written in batches; bridge table rows are written (and
+    committed) immediately because later steps may reference them.
+    """
+
     def __init__(self, db_path: str, start_date: Optional[datetime] = None,
-                 resource_table_name: Optional[str] = None,
-                 entity_table_name: Optional[str] = None,
-                 bridge_table_config: Optional[Dict[str, Any]] = None,
-                 db_config=None):
+                 resource_table_name: Optional[str] = None, db_config=None,
+                 write_buffer_size: int = WRITE_BUFFER_SIZE):
         """
-        Initialize the event tracker
-        
+        Initialize the tracking service and create the tracking tables
+
         Args:
             db_path: Path to the SQLite database
             start_date: Simulation start date
             resource_table_name: Name of the main resource table (e.g., 'Consultant')
-            entity_table_name: Name of the main entity table (e.g., 'Ticket')
-            bridge_table_config: Optional configuration for the bridge table with keys:
-                - entity_fk_column: Name of the column referencing the entity table
-                - resource_fk_column: Name of the column referencing the resource table
+            db_config: Database configuration
+            write_buffer_size: Buffered tracking rows that trigger a flush
         """
-        self.db_path = db_path
-        self.resource_table_name = resource_table_name
-        self.entity_table_name = entity_table_name
-        self.bridge_table_name = None
-        self.bridge_table = None # Will hold the SQLAlchemy Table object
-        self.entity_fk_column = None
-        self.resource_fk_column = None
-        self.bridge_mode = None
-        self.bridge_columns = set()
-        self.event_type_column = 'event_type'
-        
-        # Use NullPool to avoid connection pool issues with SQLite
-        # and enable WAL journal mode for better concurrency
-        self.engine = create_engine(
-            f"sqlite:///{db_path}?journal_mode=WAL",
-            poolclass=NullPool
-        )
-        
-        self.metadata = MetaData()
-        self.start_date = start_date or datetime.now()
-        
-        # Initialize column resolver for strict column resolution
         if not db_config:
             raise ValueError("db_config is required for EventTracker - cannot use hardcoded column names")
+        self.db_path = db_path
+        self.start_date = start_date or datetime.now()
+        self.resource_table_name = resource_table_name
         self.db_config = db_config
         self.column_resolver = ColumnResolver(db_config)
-        
-        # Cache for dynamic bridge tables: (entity_table, resource_table) -> (Table, entity_fk, resource_fk, event_type_col)
+        self.write_buffer_size = max(1, write_buffer_size)
+
+        # Seconds spent per start-up phase: engine, tables, reflection
+        self.phase_times: Dict[str, float] = {}
+
+        # Cache for dynamic bridge tables: (entity_table, resource_table, target) -> bridge info
         self.bridge_table_cache = {}
-        
-        # Use custom bridge table configuration if provided
-        if bridge_table_config:
-            self.bridge_table_name = bridge_table_config.get('name')
-            self.entity_fk_column = bridge_table_config.get('entity_fk_column')
-            self.resource_fk_column = bridge_table_config.get('resource_fk_column')
-            self.event_type_column = bridge_table_config.get('event_type_column') or self.event_type_column
-            logger.info(f"EventTracker configured with custom bridge table: {self.bridge_table_name} "
-                        f"(entity_fk: {self.entity_fk_column}, resource_fk: {self.resource_fk_column})")
-        else:
-            logger.warning("EventTracker: No bridge table configuration provided; resource tracking bridge will not be created.")
-        
-        # Create tracking tables
+        self._entities_by_name = {entity.name: entity for entity in db_config.entities}
+        # Shared by all flows so generated keys keep counting across flows writing one table
+        self._key_generators: Dict[str, Optional[BridgeKeyGenerator]] = {}
+        self._parent_plans: Dict[str, Optional[BridgeWritePlan]] = {}
+
+        self._conn = None
+        self._pending: Dict[Table, List[Dict[str, Any]]] = {}
+        self._pending_count = 0
+
+        with self.timed('engine'):
+            # Use NullPool to avoid connection pool issues with SQLite
+            # and enable WAL journal mode for better concurrency
+            self.engine = create_engine(
+                f"sqlite:///{db_path}?journal_mode=WAL",
+                poolclass=NullPool
+            )
+            self.metadata = MetaData()
+            self._inspector = inspect(self.engine)
+
         self._create_tracking_tables()
-    
+
+    @contextmanager
+    def timed(self, phase: str):
+        """Add the time spent in the block to a start-up phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[phase] = self.phase_times.get(phase, 0.0) + time.perf_counter() - started
+
     def _create_tracking_tables(self):
         """Create tables for tracking simulation events"""
         # Note: Entity arrivals are now tracked via created_at column in entity tables directly
-        
-        # Event processing table
-        self.event_processing = Table(
-            'sim_event_processing', self.metadata,
-            Column('id', Integer, primary_key=True),
-            Column('event_flow', String, nullable=False),
-            Column('event_id', Integer, nullable=False),
-            Column('entity_id', Integer, nullable=False),
-            Column('entity_table', String, nullable=True),
-            Column('start_time', Float, nullable=False),  # Simulation time in minutes
-            Column('end_time', Float, nullable=False),
-            Column('duration', Float, nullable=False),
-            Column('start_datetime', DateTime, nullable=False),
-            Column('end_datetime', DateTime, nullable=False)
-        )
-        
-        # Resource allocation table
-        self.resource_allocations = Table(
-            'sim_resource_allocations', self.metadata,
-            Column('id', Integer, primary_key=True),
-            Column('event_flow', String, nullable=False),
-            Column('event_id', Integer, nullable=False),
-            Column('resource_table', String, nullable=False),
-            Column('resource_id', Integer, nullable=False),
-            Column('allocation_time', Float, nullable=False),  # Simulation time in minutes
-            Column('release_time', Float, nullable=False),
-            Column('allocation_datetime', DateTime, nullable=False),
-            Column('release_datetime', DateTime, nullable=False)
-        )
-        
-        # Reflect existing event and resource tables if names provided
-        try:
-            inspector = None
-            if self.resource_table_name:
-                from sqlalchemy import inspect
-                inspector = inspect(self.engine)
-
-            if self.resource_table_name:
-                if inspector and inspector.has_table(self.resource_table_name):
-                    Table(self.resource_table_name, self.metadata, autoload_with=self.engine)
-                    logger.debug(f"Reflected table {self.resource_table_name} into metadata.")
-                else:
+        with self.timed('tables'):
+            # Event processing table
+            self.event_processing = Table(
+                'sim_event_processing', self.metadata,
+                Column('id', Integer, primary_key=True),
+                Column('event_flow', String, nullable=False),
+                Column('event_id', Integer, nullable=False),
+                Column('entity_id', Integer, nullable=False),
+                Column('entity_table', String, nullable=True),
+                Column('start_time', Float, nullable=False),  # Simulation time in minutes
+                Column('end_time', Float, nullable=False),
+                Column('duration', Float, nullable=False),
+                Column('start_datetime', DateTime, nullable=False),
+                Column('end_datetime', DateTime, nullable=False)
+            )
+
+            # Resource allocation table
+            self.resource_allocations = Table(
+                'sim_resource_allocations', self.metadata,
+                Column('id', Integer, primary_key=True),
+                Column('event_flow', String, nullable=False),
+                Column('event_id', Integer, nullable=False),
+                Column('resource_table', String, nullable=False),
+                Column('resource_id', Integer, nullable=False),
+                Column('allocation_time', Float, nullable=False),  # Simulation time in minutes
+                Column('release_time', Float, nullable=False),
+                Column('allocation_datetime', DateTime, nullable=False),
+                Column('release_datetime', DateTime, nullable=False)
+            )
+
+            try:
+                self.metadata.create_all(self.engine, tables=[self.event_processing, self.resource_allocations])
+            except Exception as e:
+                logger.error(f"Error during metadata.create_all: {e}")
+
+        # Reflect the resource table so bridge table FK constraints can resolve
+        if self.resource_table_name:
+            try:
+                if self.reflect_table(self.resource_table_name) is None:
                     logger.debug(f"Skipping reflection for missing resource table {self.resource_table_name}.")
-        except NoSuchTableError as e:
-            logger.warning(f"Resource table not found during reflection: {e}. Bridge table FK constraints might be skipped.")
-        except Exception as e:
-            logger.error(f"Error reflecting event/resource tables: {e}. Bridge table FK constraints might fail.")
-        
-        # Dynamic entity/resource bridge table (if names provided)
-        if self.bridge_table_name and self.resource_fk_column and (self.entity_fk_column):
+            except Exception as e:
+                logger.error(f"Error reflecting event/resource tables: {e}. Bridge table FK constraints might fail.")
+
+    def reflect_table(self, table_name: str) -> Optional[Table]:
+        """
+        Get a table from the shared metadata, reflecting it on first use.
+
+        Args:
+            table_name: Name of the table
+
+        Returns:
+            Table object, or None if the table does not exist in the database
+        """
+        table = self.metadata.tables.get(table_name)
+        if table is not None:
+            return table
+        with self.timed('reflection'):
+            if not self._inspector.has_table(table_name):
+                return None
             try:
-                # Prefer reflecting the existing schema first
-                self.bridge_table = Table(self.bridge_table_name, self.metadata, autoload_with=self.engine)
-                self.bridge_columns = {col.name for col in self.bridge_table.columns}
-                if self.entity_fk_column:
-                    self.bridge_mode = 'entity'
-                if self.event_type_column and self.event_type_column not in self.bridge_columns and 'event_type' in self.bridge_columns:
-                    self.event_type_column = 'event_type'
-            except Exception:
-                # Fallback: create a lightweight bridge table with minimal constraints
-                columns: List[Column[Any]] = [Column('id', Integer, primary_key=True)]
-                if self.entity_fk_column:
-                    entity_fk_arg = None
-                    if self.entity_table_name:
-                        entity_fk_arg = ForeignKey(f"{self.entity_table_name}.{self._get_pk_column(self.entity_table_name)}")
-                    entity_column_args = [self.entity_fk_column, Integer]
-                    if entity_fk_arg:
-                        entity_column_args.append(entity_fk_arg)
-                    columns.append(Column(*entity_column_args, nullable=False))
-                    self.bridge_mode = 'entity'
-                resource_fk_arg = None
-                if self.resource_table_name:
-                    resource_fk_arg = ForeignKey(f"{self.resource_table_name}.{self._get_pk_column(self.resource_table_name)}")
-                resource_column_args = [self.resource_fk_column, Integer]
-                if resource_fk_arg:
-                    resource_column_args.append(resource_fk_arg)
-                columns.append(Column(*resource_column_args, nullable=False))
-                columns.append(Column('event_type', String, nullable=True))
-                columns.append(Column('start_date', DateTime, nullable=True))
-                columns.append(Column('end_date', DateTime, nullable=True))
-                self.bridge_table = Table(self.bridge_table_name, self.metadata, *columns)
-                self.bridge_columns = {col.name for col in columns if hasattr(col, 'name')}
-        
-        # Create all tables defined in this metadata (sim tracking + bridge if defined)
+                table = Table(table_name, self.metadata, autoload_with=self.engine)
+            except NoSuchTableError:
+                return None
+        logger.debug(f"Reflected table {table_name} into metadata.")
+        return table
+
+    def create_table(self, table: Table):
+        """Create a table defined on the shared metadata if it does not exist yet."""
+        with self.timed('tables'):
+            try:
+                table.create(self.engine, checkfirst=True)
+            except Exception as e:
+                # Catch errors during create, e.g., if FKs still fail
+                logger.error(f"Error creating table {table.name}: {e}")
+
+    def connection(self):
+        """Get the shared connection, opening it on first use."""
+        if self._conn is None or self._conn.closed:
+            self._conn = self.engine.connect()
+        return self._conn
+
+    @contextmanager
+    def begin(self):
+        """Run the block in a transaction on the shared connection, committing on success."""
+        conn = self.connection()
         try:
-            self.metadata.create_all(self.engine)
-        except Exception as e:
-            # Catch errors during create_all, e.g., if FKs still fail
-            logger.error(f"Error during metadata.create_all: {e}")
-    
-    # Entity arrivals are now tracked automatically via created_at column in entity tables
-    
-    def record_event_processing(self, event_flow: str, event_id: int, entity_id: int, 
-                               start_time: float, end_time: float, entity_table: str = None):
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def buffer_row(self, table: Table, row: Dict[str, Any]):
         """
-        Record event processing
-        
+        Queue a row for a tracking table, flushing when the buffer is full.
+
         Args:
-            event_flow: Name of the event flow
-            event_id: Event ID
-            entity_id: Entity ID
-            start_time: Start time in minutes
-            end_time: End time in minutes
-            entity_table: Name of the entity table
+            table: Tracking table
+            row: Column values
         """
-        duration = end_time - start_time
-        start_datetime = self.start_date + timedelta(minutes=start_time)
-        end_datetime = self.start_date + timedelta(minutes=end_time)
-        
-        with self.engine.connect() as conn:
-            stmt = insert(self.event_processing).values(
-                event_flow=event_flow,
-                event_id=event_id,
-                entity_id=entity_id,
-                entity_table=entity_table,
-                start_time=start_time,
-                end_time=end_time,
-                duration=duration,
-                start_datetime=start_datetime,
-                end_datetime=end_datetime
-            )
-            conn.execute(stmt)
-            conn.commit()
-    
-    def record_resource_allocation(self, event_flow, event_id, resource_table, resource_id,
-                                  allocation_time, release_time=None,
-                                  entity_id: Optional[int] = None, entity_table: Optional[str] = None, 
-                                  event_type: Optional[str] = None, target_bridge_table: Optional[str] = None,
-                                  extra_attributes: Optional[Dict[str, Any]] = None):
-        """Record the allocation of a resource to an event."""
-        try:
-            allocation_datetime = self.start_date + timedelta(minutes=allocation_time)
-            release_datetime = self.start_date + timedelta(minutes=release_time) if release_time else None
+        self._pending.setdefault(table, []).append(row)
+        self._pending_count += 1
+        if self._pending_count >= self.write_buffer_size:
+            self.flush()
 
-            with self.engine.connect() as conn:
-                stmt = insert(self.resource_allocations).values(
-                    event_flow=event_flow,
-                    event_id=event_id,
-                    resource_table=resource_table,
-                    resource_id=resource_id,
-                    allocation_time=allocation_time,
-                    release_time=release_time,
-                    allocation_datetime=allocation_datetime,
-                    release_datetime=release_datetime
-                )
-                conn.execute(stmt)
-                
-                # Populate the dynamic bridge table if it exists and the resource table matches
-                # Attempt to populate bridge table
-                # Strategy:
-                # 1. Try static bridge configuration (legacy/single-entity mode)
-                # 2. Try dynamic lookup if entity_table is provided
-                
-                target_bridge = None
-                entity_fk = None
-                resource_fk = None
-                event_type_col = None
-                bridge_fk_info = None  # For Resource-Bridge/Entity-Bridge patterns
-                
-                # Check static bridge first
-                if self.bridge_table is not None and resource_table == self.resource_table_name and not target_bridge_table:
-                    if self.entity_table_name is None or (entity_table is None or entity_table == self.entity_table_name):
-                         target_bridge = self.bridge_table
-                         entity_fk = self.entity_fk_column
-                         resource_fk = self.resource_fk_column
-                         event_type_col = self.event_type_column
-                
-                # If no match, try dynamic lookup
-                if target_bridge is None and entity_table and resource_table:
-                    bridge_info = self._get_dynamic_bridge(entity_table, resource_table, target_bridge_table)
-                    if bridge_info:
-                        target_bridge, entity_fk, resource_fk, event_type_col, bridge_fk_info = bridge_info
-                
-                if target_bridge is not None:
-                    # For Entity-Resource pattern, require entity_id
-                    # For Resource-Bridge pattern, we don't need entity_id (use bridge FK instead)
-                    bridge_fk_col = None
-                    if bridge_fk_info:
-                        bridge_fk_col, parent_bridge_table = bridge_fk_info
-                    
-                    if entity_fk and entity_id is None and not bridge_fk_col:
-                        logger.warning(f"Bridge logging skipped for {target_bridge.name}: entity_id required but not provided.")
-                        conn.commit()
-                        return
+    def flush(self):
+        """
+        Write all buffered tracking rows in one transaction.
 
-                    bridge_data = {
-                        'start_date': allocation_datetime,
-                        'end_date': release_datetime
-                    }
-                    
-                    # Add resource FK if present
-                    if resource_fk:
-                        bridge_data[resource_fk] = resource_id
-
-                    # Add entity FK if present (Entity-Resource or Entity-Bridge patterns)
-                    if entity_fk and entity_id is not None:
-                        bridge_data[entity_fk] = entity_id
-                    
-                    # Handle chained bridge FK (Resource-Bridge or Entity-Bridge patterns)
-                    # For chained bridges, we first create a record in the parent bridge table,
-                    # then use that record's PK for the child bridge FK
-                    if bridge_fk_col:
-                        parent_bridge_table_name, parent_bridge_pk = bridge_fk_info[1], None
-                        
-                        # Create a record in the parent bridge table first
-                        parent_bridge_pk = self._create_parent_bridge_record(
-                            conn, parent_bridge_table_name, entity_id, resource_id,
-                            allocation_datetime, release_datetime, event_type
-                        )
-                        
-                        if parent_bridge_pk:
-                            bridge_data[bridge_fk_col] = parent_bridge_pk
-                            logger.debug(f"Created parent bridge record in {parent_bridge_table_name} with id={parent_bridge_pk}")
-                        else:
-                            logger.warning(f"Failed to create parent bridge record in {parent_bridge_table_name}, skipping child bridge")
-                            conn.commit()
-                            return
-                    
-                    # Handle event_type column
-                    if event_type and event_type_col and event_type_col in [c.name for c in target_bridge.columns]:
-                         bridge_data[event_type_col] = event_type
-
-                    # Handle event_id column (if exists) for direct linking (legacy behavior)
-                    if 'event_id' in [c.name for c in target_bridge.columns] and 'event_id' not in bridge_data:
-                        bridge_data['event_id'] = event_id
-
-                    # Merge extra attributes (generated data)
-                    if extra_attributes:
-                        # Only include attributes that actually exist as columns in the bridge table
-                        # to avoid SQL errors
-                        bridge_columns = [c.name for c in target_bridge.columns]
-                        for key, value in extra_attributes.items():
-                            if key in bridge_columns:
-                                bridge_data[key] = value
-
-                    # Generate PK if the bridge table has a custom PK generator
-                    bridge_pk = self._generate_bridge_pk(conn, target_bridge.name)
-                    if bridge_pk is not None:
-                        # Find the PK column name
-                        pk_col_name = self._get_pk_column_name(target_bridge.name)
-                        if pk_col_name:
-                            bridge_data[pk_col_name] = bridge_pk
-
-                    stmt = insert(target_bridge).values(**bridge_data)
-                    conn.execute(stmt)
-                
-                # Move the commit inside the with block to ensure the transaction is committed before the connection is closed
-                conn.commit()
+        If the batch fails, each table is retried in its own transaction and,
+        for a table that still fails, each row on its own, so only the rows
+        that cannot be written are dropped.
+        """
+        if not self._pending_count:
+            return
+        pending, count = self._pending, self._pending_count
+        self._pending, self._pending_count = {}, 0
+        try:
+            with self.begin() as conn:
+                for table, rows in pending.items():
+                    conn.execute(insert(table), rows)
+            logger.debug(f"Flushed {count} buffered tracking rows")
         except Exception as e:
-            logger.error(f"Error recording resource allocation: {e}")
-    
+            logger.warning(f"Error writing {count} buffered tracking rows, retrying per table: {e}")
+            for table, rows in pending.items():
+                self._flush_table(table, rows)
+
+    def _flush_table(self, table: Table, rows: List[Dict[str, Any]]):
+        """Write the buffered rows of one table, falling back to one row at a time."""
+        try:
+            with self.begin() as conn:
+                conn.execute(insert(table), rows)
+            return
+        except Exception:
+            pass
+        failed = 0
+        for row in rows:
+            try:
+                with self.begin() as conn:
+                    conn.execute(insert(table), row)
+            except Exception as e:
+                failed += 1
+                logger.error(f"Error writing tracking row to {table.name}: {e}")
+        if failed:
+            logger.error(f"Dropped {failed} of {len(rows)} buffered rows for {table.name}")
+
     def _is_bridge_table(self, table_name: str) -> bool:
         """Check if a table has type 'bridge' in db_config."""
-        if not self.db_config:
-            return False
-        for entity in self.db_config.entities:
-            if entity.name == table_name and entity.type == 'bridge':
-                return True
-        return False
+        entity = self._entities_by_name.get(table_name)
+        return entity is not None and entity.type == 'bridge'
     
     def _get_pk_column_name(self, table_name: str) -> Optional[str]:
         """Get the primary key column name for a table."""
-        if not self.db_config:
+        entity = self._entities_by_name.get(table_name)
+        if entity is None:
             return None
-        for entity in self.db_config.entities:
-            if entity.name == table_name:
-                for attr in entity.attributes:
-                    if attr.is_primary_key:
-                        return attr.name
+        for attr in entity.attributes:
+            if attr.is_primary_key:
+                return attr.name
         return None
     
-    def _generate_bridge_pk(self, conn, table_name: str) -> Optional[Any]:
+    def bridge_key_generator(self, table_name: str) -> Optional[BridgeKeyGenerator]:
         """
-        Generate a PK value for a bridge table if it has a custom generator.
+        Get the primary key generator of a bridge table.
         
         Returns:
-            Generated PK value, or None if using auto-increment
+            BridgeKeyGenerator, or None if the table uses auto-increment
         """
-        if not self.db_config:
-            return None
-        
-        # Find the entity config
-        entity_config = None
-        for entity in self.db_config.entities:
-            if entity.name == table_name:
-                entity_config = entity
-                break
-        
-        if not entity_config:
-            return None
-        
-        # Find PK attribute with generator
-        pk_attr = None
-        for attr in entity_config.attributes:
-            if attr.is_primary_key:
-                pk_attr = attr
-                break
-        
-        if not pk_attr or not pk_attr.generator:
-            # No custom generator - use auto-increment
-            return None
-        
-        # Import generator utilities
-        import dataclasses
-        from ...generator.data.attribute_generator import generate_attribute_value
-        from ...generator.data.type_processor import process_value_for_type
-        
-        gen_dict = dataclasses.asdict(pk_attr.generator) if pk_attr.generator else None
-        attr_config_dict = {
-            'name': pk_attr.name,
-            'generator': gen_dict
-        }
-        
-        # For template generators, get row count for {id}
-        row_index = 0
-        if getattr(pk_attr.generator, 'type', None) == 'template':
-            try:
-                count_result = conn.execute(text(f'SELECT COUNT(*) FROM "{table_name}"')).scalar()
-                row_index = int(count_result) if count_result is not None else 0
-            except Exception as e:
-                logger.warning(f"Could not determine row count for {table_name}: {e}")
-        
-        generated_pk = generate_attribute_value(attr_config_dict, row_index)
-        generated_pk = process_value_for_type(generated_pk, pk_attr.type)
-        logger.debug(f"Generated bridge PK for {table_name}: {generated_pk}")
-        
-        return generated_pk
+        if table_name not in self._key_generators:
+            generator = None
+            entity = self._entities_by_name.get(table_name)
+            pk_attr = next((attr for attr in entity.attributes if attr.is_primary_key), None) if entity else None
+            if pk_attr is not None and pk_attr.generator:
+                generator = BridgeKeyGenerator(table_name, pk_attr)
+            self._key_generators[table_name] = generator
+        return self._key_generators[table_name]
     
     def _get_bridge_fk_column(self, entity_config) -> Optional[tuple]:
         """
@@ -525,7 +496,7 @@ class EventTracker:
         if target_bridge_entity:
             try:
                 # Reflect the table
-                bridge_table = Table(target_bridge_entity.name, self.metadata, autoload_with=self.engine)
+                bridge_table = self.reflect_table(target_bridge_entity.name)
                 
                 # Auto-detection: If event_type column not explicitly mapped in config, 
                 # check if 'event_type' column exists in the physical table (created by TableBuilder defaults)
@@ -548,15 +519,20 @@ class EventTracker:
 
     def dispose(self):
         """
-        Properly dispose of the EventTracker engine to release database connections.
+        Flush buffered rows and dispose of the engine to release database connections.
         This is critical for preventing EBUSY errors on Windows when deleting database files.
         """
         try:
-            if hasattr(self, 'engine') and self.engine is not None:
-                self.engine.dispose()
-                logger.debug("EventTracker engine disposed successfully")
-            else:
+            if getattr(self, 'engine', None) is None:
                 logger.debug("EventTracker engine was already disposed or never created")
+                return
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self.engine.dispose()
+            self.engine = None
+            logger.debug("EventTracker engine disposed successfully")
         except Exception as e:
             logger.warning(f"Error disposing EventTracker engine: {e}")
     
@@ -568,83 +544,410 @@ class EventTracker:
             raise ValueError(f"Cannot resolve primary key for table '{table_name}': {e}. "
                            f"Ensure table has column with type='pk' defined in db_config.")
     
-    def _create_parent_bridge_record(self, conn, parent_bridge_table_name: str, 
-                                      entity_id: int, resource_id: int,
-                                      start_datetime, end_datetime, 
-                                      event_type: Optional[str] = None) -> Optional[int]:
+    def parent_bridge_plan(self, parent_bridge_table_name: str) -> Optional[BridgeWritePlan]:
         """
-        Create a record in the parent bridge table for chained bridge relationships.
+        Get the write plan of a parent bridge table in a chained bridge relationship.
         
-        When a child bridge table references a parent bridge table, this method creates
-        the parent record first and returns its PK to use as the child's FK.
+        When a child bridge table references a parent bridge table, a parent
+        record is created first and its PK is used as the child's FK. The
+        parent record gets the entity and resource IDs, the event type and the
+        event period.
         
         Args:
-            conn: Database connection
             parent_bridge_table_name: Name of the parent bridge table
-            entity_id: Entity ID
-            resource_id: Resource ID
-            start_datetime: Event start datetime
-            end_datetime: Event end datetime
-            event_type: Event type label
             
         Returns:
-            Inserted record's primary key, or None on failure
+            Compiled plan, or None if the table is unknown or missing
+        """
+        if parent_bridge_table_name in self._parent_plans:
+            return self._parent_plans[parent_bridge_table_name]
+        
+        plan = None
+        parent_entity_config = self._entities_by_name.get(parent_bridge_table_name)
+        parent_table = self.reflect_table(parent_bridge_table_name) if parent_entity_config else None
+        if parent_entity_config is None:
+            logger.error(f"Parent bridge table {parent_bridge_table_name} not found in db_config")
+        elif parent_table is None:
+            logger.error(f"Parent bridge table {parent_bridge_table_name} does not exist in the database")
+        else:
+            columns = frozenset(c.name for c in parent_table.columns)
+            entity_columns = tuple(a.name for a in parent_entity_config.attributes if a.type == 'entity_id')
+            resource_columns = tuple(a.name for a in parent_entity_config.attributes if a.type == 'resource_id')
+            event_type_columns = [a.name for a in parent_entity_config.attributes
+                                  if a.type == 'event_type' or a.name == 'event_type']
+            # Also fill an 'event_type' column that exists in the table but is not mapped in config
+            if 'event_type' in columns and 'event_type' not in event_type_columns:
+                event_type_columns.append('event_type')
+            plan = BridgeWritePlan(
+                table=parent_table,
+                statement=insert(parent_table),
+                columns=columns,
+                entity_columns=entity_columns,
+                resource_columns=resource_columns,
+                event_type_columns=tuple(event_type_columns),
+                start_column='start_date' if 'start_date' in columns else None,
+                end_column='end_date' if 'end_date' in columns else None,
+                key_generator=self.bridge_key_generator(parent_bridge_table_name)
+            )
+        self._parent_plans[parent_bridge_table_name] = plan
+        return plan
+    
+    def write_bridge_rows(self, plan: BridgeWritePlan, rows: List[Dict[str, Any]]):
+        """
+        Insert rows into a bridge table in one transaction and batch.
+        
+        Chained bridges get their parent records inserted first; a row whose
+        parent record cannot be created is skipped.
+        
+        Args:
+            plan: Compiled bridge plan
+            rows: Column values per row, each with a '_parent' row for chained bridges
         """
         try:
-            # Find parent bridge table config
-            parent_entity_config = None
-            for entity in self.db_config.entities:
-                if entity.name == parent_bridge_table_name:
-                    parent_entity_config = entity
-                    break
-            
-            if not parent_entity_config:
-                logger.error(f"Parent bridge table {parent_bridge_table_name} not found in db_config")
-                return None
-            
-            # Reflect the parent bridge table
-            parent_table = Table(parent_bridge_table_name, self.metadata, autoload_with=self.engine)
-            
-            # Build insert data for parent bridge
-            parent_data = {
-                'start_date': start_datetime,
-                'end_date': end_datetime
-            }
-            
-            # Find entity_id and resource_id columns in parent bridge
-            for attr in parent_entity_config.attributes:
-                if attr.type == 'entity_id':
-                    parent_data[attr.name] = entity_id
-                elif attr.type == 'resource_id':
-                    parent_data[attr.name] = resource_id
-                elif attr.type == 'event_type' or attr.name == 'event_type':
-                    if event_type:
-                        parent_data[attr.name] = event_type
-            
-            # Also check if 'event_type' column exists in table but not mapped in config
-            if 'event_type' in [c.name for c in parent_table.columns] and 'event_type' not in parent_data:
-                if event_type:
-                    parent_data['event_type'] = event_type
-            
-            # Generate PK if the parent bridge table has a custom PK generator
-            bridge_pk = self._generate_bridge_pk(conn, parent_bridge_table_name)
-            if bridge_pk is not None:
-                pk_col_name = self._get_pk_column_name(parent_bridge_table_name)
-                if pk_col_name:
-                    parent_data[pk_col_name] = bridge_pk
-            
-            stmt = insert(parent_table).values(**parent_data)
-            result = conn.execute(stmt)
-            
-            # Get the inserted row's primary key
-            # Use the generated PK if available, otherwise use lastrowid
-            inserted_pk = bridge_pk if bridge_pk is not None else result.lastrowid
-            
-            logger.debug(f"Created parent bridge record in {parent_bridge_table_name}: "
-                        f"entity_id={entity_id}, resource_id={resource_id}, event_type={event_type}, pk={inserted_pk}")
-            
-            return inserted_pk
-            
+            with self.begin() as conn:
+                if plan.parent is not None:
+                    rows = self._link_parent_records(conn, plan, rows)
+                    if not rows:
+                        return
+                if plan.key_generator is not None:
+                    pk_column = plan.key_generator.pk_column
+                    for row in rows:
+                        row[pk_column] = plan.key_generator.next_key(conn)
+                conn.execute(plan.statement, rows)
+        except Exception:
+            for generator in (plan.key_generator, plan.parent.key_generator if plan.parent else None):
+                if generator is not None:
+                    generator.reset()
+            raise
+    
+    def _link_parent_records(self, conn, plan: BridgeWritePlan, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert the parent bridge records of child rows and set the children's parent FK."""
+        parent = plan.parent
+        parent_rows = [row.pop('_parent') for row in rows]
+        if parent.key_generator is not None:
+            # Keys are known up front, so the parent records go in one batch too
+            pk_column = parent.key_generator.pk_column
+            for child, parent_row in zip(rows, parent_rows):
+                parent_row[pk_column] = parent.key_generator.next_key(conn)
+                child[plan.parent_fk_column] = parent_row[pk_column]
+            try:
+                conn.execute(parent.statement, parent_rows)
+            except Exception as e:
+                logger.error(f"Failed to create parent bridge records in {parent.name}: {e}")
+                logger.warning(f"Failed to create parent bridge records in {parent.name}, skipping child bridge")
+                return []
+            return rows
+        
+        linked = []
+        for child, parent_row in zip(rows, parent_rows):
+            try:
+                inserted_pk = conn.execute(parent.statement.values(**parent_row)).lastrowid
+            except Exception as e:
+                logger.error(f"Failed to create parent bridge record in {parent.name}: {e}")
+                inserted_pk = None
+            if inserted_pk:
+                child[plan.parent_fk_column] = inserted_pk
+                linked.append(child)
+            else:
+                logger.warning(f"Failed to create parent bridge record in {parent.name}, skipping child bridge")
+        return linked
+
+
+class EventTracker:
+    """
+    Tracks and records simulation events of one flow in the database
+    
+    Records are written through an EventTrackingService shared by all flows:
+    - Event processing
+    - Resource allocations
+    - A dynamic event-resource bridging table (e.g., Deliverable_Consultant)
+    
+    Note: Entity arrivals are now tracked via created_at column in entity tables
+    """
+    
+    def __init__(self, db_path: str, start_date: Optional[datetime] = None,
+                 resource_table_name: Optional[str] = None,
+                 entity_table_name: Optional[str] = None,
+                 bridge_table_config: Optional[Dict[str, Any]] = None,
+                 db_config=None, service: Optional[EventTrackingService] = None):
+        """
+        Initialize the event tracker
+        
+        Args:
+            db_path: Path to the SQLite database
+            start_date: Simulation start date
+            resource_table_name: Name of the main resource table (e.g., 'Consultant')
+            entity_table_name: Name of the main entity table (e.g., 'Ticket')
+            bridge_table_config: Optional configuration for the bridge table with keys:
+                - entity_fk_column: Name of the column referencing the entity table
+                - resource_fk_column: Name of the column referencing the resource table
+            db_config: Database configuration
+            service: Shared tracking service; a private one is created when omitted
+        """
+        self.service = service or EventTrackingService(db_path, start_date, resource_table_name, db_config)
+        self.db_path = db_path
+        self.start_date = self.service.start_date
+        self.resource_table_name = resource_table_name
+        self.entity_table_name = entity_table_name
+        self.bridge_table_name = None
+        self.bridge_table = None # Will hold the SQLAlchemy Table object
+        self.entity_fk_column = None
+        self.resource_fk_column = None
+        self.bridge_mode = None
+        self.bridge_columns = set()
+        self.event_type_column = 'event_type'
+        # (entity_table, resource_table, target_bridge_table) -> BridgeWritePlan or None
+        self._bridge_plans: Dict[Tuple[Optional[str], str, Optional[str]], Optional[BridgeWritePlan]] = {}
+        
+        # Use custom bridge table configuration if provided
+        if bridge_table_config:
+            self.bridge_table_name = bridge_table_config.get('name')
+            self.entity_fk_column = bridge_table_config.get('entity_fk_column')
+            self.resource_fk_column = bridge_table_config.get('resource_fk_column')
+            self.event_type_column = bridge_table_config.get('event_type_column') or self.event_type_column
+            logger.info(f"EventTracker configured with custom bridge table: {self.bridge_table_name} "
+                        f"(entity_fk: {self.entity_fk_column}, resource_fk: {self.resource_fk_column})")
+        else:
+            logger.warning("EventTracker: No bridge table configuration provided; resource tracking bridge will not be created.")
+        
+        self._resolve_bridge_table()
+    
+    @property
+    def engine(self):
+        return self.service.engine
+    
+    @property
+    def metadata(self):
+        return self.service.metadata
+    
+    def _resolve_bridge_table(self):
+        """Reflect this flow's entity/resource bridge table, creating a minimal one if missing"""
+        if not (self.bridge_table_name and self.resource_fk_column and self.entity_fk_column):
+            return
+        
+        # Prefer reflecting the existing schema first
+        try:
+            self.bridge_table = self.service.reflect_table(self.bridge_table_name)
         except Exception as e:
-            logger.error(f"Failed to create parent bridge record in {parent_bridge_table_name}: {e}")
+            logger.debug(f"Could not reflect bridge table {self.bridge_table_name}: {e}")
+            self.bridge_table = None
+        
+        if self.bridge_table is not None:
+            self.bridge_columns = {col.name for col in self.bridge_table.columns}
+            self.bridge_mode = 'entity'
+            if self.event_type_column and self.event_type_column not in self.bridge_columns and 'event_type' in self.bridge_columns:
+                self.event_type_column = 'event_type'
+            return
+        
+        # Fallback: create a lightweight bridge table with minimal constraints
+        columns: List[Column[Any]] = [Column('id', Integer, primary_key=True)]
+        entity_fk_arg = None
+        if self.entity_table_name:
+            entity_fk_arg = ForeignKey(f"{self.entity_table_name}.{self.service._get_pk_column(self.entity_table_name)}")
+        entity_column_args = [self.entity_fk_column, Integer]
+        if entity_fk_arg:
+            entity_column_args.append(entity_fk_arg)
+        columns.append(Column(*entity_column_args, nullable=False))
+        self.bridge_mode = 'entity'
+        resource_fk_arg = None
+        if self.resource_table_name:
+            resource_fk_arg = ForeignKey(f"{self.resource_table_name}.{self.service._get_pk_column(self.resource_table_name)}")
+        resource_column_args = [self.resource_fk_column, Integer]
+        if resource_fk_arg:
+            resource_column_args.append(resource_fk_arg)
+        columns.append(Column(*resource_column_args, nullable=False))
+        columns.append(Column('event_type', String, nullable=True))
+        columns.append(Column('start_date', DateTime, nullable=True))
+        columns.append(Column('end_date', DateTime, nullable=True))
+        self.bridge_table = Table(self.bridge_table_name, self.metadata, *columns)
+        self.bridge_columns = {col.name for col in columns if hasattr(col, 'name')}
+        self.service.create_table(self.bridge_table)
+    
+    # Entity arrivals are now tracked automatically via created_at column in entity tables
+    
+    def record_event_processing(self, event_flow: str, event_id: int, entity_id: int, 
+                               start_time: float, end_time: float, entity_table: str = None):
+        """
+        Record event processing
+        
+        Args:
+            event_flow: Name of the event flow
+            event_id: Event ID
+            entity_id: Entity ID
+            start_time: Start time in minutes
+            end_time: End time in minutes
+            entity_table: Name of the entity table
+        """
+        self.service.buffer_row(self.service.event_processing, {
+            'event_flow': event_flow,
+            'event_id': event_id,
+            'entity_id': entity_id,
+            'entity_table': entity_table,
+            'start_time': start_time,
+            'end_time': end_time,
+            'duration': end_time - start_time,
+            'start_datetime': self.start_date + timedelta(minutes=start_time),
+            'end_datetime': self.start_date + timedelta(minutes=end_time)
+        })
+    
+    def record_resource_allocation(self, event_flow, event_id, resource_table, resource_id,
+                                  allocation_time, release_time=None,
+                                  entity_id: Optional[int] = None, entity_table: Optional[str] = None, 
+                                  event_type: Optional[str] = None, target_bridge_table: Optional[str] = None,
+                                  extra_attributes: Optional[Dict[str, Any]] = None):
+        """Record the allocation of a resource to an event."""
+        self.record_resource_allocations(
+            event_flow, event_id, [(resource_table, resource_id)], allocation_time, release_time,
+            entity_id=entity_id, entity_table=entity_table, event_type=event_type,
+            target_bridge_table=target_bridge_table, extra_attributes=extra_attributes
+        )
+    
+    def record_resource_allocations(self, event_flow, event_id, resources: Iterable[Tuple[str, Any]],
+                                   allocation_time, release_time=None,
+                                   entity_id: Optional[int] = None, entity_table: Optional[str] = None,
+                                   event_type: Optional[str] = None, target_bridge_table: Optional[str] = None,
+                                   extra_attributes: Optional[Dict[str, Any]] = None):
+        """
+        Record the allocation of an event's resources.
+        
+        Each resource gets a ``sim_resource_allocations`` row and, where a
+        bridge table links the entity and resource tables, a bridge row. The
+        bridge rows of one bridge table are inserted in a single batch.
+        
+        Args:
+            event_flow: Name of the event flow
+            event_id: Event ID
+            resources: (resource_table, resource_id) pairs
+            allocation_time: Allocation time in minutes
+            release_time: Release time in minutes
+            entity_id: Entity ID
+            entity_table: Name of the entity table
+            event_type: Event type label (step ID)
+            target_bridge_table: Bridge table configured on the event step, if any
+            extra_attributes: Generated bridge column values, shared by all rows
+        """
+        try:
+            allocation_datetime = self.start_date + timedelta(minutes=allocation_time)
+            release_datetime = self.start_date + timedelta(minutes=release_time) if release_time else None
+
+            service = self.service
+            allocation_table = service.resource_allocations
+            bridge_rows: Dict[BridgeWritePlan, List[Dict[str, Any]]] = {}
+            for resource_table, resource_id in resources:
+                service.buffer_row(allocation_table, {
+                    'event_flow': event_flow,
+                    'event_id': event_id,
+                    'resource_table': resource_table,
+                    'resource_id': resource_id,
+                    'allocation_time': allocation_time,
+                    'release_time': release_time,
+                    'allocation_datetime': allocation_datetime,
+                    'release_datetime': release_datetime
+                })
+
+                plan = self._bridge_plan(entity_table, resource_table, target_bridge_table)
+                if plan is None:
+                    continue
+                if plan.requires_entity and entity_id is None:
+                    logger.warning(f"Bridge logging skipped for {plan.name}: entity_id required but not provided.")
+                    continue
+                row = plan.build_row(entity_id, resource_id, allocation_datetime, release_datetime,
+                                     event_type, event_id, extra_attributes)
+                if plan.parent is not None:
+                    row['_parent'] = plan.parent.build_row(entity_id, resource_id, allocation_datetime,
+                                                           release_datetime, event_type, event_id, None)
+                bridge_rows.setdefault(plan, []).append(row)
+
+            for plan, rows in bridge_rows.items():
+                service.write_bridge_rows(plan, rows)
+
+        except Exception as e:
+            logger.error(f"Error recording resource allocation: {e}")
+
+    def _bridge_plan(self, entity_table: Optional[str], resource_table: str,
+                     target_bridge_table: Optional[str]) -> Optional[BridgeWritePlan]:
+        """Get the compiled bridge plan for an entity/resource table pair, compiling it on first use."""
+        key = (entity_table, resource_table, target_bridge_table)
+        try:
+            return self._bridge_plans[key]
+        except KeyError:
+            plan = self._bridge_plans[key] = self._compile_bridge_plan(entity_table, resource_table, target_bridge_table)
+            return plan
+
+    def _compile_bridge_plan(self, entity_table: Optional[str], resource_table: str,
+                             target_bridge_table: Optional[str]) -> Optional[BridgeWritePlan]:
+        """
+        Resolve the bridge table an allocation is written to and compile its write plan.
+        
+        Strategy:
+        1. Static bridge configuration of this flow (legacy/single-entity mode)
+        2. Dynamic lookup in db_config when the entity table is known
+        
+        Returns:
+            Compiled plan, or None if no bridge table links the tables
+        """
+        service = self.service
+        target_bridge = None
+        entity_fk = None
+        resource_fk = None
+        event_type_col = None
+        bridge_fk_info = None  # For Resource-Bridge/Entity-Bridge patterns
+
+        # Check static bridge first
+        if self.bridge_table is not None and resource_table == self.resource_table_name and not target_bridge_table:
+            if self.entity_table_name is None or (entity_table is None or entity_table == self.entity_table_name):
+                target_bridge = self.bridge_table
+                entity_fk = self.entity_fk_column
+                resource_fk = self.resource_fk_column
+                event_type_col = self.event_type_column
+
+        # If no match, try dynamic lookup
+        if target_bridge is None and entity_table and resource_table:
+            bridge_info = service._get_dynamic_bridge(entity_table, resource_table, target_bridge_table)
+            if bridge_info:
+                target_bridge, entity_fk, resource_fk, event_type_col, bridge_fk_info = bridge_info
+
+        if target_bridge is None:
             return None
+
+        columns = frozenset(c.name for c in target_bridge.columns)
+        parent = None
+        parent_fk_column = None
+        if bridge_fk_info:
+            # Chained bridge: a parent bridge record is created first and its PK used as this row's FK
+            parent_fk_column, parent_bridge_table_name = bridge_fk_info
+            parent = service.parent_bridge_plan(parent_bridge_table_name)
+            if parent is None:
+                logger.warning(f"Failed to resolve parent bridge table {parent_bridge_table_name}, "
+                               f"bridge logging to {target_bridge.name} disabled")
+                return None
+
+        assigned = {entity_fk, resource_fk, parent_fk_column, 'start_date', 'end_date'}
+        event_type_columns = (event_type_col,) if event_type_col and event_type_col in columns else ()
+        # Direct event_id link (legacy behavior) when the bridge has such a column
+        event_id_column = 'event_id' if 'event_id' in columns and 'event_id' not in assigned | set(event_type_columns) else None
+
+        return BridgeWritePlan(
+            table=target_bridge,
+            statement=insert(target_bridge),
+            columns=columns,
+            entity_columns=(entity_fk,) if entity_fk else (),
+            resource_columns=(resource_fk,) if resource_fk else (),
+            event_type_columns=event_type_columns,
+            event_id_column=event_id_column,
+            start_column='start_date' if 'start_date' in columns else None,
+            end_column='end_date' if 'end_date' in columns else None,
+            key_generator=service.bridge_key_generator(target_bridge.name),
+            parent=parent,
+            parent_fk_column=parent_fk_column,
+            # Entity-Resource bridges need the entity ID; chained bridges link through the parent instead
+            requires_entity=bool(entity_fk) and not parent_fk_column
+        )
+
+    def flush(self):
+        """Write buffered tracking rows of all flows."""
+        self.service.flush()
+    
+    def dispose(self):
+        """Flush and dispose of the shared tracking service."""
+        self.service.dispose()
@@ -6,38 +6,189 @@ Implements Arena-style queue disciplines:
 - LIFO (Last In First Out / Stack)
 - LowAttribute (Priority queue - lower attribute values first)
 - HighAttribute (Priority queue - higher attribute values first)
+
+All disciplines are backed by HeapQueue, a binary heap keyed by
+(priority, sequence number): ties are served in arrival order (FIFO) or
+reverse arrival order (LIFO), entries can be cancelled or re-prioritised in
+O(log n), and the head is always available in O(1). A queue keeps one heap
+("lane") per kind of resource its entities wait for, so an entity waiting
+for a busy resource type does not hold up entities waiting for another.
+
+Queue activity is persisted according to ``queue_logging``: every transition
+(``full``, sim_queue_activity), time-bucketed aggregates per queue
+(``summary``, sim_queue_summary) or nothing (``off``). Rows are buffered and
+written in batches.
 """
 
+import heapq
+import itertools
 import logging
 import simpy
-from typing import Dict, Optional, Any, List
-from dataclasses import dataclass
-from collections import deque
+from typing import Dict, Optional, Any, List, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from sqlalchemy import create_engine, MetaData, Table, Column, Integer, String, Float, DateTime, insert
 from sqlalchemy.pool import NullPool
 
+from ..utils.sim_logging import get_sim_logger, trace
+
 logger = logging.getLogger(__name__)
+sim_log = get_sim_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class QueueEntry:
     """Wrapper for entities in queues with priority support"""
     entity_id: int
     entity_table: str
-    entity_attributes: Dict[str, Any]
+    # Value of the queue's priority attribute (LowAttribute/HighAttribute queues only)
+    attribute_value: Any
     entry_time: float  # Simulation time when entity entered queue
-    priority: float = 0.0  # Priority for sorting (used by PriorityStore)
+    priority: float = 0.0  # Priority for sorting (lower is served first)
+    sequence: int = 0  # Arrival order within the queue, breaks priority ties
+    lane: Any = None  # Resource the entry waits for; entries only compete within a lane
+    # Event fired when the entry becomes or stops being the head of its queue
+    wakeup: Optional[simpy.Event] = field(default=None, repr=False, compare=False)
+
+
+class HeapQueue:
+    """
+    Binary heap of QueueEntry objects ordered by (priority, sequence).
+
+    Removed entries are marked in place and dropped when they reach the top,
+    so cancelling and re-prioritising never scan the heap, and the top of the
+    heap is always a live entry. Every heap item carries a unique insertion
+    number after its order, so a removed item never ties with the live item
+    that replaced it and entries are never compared.
+    """
+
+    __slots__ = ('lifo', '_heap', '_items', '_counter', '_inserts')
+
+    def __init__(self, lifo: bool = False, counter=None):
+        """
+        Args:
+            lifo: Serve equal priorities in reverse arrival order
+            counter: Sequence number source, shared by the lanes of one queue
+        """
+        self.lifo = lifo
+        self._heap = []
+        self._items = {}  # sequence -> heap item [priority, order, insertion, entry]
+        self._counter = counter or itertools.count(1)
+        self._inserts = itertools.count()
+
+    def push(self, entry: QueueEntry, priority: float = 0.0):
+        """Add an entry with a priority (lower values are served first)."""
+        entry.sequence = next(self._counter)
+        entry.priority = priority
+        self._insert(entry)
+
+    def _insert(self, entry: QueueEntry):
+        order = -entry.sequence if self.lifo else entry.sequence
+        item = [entry.priority, order, next(self._inserts), entry]
+        self._items[entry.sequence] = item
+        heapq.heappush(self._heap, item)
+
+    def _drop_removed(self):
+        heap = self._heap
+        while heap and heap[0][3] is None:
+            heapq.heappop(heap)
+        # Rebuild when removed entries dominate the heap
+        if len(heap) > 64 and len(heap) > 2 * len(self._items):
+            self._heap = [item for item in heap if item[3] is not None]
+            heapq.heapify(self._heap)
+
+    def peek(self) -> Optional[QueueEntry]:
+        """Get the next entry without removing it."""
+        return self._heap[0][3] if self._heap else None
+
+    def head_key(self):
+        """Get the (priority, order) key of the next entry, or None if empty."""
+        return (self._heap[0][0], self._heap[0][1]) if self._heap else None
+
+    def pop(self) -> Optional[QueueEntry]:
+        """Remove and return the next entry."""
+        if not self._heap:
+            return None
+        entry = heapq.heappop(self._heap)[3]
+        del self._items[entry.sequence]
+        self._drop_removed()
+        return entry
 
-    def __lt__(self, other):
-        # Support comparison for PriorityQueue (heapq)
-        # If priorities are handled by tuple unpacking in PriorityStore, 
-        # this acts as tie-breaker (FIFO based on entry_time, then deterministic by ID)
-        if hasattr(other, 'entry_time') and self.entry_time != other.entry_time:
-            return self.entry_time < other.entry_time
-        if hasattr(other, 'entity_id'):
-            return self.entity_id < other.entity_id
-        return False
+    def pop_many(self, count: int) -> List[QueueEntry]:
+        """Remove and return up to ``count`` entries in service order."""
+        entries = []
+        while len(entries) < count and self._heap:
+            entries.append(self.pop())
+        return entries
+
+    def remove(self, entry: QueueEntry) -> bool:
+        """
+        Remove a waiting entry.
+
+        Returns:
+            False if the entry is not in this queue
+        """
+        item = self._items.get(entry.sequence)
+        if item is None or item[3] is not entry:
+            return False
+        del self._items[entry.sequence]
+        item[3] = None
+        self._drop_removed()
+        return True
+
+    def update(self, entry: QueueEntry, priority: float) -> bool:
+        """
+        Change the priority of a waiting entry, keeping its arrival order.
+
+        Returns:
+            False if the entry is not in this queue
+        """
+        if entry not in self:
+            return False
+        if priority == entry.priority:
+            return True
+        self.remove(entry)
+        entry.priority = priority
+        self._insert(entry)
+        return True
+
+    def __contains__(self, entry: QueueEntry) -> bool:
+        item = self._items.get(entry.sequence)
+        return item is not None and item[3] is entry
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class QueueSummaryBucket:
+    """Running aggregates of one queue over the current time bucket"""
+
+    __slots__ = ('bucket', 'start', 'last_time', 'length', 'max_length', 'length_area',
+                 'entries', 'exits', 'total_wait_time', 'max_wait_time')
+
+    def __init__(self, bucket: int, start: float, length: int):
+        self.length = length
+        self.reset(bucket, start)
+
+    def reset(self, bucket: int, start: float):
+        """Start accumulating a new bucket at the current queue length."""
+        self.bucket = bucket
+        self.start = start
+        self.last_time = start
+        self.max_length = self.length
+        self.length_area = 0.0
+        self.entries = 0
+        self.exits = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def advance(self, now: float):
+        """Integrate the queue length up to ``now``."""
+        self.length_area += self.length * (now - self.last_time)
+        self.last_time = now
+
+    def is_empty(self) -> bool:
+        return not (self.entries or self.exits or self.length_area or self.length)
 
 
 class QueueManager:
@@ -52,7 +203,7 @@ class QueueManager:
     """
 
     def __init__(self, env: simpy.Environment, queue_definitions: List, db_config=None,
-                 db_path: str = None, start_date: datetime = None):
+                 db_path: str = None, start_date: datetime = None, logging_config=None):
         """
         Initialize the queue manager.
 
@@ -62,21 +213,32 @@ class QueueManager:
             db_config: Optional database configuration for validation
             db_path: Optional database path for activity logging
             start_date: Optional simulation start date for datetime calculations
+            logging_config: Optional QueueLoggingConfig (defaults to full logging)
         """
         self.env = env
         self.db_config = db_config
         self.db_path = db_path
         self.start_date = start_date or datetime.now()
-        self.queues = {}  # queue_name -> queue object (deque, list, or PriorityStore)
+        self.queues: Dict[str, Dict[Any, HeapQueue]] = {}  # queue_name -> lane -> HeapQueue
         self.queue_configs = {}  # queue_name -> QueueDefinition
         self.queue_stats = {}  # queue_name -> statistics dict
+        self._lengths: Dict[str, int] = {}  # queue_name -> entries waiting in all lanes
+        self._counters = {}  # queue_name -> sequence number source shared by its lanes
+        self._waiting: Dict[str, Dict[int, QueueEntry]] = {}  # queue_name -> entity_id -> entry
+        self._heads: Dict[Tuple[str, Any], Optional[QueueEntry]] = {}  # (queue_name, lane) -> head entry
 
         # Database logging setup (optional)
+        self.logging_mode = getattr(logging_config, 'mode', 'full')
+        self.flush_size = getattr(logging_config, 'flush_size', 500)
+        self.bucket_minutes = getattr(logging_config, 'bucket_minutes', 60.0)
         self.engine = None
         self.metadata = None
         self.queue_activity_table = None
+        self.queue_summary_table = None
+        self._pending_rows = []
+        self._summaries: Dict[str, QueueSummaryBucket] = {}
 
-        if self.db_path:
+        if self.db_path and self.logging_mode != 'off':
             self._initialize_database_logging()
 
         # Create queues from definitions
@@ -87,9 +249,10 @@ class QueueManager:
 
     def _initialize_database_logging(self):
         """
-        Initialize database connection and create queue activity tracking table.
+        Initialize database connection and create the queue logging table.
 
-        Creates sim_queue_activity table to log all queue entry/exit events.
+        Creates sim_queue_activity (full mode) to log all queue entry/exit
+        events, or sim_queue_summary (summary mode) for bucketed aggregates.
         """
         try:
             # Create SQLAlchemy engine with WAL mode
@@ -101,6 +264,26 @@ class QueueManager:
 
             self.metadata = MetaData()
 
+            if self.logging_mode == 'summary':
+                self.queue_summary_table = Table(
+                    'sim_queue_summary', self.metadata,
+                    Column('id', Integer, primary_key=True),
+                    Column('queue_name', String, nullable=False),
+                    Column('bucket_start', Float, nullable=False),  # Time in minutes
+                    Column('bucket_end', Float, nullable=False),
+                    Column('bucket_start_datetime', DateTime, nullable=False),
+                    Column('entries', Integer, nullable=False),
+                    Column('exits', Integer, nullable=False),
+                    Column('avg_queue_length', Float, nullable=False),  # Time-weighted
+                    Column('max_queue_length', Integer, nullable=False),
+                    Column('total_wait_time', Float, nullable=False),  # Of entities exiting in the bucket
+                    Column('avg_wait_time', Float, nullable=True),
+                    Column('max_wait_time', Float, nullable=True)
+                )
+                self.metadata.create_all(self.engine)
+                logger.debug(f"Created sim_queue_summary table in {self.db_path}")
+                return
+
             # Define queue activity tracking table
             self.queue_activity_table = Table(
                 'sim_queue_activity', self.metadata,
@@ -108,7 +291,7 @@ class QueueManager:
                 Column('queue_name', String, nullable=False),
                 Column('entity_id', Integer, nullable=False),
                 Column('entity_table', String, nullable=False),
-                Column('action', String, nullable=False),  # 'entry' or 'exit'
+                Column('action', String, nullable=False),  # 'entry', 'exit' or 'cancel'
                 Column('simulation_time', Float, nullable=False),  # Time in minutes
                 Column('simulation_datetime', DateTime, nullable=False),  # Actual datetime
                 Column('priority', Float, nullable=True),  # Priority value (for priority queues)
@@ -125,6 +308,7 @@ class QueueManager:
             logger.error(f"Error initializing queue database logging: {e}")
             self.engine = None
             self.queue_activity_table = None
+            self.queue_summary_table = None
 
     def _create_queue(self, queue_def):
         """
@@ -138,20 +322,15 @@ class QueueManager:
 
         logger.info(f"Creating queue '{queue_name}' with type '{queue_type}'")
 
-        if queue_type == 'FIFO':
-            # Standard FIFO queue using Python deque (efficient for both ends)
-            self.queues[queue_name] = deque()
-        elif queue_type == 'LIFO':
-            # LIFO queue (stack) using Python list
-            self.queues[queue_name] = []
-        elif queue_type in ['LowAttribute', 'HighAttribute']:
-            # Priority queue using SimPy PriorityStore
-            # Note: PriorityStore orders by lowest value first, so we'll negate for HighAttribute
-            self.queues[queue_name] = simpy.PriorityStore(self.env)
-        else:
+        if queue_type not in ['FIFO', 'LIFO', 'LowAttribute', 'HighAttribute']:
             logger.error(f"Unknown queue type '{queue_type}', defaulting to FIFO")
-            self.queues[queue_name] = deque()
 
+        # Lanes are created on first use; FIFO/LIFO use a constant priority,
+        # so only arrival order counts
+        self.queues[queue_name] = {}
+        self._lengths[queue_name] = 0
+        self._counters[queue_name] = itertools.count(1)
+        self._waiting[queue_name] = {}
         self.queue_configs[queue_name] = queue_def
         self.queue_stats[queue_name] = {
             'total_entries': 0,
@@ -173,35 +352,134 @@ class QueueManager:
             queue_name: Name of the queue
             entity_id: Entity ID
             entity_table: Entity table name
-            action: 'entry' or 'exit'
+            action: 'entry', 'exit' or 'cancel'
             priority: Priority value (for priority queues)
             queue_length_before: Queue length before this action
             queue_length_after: Queue length after this action
-            wait_time: Wait time in minutes (for exit actions only)
+            wait_time: Wait time in minutes (for exit and cancel actions only)
         """
-        if not self.engine or self.queue_activity_table is None:
+        if self.engine is None:
             return  # Database logging not enabled
 
+        if self.queue_summary_table is not None:
+            self._summarize_queue_activity(queue_name, action, queue_length_before,
+                                           queue_length_after, wait_time)
+            return
+
+        if self.queue_activity_table is None:
+            return
+
+        self._buffer_row({
+            'queue_name': queue_name,
+            'entity_id': entity_id,
+            'entity_table': entity_table,
+            'action': action,
+            'simulation_time': self.env.now,
+            'simulation_datetime': self.start_date + timedelta(minutes=self.env.now),
+            'priority': priority,
+            'queue_length_before': queue_length_before,
+            'queue_length_after': queue_length_after,
+            'wait_time': wait_time
+        })
+
+    def _summarize_queue_activity(self, queue_name: str, action: str, queue_length_before: int,
+                                  queue_length_after: int, wait_time: Optional[float]):
+        """Add a queue transition to the summary bucket of its queue."""
+        now = self.env.now
+        summary = self._summaries.get(queue_name)
+        if summary is None:
+            # Buckets are aligned to multiples of bucket_minutes, like every later one
+            bucket = int(now // self.bucket_minutes)
+            summary = QueueSummaryBucket(bucket, bucket * self.bucket_minutes, queue_length_before)
+            self._summaries[queue_name] = summary
+        self._advance_summary(queue_name, summary, now)
+
+        if action == 'entry':
+            summary.entries += 1
+        elif action == 'exit':
+            summary.exits += 1
+            if wait_time is not None:
+                summary.total_wait_time += wait_time
+                summary.max_wait_time = max(summary.max_wait_time, wait_time)
+        summary.length = queue_length_after
+        summary.max_length = max(summary.max_length, queue_length_after)
+
+    def _advance_summary(self, queue_name: str, summary: QueueSummaryBucket, now: float):
+        """Close the buckets of a queue that ended before ``now``."""
+        bucket = int(now // self.bucket_minutes)
+        while summary.bucket < bucket:
+            bucket_end = (summary.bucket + 1) * self.bucket_minutes
+            summary.advance(bucket_end)
+            self._emit_summary(queue_name, summary, bucket_end)
+            next_bucket = summary.bucket + 1
+            if summary.length == 0:
+                # Nothing happens in buckets where the queue stays empty
+                next_bucket = bucket
+            summary.reset(next_bucket, next_bucket * self.bucket_minutes)
+        summary.advance(now)
+
+    def _emit_summary(self, queue_name: str, summary: QueueSummaryBucket, end: float):
+        """Buffer the summary row of a bucket ending at ``end``."""
+        if summary.is_empty():
+            return
+        span = end - summary.start
+        self._buffer_row({
+            'queue_name': queue_name,
+            'bucket_start': summary.start,
+            'bucket_end': end,
+            'bucket_start_datetime': self.start_date + timedelta(minutes=summary.start),
+            'entries': summary.entries,
+            'exits': summary.exits,
+            'avg_queue_length': summary.length_area / span if span > 0 else float(summary.length),
+            'max_queue_length': summary.max_length,
+            'total_wait_time': summary.total_wait_time,
+            'avg_wait_time': summary.total_wait_time / summary.exits if summary.exits else None,
+            'max_wait_time': summary.max_wait_time if summary.exits else None
+        })
+
+    def _buffer_row(self, row: Dict[str, Any]):
+        """Queue a row for the logging table and write the buffer once it is full."""
+        self._pending_rows.append(row)
+        if len(self._pending_rows) >= self.flush_size:
+            self._write_pending_rows()
+
+    def _write_pending_rows(self):
+        """Write all buffered rows in one transaction."""
+        if not self._pending_rows or self.engine is None:
+            return
+        table = self.queue_summary_table if self.queue_summary_table is not None else self.queue_activity_table
+        rows, self._pending_rows = self._pending_rows, []
         try:
-            simulation_datetime = self.start_date + timedelta(minutes=self.env.now)
-
-            with self.engine.connect() as conn:
-                stmt = insert(self.queue_activity_table).values(
-                    queue_name=queue_name,
-                    entity_id=entity_id,
-                    entity_table=entity_table,
-                    action=action,
-                    simulation_time=self.env.now,
-                    simulation_datetime=simulation_datetime,
-                    priority=priority,
-                    queue_length_before=queue_length_before,
-                    queue_length_after=queue_length_after,
-                    wait_time=wait_time
-                )
-                conn.execute(stmt)
-                conn.commit()
+            with self.engine.begin() as conn:
+                conn.execute(insert(table), rows)
         except Exception as e:
-            logger.warning(f"Error logging queue activity: {e}")
+            logger.warning(f"Error logging {len(rows)} queue activity rows: {e}")
+
+    def flush(self):
+        """
+        Write buffered queue logging rows.
+
+        In summary mode the open bucket of every queue is closed at the
+        current simulation time first.
+        """
+        if self.engine is None:
+            return
+        now = self.env.now
+        for queue_name, summary in self._summaries.items():
+            self._advance_summary(queue_name, summary, now)
+            self._emit_summary(queue_name, summary, now)
+            summary.reset(summary.bucket, now)
+        self._write_pending_rows()
+
+    def dispose(self):
+        """Flush buffered rows and dispose of the logging engine."""
+        if self.engine is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self.engine.dispose()
+            self.engine = None
 
     def get_queue_length(self, queue_name: str) -> int:
         """
@@ -213,20 +491,59 @@ class QueueManager:
         Returns:
             Current queue length
         """
-        if queue_name not in self.queues:
-            return 0
-
-        queue = self.queues[queue_name]
-        queue_type = self.queue_configs[queue_name].type
+        return self._lengths.get(queue_name, 0)
+
+    def _lane(self, queue_name: str, lane: Any) -> HeapQueue:
+        """Get (or create) the heap of one lane of a queue."""
+        lanes = self.queues[queue_name]
+        heap = lanes.get(lane)
+        if heap is None:
+            lifo = self.queue_configs[queue_name].type == 'LIFO'
+            heap = lanes[lane] = HeapQueue(lifo=lifo, counter=self._counters[queue_name])
+        return heap
+
+    def _head_lane(self, queue_name: str) -> Optional[HeapQueue]:
+        """Get the lane holding the next entry of the whole queue."""
+        best, best_key = None, None
+        for heap in self.queues[queue_name].values():
+            key = heap.head_key()
+            if key is not None and (best_key is None or key < best_key):
+                best, best_key = heap, key
+        return best
+
+    def _priority_for(self, queue_def, attribute_value: Any) -> float:
+        """Heap priority of an entity in a queue (lower is served first)."""
+        if queue_def.type == 'LowAttribute':
+            # Lower attribute value = higher priority (processed first)
+            return float(attribute_value if attribute_value is not None else float('inf'))
+        if queue_def.type == 'HighAttribute':
+            # Higher attribute value = higher priority; negate for the min-heap
+            return -float(attribute_value if attribute_value is not None else 0)
+        return 0.0
+
+    def _reported_priority(self, queue_name: str, entry: QueueEntry) -> Optional[float]:
+        """Priority to log, only meaningful for attribute queues."""
+        return entry.priority if self.queue_configs[queue_name].type in ['LowAttribute', 'HighAttribute'] else None
+
+    def _notify_head_change(self, queue_name: str, lane: Any):
+        """Wake the previous and the new head of a lane when the head changed."""
+        head = self.queues[queue_name][lane].peek()
+        previous = self._heads.get((queue_name, lane))
+        if head is previous:
+            return
+        self._heads[(queue_name, lane)] = head
+        for entry in (previous, head):
+            if entry is not None and entry.wakeup is not None and not entry.wakeup.triggered:
+                entry.wakeup.succeed()
 
-        if queue_type in ['FIFO', 'LIFO']:
-            return len(queue)
-        elif queue_type in ['LowAttribute', 'HighAttribute']:
-            return len(queue.items)
-        return 0
+    def is_head(self, queue_name: str, entry: QueueEntry) -> bool:
+        """Whether an entry is next to be served among the entries of its lane."""
+        lanes = self.queues.get(queue_name)
+        heap = lanes.get(entry.lane) if lanes is not None else None
+        return heap is not None and heap.peek() is entry
 
     def enqueue(self, queue_name: str, entity_id: int, entity_table: str,
-                entity_attributes: Dict[str, Any]):
+                entity_attributes: Dict[str, Any], lane: Any = None) -> Optional[QueueEntry]:
         """
         Add an entity to the queue.
 
@@ -235,42 +552,38 @@ class QueueManager:
             entity_id: Entity's ID
             entity_table: Table where entity is stored
             entity_attributes: Dict of entity attributes (for priority calculation)
+            lane: Resource the entity waits for (e.g. (table, type)); entities
+                in different lanes do not wait for each other
+
+        Returns:
+            The queued entry, or None if the queue does not exist
         """
         if queue_name not in self.queues:
             logger.warning(f"Queue '{queue_name}' not found - entity {entity_id} will use implicit queueing")
-            return
+            return None
+
+        queue_def = self.queue_configs[queue_name]
 
         # Get queue length BEFORE adding entity
-        queue_length_before = self.get_queue_length(queue_name)
+        queue_length_before = self._lengths[queue_name]
+
+        # Only the priority attribute is kept with the entry, not the whole row
+        attribute_value = None
+        if queue_def.type in ['LowAttribute', 'HighAttribute'] and entity_attributes:
+            attribute_value = entity_attributes.get(queue_def.attribute)
 
         entry = QueueEntry(
             entity_id=entity_id,
             entity_table=entity_table,
-            entity_attributes=entity_attributes,
-            entry_time=self.env.now
+            attribute_value=attribute_value,
+            entry_time=self.env.now,
+            lane=lane
         )
-
-        queue_def = self.queue_configs[queue_name]
-        queue = self.queues[queue_name]
-
-        if queue_def.type == 'FIFO':
-            queue.append(entry)
-        elif queue_def.type == 'LIFO':
-            queue.append(entry)
-        elif queue_def.type == 'LowAttribute':
-            # Lower attribute value = higher priority (processed first)
-            attr_value = entity_attributes.get(queue_def.attribute, float('inf'))
-            entry.priority = float(attr_value)
-            queue.put((entry.priority, entry))
-        elif queue_def.type == 'HighAttribute':
-            # Higher attribute value = higher priority (processed first)
-            # Negate value so SimPy's PriorityStore (which uses min-heap) works correctly
-            attr_value = entity_attributes.get(queue_def.attribute, 0)
-            entry.priority = -float(attr_value)  # Negate for max-heap behavior
-            queue.put((entry.priority, entry))
+        self._lane(queue_name, lane).push(entry, self._priority_for(queue_def, attribute_value))
+        self._waiting[queue_name][entity_id] = entry
 
         # Get queue length AFTER adding entity
-        queue_length_after = self.get_queue_length(queue_name)
+        queue_length_after = self._lengths[queue_name] = queue_length_before + 1
 
         # Update statistics
         stats = self.queue_stats[queue_name]
@@ -287,18 +600,64 @@ class QueueManager:
             queue_length_before=queue_length_before,
             queue_length_after=queue_length_after
         )
+        self._notify_head_change(queue_name, lane)
+
+        if sim_log.debug_enabled:
+            priority = self._reported_priority(queue_name, entry)
+            sim_log.debug("Entity %s entered queue '%s' (length: %s, priority: %s)", entity_id, queue_name,
+                          queue_length_after, priority if priority is not None else 'N/A')
+        trace(entity_id, "t=%.3f entity %s entered queue '%s' (length %s)",
+              self.env.now, entity_id, queue_name, queue_length_after)
+        return entry
+
+    def _record_exit(self, queue_name: str, entry: QueueEntry, queue_length_before: int,
+                     action: str = 'exit'):
+        """Update statistics and log an entry that left its queue."""
+        self._lengths[queue_name] = queue_length_before - 1
+        waiting = self._waiting[queue_name]
+        if waiting.get(entry.entity_id) is entry:
+            del waiting[entry.entity_id]
+
+        wait_time = self.env.now - entry.entry_time
+        if action == 'exit':
+            stats = self.queue_stats[queue_name]
+            stats['total_exits'] += 1
+            stats['total_wait_time'] += wait_time
+            stats['max_wait_time'] = max(stats['max_wait_time'], wait_time)
+            stats['wait_times'].append(wait_time)
 
-        logger.debug(
-            f"Entity {entity_id} entered queue '{queue_name}' "
-            f"(length: {queue_length_after}, priority: {entry.priority if queue_def.type in ['LowAttribute', 'HighAttribute'] else 'N/A'})"
+        # Log to database
+        self._log_queue_activity(
+            queue_name=queue_name,
+            entity_id=entry.entity_id,
+            entity_table=entry.entity_table,
+            action=action,
+            priority=self._reported_priority(queue_name, entry),
+            queue_length_before=queue_length_before,
+            queue_length_after=self._lengths[queue_name],
+            wait_time=wait_time
         )
 
-    def dequeue(self, queue_name: str) -> Optional[QueueEntry]:
+        sim_log.debug("Entity %s %s queue '%s' (wait time: %.2f minutes)", entry.entity_id,
+                      'exited' if action == 'exit' else 'left', queue_name, wait_time)
+        trace(entry.entity_id, "t=%.3f entity %s %s queue '%s' after %.3f minutes", self.env.now,
+              entry.entity_id, 'exited' if action == 'exit' else 'left', queue_name, wait_time)
+
+    def _remove(self, queue_name: str, entry: Optional[QueueEntry] = None) -> Optional[QueueEntry]:
+        """Take a specific entry, or the head of the whole queue, out of its lane."""
+        if entry is None:
+            heap = self._head_lane(queue_name)
+            return heap.pop() if heap is not None else None
+        heap = self.queues[queue_name].get(entry.lane)
+        return entry if heap is not None and heap.remove(entry) else None
+
+    def dequeue(self, queue_name: str, entry: Optional[QueueEntry] = None) -> Optional[QueueEntry]:
         """
         Remove and return the next entity from the queue based on queue discipline.
 
         Args:
             queue_name: Name of the queue
+            entry: Specific entry to serve (defaults to the head of the queue)
 
         Returns:
             QueueEntry object or None if queue is empty or doesn't exist
@@ -307,59 +666,88 @@ class QueueManager:
             logger.warning(f"Queue '{queue_name}' not found for dequeue operation")
             return None
 
-        queue_def = self.queue_configs[queue_name]
-        queue = self.queues[queue_name]
-        entry = None
+        queue_length_before = self._lengths[queue_name]
+        entry = self._remove(queue_name, entry)
+        if entry is None:
+            return None
 
-        # Get queue length BEFORE removing entity
-        queue_length_before = self.get_queue_length(queue_name)
+        self._record_exit(queue_name, entry, queue_length_before)
+        self._notify_head_change(queue_name, entry.lane)
+        return entry
 
-        try:
-            if queue_def.type == 'FIFO':
-                if queue:
-                    entry = queue.popleft()  # Remove from front
-            elif queue_def.type == 'LIFO':
-                if queue:
-                    entry = queue.pop()  # Remove from back (stack)
-            elif queue_def.type in ['LowAttribute', 'HighAttribute']:
-                if queue.items:
-                    # PriorityStore returns (priority, entry) tuple
-                    priority, entry = queue.items[0]  # Peek at highest priority
-                    queue.get()  # Actually remove it (must be called to update queue)
-        except Exception as e:
-            logger.error(f"Error dequeuing from '{queue_name}': {e}")
-            return None
+    def dequeue_batch(self, queue_name: str, count: int) -> List[QueueEntry]:
+        """
+        Remove and return up to ``count`` entities in queue discipline order.
 
-        if entry:
-            # Get queue length AFTER removing entity
-            queue_length_after = self.get_queue_length(queue_name)
+        Args:
+            queue_name: Name of the queue
+            count: Maximum number of entities to remove
 
-            # Calculate wait time and update statistics
-            wait_time = self.env.now - entry.entry_time
-            stats = self.queue_stats[queue_name]
-            stats['total_exits'] += 1
-            stats['total_wait_time'] += wait_time
-            stats['max_wait_time'] = max(stats['max_wait_time'], wait_time)
-            stats['wait_times'].append(wait_time)
+        Returns:
+            List of QueueEntry objects (empty if the queue is empty or doesn't exist)
+        """
+        if queue_name not in self.queues:
+            logger.warning(f"Queue '{queue_name}' not found for dequeue operation")
+            return []
+
+        entries = []
+        for _ in range(max(0, count)):
+            queue_length_before = self._lengths[queue_name]
+            entry = self._remove(queue_name)
+            if entry is None:
+                break
+            self._record_exit(queue_name, entry, queue_length_before)
+            entries.append(entry)
+        for lane in {entry.lane for entry in entries}:
+            self._notify_head_change(queue_name, lane)
+        return entries
+
+    def cancel(self, queue_name: str, entry: QueueEntry) -> bool:
+        """
+        Remove a waiting entry without serving it (e.g. its process was interrupted).
 
-            # Log to database
-            self._log_queue_activity(
-                queue_name=queue_name,
-                entity_id=entry.entity_id,
-                entity_table=entry.entity_table,
-                action='exit',
-                priority=entry.priority if queue_def.type in ['LowAttribute', 'HighAttribute'] else None,
-                queue_length_before=queue_length_before,
-                queue_length_after=queue_length_after,
-                wait_time=wait_time
-            )
+        Args:
+            queue_name: Name of the queue
+            entry: Entry returned by enqueue
 
-            logger.debug(
-                f"Entity {entry.entity_id} exited queue '{queue_name}' "
-                f"(wait time: {wait_time:.2f} minutes)"
-            )
+        Returns:
+            True if the entry was waiting in the queue
+        """
+        if queue_name not in self.queues:
+            return False
+        queue_length_before = self._lengths[queue_name]
+        if self._remove(queue_name, entry) is None:
+            return False
+        self._record_exit(queue_name, entry, queue_length_before, action='cancel')
+        self._notify_head_change(queue_name, entry.lane)
+        return True
+
+    def update_entity_attribute(self, entity_id: int, attribute_name: str, value: Any):
+        """
+        Re-prioritise a waiting entity after one of its attributes changed.
 
-        return entry
+        Args:
+            entity_id: Entity ID
+            attribute_name: Name of the changed attribute
+            value: New attribute value
+        """
+        for queue_name, waiting in self._waiting.items():
+            entry = waiting.get(entity_id)
+            if entry is None:
+                continue
+            queue_def = self.queue_configs[queue_name]
+            if queue_def.type not in ['LowAttribute', 'HighAttribute'] or queue_def.attribute != attribute_name:
+                continue
+            try:
+                priority = self._priority_for(queue_def, value)
+            except (TypeError, ValueError):
+                logger.warning(f"Cannot re-prioritise entity {entity_id} in '{queue_name}': "
+                               f"'{attribute_name}' = {value!r} is not numeric")
+                continue
+            entry.attribute_value = value
+            if self.queues[queue_name][entry.lane].update(entry, priority):
+                self._notify_head_change(queue_name, entry.lane)
+                sim_log.debug("Re-prioritised entity %s in queue '%s' to %s", entity_id, queue_name, priority)
 
     def peek(self, queue_name: str) -> Optional[QueueEntry]:
         """
@@ -373,19 +761,8 @@ class QueueManager:
         """
         if queue_name not in self.queues:
             return None
-
-        queue_def = self.queue_configs[queue_name]
-        queue = self.queues[queue_name]
-
-        if queue_def.type == 'FIFO':
-            return queue[0] if queue else None
-        elif queue_def.type == 'LIFO':
-            return queue[-1] if queue else None
-        elif queue_def.type in ['LowAttribute', 'HighAttribute']:
-            if queue.items:
-                _, entry = queue.items[0]
-                return entry
-        return None
+        heap = self._head_lane(queue_name)
+        return heap.peek() if heap is not None else None
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -6,6 +6,7 @@ using SimPy's FilterStore for efficient resource pooling and tracking.
 """
 
 import logging
+import numpy as np
 import simpy
 from typing import Dict, List, Tuple, Any, Optional
 from sqlalchemy import create_engine, inspect, text
@@ -15,17 +16,20 @@ from datetime import datetime
 
 from ...distributions import generate_from_distribution
 from ..utils.column_resolver import ColumnResolver
+from ..utils.random_streams import RandomStreamRegistry
+from ..utils.sim_logging import get_sim_logger, is_traced, trace
 
 logger = logging.getLogger(__name__)
+sim_log = get_sim_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Resource:
-    """Represents a resource with all its attributes"""
+    """Represents a resource by its key and type (the rest of its row stays in the database)"""
     id: int
     table: str
     type: str
-    attributes: Dict[str, Any]
+    ordinal: int = -1  # Dense index into the ResourceManager's utilization arrays
     
     def __getitem__(self, key):
         """Allow dict-like access for compatibility"""
@@ -35,15 +39,29 @@ class Resource:
             return self.table
         elif key == 'type':
             return self.type
-        else:
-            return self.attributes.get(key)
+        return None
     
     def get(self, key, default=None):
         """Dict-like get method"""
-        try:
-            return self[key]
-        except KeyError:
-            return default
+        value = self[key]
+        return default if value is None else value
+
+
+@dataclass(slots=True)
+class AllocationRecord:
+    """One allocate/release entry of the allocation history"""
+    event_id: Any
+    timestamp: float
+    resources: Tuple[Resource, ...]
+    action: str
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'event_id': self.event_id,
+            'timestamp': self.timestamp,
+            'resources': [(r.table, r.id, r.type) for r in self.resources],
+            'action': self.action
+        }
 
 
 class ResourceManager:
@@ -54,7 +72,7 @@ class ResourceManager:
     allowing for individual tracking and flexible filtering.
     """
     
-    def __init__(self, env, engine, db_path, db_config=None):
+    def __init__(self, env, engine, db_path, db_config=None, random_streams=None):
         """
         Initialize the resource manager
         
@@ -63,11 +81,14 @@ class ResourceManager:
             engine: SQLAlchemy engine
             db_path: Path to the SQLite database
             db_config: Optional database configuration
+            random_streams: RandomStreamRegistry for resource count formulas
+                (a private unseeded registry when omitted)
         """
         self.env = env
         self.engine = engine
         self.db_path = db_path
         self.db_config = db_config
+        self.random_streams = random_streams if random_streams is not None else RandomStreamRegistry()
         
         # Initialize column resolver for dynamic PK/column lookups
         self.column_resolver = ColumnResolver(db_config) if db_config else None
@@ -76,8 +97,18 @@ class ResourceManager:
         self.resource_store = simpy.FilterStore(env)
         
         # Track resource allocations for statistics
-        self.allocation_history = []
-        self.resource_utilization = {}
+        self.allocation_history: List[AllocationRecord] = []
+        self.total_allocations = 0
+        
+        # Utilization counters, indexed by Resource.ordinal (NaN = never allocated/released)
+        self.resources: List[Resource] = []
+        self.busy_time = np.zeros(0)
+        self.allocation_counts = np.zeros(0, dtype=np.int64)
+        self.last_allocated = np.zeros(0)
+        self.last_released = np.zeros(0)
+        
+        # Resource table -> (primary key column, resource type column) used when loading
+        self.resource_type_columns = {}
         
         # Track current allocations by event
         self.event_allocations = {}  # event_id -> List[Resource]
@@ -86,9 +117,6 @@ class ResourceManager:
         # Resources in a group are retained across steps with the same group_id
         self.group_allocations = {}
         
-        # Track all resources by ID for type lookup
-        self.all_resources = {}  # resource_key -> Resource
-        
     def get_resource_table(self, event_sim):
         """
         Get the resource table name from event simulation configuration or database config
@@ -161,6 +189,7 @@ class ResourceManager:
                         logger.warning(f"Could not resolve PK column for {resource_table}, falling back to 'id'")
                 pk_column = pk_column or 'id'
                 logger.debug(f"Using '{pk_column}' as primary key column for resource loading")
+                self.resource_type_columns[resource_table] = (pk_column, resource_type_column)
                 
                 for row in result:
                     row_dict = dict(row._mapping)
@@ -170,26 +199,16 @@ class ResourceManager:
                         id=row_dict.get(pk_column),
                         table=resource_table,
                         type=row_dict.get(resource_type_column, 'unknown'),
-                        attributes=row_dict
+                        ordinal=len(self.resources)
                     )
+                    self.resources.append(resource)
                     
                     # Add to the store
                     self.resource_store.put(resource)
                     resource_count += 1
                     resource_types.add(resource.type)
-                    
-                    # Store resource for type lookup
-                    resource_key = f"{resource_table}_{resource.id}"
-                    self.all_resources[resource_key] = resource
-                    
-                    # Initialize utilization tracking
-                    self.resource_utilization[resource_key] = {
-                        'total_busy_time': 0,
-                        'allocation_count': 0,
-                        'last_allocated': None,
-                        'last_released': None
-                    }
                 
+                self._grow_utilization_arrays()
                 logger.debug(f"Loaded {resource_count} resources of {len(resource_types)} types into FilterStore")
                 logger.debug(f"Resource types: {', '.join(sorted(resource_types))}")
                 
@@ -198,6 +217,40 @@ class ResourceManager:
                 import traceback
                 logger.error(traceback.format_exc())
     
+    def _grow_utilization_arrays(self):
+        """Extend the utilization arrays to cover all loaded resources."""
+        extra = len(self.resources) - len(self.busy_time)
+        if extra <= 0:
+            return
+        self.busy_time = np.concatenate([self.busy_time, np.zeros(extra)])
+        self.allocation_counts = np.concatenate([self.allocation_counts, np.zeros(extra, dtype=np.int64)])
+        self.last_allocated = np.concatenate([self.last_allocated, np.full(extra, np.nan)])
+        self.last_released = np.concatenate([self.last_released, np.full(extra, np.nan)])
+
+    def _record_release(self, resources: List[Resource], release_time: float):
+        """Add the busy time of released resources to their utilization counters."""
+        ordinals = [r.ordinal for r in resources if r.ordinal >= 0]
+        if not ordinals:
+            return
+        ordinals = np.asarray(ordinals)
+        allocated = self.last_allocated[ordinals]
+        was_allocated = ~np.isnan(allocated)
+        ordinals = ordinals[was_allocated]
+        self.busy_time[ordinals] += release_time - allocated[was_allocated]
+        self.last_released[ordinals] = release_time
+
+    def _current_busy_time(self, now: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busy time per resource including allocations still in progress.
+
+        Returns:
+            Tuple of (busy time array, boolean array of resources currently allocated)
+        """
+        allocated = self.last_allocated
+        with np.errstate(invalid='ignore'):
+            busy = ~np.isnan(allocated) & (np.isnan(self.last_released) | (allocated > self.last_released))
+        return self.busy_time + np.where(busy, now - allocated, 0.0), busy
+
     def _find_resource_type_column(self, column_names: List[str]) -> Optional[str]:
         """
         Find the column that represents resource type
@@ -229,7 +282,7 @@ class ResourceManager:
     
     def allocate_resources(self, event_id: int, requirements: List[Dict[str, Any]], event_flow: str = None,
                           entity_id: int = None, entity_table: str = None, entity_attributes: Dict[str, Any] = None,
-                          queue_manager = None):
+                          queue_manager = None, rng=None):
         """
         Allocate resources for an event based on requirements.
 
@@ -244,6 +297,7 @@ class ResourceManager:
             entity_table: Entity table name (required for queue-aware allocation)
             entity_attributes: Entity attributes dict (required for priority queues)
             queue_manager: QueueManager instance (required for queue-aware allocation)
+            rng: Generator for resource count formulas (defaults to a per-resource-table stream)
 
         Yields:
             When all required resources are allocated
@@ -259,71 +313,77 @@ class ResourceManager:
                 queue_name = req.get('queue')  # Optional queue reference
 
                 # Handle dynamic count with formula
-                if isinstance(count, dict) and 'formula' in count:
-                    from ...distributions import generate_from_distribution
-                    count = int(round(generate_from_distribution(count['formula'])))
-                elif isinstance(count, str):
-                    # Direct formula string
-                    from ...distributions import generate_from_distribution
-                    count = int(round(generate_from_distribution(count)))
+                if isinstance(count, (dict, str)):
+                    formula = count['formula'] if isinstance(count, dict) else count
+                    count_rng = rng if rng is not None else self.random_streams.stream('resource_count', str(resource_table))
+                    count = int(round(generate_from_distribution(formula, rng=count_rng)))
                 else:
                     count = int(count)
 
                 if count <= 0:
                     continue
 
-                logger.debug(f"Event {event_id} requesting {count} resources of type {resource_table}.{resource_value}" +
-                           (f" using queue '{queue_name}'" if queue_name else ""))
+                if sim_log.debug_enabled:
+                    sim_log.debug("Event %s requesting %s resources of type %s.%s%s", event_id, count,
+                                  resource_table, resource_value, f" using queue '{queue_name}'" if queue_name else "")
+                trace(entity_id, "t=%.3f entity %s requests %s x %s.%s (queue: %s)", self.env.now, entity_id, count,
+                      resource_table, resource_value, queue_name)
 
                 # Queue-aware resource allocation
+                queue_entry = None
                 if queue_name and queue_manager:
                     # Enqueue entity before waiting for resources
-                    queue_manager.enqueue(
+                    queue_entry = queue_manager.enqueue(
                         queue_name=queue_name,
                         entity_id=entity_id,
                         entity_table=entity_table,
-                        entity_attributes=entity_attributes or {}
+                        entity_attributes=entity_attributes or {},
+                        lane=(resource_table, resource_value)
                     )
-                    logger.debug(f"Entity {entity_id} enqueued in '{queue_name}', waiting for resources")
+                    sim_log.debug("Entity %s enqueued in '%s', waiting for resources", entity_id, queue_name)
+
+                # Define filter function for this resource type
+                def resource_filter(r, table=resource_table, value=resource_value):
+                    return r.table == table and r.type == value
 
                 # Request resources from the FilterStore
                 for i in range(count):
-                    # Define filter function for this resource type
-                    def resource_filter(r, table=resource_table, value=resource_value):
-                        return r.table == table and r.type == value
-
-                    # Wait for resource to become available
-                    resource = yield self.resource_store.get(resource_filter)
-
-                    # If using queue, dequeue entity when resource becomes available
-                    if queue_name and queue_manager and i == 0:  # Dequeue only once per requirement
-                        dequeued_entry = queue_manager.dequeue(queue_name)
-                        if dequeued_entry:
-                            logger.debug(f"Entity {dequeued_entry.entity_id} dequeued from '{queue_name}' "
-                                       f"(waited {self.env.now - dequeued_entry.entry_time:.2f} time units)")
+                    if queue_entry is not None and i == 0:
+                        # Wait for our turn in the queue, then dequeue once per requirement
+                        resource = yield from self._get_in_queue_order(
+                            queue_manager, queue_name, queue_entry, resource_filter
+                        )
+                        queue_manager.dequeue(queue_name, queue_entry)
+                        sim_log.debug("Entity %s dequeued from '%s' (waited %.2f time units)",
+                                      queue_entry.entity_id, queue_name, self.env.now - queue_entry.entry_time)
+                    else:
+                        # Wait for resource to become available
+                        resource = yield self.resource_store.get(resource_filter)
 
                     allocated_resources.append(resource)
 
                     # Track allocation
-                    resource_key = f"{resource.table}_{resource.id}"
-                    self.resource_utilization[resource_key]['allocation_count'] += 1
-                    self.resource_utilization[resource_key]['last_allocated'] = allocation_start_time
+                    if resource.ordinal >= 0:
+                        self.allocation_counts[resource.ordinal] += 1
+                        self.last_allocated[resource.ordinal] = allocation_start_time
 
-                    logger.debug(f"Allocated resource {resource_key} (type: {resource.type}) to event {event_id}")
+                    sim_log.debug("Allocated resource %s_%s (type: %s) to event %s",
+                                  resource.table, resource.id, resource.type, event_id)
 
             # Store the allocation for this event using a composite key to handle ID collisions
             allocation_key = f"{event_flow}_{event_id}" if event_flow else str(event_id)
             self.event_allocations[allocation_key] = allocated_resources
 
             # Record allocation in history
-            self.allocation_history.append({
-                'event_id': event_id,
-                'timestamp': allocation_start_time,
-                'resources': [(r.table, r.id, r.type) for r in allocated_resources],
-                'action': 'allocate'
-            })
+            self.allocation_history.append(
+                AllocationRecord(event_id, allocation_start_time, tuple(allocated_resources), 'allocate')
+            )
+            self.total_allocations += 1
 
-            logger.debug(f"Successfully allocated {len(allocated_resources)} resources to event {event_id}")
+            sim_log.debug("Successfully allocated %s resources to event %s", len(allocated_resources), event_id)
+            if is_traced(entity_id):
+                trace(entity_id, "t=%.3f entity %s allocated %s", self.env.now, entity_id,
+                      ', '.join(f"{r.table}_{r.id}" for r in allocated_resources))
 
         except simpy.Interrupt:
             # If interrupted, release any resources we managed to allocate
@@ -332,6 +392,49 @@ class ResourceManager:
                 self.resource_store.put(resource)
             raise
     
+    def _get_in_queue_order(self, queue_manager, queue_name: str, entry, resource_filter):
+        """
+        Wait until an entry is at the head of its queue and a matching resource is free.
+
+        Only the head of a queue requests a resource from the store, so the
+        queue discipline (not the store's wake order) decides who is served.
+        When another entry overtakes the head, its pending request is cancelled
+        and it waits for its turn again.
+
+        Args:
+            queue_manager: QueueManager holding the entry
+            queue_name: Name of the queue
+            entry: QueueEntry returned by enqueue
+            resource_filter: Filter selecting matching resources
+
+        Yields:
+            SimPy events; returns the allocated resource
+        """
+        request = None
+        try:
+            while True:
+                entry.wakeup = self.env.event()
+                if not queue_manager.is_head(queue_name, entry):
+                    yield entry.wakeup
+                    continue
+                request = self.resource_store.get(resource_filter)
+                yield request | entry.wakeup
+                if request.triggered:
+                    return request.value
+                # Overtaken by a higher-priority entry
+                request.cancel()
+                request = None
+        except simpy.Interrupt:
+            if request is not None:
+                if request.triggered:
+                    self.resource_store.put(request.value)
+                else:
+                    request.cancel()
+            queue_manager.cancel(queue_name, entry)
+            raise
+        finally:
+            entry.wakeup = None
+
     def release_resources(self, event_id: int, event_flow: str = None):
         """
         Release all resources allocated to an event
@@ -357,33 +460,22 @@ class ResourceManager:
         resources = self.event_allocations[allocation_key]
         release_time = self.env.now
         
+        # Update utilization tracking
+        self._record_release(resources, release_time)
+        
         for resource in resources:
-            # Update utilization tracking
-            resource_key = f"{resource.table}_{resource.id}"
-            util = self.resource_utilization[resource_key]
-            
-            if util['last_allocated'] is not None:
-                busy_duration = release_time - util['last_allocated']
-                util['total_busy_time'] += busy_duration
-                util['last_released'] = release_time
-            
             # Return resource to the store
             self.resource_store.put(resource)
             
-            logger.debug(f"Released resource {resource_key} from event {event_id}")
+            sim_log.debug("Released resource %s_%s from event %s", resource.table, resource.id, event_id)
         
         # Record release in history
-        self.allocation_history.append({
-            'event_id': event_id,
-            'timestamp': release_time,
-            'resources': [(r.table, r.id, r.type) for r in resources],
-            'action': 'release'
-        })
+        self.allocation_history.append(AllocationRecord(event_id, release_time, tuple(resources), 'release'))
         
         # Remove from current allocations
         del self.event_allocations[allocation_key]
         
-        logger.debug(f"Released {len(resources)} resources from event {event_id}")
+        sim_log.debug("Released %s resources from event %s", len(resources), event_id)
     
     def get_available_resources(self, resource_type: Optional[str] = None) -> List[Resource]:
         """
@@ -411,68 +503,76 @@ class ResourceManager:
             Dictionary of utilization statistics
         """
         stats = {
-            'total_resources': len(self.resource_utilization),
+            'total_resources': len(self.resources),
             'currently_allocated': sum(len(resources) for resources in self.event_allocations.values()),
-            'total_allocations': len([h for h in self.allocation_history if h['action'] == 'allocate']),
+            'total_allocations': self.total_allocations,
             'by_resource': {},
             'by_type': {}
         }
         
+        now = self.env.now
+        if now > 0:
+            # Include busy time of resources that are still allocated
+            current_busy, _ = self._current_busy_time(now)
+            utilization = current_busy / now * 100
+        else:
+            utilization = np.zeros(len(self.resources))
+        
         # Calculate per-resource statistics
-        type_stats = {}
-        
-        for resource_key, util in self.resource_utilization.items():
-            # Calculate utilization percentage
-            if self.env.now > 0:
-                # Add current busy time if resource is still allocated
-                current_busy = 0
-                if util['last_allocated'] and (not util['last_released'] or 
-                                              util['last_allocated'] > util['last_released']):
-                    current_busy = self.env.now - util['last_allocated']
-                
-                total_busy = util['total_busy_time'] + current_busy
-                utilization_pct = (total_busy / self.env.now) * 100
-            else:
-                utilization_pct = 0
-            
-            stats['by_resource'][resource_key] = {
-                'allocation_count': util['allocation_count'],
-                'total_busy_time': util['total_busy_time'],
-                'utilization_percentage': round(utilization_pct, 2)
+        for resource in self.resources:
+            i = resource.ordinal
+            stats['by_resource'][f"{resource.table}_{resource.id}"] = {
+                'allocation_count': int(self.allocation_counts[i]),
+                'total_busy_time': float(self.busy_time[i]),
+                'utilization_percentage': round(float(utilization[i]), 2)
             }
-            
-            # Aggregate by type
-            # Get resource type from stored resource information
-            resource_type = 'unknown'
-            if resource_key in self.all_resources:
-                resource_type = self.all_resources[resource_key].type
-            
-            if resource_type not in type_stats:
-                type_stats[resource_type] = {
-                    'count': 0,
-                    'total_allocations': 0,
-                    'total_busy_time': 0
-                }
-            
-            type_stats[resource_type]['count'] += 1
-            type_stats[resource_type]['total_allocations'] += util['allocation_count']
-            type_stats[resource_type]['total_busy_time'] += util['total_busy_time']
         
         # Calculate type-level statistics
-        for rtype, tstats in type_stats.items():
-            if self.env.now > 0 and tstats['count'] > 0:
-                avg_utilization = (tstats['total_busy_time'] / (self.env.now * tstats['count'])) * 100
+        for rtype, ordinals in self._ordinals_by_type().items():
+            count = len(ordinals)
+            if now > 0 and count > 0:
+                avg_utilization = (self.busy_time[ordinals].sum() / (now * count)) * 100
             else:
                 avg_utilization = 0
             
             stats['by_type'][rtype] = {
-                'count': tstats['count'],
-                'total_allocations': tstats['total_allocations'],
-                'average_utilization_percentage': round(avg_utilization, 2)
+                'count': count,
+                'total_allocations': int(self.allocation_counts[ordinals].sum()),
+                'average_utilization_percentage': round(float(avg_utilization), 2)
             }
         
         return stats
-    
+
+    def _ordinals_by_type(self) -> Dict[str, np.ndarray]:
+        """Group resource ordinals by resource type."""
+        by_type: Dict[str, List[int]] = {}
+        for resource in self.resources:
+            by_type.setdefault(resource.type, []).append(resource.ordinal)
+        return {rtype: np.asarray(ordinals) for rtype, ordinals in by_type.items()}
+
+    def get_utilization_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a cheap per-type utilization snapshot for progress reporting.
+
+        Unlike get_utilization_stats this does not build per-resource entries.
+
+        Returns:
+            Dictionary mapping resource type to count, busy and utilization_percentage
+        """
+        now = self.env.now
+        busy_time, busy = self._current_busy_time(now)
+
+        snapshot = {}
+        for resource_type, ordinals in self._ordinals_by_type().items():
+            count = len(ordinals)
+            utilization = (busy_time[ordinals].sum() / (now * count)) * 100 if now > 0 else 0
+            snapshot[resource_type] = {
+                'count': count,
+                'busy': int(busy[ordinals].sum()),
+                'utilization_percentage': round(float(utilization), 2)
+            }
+        return snapshot
+
     def get_allocation_history(self, event_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get resource allocation history
@@ -483,9 +583,10 @@ class ResourceManager:
         Returns:
             List of allocation history entries
         """
-        if event_id is not None:
-            return [h for h in self.allocation_history if h['event_id'] == event_id]
-        return self.allocation_history.copy()
+        return [
+            record.as_dict() for record in self.allocation_history
+            if event_id is None or record.event_id == event_id
+        ]
     
     def get_group_resources(self, entity_id: int, group_id: str) -> List[Resource]:
         """
@@ -514,7 +615,7 @@ class ResourceManager:
         if group_key not in self.group_allocations:
             self.group_allocations[group_key] = []
         self.group_allocations[group_key].extend(resources)
-        logger.debug(f"Added {len(resources)} resources to group {group_id} for entity {entity_id}")
+        sim_log.debug("Added %s resources to group %s for entity %s", len(resources), group_id, entity_id)
     
     def release_group_resources(self, entity_id: int, group_id: str):
         """
@@ -526,34 +627,42 @@ class ResourceManager:
         """
         group_key = (entity_id, group_id)
         if group_key not in self.group_allocations:
-            logger.debug(f"No group resources to release for entity {entity_id}, group {group_id}")
+            sim_log.debug("No group resources to release for entity %s, group %s", entity_id, group_id)
             return
         
         resources = self.group_allocations[group_key]
         release_time = self.env.now
         
+        # Update utilization tracking
+        self._record_release(resources, release_time)
+        
         for resource in resources:
-            # Update utilization tracking
-            resource_key = f"{resource.table}_{resource.id}"
-            util = self.resource_utilization.get(resource_key)
-            
-            if util and util['last_allocated'] is not None:
-                busy_duration = release_time - util['last_allocated']
-                util['total_busy_time'] += busy_duration
-                util['last_released'] = release_time
-            
             # Return resource to the store
             self.resource_store.put(resource)
-            logger.debug(f"Released group resource {resource_key} for entity {entity_id}")
+            sim_log.debug("Released group resource %s_%s for entity %s", resource.table, resource.id, entity_id)
         
         # Record release in history
-        self.allocation_history.append({
-            'event_id': f"group_{entity_id}_{group_id}",
-            'timestamp': release_time,
-            'resources': [(r.table, r.id, r.type) for r in resources],
-            'action': 'release_group'
-        })
+        self.allocation_history.append(
+            AllocationRecord(f"group_{entity_id}_{group_id}", release_time, tuple(resources), 'release_group')
+        )
         
         # Remove from group allocations
         del self.group_allocations[group_key]
-        logger.debug(f"Released {len(resources)} group resources for entity {entity_id}, group {group_id}")
+        sim_log.debug("Released %s group resources for entity %s, group %s", len(resources), entity_id, group_id)
+        trace(entity_id, "t=%.3f entity %s released group %s", release_time, entity_id, group_id)
+
+    def release_entity_groups(self, entity_id: int) -> int:
+        """
+        Release every group allocation still held by an entity (e.g. when it leaves its flow).
+        
+        Args:
+            entity_id: Entity ID
+            
+        Returns:
+            Number of groups released
+        """
+        group_ids = [group_id for owner, group_id in self.group_allocations if owner == entity_id]
+        for group_id in group_ids:
+            sim_log.debug("Entity %s left its flow holding group %s; releasing it", entity_id, group_id)
+            self.release_group_resources(entity_id, group_id)
+        return len(group_ids)
@@ -159,6 +159,8 @@ class AssignStepProcessor(StepProcessor):
                     entity_id, entity_table, db_attributes
                 )
                 if success:
+                    if self.assignment_handler_factory.entity_attribute_manager:
+                        self.assignment_handler_factory.entity_attribute_manager.mark_persisted(entity_id, db_attributes)
                     self.logger.debug(f"Persisted {len(db_attributes)} attributes to database for entity {entity_id}")
                 else:
                     self.logger.warning(f"Failed to persist attributes to database for entity {entity_id}")
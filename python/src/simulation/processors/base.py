@@ -8,6 +8,9 @@ from abc import ABC, abstractmethod
 from typing import Any, Generator, Optional
 import logging
 
+from ..utils.random_streams import RandomStreamRegistry
+from ..utils.sim_logging import get_sim_logger
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,7 +42,47 @@ class StepProcessor(ABC):
         self.event_tracker = event_tracker
         self.config = config
         self.simulator = simulator
+        self.flow_graph = None
+        self.random_streams = None
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        # Lazy logger for per-entity messages
+        self.sim_log = get_sim_logger(self.logger.name)
+
+    def set_flow_graph(self, flow_graph):
+        """
+        Set the compiled flow graph used for step lookups.
+
+        Args:
+            flow_graph: FlowGraph compiled from the simulation config
+        """
+        self.flow_graph = flow_graph
+
+    def set_random_streams(self, random_streams):
+        """
+        Set the registry this processor draws its random numbers from.
+
+        Args:
+            random_streams: RandomStreamRegistry of the simulation
+        """
+        self.random_streams = random_streams
+
+    def get_random_stream(self, kind: str, step: 'Step', flow: 'EventFlow' = None):
+        """
+        Get the random stream of a step.
+
+        Args:
+            kind: Stream category, e.g. 'create', 'event', 'decide'
+            step: Step drawing the numbers
+            flow: Flow containing the step
+
+        Returns:
+            numpy Generator of the step's stream; without a configured registry
+            the processor uses its own unseeded one
+        """
+        if self.random_streams is None:
+            self.random_streams = RandomStreamRegistry()
+        name = f"{flow.flow_id}.{step.step_id}" if flow is not None else step.step_id
+        return self.random_streams.stream(kind, name)
     
     @abstractmethod
     def process(self, entity_id: int, step: 'Step', flow: 'EventFlow', 
@@ -90,11 +133,13 @@ class StepProcessor(ABC):
     
     def log_step_start(self, entity_id: int, step: 'Step'):
         """Log the start of step processing."""
-        self.logger.debug(f"Starting {step.step_type} step '{step.step_id}' for entity {entity_id}")
+        self.sim_log.debug("Starting %s step '%s' for entity %s", step.step_type, step.step_id, entity_id)
     
     def log_step_end(self, entity_id: int, step: 'Step', next_step_id: Optional[str] = None):
         """Log the end of step processing."""
         if next_step_id:
-            self.logger.debug(f"Completed {step.step_type} step '{step.step_id}' for entity {entity_id}, next: {next_step_id}")
+            self.sim_log.debug("Completed %s step '%s' for entity %s, next: %s",
+                               step.step_type, step.step_id, entity_id, next_step_id)
         else:
-            self.logger.debug(f"Completed {step.step_type} step '{step.step_id}' for entity {entity_id}, flow ended")
+            self.sim_log.debug("Completed %s step '%s' for entity %s, flow ended",
+                               step.step_type, step.step_id, entity_id)
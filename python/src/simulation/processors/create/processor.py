@@ -6,20 +6,27 @@ and routes them to their initial processing steps.
 """
 
 import logging
-import random
 from datetime import timedelta
-from typing import Optional, Generator, Dict, Any
+from typing import Optional, Generator, Dict, Any, List
 from sqlalchemy import create_engine, insert, text
 from sqlalchemy.orm import Session
 from sqlalchemy.pool import NullPool
 
 from ..base import StepProcessor
+from ...utils.random_streams import BlockSampler
 from ...utils.column_resolver import ColumnResolver
+from ...utils.sim_logging import get_sim_logger
 from ..utils import extract_distribution_config, extract_distribution_config_with_time_unit
 from ....distributions import generate_from_distribution
 from ....utils.time_units import TimeUnitConverter
 
 logger = logging.getLogger(__name__)
+sim_log = get_sim_logger(__name__)
+
+# Interarrival times drawn per block from a Create step's random stream
+INTERARRIVAL_BLOCK_SIZE = 256
+# Upper bound on arrivals merged into one instant (guards zero interarrival times)
+MAX_BULK_ARRIVALS = 1000
 
 
 class CreateStepProcessor(StepProcessor):
@@ -110,11 +117,11 @@ class CreateStepProcessor(StepProcessor):
         
         if entity_id is not None:
              # --- Trigger Mode ---
-            logger.info(f"Create module {step.step_id} triggered by entity {entity_id}")
+            sim_log.debug("Create module %s triggered by entity %s", step.step_id, entity_id)
             
             # Determine how many entities to create
-            count = self._get_entities_per_arrival(config)
-            logger.debug(f"Triggering generation of {count} entities in {config.entity_table}")
+            count = self._get_entities_per_arrival(config, self.get_random_stream('create_batch', step, flow))
+            sim_log.debug("Triggering generation of %s entities in %s", count, config.entity_table)
             
             # Context for new entities (linking to parent)
             parent_table = entity_table  # The table of the entity that triggered this
@@ -147,79 +154,77 @@ class CreateStepProcessor(StepProcessor):
             max_entities = self._get_max_entities(config)
             logger.info(f"Create module {step.step_id} will generate up to {max_entities} entities")
             
-            # Schedule the first arrival (non-blocking)
-            self._schedule_next_arrival(step, flow, config, event_flow, 0, max_entities)
+            # One long-lived process generates every arrival of this step (non-blocking)
+            self.env.process(self._run_arrivals(step, flow, config, event_flow, max_entities))
             
             # Return immediately - arrivals will continue independently
             return None
         
         yield  # Make this a generator (required by interface)
     
-    def _schedule_next_arrival(self, step: 'Step', flow: 'EventFlow', config: 'CreateConfig', 
-                              event_flow: str, entities_created: int, max_entities: int):
-        """Schedule the next entity arrival as a separate non-blocking process."""
-        # Generate interarrival time
-        try:
-            dist_config, time_unit = extract_distribution_config_with_time_unit(config.interarrival_time)
-            interarrival_value = generate_from_distribution(dist_config)
-            # Use specified time_unit or fall back to base_time_unit
-            time_unit_to_use = time_unit if time_unit is not None else self.config.base_time_unit
-            interarrival_minutes = TimeUnitConverter.to_minutes(interarrival_value, time_unit_to_use)
-            
-            # Schedule the arrival event
-            self.env.process(self._entity_arrival_event(
-                interarrival_minutes, step, flow, config, event_flow, entities_created, max_entities
-            ))
-            
-        except Exception as e:
-            logger.error(f"Error scheduling arrival for Create module {step.step_id}: {e}", exc_info=True)
-    
-    def _entity_arrival_event(self, delay: float, step: 'Step', flow: 'EventFlow', 
-                             config: 'CreateConfig', event_flow: str, entities_created: int, max_entities: int):
-        """Handle a single arrival event (possibly batch)."""
+    def _interarrival_times(self, step: 'Step', flow: 'EventFlow', config: 'CreateConfig'):
+        """Yield interarrival times in minutes, drawn in blocks from the step's random stream."""
+        dist_config, time_unit = extract_distribution_config_with_time_unit(config.interarrival_time)
+        # Use specified time_unit or fall back to base_time_unit
+        time_unit_to_use = time_unit if time_unit is not None else self.config.base_time_unit
+        sampler = BlockSampler(dist_config, self.get_random_stream('create', step, flow), INTERARRIVAL_BLOCK_SIZE)
+        while True:
+            yield TimeUnitConverter.to_minutes(sampler.next(), time_unit_to_use)
+
+    def _should_stop_arrivals(self, step: 'Step') -> bool:
+        """Check termination conditions (evaluated from in-memory counters)."""
+        if self.simulator and self.simulator.termination_monitor:
+            should_terminate, reason = self.simulator.termination_monitor._check_termination_conditions()
+            if should_terminate:
+                logger.info(f"Create module {step.step_id} stopping - {reason}")
+                return True
+        return False
+
+    def _run_arrivals(self, step: 'Step', flow: 'EventFlow', config: 'CreateConfig',
+                      event_flow: str, max_entities: int):
+        """
+        Generate all arrivals of a source Create step.
+
+        Arrivals that land in the same instant (zero interarrival times or
+        entities_per_arrival > 1) are created together with one batched INSERT.
+        """
         try:
-            # Wait for interarrival time
-            yield self.env.timeout(delay)
-            
-            # Check if we should stop creating entities
-            if max_entities != -1 and entities_created >= max_entities:
-                logger.info(f"Create module {step.step_id} reached max entities ({max_entities})")
-                return
-            
-            # Check termination conditions
-            if self.simulator and self.simulator.termination_monitor:
-                should_terminate, reason = self.simulator.termination_monitor._check_termination_conditions()
-                if should_terminate:
-                    logger.info(f"Create module {step.step_id} stopping - {reason}")
+            interarrival_times = self._interarrival_times(step, flow, config)
+            batch_rng = self.get_random_stream('create_batch', step, flow)
+            entities_created = 0
+            delay = next(interarrival_times)
+
+            while max_entities == -1 or entities_created < max_entities:
+                # Wait for interarrival time
+                yield self.env.timeout(delay)
+
+                if self._should_stop_arrivals(step):
                     return
-            
-            # Determine how many entities to create in this arrival
-            batch_size = self._get_entities_per_arrival(config)
-            
-            # Ensure we don't exceed max_entities
-            if max_entities != -1:
-                remaining_entities = max_entities - entities_created
-                batch_size = min(batch_size, remaining_entities)
-            
-            # Create and route batch of entities
-            successfully_created, _ = self._create_and_route_batch(batch_size, step, flow, config, event_flow)
-            
-            new_entities_created = entities_created + successfully_created
-            
-            if successfully_created > 0:
-                if batch_size == 1:
-                    logger.debug(f"Create module {step.step_id} created entity ({new_entities_created}/{max_entities if max_entities != -1 else '∞'})")
-                else:
-                    logger.debug(f"Create module {step.step_id} created {successfully_created} entities in batch ({new_entities_created}/{max_entities if max_entities != -1 else '∞'})")
-            
-            # Schedule next arrival if we haven't reached the limit
-            if max_entities == -1 or new_entities_created < max_entities:
-                self._schedule_next_arrival(step, flow, config, event_flow, new_entities_created, max_entities)
-            else:
-                logger.info(f"Create module {step.step_id} completed. Created {new_entities_created} entities")
-                
+
+                # Determine how many entities arrive in this instant
+                batch_size = self._get_entities_per_arrival(config, batch_rng)
+                delay = next(interarrival_times)
+                while delay <= 0 and batch_size < MAX_BULK_ARRIVALS and (
+                        max_entities == -1 or entities_created + batch_size < max_entities):
+                    batch_size += self._get_entities_per_arrival(config, batch_rng)
+                    delay = next(interarrival_times)
+
+                # Ensure we don't exceed max_entities
+                if max_entities != -1:
+                    batch_size = min(batch_size, max_entities - entities_created)
+
+                # Create and route batch of entities
+                successfully_created, _ = self._create_and_route_batch(batch_size, step, flow, config, event_flow)
+                entities_created += successfully_created
+
+                if successfully_created > 0 and sim_log.debug_enabled:
+                    sim_log.debug("Create module %s created %s entities (%s/%s)", step.step_id, successfully_created,
+                                  entities_created, max_entities if max_entities != -1 else '∞')
+
+            logger.info(f"Create module {step.step_id} completed. Created {entities_created} entities")
+
         except Exception as e:
-            logger.error(f"Error in arrival event for Create module {step.step_id}: {e}", exc_info=True)
+            logger.error(f"Error in arrival process for Create module {step.step_id}: {e}", exc_info=True)
 
     def _create_and_route_batch(self, count: int, step: 'Step', flow: 'EventFlow', 
                                 config: 'CreateConfig', event_flow: str, 
@@ -230,31 +235,28 @@ class CreateStepProcessor(StepProcessor):
         Returns:
             (number_successfully_created, list_of_created_ids)
         """
-        successfully_created = 0
-        created_ids = []
-        
-        for i in range(count):
-            # Pass initial_data (e.g. parent FKs) to creation
-            created_entity_id = self._create_entity(config.entity_table, initial_data)
-            
-            if created_entity_id:
-                # Increment entities processed counter for termination tracking
-                if self.simulator:
-                    self.simulator.initializer.entities_processed += 1
-                
-                # FORKING LOGIC: Route to ALL next steps
-                for next_step_id in step.next_steps:
-                    self._route_entity_to_next_step(created_entity_id, next_step_id, flow, 
-                                                   config.entity_table, event_flow)
-                
-                successfully_created += 1
-                created_ids.append(created_entity_id)
-            else:
-                logger.warning(f"Create module {step.step_id} failed to create entity")
+        if count <= 0:
+            return 0, []
+
+        # Pass initial_data (e.g. parent FKs) to creation
+        created_ids = self._create_entities(config.entity_table, count, initial_data)
+
+        # Increment entities processed counter for termination tracking
+        if self.simulator:
+            self.simulator.initializer.entities_processed += len(created_ids)
+
+        for created_entity_id in created_ids:
+            # FORKING LOGIC: Route to ALL next steps
+            for next_step_id in step.next_steps:
+                self._route_entity_to_next_step(created_entity_id, next_step_id, flow, 
+                                               config.entity_table, event_flow)
+
+        if len(created_ids) < count:
+            logger.warning(f"Create module {step.step_id} failed to create {count - len(created_ids)} of {count} entities")
         
-        return successfully_created, created_ids
+        return len(created_ids), created_ids
 
-    def _get_entities_per_arrival(self, config: 'CreateConfig') -> int:
+    def _get_entities_per_arrival(self, config: 'CreateConfig', rng=None) -> int:
         """Get number of entities to create in this arrival."""
         if config.entities_per_arrival is None:
             return 1  # Default single entity
@@ -266,7 +268,7 @@ class CreateStepProcessor(StepProcessor):
             # It's a distribution formula
             try:
                 dist_config = extract_distribution_config(config.entities_per_arrival)
-                return max(1, int(generate_from_distribution(dist_config)))
+                return max(1, int(generate_from_distribution(dist_config, rng=rng)))
             except Exception as e:
                 logger.warning(f"Error generating entities_per_arrival: {e}, using default 1")
                 return 1
@@ -286,16 +288,18 @@ class CreateStepProcessor(StepProcessor):
         
         return int(config.max_entities)
     
-    def _create_entity(self, entity_table: str, initial_data: Optional[Dict[str, Any]] = None) -> Optional[int]:
+    def _create_entities(self, entity_table: str, count: int,
+                         initial_data: Optional[Dict[str, Any]] = None) -> List[Any]:
         """
-        Create a new entity in the specified table.
+        Create entities arriving together in the specified table (one INSERT for a batch).
         
         Args:
             entity_table: Name of the entity table
+            count: Number of entities to create
             initial_data: Optional data to override generation
             
         Returns:
-            ID of created entity or None on failure
+            IDs of the created entities
         """
         # Create a process-specific engine for this entity creation
         process_engine = create_engine(
@@ -306,25 +310,25 @@ class CreateStepProcessor(StepProcessor):
         
         try:
             with Session(process_engine) as session:
-                # Create entity using EntityManager, passing initial_data
-                entity_id = self.entity_manager.create_entity(session, entity_table, initial_data)
+                # Create entities using EntityManager, passing initial_data
+                entity_ids = self.entity_manager.create_entities(session, entity_table, count, initial_data)
 
-                if entity_id:
+                if entity_ids:
                     session.commit()
                     
                     # Entity arrival time is now automatically tracked via created_at column
                     
-                    # Update entity count
-                    self.entity_manager.entity_count += 1
+                    # Update in-memory entity counts (used by termination checks)
+                    self.entity_manager.record_created(entity_table, len(entity_ids))
                     
-                    return entity_id
+                    return entity_ids
                 else:
                     logger.error(f"Failed to create entity in table {entity_table}")
-                    return None
+                    return []
                     
         except Exception as e:
             logger.error(f"Error creating entity in {entity_table}: {e}", exc_info=True)
-            return None
+            return []
         finally:
             process_engine.dispose()
     
@@ -398,11 +402,3 @@ class CreateStepProcessor(StepProcessor):
             f"For triggered Create steps, the child entity table must have a column with "
             f"generator type='foreign_key' OR type in (entity_id, fk), plus ref='{parent_table}.<pk_column>'."
         )
-    
-    
-    def _find_step_by_id(self, step_id: str, flow: 'EventFlow') -> Optional['Step']:
-        """Find a step by its ID within a flow."""
-        for step in flow.steps:
-            if step.step_id == step_id:
-                return step
-        return None
@@ -6,9 +6,10 @@ branching, supporting various decision types inspired by Rockwell Arena.
 """
 
 import logging
-import random
 from typing import Any, Generator, Optional
 
+import numpy as np
+
 from ..base import StepProcessor
 from ...utils.sql_helpers import SQLExpressionEvaluator
 
@@ -132,7 +133,8 @@ class DecideStepProcessor(StepProcessor):
         decide_config = step.decide_config
         
         # Determine next step based on decision type
-        next_step_id = self._evaluate_decision(entity_id, decide_config, entity_table)
+        rng = self.get_random_stream('decide', step, flow)
+        next_step_id = self._evaluate_decision(entity_id, decide_config, entity_table, rng)
         
         if next_step_id:
             self.logger.debug(f"Entity {entity_id} decision at {step.step_id}: chose {next_step_id}")
@@ -145,7 +147,8 @@ class DecideStepProcessor(StepProcessor):
         yield self.env.timeout(0)  # Instantaneous event
         return next_step_id
     
-    def _evaluate_decision(self, entity_id: int, decide_config: 'DecideConfig', entity_table: str = None) -> Optional[str]:
+    def _evaluate_decision(self, entity_id: int, decide_config: 'DecideConfig', entity_table: str = None,
+                           rng=None) -> Optional[str]:
         """
         Evaluate the decision and return the next step ID.
         
@@ -153,6 +156,7 @@ class DecideStepProcessor(StepProcessor):
             entity_id: Entity ID for context
             decide_config: Decision configuration
             entity_table: Entity table name for database lookups
+            rng: Random stream of the decide step (default: the global np.random state)
             
         Returns:
             Next step ID or None if no valid outcome
@@ -160,18 +164,18 @@ class DecideStepProcessor(StepProcessor):
         decision_type = decide_config.decision_type
         
         if decision_type == "2way-chance":
-            return self._evaluate_2way_chance(entity_id, decide_config)
+            return self._evaluate_2way_chance(entity_id, decide_config, rng)
         elif decision_type == "2way-condition":
-            return self._evaluate_2way_condition(entity_id, decide_config, entity_table)
+            return self._evaluate_2way_condition(entity_id, decide_config, entity_table, rng)
         elif decision_type == "nway-chance":
-            return self._evaluate_nway_chance(entity_id, decide_config)
+            return self._evaluate_nway_chance(entity_id, decide_config, rng)
         elif decision_type == "nway-condition":
-            return self._evaluate_nway_condition(entity_id, decide_config, entity_table)
+            return self._evaluate_nway_condition(entity_id, decide_config, entity_table, rng)
         else:
             self.logger.error(f"Invalid decision type: {decision_type}")
             return None
     
-    def _evaluate_2way_chance(self, entity_id: int, decide_config: 'DecideConfig') -> Optional[str]:
+    def _evaluate_2way_chance(self, entity_id: int, decide_config: 'DecideConfig', rng=None) -> Optional[str]:
         """
         Evaluate 2-way chance decision. Uses first outcome's probability,
         second outcome gets the remaining probability automatically.
@@ -198,14 +202,15 @@ class DecideStepProcessor(StepProcessor):
                 break
         
         # Make decision: if random <= probability, choose first, else choose second
-        if random.random() <= probability:
+        if (rng or np.random).random() <= probability:
             self.logger.debug(f"Entity {entity_id}: 2-way chance chose primary outcome ({probability:.1%})")
             return first_outcome.next_step_id
         else:
             self.logger.debug(f"Entity {entity_id}: 2-way chance chose else outcome ({1-probability:.1%})")
             return outcomes[1].next_step_id
     
-    def _evaluate_2way_condition(self, entity_id: int, decide_config: 'DecideConfig', entity_table: str = None) -> Optional[str]:
+    def _evaluate_2way_condition(self, entity_id: int, decide_config: 'DecideConfig', entity_table: str = None,
+                                 rng=None) -> Optional[str]:
         """
         Evaluate 2-way conditional decision. First outcome has the condition,
         second outcome is the "else" case.
@@ -229,14 +234,14 @@ class DecideStepProcessor(StepProcessor):
         first_outcome = outcomes[0]
         
         # Evaluate first outcome's conditions - if they match, choose it, else choose second
-        if self._evaluate_outcome_conditions(entity_id, first_outcome.conditions, entity_table):
+        if self._evaluate_outcome_conditions(entity_id, first_outcome.conditions, entity_table, rng):
             self.logger.debug(f"Entity {entity_id}: 2-way condition matched primary condition")
             return first_outcome.next_step_id
         else:
             self.logger.debug(f"Entity {entity_id}: 2-way condition fell through to else outcome")
             return outcomes[1].next_step_id
     
-    def _evaluate_nway_chance(self, entity_id: int, decide_config: 'DecideConfig') -> Optional[str]:
+    def _evaluate_nway_chance(self, entity_id: int, decide_config: 'DecideConfig', rng=None) -> Optional[str]:
         """
         Evaluate N-way chance decision using cumulative probability distribution.
         
@@ -277,7 +282,7 @@ class DecideStepProcessor(StepProcessor):
             self.logger.debug(f"Entity {entity_id}: Normalized N-way probabilities: {probabilities}")
         
         # Use cumulative distribution
-        random_value = random.random()
+        random_value = (rng or np.random).random()
         cumulative_prob = 0.0
         
         for i, prob in enumerate(probabilities):
@@ -290,7 +295,8 @@ class DecideStepProcessor(StepProcessor):
         self.logger.warning(f"N-way chance probability fallback for entity {entity_id}, choosing last outcome")
         return outcome_ids[-1]
     
-    def _evaluate_nway_condition(self, entity_id: int, decide_config: 'DecideConfig', entity_table: str = None) -> Optional[str]:
+    def _evaluate_nway_condition(self, entity_id: int, decide_config: 'DecideConfig', entity_table: str = None,
+                                 rng=None) -> Optional[str]:
         """
         Evaluate N-way conditional decision. Evaluates conditions in order,
         returns first matching outcome.
@@ -313,7 +319,7 @@ class DecideStepProcessor(StepProcessor):
         
         # Evaluate each outcome's conditions in order
         for i, outcome in enumerate(outcomes):
-            if self._evaluate_outcome_conditions(entity_id, outcome.conditions, entity_table):
+            if self._evaluate_outcome_conditions(entity_id, outcome.conditions, entity_table, rng):
                 self.logger.debug(f"Entity {entity_id}: N-way condition matched outcome {i} ({outcome.outcome_id})")
                 return outcome.next_step_id
         
@@ -321,7 +327,8 @@ class DecideStepProcessor(StepProcessor):
         self.logger.warning(f"No outcome conditions matched for entity {entity_id} in N-way conditional decision")
         return None
     
-    def _evaluate_outcome_conditions(self, entity_id: int, conditions: list, entity_table: str = None) -> bool:
+    def _evaluate_outcome_conditions(self, entity_id: int, conditions: list, entity_table: str = None,
+                                     rng=None) -> bool:
         """
         Evaluate all conditions for an outcome (AND logic).
         
@@ -336,12 +343,12 @@ class DecideStepProcessor(StepProcessor):
             return True  # No conditions means always true
         
         for condition in conditions:
-            if not self._evaluate_single_condition(entity_id, condition, entity_table):
+            if not self._evaluate_single_condition(entity_id, condition, entity_table, rng):
                 return False  # AND logic - one false condition fails the outcome
         
         return True  # All conditions passed
     
-    def _evaluate_single_condition(self, entity_id: int, condition, entity_table: str = None) -> bool:
+    def _evaluate_single_condition(self, entity_id: int, condition, entity_table: str = None, rng=None) -> bool:
         """
         Evaluate a single condition using the new if/name/is/value format.
         
@@ -364,7 +371,7 @@ class DecideStepProcessor(StepProcessor):
         
         # Detect different condition types
         if if_type == "probability":
-            return self._evaluate_probability_condition(entity_id, operator, value)
+            return self._evaluate_probability_condition(entity_id, operator, value, rng)
         elif if_type == "attribute":
             if not condition.name:
                 self.logger.error(f"Invalid attribute condition for entity {entity_id}: missing name field")
@@ -384,7 +391,8 @@ class DecideStepProcessor(StepProcessor):
             self.logger.error(f"Unsupported if type or unrecognized expression: {if_type}")
             return False
     
-    def _evaluate_probability_condition(self, entity_id: int, operator: str, probability_value: float) -> bool:
+    def _evaluate_probability_condition(self, entity_id: int, operator: str, probability_value: float,
+                                        rng=None) -> bool:
         """
         Evaluate probability condition.
         
@@ -392,6 +400,7 @@ class DecideStepProcessor(StepProcessor):
             entity_id: Entity ID
             operator: Comparison operator (should be "==")
             probability_value: Probability threshold
+            rng: Random stream of the decide step
             
         Returns:
             True if random value meets probability condition
@@ -400,7 +409,7 @@ class DecideStepProcessor(StepProcessor):
             self.logger.error(f"Unsupported probability operator: {operator}")
             return False
             
-        random_value = random.random()
+        random_value = (rng or np.random).random()
         result = random_value <= probability_value
         self.logger.debug(f"Entity {entity_id}: Probability {random_value} <= {probability_value} -> {result}")
         return result
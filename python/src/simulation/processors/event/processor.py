@@ -6,10 +6,9 @@ duration processing, and event creation in the database.
 """
 
 import logging
-import random
 from datetime import timedelta
-from typing import Any, Generator, Optional
-from sqlalchemy import create_engine, insert
+from typing import Any, Callable, Dict, Generator, Optional, Tuple
+from sqlalchemy import create_engine, insert, text
 from sqlalchemy.orm import Session
 from sqlalchemy.pool import NullPool
 
@@ -20,6 +19,12 @@ from ....utils.time_units import TimeUnitConverter
 
 logger = logging.getLogger(__name__)
 
+# Table types whose rows the simulation creates; FK parents in them are re-read per event
+SIMULATED_TABLE_TYPES = ('entity', 'event', 'bridge')
+
+# Marks a bridge column left to its database default
+_NO_VALUE = object()
+
 
 class EventStepProcessor(StepProcessor):
     """
@@ -40,10 +45,13 @@ class EventStepProcessor(StepProcessor):
 
         # Database config (set via set_db_config)
         self.db_config = None
+        # Bridge table -> compiled generators of its generated columns
+        self._bridge_attribute_plans: Dict[str, Tuple] = {}
 
     def set_db_config(self, db_config):
         """Set the database configuration."""
         self.db_config = db_config
+        self._bridge_attribute_plans.clear()
     
     def can_handle(self, step_type: str) -> bool:
         """Check if this processor can handle event steps."""
@@ -114,11 +122,12 @@ class EventStepProcessor(StepProcessor):
 
             # Determine if this step is part of a resource group
             current_group_id = step.group_id
+            rng = self.get_random_stream('event', step, flow)
             
             # Allocate resources if required
             if event_config.resource_requirements:
                 requirements_list = self._convert_resource_requirements(
-                    event_config.resource_requirements
+                    event_config.resource_requirements, rng
                 )
 
                 try:
@@ -135,7 +144,7 @@ class EventStepProcessor(StepProcessor):
 
 
                             matched_resources, unmet_requirements = self._filter_group_resources_by_requirements(
-                                group_resources, requirements_list
+                                group_resources, requirements_list, rng
                             )
 
                             
@@ -151,12 +160,13 @@ class EventStepProcessor(StepProcessor):
                                             entity_id=entity_id,
                                             entity_table=entity_table,
                                             entity_attributes=entity_attributes,
-                                            queue_manager=self.queue_manager
+                                            queue_manager=self.queue_manager,
+                                            rng=rng
                                         )
                                     )
                                 else:
                                     yield self.env.process(
-                                        self.resource_manager.allocate_resources(event_id, unmet_requirements, event_flow_label)
+                                        self.resource_manager.allocate_resources(event_id, unmet_requirements, event_flow_label, rng=rng)
                                     )
                                 # Combine matched from group + newly allocated
                                 newly_allocated = self.resource_manager.event_allocations.get(allocation_key, [])
@@ -185,12 +195,13 @@ class EventStepProcessor(StepProcessor):
                                     entity_id=entity_id,
                                     entity_table=entity_table,
                                     entity_attributes=entity_attributes,
-                                    queue_manager=self.queue_manager
+                                    queue_manager=self.queue_manager,
+                                    rng=rng
                                 )
                             )
                         else:
                             yield self.env.process(
-                                self.resource_manager.allocate_resources(event_id, requirements_list, event_flow_label)
+                                self.resource_manager.allocate_resources(event_id, requirements_list, event_flow_label, rng=rng)
                             )
                         
                         # Add newly allocated resources to group if group_id is set
@@ -200,13 +211,13 @@ class EventStepProcessor(StepProcessor):
                             if allocated:
                                 self.resource_manager.add_to_group(entity_id, current_group_id, allocated)
 
-                    self.logger.debug(f"Resources allocated for event {event_id}")
+                    self.sim_log.debug("Resources allocated for event %s", event_id)
                 except Exception as e:
                     self.logger.warning(f"Resource allocation failed for event {event_id}: {e}")
                     return None
             
             # Process event duration
-            duration_minutes = self._calculate_event_duration(event_config)
+            duration_minutes = self._calculate_event_duration(event_config, rng)
             start_time = self.env.now
             
             # Wait for the event duration
@@ -238,14 +249,9 @@ class EventStepProcessor(StepProcessor):
                 entity_table=entity_table
             )
             
-            # Determine next step and its group_id
-            next_step_id = step.next_steps[0] if step.next_steps else None
-            next_group_id = self._get_step_group_id(next_step_id, flow) if next_step_id else None
-
-                
-
             # Release resources - but skip if next step has same group_id
-            if current_group_id and next_group_id == current_group_id:
+            keeps_group = self._keeps_group_resources(step, flow)
+            if current_group_id and keeps_group:
                 # Keep resources for next step in the same group
 
 
@@ -253,7 +259,7 @@ class EventStepProcessor(StepProcessor):
                 allocation_key = f"{event_flow_label}_{event_id}" if event_flow_label else str(event_id)
                 if allocation_key in self.resource_manager.event_allocations:
                     del self.resource_manager.event_allocations[allocation_key]
-            elif current_group_id and next_group_id != current_group_id:
+            elif current_group_id:
                 # Exiting group - release all group resources
                 self.resource_manager.release_group_resources(entity_id, current_group_id)
                 # Clear event allocation as well
@@ -264,10 +270,8 @@ class EventStepProcessor(StepProcessor):
                 # No group - standard release
                 self.resource_manager.release_resources(event_id, event_flow_label)
             
-            self.logger.debug(
-                f"Processed event {event_id} (step {step.step_id}) for entity {entity_id} "
-                f"in {duration_minutes/60:.2f} hours"
-            )
+            self.sim_log.debug("Processed event %s (step %s) for entity %s in %.2f hours",
+                               event_id, step.step_id, entity_id, duration_minutes / 60)
             
         except Exception as e:
             self.logger.error(f"Error processing event step {step.step_id}: {str(e)}", exc_info=True)
@@ -298,30 +302,32 @@ class EventStepProcessor(StepProcessor):
             Created event ID or None if failed
         """
         synthetic_id = self._next_synthetic_event_id(step)
-        self.logger.debug(
-            f"Using synthetic event id {synthetic_id} for step {step.step_id} (flow={event_flow})"
-        )
+        self.sim_log.debug("Using synthetic event id %s for step %s (flow=%s)", synthetic_id, step.step_id, event_flow)
         return synthetic_id
     
-    def _get_step_group_id(self, step_id: str, flow) -> Optional[str]:
+    def _keeps_group_resources(self, step: 'Step', flow) -> bool:
         """
-        Look up a step's group_id from the flow.
+        Check whether the step's next step belongs to the same resource group.
         
         Args:
-            step_id: Step ID to look up
+            step: Current step
             flow: Event flow containing the steps
             
         Returns:
-            group_id if found, else None
+            True if the group's resources should be kept for the next step
         """
-        if not flow or not hasattr(flow, 'steps'):
-            return None
-        for step in flow.steps:
-            if step.step_id == step_id:
-                return step.group_id
-        return None
+        if self.flow_graph is not None and flow is not None:
+            return self.flow_graph.get(flow).keeps_group_resources(step.step_id)
+        if not step.group_id or not step.next_steps or not flow or not hasattr(flow, 'steps'):
+            return False
+        next_step_id = step.next_steps[0]
+        for candidate in flow.steps:
+            if candidate.step_id == next_step_id:
+                return candidate.group_id == step.group_id
+        return False
     
-    def _filter_group_resources_by_requirements(self, group_resources: list, requirements: list) -> tuple:
+    def _filter_group_resources_by_requirements(self, group_resources: list, requirements: list,
+                                                rng) -> tuple:
         """
         Filter group resources to match step requirements.
         
@@ -332,6 +338,7 @@ class EventStepProcessor(StepProcessor):
         Args:
             group_resources: List of Resource objects in the group
             requirements: List of requirement dicts with 'value' (type) and 'count'
+            rng: numpy Generator used to pick among matching resources
             
         Returns:
             Tuple of (matched_resources, unmet_requirements):
@@ -351,12 +358,13 @@ class EventStepProcessor(StepProcessor):
             
             if len(matching) >= required_count:
                 # Fully satisfied from group - randomly select required count
-                selected = random.sample(matching, required_count)
+                picks = rng.choice(len(matching), required_count, replace=False)
+                selected = [matching[i] for i in picks]
                 matched.extend(selected)
                 # Remove selected from available pool
                 for r in selected:
                     available.remove(r)
-                self.logger.debug(f"Matched {required_count} '{required_type}' from group")
+                self.sim_log.debug("Matched %s '%s' from group", required_count, required_type)
             elif len(matching) > 0:
                 # Partially satisfied - take what we have, need more
                 matched.extend(matching)
@@ -365,15 +373,16 @@ class EventStepProcessor(StepProcessor):
                 # Need to allocate the remainder
                 remaining_count = required_count - len(matching)
                 unmet.append({**req, 'count': remaining_count})
-                self.logger.debug(f"Partial match: got {len(matching)} '{required_type}' from group, need {remaining_count} more")
+                self.sim_log.debug("Partial match: got %s '%s' from group, need %s more",
+                                   len(matching), required_type, remaining_count)
             else:
                 # Not satisfied at all from group - need full allocation
                 unmet.append(req)
-                self.logger.debug(f"No '{required_type}' in group, need to allocate {required_count}")
+                self.sim_log.debug("No '%s' in group, need to allocate %s", required_type, required_count)
         
         return matched, unmet
 
-    def _convert_resource_requirements(self, requirements) -> list:
+    def _convert_resource_requirements(self, requirements, rng=None) -> list:
         """Convert resource requirements to the format expected by resource manager."""
         requirements_list = []
         for req in requirements:
@@ -385,7 +394,7 @@ class EventStepProcessor(StepProcessor):
                     # We reuse extract_distribution_config which is imported
                     dist_config = extract_distribution_config(count_val)
                     # Generate value
-                    val = generate_from_distribution(dist_config)
+                    val = generate_from_distribution(dist_config, rng=rng)
                     # Convert to int, ensure valid count (at least 1 usually, but 0 might be valid contextually?)
                     # Generally resources required implies > 0, but 0 is safe to process (just no allocation)
                     count_val = max(0, int(round(val)))
@@ -404,12 +413,12 @@ class EventStepProcessor(StepProcessor):
             requirements_list.append(req_dict)
         return requirements_list
     
-    def _calculate_event_duration(self, event_config) -> float:
+    def _calculate_event_duration(self, event_config, rng=None) -> float:
         """Calculate event duration in minutes from configuration."""
         try:
             # Extract the actual distribution config and time unit from duration field
             dist_config, time_unit = extract_distribution_config_with_time_unit(event_config.duration)
-            duration_value = generate_from_distribution(dist_config)
+            duration_value = generate_from_distribution(dist_config, rng=rng)
             # Use specified time_unit or fall back to base_time_unit
             time_unit_to_use = time_unit if time_unit is not None else self.config.base_time_unit
             return TimeUnitConverter.to_minutes(duration_value, time_unit_to_use)
@@ -461,100 +470,142 @@ class EventStepProcessor(StepProcessor):
             
             if active_event_tracker and allocation_key in self.resource_manager.event_allocations:
                 
-                # Check for bridge table generators
-                extra_attributes = {}
-                if bridge_table and self.db_config:
-                    # Find bridge entity config
-                    bridge_entity = next((e for e in self.db_config.entities if e.name == bridge_table), None)
-                    if bridge_entity:
-                        from ....generator.data.attribute_generator import generate_attribute_value
-                        from ....generator.data.formula.evaluator import FormulaEvaluator
-                        # We might need a session for formula evaluation if complex formulas are used
-                        # For now, simple generation
-                        
-                        for attr in bridge_entity.attributes:
-                            # Skip standard logging columns handled by tracker
-                            if attr.name in ('id', 'event_id', 'start_date', 'end_date', 'event_type'):
-                                continue
-                            # Skip entity fk and resource fk (handled by tracker logic if named correctly)
-                            if attr.type in ('entity_id', 'resource_id'):
-                                continue
-                            
-                            # Handle FK with formula - generate value from the distribution
-                            if attr.generator and attr.generator.type == 'foreign_key':
-                                # Only skip FKs that don't have a formula - those are handled elsewhere
-                                if not attr.generator.formula:
-                                    continue
-                                # FK with formula: look up actual parent PKs and select by position
-                                try:
-                                    if attr.ref:
-                                        ref_table, ref_column = attr.ref.split('.')
-                                        # Query the parent table for actual PK values
-                                        from sqlalchemy import text
-                                        from sqlalchemy.orm import sessionmaker
-                                        Session = sessionmaker(bind=self.engine)
-                                        with Session() as session:
-                                            result = session.execute(text(f'SELECT "{ref_column}" FROM "{ref_table}"'))
-                                            parent_ids = [row[0] for row in result.fetchall()]
-                                        
-                                        if parent_ids:
-                                            # Use ForeignKeyResolver to select by position
-                                            from ....generator.data.foreign_key import ForeignKeyResolver
-                                            fk_resolver = ForeignKeyResolver()
-                                            val = fk_resolver.select_parent_id(parent_ids, attr.generator.formula)
-                                            extra_attributes[attr.name] = val
-                                        else:
-                                            self.logger.warning(f"No parent records found in {ref_table} for FK {attr.name}")
-                                    else:
-                                        self.logger.warning(f"FK {attr.name} has formula but no ref defined")
-                                except Exception as e:
-                                    self.logger.warning(f"Error generating FK {attr.name} from formula {attr.generator.formula}: {e}")
-                                continue
-                            
-                            # Safest is to generate only if it has a generator
-                            
-                            if attr.generator:
-                                try:
-                                    # Convert to dict format expected by generator
-                                    attr_dict = {
-                                        'name': attr.name,
-                                        'generator': {
-                                            'type': attr.generator.type,
-                                            'method': attr.generator.method,
-                                            'template': attr.generator.template,
-                                            'formula': attr.generator.formula,
-                                            'expression': getattr(attr.generator, 'expression', None)
-                                        }
-                                    }
-                                    # Use a dummy index 0 or event_id as seed proxy
-                                    val = generate_attribute_value(attr_dict, event_id)
-                                    # Apply type processing to respect integer/decimal constraints
-                                    from ....generator.data.type_processor import process_value_for_type
-                                    val = process_value_for_type(val, attr.type)
-                                    extra_attributes[attr.name] = val
-                                except Exception as e:
-                                    self.logger.warning(f"Error generating attribute {attr.name} for bridge {bridge_table}: {e}")
+                # Generated values for the bridge table's own columns
+                extra_attributes = self._generate_bridge_attributes(bridge_table, event_id) if bridge_table else {}
 
                 allocated_resources = self.resource_manager.event_allocations[allocation_key]
-                for resource in allocated_resources:
-                    # Record in the event tracker
-                    active_event_tracker.record_resource_allocation(
-                        event_flow=event_flow or self._get_event_flow_label(None),
-                        event_id=event_id,
-                        resource_table=resource.table,
-                        resource_id=resource.id,
-                        allocation_time=start_time,
-                        release_time=end_time,
-                        entity_id=entity_id,
-                        entity_table=entity_table,
-                        event_type=event_type,
-                        target_bridge_table=bridge_table,
-                        extra_attributes=extra_attributes
-                    )
-                self.logger.debug(f"Recorded {len(allocated_resources)} resource allocations for event {event_id}")
+                active_event_tracker.record_resource_allocations(
+                    event_flow=event_flow or self._get_event_flow_label(None),
+                    event_id=event_id,
+                    resources=[(resource.table, resource.id) for resource in allocated_resources],
+                    allocation_time=start_time,
+                    release_time=end_time,
+                    entity_id=entity_id,
+                    entity_table=entity_table,
+                    event_type=event_type,
+                    target_bridge_table=bridge_table,
+                    extra_attributes=extra_attributes
+                )
+                self.sim_log.debug("Recorded %s resource allocations for event %s", len(allocated_resources), event_id)
         except Exception as e:
             self.logger.warning(f"Error recording resource allocations for event {event_id}: {str(e)}")
 
+    def _generate_bridge_attributes(self, bridge_table: str, event_id: int) -> Dict[str, Any]:
+        """
+        Generate the values of a bridge table's generated columns for one event.
+
+        Args:
+            bridge_table: Name of the bridge table
+            event_id: Event ID (row index for the generators)
+
+        Returns:
+            Column name -> generated value
+        """
+        plan = self._bridge_attribute_plans.get(bridge_table)
+        if plan is None:
+            plan = self._bridge_attribute_plans[bridge_table] = self._compile_bridge_attribute_plan(bridge_table)
+
+        extra_attributes = {}
+        for name, generate, error_label in plan:
+            try:
+                value = generate(event_id)
+            except Exception as e:
+                self.logger.warning(f"{error_label}: {e}")
+                continue
+            if value is not _NO_VALUE:
+                extra_attributes[name] = value
+        return extra_attributes
+
+    def _compile_bridge_attribute_plan(self, bridge_table: str) -> Tuple[Tuple[str, Callable[[int], Any], str], ...]:
+        """
+        Resolve the generated columns of a bridge table once.
+
+        Standard logging columns and entity/resource FKs are filled by the
+        event tracker. FKs with a formula select a parent by position; other
+        columns with a generator use the attribute generator.
+
+        Returns:
+            (column name, generate(event_id), error label) per generated column
+        """
+        bridge_entity = next((e for e in self.db_config.entities if e.name == bridge_table), None) if self.db_config else None
+        if bridge_entity is None:
+            return ()
+
+        from ....generator.data.attribute_generator import generate_attribute_value
+        from ....generator.data.type_processor import process_value_for_type
+
+        plan = []
+        for attr in bridge_entity.attributes:
+            # Skip standard logging columns handled by tracker
+            if attr.name in ('id', 'event_id', 'start_date', 'end_date', 'event_type'):
+                continue
+            # Skip entity fk and resource fk (handled by tracker logic if named correctly)
+            if attr.type in ('entity_id', 'resource_id') or not attr.generator:
+                continue
+
+            if attr.generator.type == 'foreign_key':
+                # Only FKs with a formula are generated here - those without are handled elsewhere
+                if not attr.generator.formula:
+                    continue
+                if not attr.ref:
+                    self.logger.warning(f"FK {attr.name} has formula but no ref defined")
+                    continue
+                error_label = f"Error generating FK {attr.name} from formula {attr.generator.formula}"
+                try:
+                    plan.append((attr.name, self._parent_selector(attr), error_label))
+                except Exception as e:
+                    self.logger.warning(f"{error_label}: {e}")
+                continue
+
+            attr_dict = {
+                'name': attr.name,
+                'generator': {
+                    'type': attr.generator.type,
+                    'method': attr.generator.method,
+                    'template': attr.generator.template,
+                    'formula': attr.generator.formula,
+                    'expression': getattr(attr.generator, 'expression', None)
+                }
+            }
+
+            def generate(event_id, attr_dict=attr_dict, attr_type=attr.type):
+                # event_id serves as row index; type processing respects integer/decimal constraints
+                return process_value_for_type(generate_attribute_value(attr_dict, event_id), attr_type)
+
+            plan.append((attr.name, generate, f"Error generating attribute {attr.name} for bridge {bridge_table}"))
+        return tuple(plan)
+
+    def _parent_selector(self, attr) -> Callable[[int], Any]:
+        """
+        Build the value generator of an FK column with a formula.
+
+        The parent's PK values are read once for tables the simulation does
+        not write to, and per event for entity, event and bridge tables.
+        """
+        from ....generator.data.foreign_key import ForeignKeyResolver
+
+        ref_table, ref_column = attr.ref.split('.')
+        query = text(f'SELECT "{ref_column}" FROM "{ref_table}"')
+        ref_entity = next((e for e in self.db_config.entities if e.name == ref_table), None)
+        static = ref_entity is not None and ref_entity.type not in SIMULATED_TABLE_TYPES and isinstance(ref_entity.rows, int)
+        resolver = ForeignKeyResolver()
+        formula = attr.generator.formula
+        cached_ids = []
+
+        def select(event_id):
+            parent_ids = cached_ids
+            if not parent_ids:
+                with self.engine.connect() as conn:
+                    parent_ids = [row[0] for row in conn.execute(query)]
+                if static:
+                    cached_ids.extend(parent_ids)
+            if not parent_ids:
+                self.logger.warning(f"No parent records found in {ref_table} for FK {attr.name}")
+                return _NO_VALUE
+            return resolver.select_parent_id(parent_ids, formula)
+
+        return select
+
     def _next_synthetic_event_id(self, step: 'Step') -> int:
         """Generate a synthetic event ID when no event table is available."""
         self.synthetic_event_counter += 1
@@ -53,6 +53,8 @@ class StepProcessorFactory:
         self.simulator = simulator
         self.queue_manager = queue_manager
         self.db_config = db_config
+        self.flow_graph = None
+        self.random_streams = None
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
         # Initialize all processors with simulator and queue_manager references
@@ -124,6 +126,9 @@ class StepProcessorFactory:
                 self._processor_cache[step_type] = processor
         
         self.logger.debug(f"Built processor cache: {list(self._processor_cache.keys())}")
+        if self.flow_graph is not None:
+            # Compiled steps hold resolved processors
+            self.flow_graph.rebuild()
     
     def _get_supported_types(self, processor: StepProcessor) -> List[str]:
         """
@@ -168,7 +173,7 @@ class StepProcessorFactory:
         return None
     
     def process_step(self, entity_id: int, step: 'Step', flow: 'EventFlow', 
-                    entity_table: str, event_flow: str, flow_event_tracker=None):
+                    entity_table: str, event_flow: str, flow_event_tracker=None, processor=None):
         """
         Process a step using the appropriate processor.
         
@@ -179,11 +184,13 @@ class StepProcessorFactory:
             entity_table: Name of entity table
             event_flow: Event flow identifier/label
             flow_event_tracker: Flow-specific EventTracker (optional, uses default if not provided)
+            processor: Processor already resolved for this step (optional, e.g. from the flow graph)
             
         Returns:
             Generator from the step processor
         """
-        processor = self.get_processor(step.step_type)
+        if processor is None:
+            processor = self.get_processor(step.step_type)
         if processor is None:
             raise ValueError(f"No processor available for step type: {step.step_type}")
         
@@ -193,6 +200,28 @@ class StepProcessorFactory:
         self.logger.debug(f"Processing {step.step_type} step '{step.step_id}' for entity {entity_id} using EventTracker for flow {flow.flow_id}")
         return processor.process(entity_id, step, flow, entity_table, event_flow, event_tracker)
     
+    def set_flow_graph(self, flow_graph):
+        """
+        Share the compiled flow graph with all processors.
+
+        Args:
+            flow_graph: FlowGraph compiled from the simulation config
+        """
+        self.flow_graph = flow_graph
+        for processor in self.processors:
+            processor.set_flow_graph(flow_graph)
+
+    def set_random_streams(self, random_streams):
+        """
+        Share the simulation's random stream registry with all processors.
+
+        Args:
+            random_streams: RandomStreamRegistry of the simulation
+        """
+        self.random_streams = random_streams
+        for processor in self.processors:
+            processor.set_random_streams(random_streams)
+
     def add_processor(self, processor: StepProcessor):
         """
         Add a new step processor to the factory.
@@ -206,6 +235,8 @@ class StepProcessorFactory:
             raise TypeError("Processor must inherit from StepProcessor")
         
         self.processors.append(processor)
+        processor.set_flow_graph(self.flow_graph)
+        processor.set_random_streams(self.random_streams)
         self._build_processor_cache()  # Rebuild cache
         
         supported_types = self._get_supported_types(processor)
@@ -491,6 +491,7 @@ class TriggerStepProcessor(StepProcessor):
                 # Get the inserted row ID (assuming last_insert_rowid for SQLite)
                 row_id = result.lastrowid
                 generated_ids.append(row_id)
+                self.entity_manager.record_inserted(target_table)
 
                 self.logger.debug(f"Generated {target_table} record {row_id} with FK {fk_column}={entity_id}")
 
@@ -54,13 +54,9 @@ class EntitiesCondition(TerminationCondition):
     
     def evaluate(self, simulator) -> Tuple[bool, str]:
         if self.table_name and self.table_name != '*':
-            # Count entities in specific table
+            # Count entities in specific table (tracked in memory by the entity manager)
             try:
-                from sqlalchemy import text
-                with simulator.initializer.engine.connect() as conn:
-                    sql_query = text(f'SELECT COUNT(*) FROM "{self.table_name}"')
-                    result = conn.execute(sql_query).fetchone()
-                    entity_count = result[0] if result else 0
+                entity_count = simulator.initializer.entity_manager.get_table_entity_count(self.table_name)
             except Exception as e:
                 logger.error(f"Error counting entities in table '{self.table_name}': {e}")
                 return False, ""
@@ -0,0 +1,144 @@
+"""
+Low-overhead logging for the simulation hot path.
+
+Steps, queue operations and resource allocations run once per entity, so
+their log calls must cost nothing when the message is not emitted.
+``SimLogger`` wraps a standard logger with precomputed ``debug_enabled`` /
+``info_enabled`` flags that call sites check before building any message,
+and passes ``%``-style arguments through so formatting only happens when a
+record is actually handled.
+
+``configure_sim_logging`` applies per-subsystem levels and the sampled trace
+mode: with ``trace_every = N``, every step, queue wait and resource
+allocation of 1 in N entities is logged at INFO through the
+``src.simulation.trace`` logger, whatever the subsystem levels are. Integer
+entity IDs are sampled by value, other IDs (template primary keys) by a CRC32
+of their text, so the same entities are traced on every run.
+"""
+
+import logging
+import weakref
+import zlib
+from typing import Any, Dict, Tuple
+
+# Subsystem -> logger name prefixes it covers
+SUBSYSTEM_LOGGERS: Dict[str, Tuple[str, ...]] = {
+    'engine': ('src.simulation.core', 'src.simulation.termination'),
+    'processors': ('src.simulation.processors',),
+    'resources': ('src.simulation.managers.resource_manager',),
+    'queues': ('src.simulation.managers.queue_manager',),
+    'entities': ('src.simulation.managers.entity_manager', 'src.simulation.managers.entity_attribute_manager'),
+    'tracking': ('src.simulation.managers.event_tracker',),
+}
+
+TRACE_LOGGER_NAME = 'src.simulation.trace'
+
+_sim_loggers = weakref.WeakSet()
+_configured_loggers = set()  # Logger names whose level was set by configure_sim_logging
+_trace_every = 0
+_trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+
+class SimLogger:
+    """Logger wrapper whose enabled checks are plain attribute reads."""
+
+    __slots__ = ('logger', 'debug_enabled', 'info_enabled', '__weakref__')
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Name of the wrapped logger
+        """
+        self.logger = logging.getLogger(name)
+        self.refresh()
+        _sim_loggers.add(self)
+
+    def refresh(self):
+        """Recompute the enabled flags after logging levels changed."""
+        self.debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        self.info_enabled = self.logger.isEnabledFor(logging.INFO)
+
+    def debug(self, msg: str, *args):
+        if self.debug_enabled:
+            self.logger.debug(msg, *args)
+
+    def info(self, msg: str, *args):
+        if self.info_enabled:
+            self.logger.info(msg, *args)
+
+    def warning(self, msg: str, *args, **kwargs):
+        self.logger.warning(msg, *args, **kwargs)
+
+    def error(self, msg: str, *args, **kwargs):
+        self.logger.error(msg, *args, **kwargs)
+
+
+def get_sim_logger(name: str) -> SimLogger:
+    """
+    Get a hot-path logger.
+
+    Args:
+        name: Logger name, usually the module's ``__name__``
+
+    Returns:
+        SimLogger wrapping ``logging.getLogger(name)``
+    """
+    return SimLogger(name)
+
+
+def refresh_sim_loggers():
+    """Recompute the enabled flags of all SimLoggers."""
+    for sim_logger in list(_sim_loggers):
+        sim_logger.refresh()
+
+
+def configure_sim_logging(config=None):
+    """
+    Apply simulation logging settings and refresh all SimLoggers.
+
+    Levels set by a previous call are reset first, so a run without a
+    ``logging`` section uses the process log level again.
+
+    Args:
+        config: SimLoggingConfig (levels per subsystem, trace_every), or None
+    """
+    global _trace_every
+    for name in _configured_loggers:
+        logging.getLogger(name).setLevel(logging.NOTSET)
+    _configured_loggers.clear()
+
+    levels = getattr(config, 'levels', None) or {}
+    for subsystem, level in levels.items():
+        for name in SUBSYSTEM_LOGGERS.get(subsystem, ()):
+            logging.getLogger(name).setLevel(level)
+            _configured_loggers.add(name)
+
+    _trace_every = int(getattr(config, 'trace_every', 0) or 0)
+    if _trace_every:
+        _trace_logger.setLevel(logging.INFO)
+        _configured_loggers.add(TRACE_LOGGER_NAME)
+    refresh_sim_loggers()
+
+
+def _in_sample(entity_id: Any) -> bool:
+    if not isinstance(entity_id, int):
+        entity_id = zlib.crc32(str(entity_id).encode('utf-8'))
+    return entity_id % _trace_every == 0
+
+
+def is_traced(entity_id: Any) -> bool:
+    """Whether an entity is in the traced sample."""
+    return bool(_trace_every) and _in_sample(entity_id)
+
+
+def trace(entity_id: Any, msg: str, *args):
+    """
+    Log a trace line for an entity if it is in the traced sample.
+
+    Args:
+        entity_id: Entity ID
+        msg: ``%``-style message (formatted only when emitted)
+        *args: Message arguments
+    """
+    if _trace_every and _in_sample(entity_id):
+        _trace_logger.info(msg, *args)
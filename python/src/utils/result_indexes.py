@@ -0,0 +1,87 @@
+"""
+Helper indexes and views for querying simulation results.
+
+Built once after a simulation completes, so the results API can aggregate
+``sim_event_processing``, ``sim_resource_allocations`` and
+``sim_queue_activity`` by time bucket with covering index scans, without
+slowing down the inserts made while the simulation runs.
+"""
+
+import logging
+import sqlite3
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (table, index name, columns); time column first so bucket ranges are index range scans
+RESULT_INDEXES = (
+    ('sim_event_processing', 'ix_sim_event_processing_start_time', ('start_time', 'event_flow', 'duration')),
+    ('sim_event_processing', 'ix_sim_event_processing_end_time', ('end_time', 'event_flow')),
+    ('sim_resource_allocations', 'ix_sim_resource_allocations_allocation_time',
+     ('allocation_time', 'release_time', 'resource_table', 'resource_id')),
+    ('sim_queue_activity', 'ix_sim_queue_activity_simulation_time', ('simulation_time', 'queue_name', 'action')),
+)
+
+# Resource allocations joined with the type of the allocated resource
+RESOURCE_TYPES_VIEW = 'sim_resource_allocation_types'
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def build_result_indexes(db_path: str,
+                         resource_type_columns: Optional[Dict[str, Tuple[str, str]]] = None) -> bool:
+    """
+    Create the result helper indexes and the resource type view.
+
+    Args:
+        db_path: Path to the simulated SQLite database
+        resource_type_columns: Resource table -> (primary key column, resource type column)
+
+    Returns:
+        True if the helpers were created
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path, timeout=30)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        created = 0
+        for table, index_name, columns in RESULT_INDEXES:
+            if table in tables:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(index_name)} ON {_quote(table)} "
+                    f"({', '.join(_quote(c) for c in columns)})"
+                )
+                created += 1
+
+        resource_tables = {
+            table: columns for table, columns in (resource_type_columns or {}).items() if table in tables
+        }
+        if 'sim_resource_allocations' in tables and resource_tables:
+            cases = ' '.join(
+                f"WHEN {_literal(table)} THEN (SELECT {_quote(type_column)} FROM {_quote(table)} "
+                f"WHERE {_quote(pk_column)} = a.resource_id)"
+                for table, (pk_column, type_column) in sorted(resource_tables.items())
+            )
+            conn.execute(f"DROP VIEW IF EXISTS {_quote(RESOURCE_TYPES_VIEW)}")
+            conn.execute(
+                f"CREATE VIEW {_quote(RESOURCE_TYPES_VIEW)} AS "
+                f"SELECT a.*, CASE a.resource_table {cases} END AS resource_type "
+                f"FROM sim_resource_allocations a"
+            )
+        # Refresh planner statistics for the new indexes
+        conn.execute("ANALYZE")
+        conn.commit()
+        logger.debug(f"Built {created} result indexes in {db_path}")
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to build result indexes for {db_path}: {e}")
+        return False
+    finally:
+        if conn:
+            conn.close()
@@ -0,0 +1,237 @@
+"""
+Incremental row counts for generated and simulated databases.
+
+Writers record how many rows they insert or delete per table in a small
+metadata table, so readers can report table sizes without ``COUNT(*)``
+scans. Counting piggybacks on SQLAlchemy's engine events: the rowcount of
+every INSERT/DELETE executed against a tracked database is held per
+connection, applied on commit, dropped on rollback, and written out once
+when tracking ends.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+ROW_COUNTS_TABLE = '_db_simulator_row_counts'
+
+_WRITE_PATTERN = re.compile(
+    r'^\s*(INSERT|DELETE)\s+(?:OR\s+\w+\s+)?(?:INTO|FROM)\s+["`\[]?([^\s"`\]\(]+)',
+    re.IGNORECASE
+)
+
+_trackers: Dict[str, 'RowCountTracker'] = {}
+_trackers_lock = threading.Lock()
+_listener_installed = False
+_PENDING_KEY = '_row_count_pending'
+
+
+def _normalize_path(db_path: str) -> str:
+    return os.path.normcase(os.path.abspath(db_path))
+
+
+@lru_cache(maxsize=4096)
+def _parse_write(statement: str):
+    """Return (sign, table) for INSERT/DELETE statements, None otherwise."""
+    match = _WRITE_PATTERN.match(statement)
+    if not match:
+        return None
+    return (1 if match.group(1).upper() == 'INSERT' else -1), match.group(2)
+
+
+@lru_cache(maxsize=256)
+def _engine_path(database: Optional[str]) -> Optional[str]:
+    if not database or database == ':memory:':
+        return None
+    return _normalize_path(database)
+
+
+def _tracker_for(conn) -> Optional['RowCountTracker']:
+    if not _trackers:
+        return None
+    return _trackers.get(_engine_path(conn.engine.url.database))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    tracker = _tracker_for(conn)
+    if tracker is None:
+        return
+    parsed = _parse_write(statement)
+    if parsed is None:
+        return
+    sign, table = parsed
+    if cursor.rowcount < 0:
+        # Driver could not report how many rows were written
+        tracker.unknown.add(table)
+        return
+    pending = conn.info.setdefault(_PENDING_KEY, {})
+    pending[table] = pending.get(table, 0) + sign * cursor.rowcount
+
+
+def _on_commit(conn):
+    pending = conn.info.pop(_PENDING_KEY, None)
+    if pending:
+        tracker = _tracker_for(conn)
+        if tracker is not None:
+            for table, delta in pending.items():
+                tracker.add(table, delta)
+
+
+def _on_rollback(conn):
+    conn.info.pop(_PENDING_KEY, None)
+
+
+def _install_listener():
+    global _listener_installed
+    if not _listener_installed:
+        # Only writers need SQLAlchemy; readers of the counts stay lightweight
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "commit", _on_commit)
+        event.listen(Engine, "rollback", _on_rollback)
+        _listener_installed = True
+
+
+def _ensure_table(conn: sqlite3.Connection):
+    conn.execute(
+        f'CREATE TABLE IF NOT EXISTS "{ROW_COUNTS_TABLE}" ('
+        'table_name TEXT PRIMARY KEY, row_count INTEGER NOT NULL, updated_at TEXT NOT NULL)'
+    )
+
+
+def read_row_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    Read recorded row counts.
+
+    Args:
+        conn: Open SQLite connection to the database
+
+    Returns:
+        Mapping of table name to row count (empty if nothing was recorded)
+    """
+    try:
+        rows = conn.execute(f'SELECT table_name, row_count FROM "{ROW_COUNTS_TABLE}"').fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    return {row[0]: int(row[1]) for row in rows}
+
+
+class RowCountTracker:
+    """
+    Tallies rows inserted into and deleted from one database while active.
+
+    Use as a context manager around the code that writes to the database and
+    call ``flush`` once the writes are committed.
+    """
+
+    def __init__(self, db_path: str, fresh: bool = False):
+        """
+        Args:
+            db_path: Path to the SQLite database being written
+            fresh: The database starts empty, so tallies are absolute counts
+        """
+        self.db_path = db_path
+        self.fresh = fresh
+        self.deltas: Dict[str, int] = {}
+        self.unknown = set()
+        self._key = _normalize_path(db_path)
+
+    def add(self, table: str, delta: int):
+        """Record a change in the number of rows of a table."""
+        self.deltas[table] = self.deltas.get(table, 0) + delta
+
+    def start(self):
+        """Start tallying writes to the database."""
+        _install_listener()
+        with _trackers_lock:
+            _trackers[self._key] = self
+
+    def stop(self):
+        """Stop tallying writes to the database."""
+        with _trackers_lock:
+            if _trackers.get(self._key) is self:
+                del _trackers[self._key]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def flush(self) -> bool:
+        """
+        Write the tallies to the metadata table.
+
+        Tables whose count cannot be derived incrementally (no recorded
+        baseline, or an unknown rowcount) are counted once here.
+
+        Returns:
+            True if the counts were written
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            _ensure_table(conn)
+            recorded = read_row_counts(conn)
+            tables = [row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' AND name != ?",
+                (ROW_COUNTS_TABLE,)
+            )]
+            now = datetime.now().isoformat()
+            updates = []
+            for table in tables:
+                delta = self.deltas.get(table, 0)
+                if table in self.unknown:
+                    count = None
+                elif self.fresh:
+                    count = delta
+                elif table in recorded:
+                    count = recorded[table] + delta
+                else:
+                    count = None
+                if count is None:
+                    count = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+                updates.append((table, count, now))
+            conn.executemany(
+                f'INSERT OR REPLACE INTO "{ROW_COUNTS_TABLE}" (table_name, row_count, updated_at) VALUES (?, ?, ?)',
+                updates
+            )
+            stale = set(recorded) - set(tables)
+            if stale:
+                conn.executemany(f'DELETE FROM "{ROW_COUNTS_TABLE}" WHERE table_name = ?', [(t,) for t in stale])
+            conn.commit()
+            logger.debug(f"Recorded row counts for {len(updates)} tables in {self.db_path}")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to record row counts for {self.db_path}: {e}")
+            return False
+        finally:
+            if conn:
+                conn.close()
+
+    def invalidate(self):
+        """Drop recorded counts of the tables written while tracking (after a failed run)."""
+        touched = set(self.deltas) | self.unknown
+        if not touched:
+            return
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            _ensure_table(conn)
+            conn.executemany(f'DELETE FROM "{ROW_COUNTS_TABLE}" WHERE table_name = ?', [(t,) for t in touched])
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to invalidate row counts for {self.db_path}: {e}")
+        finally:
+            if conn:
+                conn.close()
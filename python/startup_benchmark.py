@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""
+API startup benchmark.
+
+Starts ``main.py api`` under ``python -X importtime``, measures the time until
+the first successful ``/api/health`` response and reports the slowest imports
+of that startup. Exits non-zero when the time-to-health target is missed, so
+it can guard against heavy imports creeping back onto the startup path.
+
+Usage:
+    python startup_benchmark.py [--runs 3] [--target 0.75] [--top 15] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+# Seconds from process start to the first /health response
+DEFAULT_TARGET_SECONDS = 0.75
+HEALTH_TIMEOUT_SECONDS = 60
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_health(port, process):
+    url = f"http://127.0.0.1:{port}/api/health"
+    deadline = time.monotonic() + HEALTH_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API process exited with code {process.returncode} before becoming healthy")
+        try:
+            with urllib.request.urlopen(url, timeout=0.5) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"API did not become healthy within {HEALTH_TIMEOUT_SECONDS}s")
+
+
+def parse_importtime(lines):
+    """
+    Parse ``-X importtime`` output.
+
+    Args:
+        lines: Lines of the interpreter's stderr
+
+    Returns:
+        List of (module, self_us, cumulative_us) for top-level imports of the
+        application (nesting depth 0 or 1), slowest first
+    """
+    imports = []
+    for line in lines:
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        depth = (len(match.group(3)) - 1) // 2
+        if depth <= 1:
+            imports.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return sorted(imports, key=lambda item: item[2], reverse=True)
+
+
+def measure_startup(workdir):
+    """
+    Start the API once and measure it.
+
+    Returns:
+        Tuple of (seconds to first /health response, parsed importtime entries)
+    """
+    port = _free_port()
+    env = dict(os.environ)
+    # Keep the benchmark away from the user's configuration and jobs
+    env['DB_SIMULATOR_CONFIG_DB'] = os.path.join(workdir, 'configs.db')
+    env['DB_SIMULATOR_OUTPUT_DIR'] = os.path.join(workdir, 'output')
+    with tempfile.TemporaryFile(mode='w+') as stderr:
+        started = time.monotonic()
+        process = subprocess.Popen(
+            [sys.executable, '-X', 'importtime', 'main.py', 'api', '--port', str(port)],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr
+        )
+        try:
+            _wait_for_health(port, process)
+            elapsed = time.monotonic() - started
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+        stderr.seek(0)
+        return elapsed, parse_importtime(stderr.read().splitlines())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure API time-to-first-/health and startup imports')
+    parser.add_argument('--runs', type=int, default=3, help='Startups to measure (best run is reported)')
+    parser.add_argument('--target', type=float, default=DEFAULT_TARGET_SECONDS,
+                        help=f'Time-to-health target in seconds (default: {DEFAULT_TARGET_SECONDS})')
+    parser.add_argument('--top', type=int, default=15, help='Slowest imports to list')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    timings, imports = [], []
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(max(1, args.runs)):
+            elapsed, run_imports = measure_startup(workdir)
+            if not timings or elapsed < min(timings):
+                imports = run_imports
+            timings.append(elapsed)
+
+    best = min(timings)
+    report = {
+        'time_to_health_seconds': round(best, 3),
+        'runs_seconds': [round(t, 3) for t in timings],
+        'target_seconds': args.target,
+        'passed': best <= args.target,
+        'slowest_imports': [
+            {'module': module, 'self_ms': round(self_us / 1000, 1), 'cumulative_ms': round(cumulative_us / 1000, 1)}
+            for module, self_us, cumulative_us in imports[:args.top]
+        ],
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Time to first /health: {best:.3f}s (target {args.target:.3f}s, runs: "
+              f"{', '.join(f'{t:.3f}s' for t in timings)})")
+        print("Slowest startup imports (cumulative):")
+        for entry in report['slowest_imports']:
+            print(f"  {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+        print("PASS" if report['passed'] else "FAIL: startup is slower than the target")
+    sys.exit(0 if report['passed'] else 1)
+
+
+if __name__ == '__main__':
+    main()
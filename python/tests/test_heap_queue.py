@@ -0,0 +1,66 @@
+"""
+Tests for HeapQueue re-prioritisation.
+"""
+
+import pytest
+
+from src.simulation.managers.queue_manager import HeapQueue, QueueEntry
+
+
+def _entries(count):
+    return [QueueEntry(entity_id=i, entity_table='Entity', attribute_value=None, entry_time=0.0)
+            for i in range(count)]
+
+
+def _drain(heap):
+    return [entry.entity_id for entry in heap.pop_many(len(heap))]
+
+
+@pytest.mark.parametrize('lifo', [False, True])
+def test_update_to_same_priority(lifo):
+    heap = HeapQueue(lifo=lifo)
+    a, b, c, d = _entries(4)
+    for priority, entry in enumerate((a, b, c, d), start=1):
+        heap.push(entry, priority)
+
+    assert heap.update(c, 3)
+    assert heap.update(a, 1)
+    assert _drain(heap) == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize('lifo', [False, True])
+def test_update_back_and_forth(lifo):
+    heap = HeapQueue(lifo=lifo)
+    a, b, c, d = _entries(4)
+    for priority, entry in enumerate((a, b, c, d), start=1):
+        heap.push(entry, priority)
+
+    assert heap.update(c, 5)
+    assert heap.update(c, 3)
+    assert heap.update(c, 5)
+    assert heap.update(c, 3)
+    assert len(heap) == 4
+    assert _drain(heap) == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize('lifo, expected', [(False, [0, 1, 2, 3]), (True, [3, 2, 1, 0])])
+def test_update_keeps_arrival_order_on_ties(lifo, expected):
+    heap = HeapQueue(lifo=lifo)
+    entries = _entries(4)
+    for entry in entries:
+        heap.push(entry, 0.0)
+
+    assert heap.update(entries[1], 9.0)
+    assert heap.update(entries[1], 0.0)
+    assert _drain(heap) == expected
+
+
+def test_update_of_missing_entry():
+    heap = HeapQueue()
+    a, b = _entries(2)
+    heap.push(a, 1)
+
+    assert not heap.update(b, 1)
+    heap.remove(a)
+    assert not heap.update(a, 2)
+    assert len(heap) == 0
@@ -0,0 +1,52 @@
+"""
+Tests for chunked table population.
+"""
+
+import sqlite3
+
+import pytest
+
+from src.generator import generate_database
+
+SELF_REFERENCE_CONFIG = """
+entities:
+  - name: Employee
+    type: resource
+    rows: 50
+    attributes:
+      - name: id
+        type: pk
+{pk_generator}
+      - name: manager_id
+        type: fk
+        generator:
+          type: foreign_key
+          subtype: many_to_one
+        ref: Employee.id
+"""
+
+TEMPLATE_PK = """        generator:
+          type: template
+          template: 'E{id}'"""
+
+
+@pytest.mark.parametrize('pk_generator', ['', TEMPLATE_PK], ids=['auto_increment', 'template'])
+@pytest.mark.parametrize('chunk_size', [1, 7, 10000])
+def test_self_reference_points_at_earlier_rows(tmp_path, pk_generator, chunk_size):
+    config = SELF_REFERENCE_CONFIG.format(pk_generator=pk_generator)
+    db_path = generate_database(config, str(tmp_path), 'employees', chunk_size=chunk_size, use_cache=False)
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        rows = conn.execute("SELECT id, manager_id FROM Employee ORDER BY rowid").fetchall()
+    finally:
+        conn.close()
+
+    assert len(rows) == 50
+    # Only the first row has no earlier row to point at
+    assert rows[0][1] is None
+    seen = set()
+    for key, manager in rows:
+        if seen:
+            assert manager in seen
+        seen.add(key)